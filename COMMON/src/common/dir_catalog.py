@@ -0,0 +1,194 @@
+"""
+Persistent, mtime-validated directory listing of a tree.
+
+Indexing a photo library by file name means listing every folder in it.
+A directory's mtime changes whenever an entry is added, removed or renamed
+in it, so the listing is stored in a JSON catalog with each directory's
+mtime, and the next build only lists directories whose mtime changed.
+Unchanged ones cost a single stat.
+
+Usage:
+    from common.dir_catalog import DirCatalog
+
+    catalog = DirCatalog("/photos", ".log/photos_catalog.json").build()
+    for rel, files in catalog.iter_files():
+        ...
+    catalog.save()
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+class DirCatalog:
+    """
+    Directory tree listing: relative dir -> [mtime_ns, subdirs, files].
+
+    The root itself is the "" entry. Entries are kept in walk order (parents
+    before children, subdirectories in sorted order) and names are sorted.
+    """
+
+    # Version 1 catalogs were written by per-project indexes in two layouts
+    VERSION = 2
+
+    def __init__(
+        self,
+        root: PathLike,
+        catalog_path: Optional[PathLike] = None,
+        file_filter: Optional[Callable[[str], bool]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Args:
+            root: Directory to list
+            catalog_path: JSON file persisting the listing (None keeps it in memory)
+            file_filter: Predicate on file names to include (None includes all files)
+            logger: Optional logger instance
+        """
+        self.root = os.path.abspath(root)
+        self.catalog_path = Path(catalog_path) if catalog_path else None
+        self.file_filter = file_filter
+        self.logger = logger or logging.getLogger(__name__)
+        self.dirs: Dict[str, list] = {}
+        self.stats = {"dirs": 0, "listed": 0, "files": 0}
+
+    def path_of(self, rel: str) -> str:
+        """Absolute path of a directory given relative to the root."""
+        return os.path.join(self.root, rel) if rel else self.root
+
+    def rel_of(self, directory: PathLike) -> str:
+        """Catalog key of an absolute directory path."""
+        rel = os.path.relpath(os.path.abspath(directory), self.root)
+        return "" if rel == "." else rel
+
+    def load(self) -> Dict[str, list]:
+        """
+        Read the catalog file.
+
+        Returns:
+            Directory entries, or {} if missing, unreadable or for another root
+        """
+        if not self.catalog_path or not self.catalog_path.exists():
+            return {}
+        try:
+            with open(self.catalog_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable directory catalog {self.catalog_path}: {e}")
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.VERSION
+            or data.get("root") != self.root
+        ):
+            return {}
+        return data.get("dirs") or {}
+
+    def _list_dir(self, path: str) -> Tuple[List[str], List[str]]:
+        subdirs, files = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file() and (
+                        self.file_filter is None or self.file_filter(entry.name)
+                    ):
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return sorted(subdirs), sorted(files)
+
+    def build(self) -> "DirCatalog":
+        """
+        List the tree, reusing catalog entries of directories whose mtime is unchanged.
+
+        Returns:
+            self, for chaining
+        """
+        previous = self.load()
+        dirs: Dict[str, list] = {}
+        listed = 0
+
+        pending = [""]
+        while pending:
+            rel = pending.pop()
+            path = self.path_of(rel)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+                entry = previous.get(rel)
+                if entry is not None and entry[0] == mtime_ns:
+                    subdirs, files = entry[1], entry[2]
+                else:
+                    subdirs, files = self._list_dir(path)
+                    listed += 1
+            except OSError as e:
+                self.logger.debug(f"Cannot list {path}: {e}")
+                continue
+
+            dirs[rel] = [mtime_ns, subdirs, files]
+            pending.extend(os.path.join(rel, d) if rel else d for d in reversed(subdirs))
+
+        self.dirs = dirs
+        self.stats = {
+            "dirs": len(dirs),
+            "listed": listed,
+            "files": sum(len(entry[2]) for entry in dirs.values()),
+        }
+        return self
+
+    def iter_files(self) -> Iterator[Tuple[str, List[str]]]:
+        """Yield (relative dir, file names) for every directory, in walk order."""
+        for rel, entry in self.dirs.items():
+            yield rel, entry[2]
+
+    def rename_file(self, old_path: PathLike, new_path: PathLike) -> None:
+        """
+        Record a file rename or move done by the caller.
+
+        Updates the file lists and mtimes of the affected directories, so the
+        next build can still reuse them.
+        """
+        old_path, new_path = os.path.abspath(old_path), os.path.abspath(new_path)
+        for path, remove, add in (
+            (old_path, os.path.basename(old_path), None),
+            (new_path, None, os.path.basename(new_path)),
+        ):
+            directory = os.path.dirname(path)
+            entry = self.dirs.get(self.rel_of(directory))
+            if entry is None:
+                continue
+            files = [name for name in entry[2] if name != remove]
+            if add is not None and add not in files:
+                files.append(add)
+            entry[2] = sorted(files)
+            try:
+                entry[0] = os.stat(directory).st_mtime_ns
+            except OSError:
+                pass
+
+    def save(self) -> bool:
+        """
+        Write the listing to the catalog file atomically.
+
+        Returns:
+            True if saved, False if there is no catalog path or on error
+        """
+        if not self.catalog_path:
+            return False
+        try:
+            self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {"version": self.VERSION, "root": self.root, "dirs": self.dirs}
+            tmp_path = self.catalog_path.with_name(self.catalog_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_path, self.catalog_path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not save directory catalog {self.catalog_path}: {e}")
+            return False
@@ -0,0 +1,283 @@
+"""
+Persistent content hash cache shared by duplicate detection tools.
+
+Hashing a photo library is pure I/O, so digests are stored in a JSON file keyed
+by absolute path and validated against the file's size and mtime. A file is only
+re-read when it changed since the last run.
+
+Usage:
+    from common.hash_cache import HashCache
+
+    with HashCache(".log/hash_cache.json") as cache:
+        digest = cache.get_hash("/photos/IMG_0001.jpg")
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+PathLike = Union[str, Path]
+
+
+def hash_file(
+    file_path: PathLike, algorithm: str = "sha1", chunk_size: int = 1024 * 1024
+) -> str:
+    """
+    Compute the hex digest of a file's full content.
+
+    Args:
+        file_path: File to hash
+        algorithm: Any hashlib algorithm name (sha1 matches Immich checksums)
+        chunk_size: Read block size in bytes
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_file_partial(file_path: PathLike, block_size: int = 64 * 1024) -> str:
+    """
+    Compute a cheap fingerprint from the file size and its first/last blocks.
+
+    Two files with different fingerprints are certainly different; equal
+    fingerprints still need a full hash to confirm.
+
+    Args:
+        file_path: File to fingerprint
+        block_size: Bytes read from the start and from the end of the file
+
+    Returns:
+        Hex digest string
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(str(size).encode())
+    with open(file_path, "rb") as f:
+        digest.update(f.read(block_size))
+        if size > 2 * block_size:
+            f.seek(-block_size, os.SEEK_END)
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+class HashCache:
+    """Persistent, stat-validated cache of file content hashes."""
+
+    VERSION = 1
+
+    # Default location alongside the other per-project caches
+    DEFAULT_PATH = Path(".log") / "hash_cache.json"
+
+    def __init__(
+        self,
+        cache_path: Optional[PathLike] = None,
+        logger: Optional[logging.Logger] = None,
+        autoload: bool = True,
+    ):
+        """
+        Initialize the hash cache.
+
+        Args:
+            cache_path: JSON file to persist digests to (None keeps them in memory)
+            logger: Optional logger instance
+            autoload: Load existing entries from cache_path immediately
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.logger = logger or logging.getLogger(__name__)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "bytes_hashed": 0,
+        }
+
+        if autoload and self.cache_path:
+            self.load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.save()
+        return False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def load(self) -> bool:
+        """
+        Load entries from the cache file.
+
+        Returns:
+            True if loaded successfully, False if missing or unreadable
+        """
+        if not self.cache_path or not self.cache_path.exists():
+            return False
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                self.logger.warning(
+                    f"Ignoring hash cache with unknown version: {self.cache_path}"
+                )
+                return False
+            self.entries = data.get("entries", {})
+            self.dirty = False
+            self.logger.debug(
+                f"Loaded {len(self.entries)} cached hashes from {self.cache_path}"
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Error loading hash cache {self.cache_path}: {e}")
+            return False
+
+    def save(self) -> bool:
+        """
+        Write entries to the cache file atomically if anything changed.
+
+        Returns:
+            True if the cache is persisted (or has nothing to persist)
+        """
+        if not self.cache_path or not self.dirty:
+            return True
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": self.VERSION, "entries": self.entries},
+                    f,
+                    separators=(",", ":"),
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+            self.logger.debug(
+                f"Saved {len(self.entries)} cached hashes to {self.cache_path}"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Error saving hash cache {self.cache_path}: {e}")
+            return False
+
+    @staticmethod
+    def _key(file_path: PathLike) -> str:
+        return os.path.abspath(os.fspath(file_path))
+
+    def _entry(self, file_path: PathLike, stat_result=None) -> Dict[str, Any]:
+        """Return the cache entry for a file, dropping it if the file changed."""
+        key = self._key(file_path)
+        st = stat_result or os.stat(key)
+        entry = self.entries.get(key)
+        if (
+            entry is None
+            or entry.get("size") != st.st_size
+            or entry.get("mtime_ns") != st.st_mtime_ns
+        ):
+            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            self.entries[key] = entry
+            self.dirty = True
+        return entry
+
+    def get_cached(self, file_path: PathLike, algorithm: str = "sha1") -> Optional[str]:
+        """
+        Return a cached digest without reading the file, if still valid.
+
+        Args:
+            file_path: File to look up
+            algorithm: Digest algorithm name
+
+        Returns:
+            Hex digest, or None if not cached or the file changed
+        """
+        key = self._key(file_path)
+        entry = self.entries.get(key)
+        if entry is None or algorithm not in entry:
+            return None
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        return entry[algorithm]
+
+    def get_hash(
+        self, file_path: PathLike, algorithm: str = "sha1", stat_result=None
+    ) -> str:
+        """
+        Return the full-content digest of a file, hashing it only if needed.
+
+        Args:
+            file_path: File to hash
+            algorithm: Digest algorithm name (sha1 matches Immich checksums)
+            stat_result: Optional os.stat result to avoid a second stat call
+
+        Returns:
+            Hex digest string
+        """
+        entry = self._entry(file_path, stat_result)
+        digest = entry.get(algorithm)
+        if digest is not None:
+            self.stats["hits"] += 1
+            return digest
+
+        self.stats["misses"] += 1
+        digest = hash_file(file_path, algorithm)
+        self.stats["bytes_hashed"] += entry["size"]
+        entry[algorithm] = digest
+        self.dirty = True
+        return digest
+
+    def get_partial_hash(self, file_path: PathLike, stat_result=None) -> str:
+        """
+        Return the cheap size+first/last-block fingerprint of a file.
+
+        Args:
+            file_path: File to fingerprint
+            stat_result: Optional os.stat result to avoid a second stat call
+
+        Returns:
+            Hex digest string
+        """
+        entry = self._entry(file_path, stat_result)
+        digest = entry.get("partial")
+        if digest is not None:
+            self.stats["hits"] += 1
+            return digest
+
+        self.stats["misses"] += 1
+        digest = hash_file_partial(file_path)
+        entry["partial"] = digest
+        self.dirty = True
+        return digest
+
+    def forget(self, file_path: PathLike):
+        """Drop any cached digests for a file."""
+        if self.entries.pop(self._key(file_path), None) is not None:
+            self.dirty = True
+
+    def prune(self) -> int:
+        """
+        Remove entries for files that no longer exist.
+
+        Returns:
+            Number of entries removed
+        """
+        missing = [key for key in self.entries if not os.path.exists(key)]
+        for key in missing:
+            del self.entries[key]
+        if missing:
+            self.dirty = True
+        return len(missing)
@@ -0,0 +1,322 @@
+"""
+Shared HTTP client with timeouts, retries, rate limiting and latency stats.
+
+Wraps a pooled requests.Session. Every request gets connect/read timeouts;
+idempotent requests that fail with a connection error or a transient status
+(429/502/503/504) are retried with jittered exponential backoff, honouring
+Retry-After. An optional token bucket caps the request rate across threads,
+and per-endpoint latency histograms show where the time goes.
+
+Requires the ``requests`` package (already a dependency of the projects that
+talk to HTTP APIs).
+
+Usage:
+    from common.http_client import HttpClient
+
+    client = HttpClient("http://immich:2283", headers={"x-api-key": key},
+                        rate_limit=20)
+    resp = client.get("/api/assets/123")
+    resp = client.post("/api/search/metadata", json=query, idempotent=True)
+    for line in client.format_latency_report():
+        logger.info(line)
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, blocking until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000.0
+        index = 0
+        while index < len(self.BOUNDS_MS) and ms > self.BOUNDS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound (ms) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return float(self.BOUNDS_MS[index]) if index < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class HttpClient:
+    """Pooled HTTP client with timeouts, idempotent retries and rate limiting."""
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(
+        self,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        pool_size: int = 16,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 120.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        rate_limit: Optional[float] = None,
+        burst: Optional[float] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Args:
+            base_url: Prefix for relative request paths
+            headers: Headers sent with every request
+            pool_size: Keep-alive connections per host (size for concurrent callers)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: First backoff ceiling in seconds, doubled per attempt
+            backoff_max: Upper limit for a single backoff delay
+            rate_limit: Sustained requests per second across all threads (None: unlimited)
+            burst: Requests allowed in a burst (default: max(1, rate_limit))
+            logger: Optional logger instance
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0}
+        self._lock = threading.Lock()
+        self._sleep = time.sleep
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        max_retries: Optional[int] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures when it is safe to.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL or path relative to base_url
+            idempotent: Override whether the request may be repeated (POST
+                searches, for example); defaults to the HTTP method semantics
+            max_retries: Override the client's retry count for this request
+            **kwargs: Passed to requests (json, params, timeout, ...)
+
+        Returns:
+            The final response (a retryable status is returned once retries
+            are exhausted; callers still call raise_for_status)
+        """
+        method = method.upper()
+        if not url.startswith(("http://", "https://")):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        if idempotent is None:
+            idempotent = method in self.IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        # Delegate to session.get/post/... so callers can mock per-method
+        send = getattr(self.session, method.lower())
+        endpoint = self.endpoint_name(method, url)
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        attempt = 0
+        while True:
+            if self.limiter:
+                waited = self.limiter.acquire()
+                if waited:
+                    with self._lock:
+                        self.stats["throttled_seconds"] += waited
+
+            start = time.perf_counter()
+            try:
+                resp = send(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(endpoint, time.perf_counter() - start)
+                # A refused/timed-out connect never reached the server
+                safe = idempotent or self._never_sent(e)
+                if not safe or attempt >= max_retries:
+                    with self._lock:
+                        self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(
+                    f"{endpoint} failed ({e.__class__.__name__}), "
+                    f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+                )
+            else:
+                self._record(endpoint, time.perf_counter() - start)
+                status = getattr(resp, "status_code", None)
+                if not (idempotent and status in self.RETRY_STATUSES and attempt < max_retries):
+                    return resp
+                delay = self._retry_after(resp)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                self.logger.warning(
+                    f"{endpoint} returned {status}, "
+                    f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+                )
+
+            with self._lock:
+                self.stats["retries"] += 1
+            self._sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _never_sent(exc: Exception) -> bool:
+        """True if the request failed while connecting (timed out or refused)."""
+        if isinstance(exc, requests.exceptions.ConnectTimeout):
+            return True
+        reason = exc.args[0] if exc.args else None
+        # requests wraps urllib3's MaxRetryError, whose reason is the connect error
+        reason = getattr(reason, "reason", reason)
+        return isinstance(reason, (NewConnectionError, ConnectionRefusedError))
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given retry attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, resp) -> Optional[float]:
+        """Return the Retry-After delay in seconds, if given as a number."""
+        try:
+            return min(self.backoff_max, max(0.0, float(resp.headers["Retry-After"])))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+    def _record(self, endpoint: str, seconds: float):
+        with self._lock:
+            self.stats["requests"] += 1
+            histogram = self.histograms.get(endpoint)
+            if histogram is None:
+                histogram = self.histograms[endpoint] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @staticmethod
+    def endpoint_name(method: str, url: str) -> str:
+        """Group URLs by endpoint, replacing numeric and UUID path segments with {id}."""
+        segments = [
+            "{id}" if _ID_SEGMENT.match(segment) else segment
+            for segment in urlsplit(url).path.split("/")
+        ]
+        return f"{method.upper()} {'/'.join(segments) or '/'}"
+
+    def latency_report(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-endpoint latency statistics, slowest total time first."""
+        with self._lock:
+            items = sorted(
+                self.histograms.items(), key=lambda item: item[1].total_ms, reverse=True
+            )
+            return {endpoint: histogram.to_dict() for endpoint, histogram in items}
+
+    def format_latency_report(self) -> List[str]:
+        """Return the latency report as log-friendly lines."""
+        lines = []
+        for endpoint, data in self.latency_report().items():
+            lines.append(
+                f"{endpoint}: {data['count']} requests, mean {data['mean_ms']}ms, "
+                f"p50 <={data['p50_ms']:g}ms, p95 <={data['p95_ms']:g}ms, max {data['max_ms']}ms"
+            )
+        return lines
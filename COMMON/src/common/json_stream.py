@@ -0,0 +1,212 @@
+"""
+Streaming readers and writers for large JSON caches.
+
+json.load() needs the whole file as one string plus the decoded objects, so
+peak memory is several times the file size. iter_json_members() walks the
+top-level object incrementally and can stream the members of selected large
+values (e.g. "assets") one at a time.
+
+For caches that are only ever read front to back, JSON Lines is cheaper still:
+a header line with a record count, then one compact record per line.
+
+Usage:
+    from common.json_stream import iter_json_members, read_jsonl, write_jsonl
+
+    with open("cache.json", encoding="utf-8") as f:
+        for key, subkey, value in iter_json_members(f, stream=("assets",)):
+            ...
+
+    write_jsonl("cache.jsonl", assets, header={"query": query})
+    header, records = read_jsonl("cache.jsonl")
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+_WHITESPACE = " \t\n\r"
+
+
+def _key_sharing_decoder() -> json.JSONDecoder:
+    """
+    Return a decoder that reuses one string object per distinct object key.
+
+    json.load shares repeated keys across a whole document, but each
+    raw_decode()/loads() call starts afresh; decoding millions of small values
+    separately would otherwise keep millions of copies of the same keys.
+    """
+    keys: Dict[str, str] = {}
+
+    def make_object(pairs) -> Dict[str, Any]:
+        return {keys.setdefault(key, key): value for key, value in pairs}
+
+    return json.JSONDecoder(object_pairs_hook=make_object)
+
+
+class _StreamReader:
+    """Character buffer over a text file with incremental JSON decoding."""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = _key_sharing_decoder()
+
+    def _fill(self) -> bool:
+        """Read another chunk; returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer stays about one chunk long
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self, closing: str) -> Iterator[Tuple[Any, None]]:
+        """Iterate over object keys or array slots up to the closing bracket."""
+        if self.peek() == closing:
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            if closing == "}":
+                key = self.value()
+                self.expect(":")
+                yield key
+            else:
+                yield index
+                index += 1
+            separator = self.peek()
+            self.pos += 1
+            if separator == closing:
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '{closing}' at offset {self.pos - 1}")
+
+
+def iter_json_members(
+    fp: IO[str],
+    stream: Iterable[str] = (),
+    chunk_size: int = 1024 * 1024,
+) -> Iterator[Tuple[str, Optional[Any], Any]]:
+    """
+    Iterate over the members of a top-level JSON object without loading it.
+
+    Args:
+        fp: Text file positioned at the start of a JSON object
+        stream: Top-level keys whose object/array value is yielded member by member
+        chunk_size: Characters read per chunk
+
+    Yields:
+        (key, None, value) for ordinary members, and (key, subkey, value) for
+        each member of a streamed value (subkey is the object key or list index)
+    """
+    stream = set(stream)
+    reader = _StreamReader(fp, chunk_size)
+    reader.expect("{")
+    for key in reader.members("}"):
+        opening = reader.peek()
+        if key in stream and opening in "{[":
+            reader.pos += 1
+            closing = "}" if opening == "{" else "]"
+            for subkey in reader.members(closing):
+                yield key, subkey, reader.value()
+        else:
+            yield key, None, reader.value()
+
+
+def write_jsonl(
+    path: PathLike, records: Iterable[Any], header: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Write records as JSON Lines with a leading header line.
+
+    The header gets a "count" field so readers know the length up front. The
+    file is written atomically via a temporary file.
+
+    Args:
+        path: Destination file
+        records: Sized collection of JSON-serializable records
+        header: Extra header fields (e.g. the query that produced the records)
+
+    Returns:
+        Number of records written
+    """
+    records = list(records) if not hasattr(records, "__len__") else records
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(dict(header or {}, count=len(records)), ensure_ascii=False))
+        f.write("\n")
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+            f.write("\n")
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def read_jsonl_header(path: PathLike) -> Dict[str, Any]:
+    """Return the header line of a file written by write_jsonl."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.loads(f.readline())
+
+
+def iter_jsonl(path: PathLike) -> Iterator[Any]:
+    """Iterate over the records of a file written by write_jsonl."""
+    decoder = _key_sharing_decoder()
+    with open(path, "r", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield decoder.decode(line)
+
+
+def read_jsonl(path: PathLike) -> Tuple[Dict[str, Any], Iterator[Any]]:
+    """
+    Open a file written by write_jsonl.
+
+    Returns:
+        (header, iterator over records)
+    """
+    return read_jsonl_header(path), iter_jsonl(path)
@@ -0,0 +1,216 @@
+"""
+Row files for wide tables of string columns: CSV, or Parquet via pyarrow.
+
+Analyze scripts write one row per image with dozens of columns, and update
+scripts read them back. CSV stays the default because it opens in
+spreadsheets; a path ending in .parquet selects Parquet, which reloads far
+faster, reads only the requested columns and filters rows while scanning.
+Parquet needs the optional pyarrow package (pip install pyarrow).
+
+Both formats use the same dict-per-row API and return every value as a
+string, just as csv.DictReader does.
+
+Usage:
+    from common.row_store import RowReader, RowWriter
+
+    with RowWriter("analyze.parquet", headers) as writer:
+        writer.writerow({"Filename": "a.jpg", "Select": ""})
+
+    with RowReader("analyze.parquet") as reader:
+        for row in reader.iter_rows(columns=["Filename"], where=("Select", {"y", "yes"})):
+            ...
+"""
+
+import csv
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+PathLike = Union[str, Path]
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+
+# (column, values): keep rows whose column value, trimmed and lowercased, is in values
+RowFilter = Tuple[str, Iterable[str]]
+
+
+def is_parquet(path: PathLike) -> bool:
+    """Return True if the path selects the Parquet format."""
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def _require_pyarrow(path: PathLike) -> None:
+    if not HAS_PYARROW:
+        raise ImportError(f"Reading or writing {path} needs pyarrow (pip install pyarrow)")
+
+
+def _matches(value: Any, values: set) -> bool:
+    return str(value or "").strip().lower() in values
+
+
+class RowWriter:
+    """
+    Write dict rows with a fixed set of columns to CSV or Parquet.
+
+    Parquet rows are buffered and written as one row group per batch_size
+    rows, with every column stored as a string.
+    """
+
+    def __init__(self, path: PathLike, fieldnames: Sequence[str], batch_size: int = 10000):
+        """
+        Args:
+            path: Output file; a .parquet suffix selects Parquet
+            fieldnames: Column names, in order
+            batch_size: Rows per Parquet row group
+        """
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.batch_size = max(1, batch_size)
+        self.rows_written = 0
+        self._file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._columns: Dict[str, List[str]] = {}
+
+        if is_parquet(self.path):
+            _require_pyarrow(self.path)
+            self._schema = pa.schema([(name, pa.string()) for name in self.fieldnames])
+            self._parquet_writer = pq.ParquetWriter(str(self.path), self._schema)
+            self._reset_columns()
+        else:
+            self._file = self.path.open("w", newline="", encoding="utf-8")
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+            self._csv_writer.writeheader()
+
+    def _reset_columns(self) -> None:
+        self._columns = {name: [] for name in self.fieldnames}
+
+    def _flush(self) -> None:
+        if self._parquet_writer is None or not self._columns[self.fieldnames[0]]:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._parquet_writer.write_table(table)
+        self._reset_columns()
+
+    def writerow(self, row: Dict[str, Any]) -> None:
+        """Write one row; missing columns are written as empty strings."""
+        self.rows_written += 1
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(row)
+            return
+
+        for name, column in self._columns.items():
+            value = row.get(name)
+            column.append("" if value is None else str(value))
+        if len(self._columns[self.fieldnames[0]]) >= self.batch_size:
+            self._flush()
+
+    def writerows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.writerow(row)
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._flush()
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RowReader:
+    """
+    Read dict rows from a CSV or Parquet file.
+
+    fieldnames lists every column in the file. iter_rows() can project to a
+    subset of columns and filter on one column; for Parquet both happen in
+    pyarrow before any Python dicts are built.
+    """
+
+    def __init__(self, path: PathLike):
+        """
+        Args:
+            path: Input file; a .parquet suffix selects Parquet
+        """
+        self.path = Path(path)
+        self.rows_read = 0
+        self._file = None
+        if is_parquet(self.path):
+            _require_pyarrow(self.path)
+            self._parquet = pq.ParquetFile(str(self.path))
+            self.fieldnames: List[str] = list(self._parquet.schema_arrow.names)
+        else:
+            self._parquet = None
+            self._file = self.path.open(newline="", encoding="utf-8")
+            self._csv_reader = csv.DictReader(self._file)
+            self.fieldnames = list(self._csv_reader.fieldnames or [])
+
+    def iter_rows(
+        self, columns: Optional[Sequence[str]] = None, where: Optional[RowFilter] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Yield rows as dicts of strings.
+
+        Args:
+            columns: Columns to include (those missing from the file are ignored); None for all
+            where: (column, values) keeping rows whose trimmed, lowercased value is in values
+
+        rows_read counts every row scanned, including rows filtered out by where.
+        """
+        selected = [name for name in columns if name in self.fieldnames] if columns else None
+        if self._parquet is not None:
+            yield from self._iter_parquet(selected, where)
+            return
+
+        where_column, where_values = (where[0], set(where[1])) if where else (None, None)
+        for row in self._csv_reader:
+            self.rows_read += 1
+            if where_column is not None and not _matches(row.get(where_column), where_values):
+                continue
+            yield {name: row.get(name) for name in selected} if selected is not None else row
+
+    def _iter_parquet(
+        self, columns: Optional[List[str]], where: Optional[RowFilter]
+    ) -> Iterator[Dict[str, str]]:
+        self.rows_read = self._parquet.metadata.num_rows
+        filters = None
+        if where:
+            column = pc.field(where[0]).cast(pa.string())
+            normalized = pc.utf8_lower(pc.utf8_trim_whitespace(column))
+            filters = normalized.isin(sorted(set(where[1])))
+
+        table = pq.read_table(str(self.path), columns=columns, filters=filters)
+        if any(field.type != pa.string() for field in table.schema):
+            table = table.cast(pa.schema([(field.name, pa.string()) for field in table.schema]))
+        for batch in table.to_batches():
+            has_nulls = any(column.null_count for column in batch.columns)
+            for row in batch.to_pylist():
+                if has_nulls:
+                    row = {key: "" if value is None else str(value) for key, value in row.items()}
+                yield row
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RowReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,85 @@
+"""
+Tests for the persistent directory catalog.
+"""
+
+import json
+import os
+
+from common.dir_catalog import DirCatalog
+
+
+def make_tree(root, paths):
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+class TestDirCatalog:
+    """Test cases for the DirCatalog class."""
+
+    def test_build_lists_tree_in_walk_order(self, tmp_path):
+        """Every directory is listed once, parents before children."""
+        root = tmp_path / "photos"
+        make_tree(root, ["top.jpg", "b/2.jpg", "a/1.jpg", "a/x/3.jpg", "a/notes.txt"])
+
+        catalog = DirCatalog(root, file_filter=lambda name: name.endswith(".jpg")).build()
+
+        assert list(catalog.iter_files()) == [
+            ("", ["top.jpg"]),
+            ("a", ["1.jpg"]),
+            (os.path.join("a", "x"), ["3.jpg"]),
+            ("b", ["2.jpg"]),
+        ]
+        assert catalog.dirs[""][1] == ["a", "b"]
+        assert catalog.stats == {"dirs": 4, "listed": 4, "files": 4}
+
+    def test_rebuild_lists_only_changed_dirs(self, tmp_path):
+        """A persisted catalog is reused for directories whose mtime is unchanged."""
+        root = tmp_path / "photos"
+        make_tree(root, ["2020/a.jpg", "2021/b.jpg"])
+        catalog_path = tmp_path / "catalog.json"
+        DirCatalog(root, catalog_path).build().save()
+
+        (root / "2021" / "c.jpg").write_text("x")
+        rebuilt = DirCatalog(root, catalog_path).build()
+
+        assert rebuilt.stats["listed"] == 1
+        assert rebuilt.dirs["2021"][2] == ["b.jpg", "c.jpg"]
+
+    def test_catalog_of_other_root_or_version_is_ignored(self, tmp_path):
+        """Catalogs written for another root or format are not reused."""
+        root = tmp_path / "photos"
+        make_tree(root, ["a.jpg"])
+        catalog_path = tmp_path / "catalog.json"
+        DirCatalog(tmp_path, catalog_path).build().save()
+
+        assert DirCatalog(root, catalog_path).build().stats["listed"] == 1
+
+        data = json.loads(catalog_path.read_text())
+        data["version"] = 1
+        catalog_path.write_text(json.dumps(data))
+        assert DirCatalog(tmp_path, catalog_path).load() == {}
+
+        catalog_path.write_text("{broken")
+        assert DirCatalog(tmp_path, catalog_path).load() == {}
+
+    def test_rename_file_keeps_catalog_reusable(self, tmp_path):
+        """Recorded renames and moves update file lists and mtimes."""
+        root = tmp_path / "photos"
+        make_tree(root, ["a/1.jpg", "b/2.jpg"])
+        catalog_path = tmp_path / "catalog.json"
+        catalog = DirCatalog(root, catalog_path).build()
+
+        os.rename(root / "a" / "1.jpg", root / "b" / "1.jpg")
+        catalog.rename_file(root / "a" / "1.jpg", root / "b" / "1.jpg")
+        catalog.save()
+
+        reloaded = DirCatalog(root, catalog_path).build()
+        assert reloaded.stats["listed"] == 0
+        assert reloaded.dirs["a"][2] == []
+        assert reloaded.dirs["b"][2] == ["1.jpg", "2.jpg"]
+
+    def test_save_without_catalog_path(self, tmp_path):
+        """An in-memory catalog has nothing to save."""
+        assert DirCatalog(tmp_path).build().save() is False
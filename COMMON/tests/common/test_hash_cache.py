@@ -0,0 +1,104 @@
+"""
+Tests for the persistent content hash cache.
+"""
+
+import hashlib
+import os
+
+from common.hash_cache import HashCache, hash_file, hash_file_partial
+
+
+class TestHashFile:
+    """Test cases for the module-level hashing helpers."""
+
+    def test_hash_file_matches_hashlib(self, tmp_path):
+        """Full hash should match hashlib over the whole content."""
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+
+        assert hash_file(path) == hashlib.sha1(data).hexdigest()
+        assert hash_file(path, "md5") == hashlib.md5(data).hexdigest()
+
+    def test_partial_hash_distinguishes_tail(self, tmp_path):
+        """Partial hash should see changes in the last block."""
+        head = b"a" * 200 * 1024
+        first = tmp_path / "first.bin"
+        second = tmp_path / "second.bin"
+        first.write_bytes(head + b"x")
+        second.write_bytes(head + b"y")
+
+        assert hash_file_partial(first) != hash_file_partial(second)
+
+
+class TestHashCache:
+    """Test cases for the HashCache class."""
+
+    def test_hash_is_cached(self, tmp_path):
+        """Second lookup of an unchanged file should not re-read it."""
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(b"image data")
+        cache = HashCache()
+
+        first = cache.get_hash(path)
+        second = cache.get_hash(path)
+
+        assert first == second == hashlib.sha1(b"image data").hexdigest()
+        assert cache.stats["misses"] == 1
+        assert cache.stats["hits"] == 1
+
+    def test_changed_file_is_rehashed(self, tmp_path):
+        """Size or mtime changes should invalidate the cached digest."""
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(b"old")
+        cache = HashCache()
+        cache.get_hash(path)
+
+        path.write_bytes(b"newer content")
+
+        assert cache.get_cached(path) is None
+        assert cache.get_hash(path) == hashlib.sha1(b"newer content").hexdigest()
+        assert cache.stats["misses"] == 2
+
+    def test_persistence_round_trip(self, tmp_path):
+        """Digests saved by one instance should be hits for the next."""
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(b"image data")
+        cache_file = tmp_path / ".log" / "hash_cache.json"
+
+        with HashCache(cache_file) as cache:
+            digest = cache.get_hash(path)
+        assert cache_file.exists()
+
+        reloaded = HashCache(cache_file)
+        assert len(reloaded) == 1
+        assert reloaded.get_cached(path) == digest
+        assert reloaded.get_hash(path) == digest
+        assert reloaded.stats["misses"] == 0
+
+    def test_prune_removes_missing_files(self, tmp_path):
+        """Prune should drop entries for deleted files."""
+        keep = tmp_path / "keep.jpg"
+        gone = tmp_path / "gone.jpg"
+        keep.write_bytes(b"keep")
+        gone.write_bytes(b"gone")
+        cache = HashCache()
+        cache.get_hash(keep)
+        cache.get_hash(gone)
+
+        gone.unlink()
+
+        assert cache.prune() == 1
+        assert len(cache) == 1
+
+    def test_unreadable_cache_file_is_ignored(self, tmp_path):
+        """A corrupt cache file should not prevent hashing."""
+        cache_file = tmp_path / "hash_cache.json"
+        cache_file.write_text("{not json")
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(b"data")
+
+        cache = HashCache(cache_file)
+
+        assert len(cache) == 0
+        assert cache.get_hash(path) == hashlib.sha1(b"data").hexdigest()
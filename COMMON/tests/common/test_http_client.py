@@ -0,0 +1,163 @@
+"""
+Tests for the shared HTTP client, run against a local stub server.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from common.http_client import HttpClient, LatencyHistogram, TokenBucket
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves scripted responses: each path pops its next (status, headers) entry."""
+
+    def _respond(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((self.command, self.path))
+            script = server.scripts.get(self.path, [])
+            status, headers = script.pop(0) if script else (200, {})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.hits = []
+    server.scripts = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **kwargs):
+    client = HttpClient(server.url, headers={"x-api-key": "key"}, **kwargs)
+    client.delays = []
+    client._sleep = client.delays.append
+    return client
+
+
+class TestHttpClient:
+    """Test cases for HttpClient retries and reporting."""
+
+    def test_retries_transient_status_for_get(self, stub_server):
+        """A 502 then 503 on GET is retried until it succeeds."""
+        stub_server.scripts["/api/assets/1"] = [(502, {}), (503, {"Retry-After": "2"})]
+        client = make_client(stub_server)
+
+        resp = client.get("/api/assets/1")
+
+        assert resp.status_code == 200
+        assert len(stub_server.hits) == 3
+        assert client.stats["retries"] == 2
+        assert client.delays[1] == 2.0
+        assert 0 <= client.delays[0] <= client.backoff_base
+
+    def test_post_not_retried_unless_idempotent(self, stub_server):
+        """POST is only retried when the caller marks it idempotent."""
+        stub_server.scripts["/api/search"] = [(502, {}), (502, {})]
+        client = make_client(stub_server)
+
+        assert client.post("/api/search", json={}).status_code == 502
+        assert client.post("/api/search", json={}, idempotent=True).status_code == 200
+        assert len(stub_server.hits) == 3
+
+    def test_gives_up_after_max_retries(self, stub_server):
+        """The last transient response is returned once retries are used up."""
+        stub_server.scripts["/api/queues"] = [(429, {})] * 5
+        client = make_client(stub_server, max_retries=2)
+
+        assert client.get("/api/queues").status_code == 429
+        assert len(stub_server.hits) == 3
+
+    def test_connection_error_raised_after_retries(self):
+        """Connection failures are retried and then raised."""
+        client = HttpClient("http://127.0.0.1:9", max_retries=1, connect_timeout=0.5)
+        client._sleep = lambda delay: None
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("/api/server/ping")
+        assert client.stats["retries"] == 1
+        assert client.stats["failures"] == 1
+
+    def test_refused_connection_retried_for_post(self):
+        """A refused connect never reached the server, so even POST is retried."""
+        client = HttpClient("http://127.0.0.1:9", max_retries=1, connect_timeout=0.5)
+        client._sleep = lambda delay: None
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.post("/api/search", json={})
+        assert client.stats["retries"] == 1
+
+    def test_read_failure_not_retried_for_post(self):
+        """A POST that may have reached the server is not repeated."""
+        client = HttpClient("http://127.0.0.1:9", max_retries=2)
+        client._sleep = lambda delay: None
+
+        def aborted(*args, **kwargs):
+            raise requests.exceptions.ConnectionError("Connection aborted.")
+
+        client.session.post = aborted
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.post("/api/search", json={})
+        assert client.stats["retries"] == 0
+
+    def test_latency_report_groups_ids(self, stub_server):
+        """Asset ids are folded into one endpoint in the latency report."""
+        client = make_client(stub_server)
+        client.get("/api/assets/0b4a9e2c-1f6d-4c1e-9a55-2d8e1f3b7c10")
+        client.get("/api/assets/42")
+
+        report = client.latency_report()
+
+        assert list(report) == ["GET /api/assets/{id}"]
+        assert report["GET /api/assets/{id}"]["count"] == 2
+        assert client.format_latency_report()[0].startswith("GET /api/assets/{id}: 2 requests")
+
+
+class TestRateLimitAndHistogram:
+    """Test cases for TokenBucket and LatencyHistogram."""
+
+    def test_token_bucket_limits_rate(self):
+        """After the burst, tokens are handed out at the configured rate."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+
+        assert time.monotonic() - start >= 0.09
+
+    def test_histogram_percentiles(self):
+        """Percentiles report the upper bound of the containing bucket."""
+        histogram = LatencyHistogram()
+        for ms in [5] * 90 + [300] * 10:
+            histogram.record(ms / 1000)
+
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(95) == 500
+        assert histogram.to_dict()["count"] == 100
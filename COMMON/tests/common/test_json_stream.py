@@ -0,0 +1,76 @@
+"""
+Tests for the streaming JSON helpers.
+"""
+
+import io
+import json
+
+import pytest
+
+from common.json_stream import iter_json_members, read_jsonl, write_jsonl
+
+
+DOCUMENT = {
+    "metadata": {"created": "2025-01-01T00:00:00Z", "total_assets": 3, "ratio": 1.25e3},
+    "assets": {
+        "a1": {"id": "a1", "originalFileName": "IMG_0001.jpg", "tags": ["x", "y"]},
+        "a2": {"id": "a2", "description": "braces } and \"quotes\" ,:[", "size": 123456789},
+        "a3": {"id": "a3", "albums": [], "exifInfo": {}, "flag": None, "ok": True},
+    },
+    "list": [1, 22, 333, {"nested": [4444]}],
+    "empty": {},
+}
+
+
+class TestIterJsonMembers:
+    """Test cases for iter_json_members."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1024 * 1024])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_matches_json_load(self, chunk_size, indent):
+        """Streaming at any chunk size reproduces the document."""
+        text = json.dumps(DOCUMENT, indent=indent)
+        rebuilt = {}
+        for key, subkey, value in iter_json_members(
+            io.StringIO(text), stream=("assets", "list", "empty"), chunk_size=chunk_size
+        ):
+            if key in ("assets", "empty"):
+                rebuilt.setdefault(key, {})[subkey] = value
+            elif key == "list":
+                rebuilt.setdefault(key, []).append(value)
+            else:
+                assert subkey is None
+                rebuilt[key] = value
+        rebuilt.setdefault("empty", {})
+
+        assert rebuilt == DOCUMENT
+
+    def test_unstreamed_values_are_whole(self):
+        """Keys not listed in stream are yielded as complete values."""
+        members = list(iter_json_members(io.StringIO(json.dumps(DOCUMENT))))
+
+        assert [key for key, _, _ in members] == list(DOCUMENT)
+        assert members[1] == ("assets", None, DOCUMENT["assets"])
+
+    def test_truncated_input_raises(self):
+        """Truncated files are reported rather than silently accepted."""
+        text = json.dumps(DOCUMENT)[:-20]
+
+        with pytest.raises(ValueError):
+            list(iter_json_members(io.StringIO(text), stream=("assets",), chunk_size=16))
+
+
+class TestJsonLines:
+    """Test cases for the JSON Lines writer and reader."""
+
+    def test_round_trip(self, tmp_path):
+        """Records and header survive a round trip; count is recorded."""
+        path = tmp_path / ".log" / "cache.jsonl"
+        records = [{"id": f"a{i}", "name": "ü"} for i in range(5)]
+
+        assert write_jsonl(path, records, header={"query": {"page": 1}}) == 5
+
+        header, rows = read_jsonl(path)
+        assert header == {"query": {"page": 1}, "count": 5}
+        assert list(rows) == records
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 6
@@ -0,0 +1,71 @@
+"""
+Tests for CSV/Parquet row files.
+"""
+
+import pytest
+
+from common.row_store import RowReader, RowWriter, is_parquet
+
+
+HEADERS = ["Filename", "Calc Date", "Select"]
+
+ROWS = [
+    {"Filename": "a.jpg", "Calc Date": "2024-01-02", "Select": "Y "},
+    {"Filename": "b.jpg", "Calc Date": "", "Select": ""},
+    {"Filename": "c.jpg", "Calc Date": "2024-03-04", "Select": "yes"},
+    {"Filename": "d.jpg", "Select": "no"},
+]
+
+
+def _formats():
+    formats = ["rows.csv"]
+    try:
+        import pyarrow  # noqa: F401
+
+        formats.append("rows.parquet")
+    except ImportError:
+        pass
+    return formats
+
+
+class TestRowStore:
+    """Test cases for RowWriter and RowReader."""
+
+    @pytest.mark.parametrize("name", _formats())
+    def test_round_trip(self, tmp_path, name):
+        """Rows come back as strings with missing values empty."""
+        path = tmp_path / name
+        with RowWriter(path, HEADERS, batch_size=3) as writer:
+            writer.writerows(ROWS)
+
+        with RowReader(path) as reader:
+            rows = list(reader.iter_rows())
+
+        assert reader.fieldnames == HEADERS
+        assert reader.rows_read == 4
+        assert rows[3] == {"Filename": "d.jpg", "Calc Date": "", "Select": "no"}
+        assert [row["Filename"] for row in rows] == ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]
+
+    @pytest.mark.parametrize("name", _formats())
+    def test_projection_and_filter(self, tmp_path, name):
+        """Only requested columns and matching rows are returned; all rows are counted."""
+        path = tmp_path / name
+        with RowWriter(path, HEADERS) as writer:
+            writer.writerows(ROWS)
+
+        with RowReader(path) as reader:
+            rows = list(reader.iter_rows(
+                columns=["Filename", "Select", "Missing"], where=("Select", {"y", "yes"})
+            ))
+
+        assert rows == [
+            {"Filename": "a.jpg", "Select": "Y "},
+            {"Filename": "c.jpg", "Select": "yes"},
+        ]
+        assert reader.rows_read == 4
+
+    def test_is_parquet(self):
+        """The suffix selects the format."""
+        assert is_parquet("out.parquet")
+        assert is_parquet("OUT.PQ")
+        assert not is_parquet("out.csv")
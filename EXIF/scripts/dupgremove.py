@@ -9,6 +9,10 @@ marked for deletion to a backup directory, preserving the original folder struct
 
 The script safely moves duplicates instead of deleting them, allowing for recovery
 if needed.
+
+With --link, duplicates are instead verified byte-identical (using the persistent
+hash cache) and replaced in place by a hardlink or reflink to the kept file of
+their group. Replacements are recorded in a manifest that --undo-links reverts.
 """
 
 import sys
@@ -51,7 +55,10 @@ SCRIPT_INFO = {
         'results.csv /photos',
         'results.csv /photos --target /backup/duplicates',
         '--input results.csv --source /photos --dry-run',
-        'results.csv /photos --target /backup --verbose'
+        'results.csv /photos --target /backup --verbose',
+        'results.csv /photos --link',
+        'results.csv /photos --link reflink --manifest links.jsonl',
+        '--undo-links links.jsonl'
     ]
 }
 
@@ -68,6 +75,22 @@ SCRIPT_ARGUMENTS = {
     'target': {
         'flag': '--target',
         'help': 'Directory to move duplicates to (default: {source}.duplicates_{timestamp})'
+    },
+    'link': {
+        'flag': '--link',
+        'nargs': '?',
+        'const': 'auto',
+        'choices': list(DupGuruRemover.LINK_MODES),
+        'help': 'Replace duplicates with links to the kept file instead of moving them '
+                '(auto, hardlink or reflink; default: auto)'
+    },
+    'manifest': {
+        'flag': '--manifest',
+        'help': 'Link manifest file for undo (default: {input}_links_{timestamp}.jsonl)'
+    },
+    'undo_links': {
+        'flag': '--undo-links',
+        'help': 'Restore independent copies from a link manifest and exit'
     }
 }
 
@@ -87,6 +110,25 @@ def main():
     # Parse arguments
     args = parser.parse_args()
     
+    # Undo a previous link run - needs only the manifest
+    if args.undo_links:
+        logger = parser.setup_logging(vars(args), "dupgremove")
+        try:
+            undo_stats = DupGuruRemover.undo_links(
+                args.undo_links, dry_run=args.dry_run, logger=logger
+            )
+        except Exception as e:
+            logger.error(f"Error undoing links: {e}")
+            if not args.quiet:
+                print(f"❌ Error: {e}")
+            sys.exit(1)
+        if not args.quiet:
+            print("\nDupGuru Link Undo Results:")
+            print(f"  Copies restored: {undo_stats['restored']}")
+            print(f"  Entries skipped: {undo_stats['skipped']}")
+            print(f"  Errors: {undo_stats['errors']}")
+        sys.exit(1 if undo_stats['errors'] else 0)
+
     # Validate and resolve required arguments with custom error handling
     try:
         resolved_args = parser.validate_required_args(args, {
@@ -105,15 +147,17 @@ def main():
             print("source directory is required", file=sys.stderr)
             sys.exit(1)
     
-    # Add target to resolved_args
+    # Add target and link options to resolved_args
     resolved_args['target'] = args.target
+    resolved_args['link'] = args.link
+    resolved_args['manifest'] = args.manifest
     
     # Setup logging with consistent pattern
     # Use script name without extension for proper log file naming
     logger = parser.setup_logging(resolved_args, "dupgremove")
     
-    # Generate default target if not provided
-    if not resolved_args['target']:
+    # Generate default target if not provided (not used in link mode)
+    if not resolved_args['target'] and not resolved_args['link']:
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -145,6 +189,8 @@ def main():
         'input_file': 'Input CSV file',
         'source_dir': 'Source directory',
         'target': 'Target directory',
+        'link': 'Link mode',
+        'manifest': 'Link manifest',
         'dry_run': 'Dry run mode',
         'verbose': 'Verbose mode',
         'quiet': 'Quiet mode'
@@ -159,7 +205,9 @@ def main():
             dup_path=resolved_args['target'],
             dry_run=resolved_args.get('dry_run', False),
             verbose=resolved_args.get('verbose', False),
-            logger=logger
+            logger=logger,
+            link_mode=resolved_args['link'],
+            manifest_path=resolved_args['manifest']
         )
         
         logger.info("Starting dupGuru file removal")
@@ -176,7 +224,13 @@ def main():
         logger.info("Processing complete")
         logger.info(f"Total rows processed: {stats['total_rows']}")
         logger.info(f"Delete actions found: {stats['delete_actions']}")
-        logger.info(f"Files moved: {stats['files_moved']}")
+        if remover.link_mode:
+            logger.info(f"Files linked: {stats['files_linked']}")
+            logger.info(f"Content mismatches: {stats['hash_mismatches']}")
+            logger.info(f"Bytes reclaimed: {stats['bytes_reclaimed']}")
+            logger.info(f"Link manifest: {remover.manifest_path}")
+        else:
+            logger.info(f"Files moved: {stats['files_moved']}")
         logger.info(f"Files not found: {stats['files_not_found']}")
         logger.info(f"Warnings: {stats['warnings']}")
         logger.info(f"Errors: {stats['errors']}")
@@ -185,7 +239,13 @@ def main():
         if not resolved_args.get('quiet'):
             remover.print_statistics()
             
-            if stats['files_moved'] > 0 and not resolved_args.get('dry_run'):
+            if remover.link_mode:
+                if resolved_args.get('dry_run'):
+                    print(f"\n✅ Dry run complete - would link {stats['files_linked']} files")
+                else:
+                    print(f"\n✅ Linked {stats['files_linked']} files "
+                          f"(undo with --undo-links {remover.manifest_path})")
+            elif stats['files_moved'] > 0 and not resolved_args.get('dry_run'):
                 print(f"\n✅ Successfully moved {stats['files_moved']} files")
             elif resolved_args.get('dry_run'):
                 print(f"\n✅ Dry run complete - would move {stats['files_moved']} files")
@@ -195,7 +255,7 @@ def main():
         logger.info("DupGuru file removal completed successfully")
         
         # Exit with error code if there were errors but no files moved
-        if stats['errors'] > 0 and stats['files_moved'] == 0:
+        if stats['errors'] > 0 and stats['files_moved'] == 0 and stats['files_linked'] == 0:
             if not resolved_args.get('quiet'):
                 print("⚠️  No files were moved due to errors")
             logger.warning("No files were moved due to errors")
@@ -13,6 +13,11 @@ Decision Rules:
 5. For size differences >50KB: prefer larger file (better quality)
 6. For size differences ≤50KB: prefer organized format (just metadata differences)
 7. Ensure every group keeps at least one file (safety check)
+
+Groups of any size are resolved: every member is ranked against the others with
+the rules above and the winner is kept. Rule inputs are computed column-wise per
+batch of rows with precompiled patterns, and input/output are streamed group by
+group so very large exports never have to be held in memory at once.
 """
 
 import argparse
@@ -33,6 +38,20 @@ class DupGuruProcessor:
     
     # File size threshold for quality vs metadata differences
     SIZE_THRESHOLD_KB = 50
+
+    # Rows resolved per column-wise batch when streaming
+    BATCH_ROWS = 10000
+
+    # Columns every dupGuru export must provide
+    REQUIRED_COLUMNS = ('Group ID', 'Filename', 'Folder', 'Size (KB)')
+
+    # Precompiled patterns shared by all rule checks
+    DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+    MONTH_PATTERN = re.compile(r'(\d{4})-(\d{2})')
+    ORGANIZED_PATTERN = re.compile(
+        r'\d{4}-\d{2}-\d{2}_\d{4}_[A-Z]+_\d+x\d+_.*\.(jpg|jpeg|png|gif)$', re.IGNORECASE
+    )
+    INVALID_FOLDER_PATTERNS = ('0000-00', 'nptsi', 'new folder', 'photos from 20')
     
     def __init__(self, input_file, output_file=None, verbose=False):
         """
@@ -50,7 +69,9 @@ class DupGuruProcessor:
         # Statistics tracking
         self.stats = {
             'total_groups': 0,
+            'total_rows': 0,
             'filled_pairs': 0,
+            'filled_multi_groups': 0,
             'size_based_decisions': 0,
             'rule_based_decisions': 0,
             'manual_review_needed': 0,
@@ -60,6 +81,9 @@ class DupGuruProcessor:
         # Decision reason tracking
         self.decision_reasons = Counter()
 
+        # Folder rule results memoized per distinct folder string
+        self._folder_cache = {}
+
     def _generate_output_filename(self):
         """Generate output filename based on input filename."""
         input_path = Path(self.input_file)
@@ -81,7 +105,7 @@ class DupGuruProcessor:
 
     def extract_date_from_filename(self, filename):
         """Extract date from filename in YYYY-MM-DD format."""
-        match = re.search(r'(\d{4})-(\d{2})-(\d{2})', filename)
+        match = self.DATE_PATTERN.search(filename)
         if match:
             try:
                 return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
@@ -95,7 +119,7 @@ class DupGuruProcessor:
         
         for part in folder_parts:
             # Check for YYYY-MM-DD pattern
-            match = re.search(r'(\d{4})-(\d{2})-(\d{2})', part)
+            match = self.DATE_PATTERN.search(part)
             if match:
                 try:
                     date = datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
@@ -104,7 +128,7 @@ class DupGuruProcessor:
                     continue
             
             # Check for YYYY-MM pattern
-            match = re.search(r'(\d{4})-(\d{2})', part)
+            match = self.MONTH_PATTERN.search(part)
             if match:
                 try:
                     date = datetime(int(match.group(1)), int(match.group(2)), 1)
@@ -116,108 +140,204 @@ class DupGuruProcessor:
 
     def is_organized_filename(self, filename):
         """Check if filename follows organize.py target format."""
-        pattern = r'\d{4}-\d{2}-\d{2}_\d{4}_[A-Z]+_\d+x\d+_.*\.(jpg|jpeg|png|gif)$'
-        return bool(re.match(pattern, filename, re.IGNORECASE))
+        return bool(self.ORGANIZED_PATTERN.match(filename))
 
     def is_invalid_folder(self, folder_path):
         """Check if folder path contains invalid patterns."""
         folder_lower = folder_path.lower()
-        invalid_patterns = [
-            '0000-00',
-            'nptsi',
-            'new folder',
-            'photos from 20',
-        ]
-        return any(pattern in folder_lower for pattern in invalid_patterns)
+        return any(pattern in folder_lower for pattern in self.INVALID_FOLDER_PATTERNS)
 
     def is_scanned_file(self, folder_path, filename):
         """Check if this is a scanned file in a _Scans folder."""
         return '_scans' in folder_path.lower()
 
-    def analyze_duplicate_pair(self, file1, file2):
-        """Analyze a pair of duplicate files and determine which to keep."""
-        
-        # Extract key information
-        f1_date = self.extract_date_from_filename(file1['Filename'])
-        f2_date = self.extract_date_from_filename(file2['Filename'])
-        
-        f1_folder_date, f1_valid_folder = self.extract_date_from_folder(file1['Folder'])
-        f2_folder_date, f2_valid_folder = self.extract_date_from_folder(file2['Folder'])
-        
-        f1_organized = self.is_organized_filename(file1['Filename'])
-        f2_organized = self.is_organized_filename(file2['Filename'])
-        
-        f1_invalid_folder = self.is_invalid_folder(file1['Folder'])
-        f2_invalid_folder = self.is_invalid_folder(file2['Folder'])
-        
-        f1_scanned = self.is_scanned_file(file1['Folder'], file1['Filename'])
-        f2_scanned = self.is_scanned_file(file2['Folder'], file2['Filename'])
-        
-        f1_size = int(file1['Size (KB)'])
-        f2_size = int(file2['Size (KB)'])
-        size_diff = abs(f1_size - f2_size)
-        
-        # Decision logic (order matters - first match wins)
-        decisions = []
+    def _folder_features(self, folder_path):
+        """Return (valid_folder, invalid_folder, scanned) for a folder, memoized."""
+        features = self._folder_cache.get(folder_path)
+        if features is None:
+            _, valid_folder = self.extract_date_from_folder(folder_path)
+            features = (
+                valid_folder,
+                self.is_invalid_folder(folder_path),
+                self.is_scanned_file(folder_path, ''),
+            )
+            self._folder_cache[folder_path] = features
+        return features
+
+    def compute_columns(self, rows):
+        """
+        Compute rule inputs column-wise for a batch of rows.
+
+        Folder-derived values are memoized per distinct folder, since dupGuru
+        exports repeat the same folders many times.
+
+        Returns:
+            Dict of column name -> list of values aligned with ``rows``
+        """
+        filenames = [row['Filename'] for row in rows]
+        folder_features = [self._folder_features(row['Folder']) for row in rows]
+        return {
+            'date': [self.extract_date_from_filename(name) for name in filenames],
+            'organized': [self.is_organized_filename(name) for name in filenames],
+            'valid_folder': [f[0] for f in folder_features],
+            'invalid_folder': [f[1] for f in folder_features],
+            'scanned': [f[2] for f in folder_features],
+            'size': [int(row['Size (KB)']) for row in rows],
+        }
+
+    def _compare(self, cols, i, j, labels=('File 1', 'File 2')):
+        """
+        Compare two rows of a column batch using the decision rules.
+
+        Args:
+            cols: Column batch from compute_columns()
+            i, j: Positions of the two rows within the column batch
+            labels: Names of rows i and j used in reasons
+
+        Returns:
+            Tuple of (winning index or None, reason) - first matching rule wins
+        """
+        invalid_i, invalid_j = cols['invalid_folder'][i], cols['invalid_folder'][j]
+        valid_i, valid_j = cols['valid_folder'][i], cols['valid_folder'][j]
         
         # Rule 1: Invalid folder structures (highest priority)
-        if f1_invalid_folder and not f2_invalid_folder:
-            decisions.append(('file2', 'File 1 in invalid folder structure'))
-        elif f2_invalid_folder and not f1_invalid_folder:
-            decisions.append(('file1', 'File 2 in invalid folder structure'))
+        if invalid_i and not invalid_j:
+            return j, f'{labels[0]} in invalid folder structure'
+        if invalid_j and not invalid_i:
+            return i, f'{labels[1]} in invalid folder structure'
         
         # Rule 2: Prefer older files in valid folders (manually corrected dates)
-        if f1_date and f2_date and f1_valid_folder and f2_valid_folder:
-            if f1_date < f2_date:
-                decisions.append(('file1', 'Older file with valid folder structure'))
-            elif f2_date < f1_date:
-                decisions.append(('file2', 'Older file with valid folder structure'))
+        date_i, date_j = cols['date'][i], cols['date'][j]
+        if date_i and date_j and valid_i and valid_j:
+            if date_i < date_j:
+                return i, 'Older file with valid folder structure'
+            if date_j < date_i:
+                return j, 'Older file with valid folder structure'
         
         # Rule 3: Scanned photos - prefer original scans
-        if f1_scanned and not f2_scanned:
-            decisions.append(('file1', 'Original scanned file'))
-        elif f2_scanned and not f1_scanned:
-            decisions.append(('file2', 'Original scanned file'))
+        scanned_i, scanned_j = cols['scanned'][i], cols['scanned'][j]
+        if scanned_i and not scanned_j:
+            return i, 'Original scanned file'
+        if scanned_j and not scanned_i:
+            return j, 'Original scanned file'
         
         # Rule 4: Organized filename format
-        if f1_organized and not f2_organized:
-            decisions.append(('file1', 'Organized filename format'))
-        elif f2_organized and not f1_organized:
-            decisions.append(('file2', 'Organized filename format'))
+        organized_i, organized_j = cols['organized'][i], cols['organized'][j]
+        if organized_i and not organized_j:
+            return i, 'Organized filename format'
+        if organized_j and not organized_i:
+            return j, 'Organized filename format'
         
         # Rule 5: File size considerations
+        size_i, size_j = cols['size'][i], cols['size'][j]
+        size_diff = abs(size_i - size_j)
         if size_diff > self.SIZE_THRESHOLD_KB:  # Significant quality difference
-            if f1_size > f2_size:
-                decisions.append(('file1', f'Larger file size ({f1_size}KB vs {f2_size}KB, {size_diff}KB difference)'))
-            else:
-                decisions.append(('file2', f'Larger file size ({f2_size}KB vs {f1_size}KB, {size_diff}KB difference)'))
+            if size_i > size_j:
+                return i, f'Larger file size ({size_i}KB vs {size_j}KB, {size_diff}KB difference)'
+            return j, f'Larger file size ({size_j}KB vs {size_i}KB, {size_diff}KB difference)'
         
         # Rule 6: Valid folder structure as tiebreaker
-        if f1_valid_folder and not f2_valid_folder:
-            decisions.append(('file1', 'Valid folder date structure'))
-        elif f2_valid_folder and not f1_valid_folder:
-            decisions.append(('file2', 'Valid folder date structure'))
-        
-        # Return the most important decision
-        if decisions:
-            keep_file, reason = decisions[0]  # First decision has highest priority
-            
-            # Track decision type for statistics
-            if 'size' in reason.lower():
-                self.stats['size_based_decisions'] += 1
-            else:
-                self.stats['rule_based_decisions'] += 1
-            
-            self.decision_reasons[reason] += 1
-            
-            if keep_file == 'file1':
-                return 'Keep', 'Delete', reason, f'Not keeping: {reason.lower()}'
+        if valid_i and not valid_j:
+            return i, 'Valid folder date structure'
+        if valid_j and not valid_i:
+            return j, 'Valid folder date structure'
+        
+        return None, None
+
+    def _record_decision(self, reason):
+        """Track a decision for statistics."""
+        if 'size' in reason.lower():
+            self.stats['size_based_decisions'] += 1
+        else:
+            self.stats['rule_based_decisions'] += 1
+        self.decision_reasons[reason] += 1
+
+    def analyze_duplicate_pair(self, file1, file2):
+        """Analyze a pair of duplicate files and determine which to keep."""
+        winner, reason = self._compare(self.compute_columns([file1, file2]), 0, 1)
+        
+        if winner is None:
+            # If no clear decision, need manual review
+            self.stats['manual_review_needed'] += 1
+            return '', '', 'Manual review needed', 'Manual review needed'
+        
+        self._record_decision(reason)
+        if winner == 0:
+            return 'Keep', 'Delete', reason, f'Not keeping: {reason.lower()}'
+        return 'Delete', 'Keep', f'Not keeping: {reason.lower()}', reason
+
+    def resolve_group(self, group_rows, cols, indices):
+        """
+        Resolve a duplicate group of any size in place.
+
+        The group is ranked with a single elimination pass using the pairwise
+        rules, then every member is compared against the winner. Members that
+        lose to the winner are marked Delete; members the rules cannot separate
+        from the winner (or that beat it) are left for manual review. Reasons
+        refer to members as "File N", their 1-based position in the group.
+
+        Args:
+            group_rows: Rows belonging to the group
+            cols: Column batch from compute_columns()
+            indices: Positions of group_rows within the column batch
+        """
+        position = {idx: pos for pos, idx in enumerate(indices, 1)}
+
+        def compare(i, j):
+            return self._compare(cols, i, j, (f'File {position[i]}', f'File {position[j]}'))
+
+        best = indices[0]
+        # Comparisons made against the current best, reused if it stays the winner
+        results = {}
+        for idx in indices[1:]:
+            winner, reason = compare(best, idx)
+            if winner == idx:
+                best = idx
+                results = {}
             else:
-                return 'Delete', 'Keep', f'Not keeping: {reason.lower()}', reason
+                results[idx] = (winner, reason)
         
-        # If no clear decision, need manual review
-        self.stats['manual_review_needed'] += 1
-        return '', '', 'Manual review needed', 'Manual review needed'
+        outcomes = []
+        keep_reasons = []
+        for idx in indices:
+            if idx == best:
+                outcomes.append(None)
+                continue
+            if idx in results:
+                winner, reason = results[idx]
+            else:
+                winner, reason = compare(best, idx)
+            if winner == best:
+                outcomes.append(reason)
+                if reason not in keep_reasons:
+                    keep_reasons.append(reason)
+            else:
+                outcomes.append('')
+        
+        if not keep_reasons:
+            # If no clear decision, need manual review
+            self.stats['manual_review_needed'] += 1
+            for row in group_rows:
+                row['Action'] = ''
+                row['Comments'] = 'Manual review needed'
+            return
+        
+        if '' in outcomes:
+            self.stats['manual_review_needed'] += 1
+        
+        for row, reason in zip(group_rows, outcomes):
+            if reason is None:
+                row['Action'] = 'Keep'
+                row['Comments'] = '; '.join(keep_reasons)
+            elif reason:
+                self._record_decision(reason)
+                row['Action'] = 'Delete'
+                row['Comments'] = f'Not keeping: {reason.lower()}'
+                if len(indices) > 2:
+                    row['Comments'] += f' (keeping file {position[best]})'
+            else:
+                row['Action'] = ''
+                row['Comments'] = 'Manual review needed'
 
     def calculate_best_file_score(self, row):
         """Calculate a score for a file to determine the best one to keep."""
@@ -286,7 +406,7 @@ class DupGuruProcessor:
                             if not row['Comments'].strip():
                                 row['Comments'] = 'Not best option in group'
         
-        self.stats['safety_fixes'] = safety_fixes
+        self.stats['safety_fixes'] += safety_fixes
         if safety_fixes > 0:
             self._log(f"Applied {safety_fixes} safety fixes", "INFO")
 
@@ -315,8 +435,98 @@ class DupGuruProcessor:
             self._log(f"Error checking existing actions: {e}", "ERROR")
             return False
 
+    def _groups_are_contiguous(self, filepath):
+        """
+        Check whether each Group ID appears as one contiguous run of rows.
+
+        dupGuru writes groups contiguously, which allows group-by-group
+        streaming. Only the Group ID column is inspected.
+        """
+        seen = set()
+        current = None
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'Group ID' not in header:
+                return True
+            group_col = header.index('Group ID')
+            for values in reader:
+                group_id = values[group_col] if group_col < len(values) else None
+                if group_id != current:
+                    if group_id in seen:
+                        return False
+                    seen.add(group_id)
+                    current = group_id
+        return True
+
+    def _iter_groups(self, reader, contiguous):
+        """Yield (group_id, rows) from a DictReader, streaming when possible."""
+        if not contiguous:
+            self._log("Group IDs are not contiguous - grouping in memory", "WARN")
+            self._log("Output rows are written group by group, not in input order", "INFO")
+            groups = defaultdict(list)
+            for row in reader:
+                groups[row['Group ID']].append(row)
+            yield from groups.items()
+            return
+        
+        current_id = None
+        current_rows = []
+        for row in reader:
+            group_id = row['Group ID']
+            if current_rows and group_id != current_id:
+                yield current_id, current_rows
+                current_rows = []
+            current_id = group_id
+            current_rows.append(row)
+        if current_rows:
+            yield current_id, current_rows
+
+    def _iter_batches(self, groups):
+        """Bundle consecutive groups into batches of roughly BATCH_ROWS rows."""
+        batch = []
+        batch_rows = 0
+        for group_id, group_rows in groups:
+            batch.append((group_id, group_rows))
+            batch_rows += len(group_rows)
+            if batch_rows >= self.BATCH_ROWS:
+                yield batch
+                batch = []
+                batch_rows = 0
+        if batch:
+            yield batch
+
+    def _process_batch(self, batch):
+        """Resolve every unresolved group in a batch using one column computation."""
+        pending = []
+        for group_id, group_rows in batch:
+            self.stats['total_rows'] += len(group_rows)
+            # Only fill if all Action fields are empty (preserve existing decisions)
+            if len(group_rows) < 2:
+                self._log(f"Skipping group {group_id} with a single file", "WARN")
+                continue
+            if any(row['Action'].strip() for row in group_rows):
+                continue
+            pending.append(group_rows)
+        
+        if pending:
+            flat_rows = [row for group_rows in pending for row in group_rows]
+            cols = self.compute_columns(flat_rows)
+            offset = 0
+            for group_rows in pending:
+                indices = list(range(offset, offset + len(group_rows)))
+                offset += len(group_rows)
+                self.resolve_group(group_rows, cols, indices)
+                if len(group_rows) == 2:
+                    self.stats['filled_pairs'] += 1
+                else:
+                    self.stats['filled_multi_groups'] += 1
+        
+        # Safety check - ensure every group keeps at least one file
+        self.ensure_group_safety(dict(batch))
+
     def process_csv(self):
-        """Process the dupGuru CSV file."""
+        """Process the dupGuru CSV file, streaming groups from input to output."""
         self._log(f"Processing dupGuru CSV: {self.input_file}")
         
         # Validate input file
@@ -328,14 +538,23 @@ class DupGuruProcessor:
         if has_existing:
             self._log("File already has Action/Comments data - will preserve existing decisions")
         
-        # Read all data
-        all_rows = []
-        fieldnames = None
+        try:
+            contiguous = self._groups_are_contiguous(self.input_file)
+        except Exception as e:
+            raise RuntimeError(f"Error reading CSV file: {e}")
+        
+        # Create output directory if needed
+        os.makedirs(os.path.dirname(self.output_file) or '.', exist_ok=True)
         
         try:
-            with open(self.input_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                fieldnames = list(reader.fieldnames) if reader.fieldnames else []
+            with open(self.input_file, 'r', encoding='utf-8-sig', newline='') as f_in:
+                reader = csv.reader(f_in)
+                header = next(reader, [])
+                fieldnames = list(header)
+                
+                missing = [c for c in self.REQUIRED_COLUMNS if c not in fieldnames]
+                if missing:
+                    raise RuntimeError(f"Missing required columns: {', '.join(missing)}")
                 
                 # Ensure Action and Comments columns exist
                 if 'Action' not in fieldnames:
@@ -343,68 +562,51 @@ class DupGuruProcessor:
                 if 'Comments' not in fieldnames:
                     fieldnames.append('Comments')
                 
-                for row in reader:
-                    # Initialize missing columns
-                    if 'Action' not in row:
-                        row['Action'] = ''
-                    if 'Comments' not in row:
-                        row['Comments'] = ''
-                    all_rows.append(row)
+                with open(self.output_file, 'w', newline='', encoding='utf-8') as f_out:
+                    writer = csv.writer(f_out)
+                    writer.writerow(fieldnames)
                     
+                    rows = self._iter_rows(reader, header)
+                    groups = self._iter_groups(rows, contiguous)
+                    for batch in self._iter_batches(groups):
+                        self._process_batch(batch)
+                        self.stats['total_groups'] += len(batch)
+                        writer.writerows(
+                            [row.get(name, '') for name in fieldnames]
+                            for _, group_rows in batch
+                            for row in group_rows
+                        )
+        except RuntimeError:
+            raise
         except Exception as e:
-            raise RuntimeError(f"Error reading CSV file: {e}")
+            raise RuntimeError(f"Error processing CSV file: {e}")
         
-        if not all_rows:
+        if not self.stats['total_rows']:
             raise RuntimeError("No data found in CSV file")
         
-        # Group by Group ID
-        groups = defaultdict(list)
-        for row in all_rows:
-            groups[row['Group ID']].append(row)
-        
-        self.stats['total_groups'] = len(groups)
-        self._log(f"Found {len(groups)} duplicate groups")
-        
-        # Process each group
-        for group_id, group_rows in groups.items():
-            if len(group_rows) != 2:
-                self._log(f"Skipping group {group_id} with {len(group_rows)} files (expected 2)", "WARN")
-                continue
-            
-            file1, file2 = group_rows
-            
-            # Only fill if both Action fields are empty (preserve existing decisions)
-            if not file1['Action'].strip() and not file2['Action'].strip():
-                action1, action2, comment1, comment2 = self.analyze_duplicate_pair(file1, file2)
-                file1['Action'] = action1
-                file1['Comments'] = comment1
-                file2['Action'] = action2
-                file2['Comments'] = comment2
-                self.stats['filled_pairs'] += 1
-        
-        # Safety check - ensure every group keeps at least one file
-        self.ensure_group_safety(groups)
-        
-        # Create output directory if needed
-        os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
-        
-        # Write processed data
-        try:
-            with open(self.output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for row in all_rows:
-                    writer.writerow(row)
-        except Exception as e:
-            raise RuntimeError(f"Error writing output file: {e}")
-        
+        self._log(f"Found {self.stats['total_groups']} duplicate groups")
         self._log(f"Output saved to: {self.output_file}")
 
+    @staticmethod
+    def _iter_rows(reader, header):
+        """Yield rows as dicts with Action/Comments initialized."""
+        for values in reader:
+            if not values:
+                continue
+            row = dict(zip(header, values))
+            # Initialize missing columns
+            if row.get('Action') is None:
+                row['Action'] = ''
+            if row.get('Comments') is None:
+                row['Comments'] = ''
+            yield row
+
     def print_statistics(self):
         """Print processing statistics."""
         print(f"DupGuru Processing Results:")
         print(f"  Total groups: {self.stats['total_groups']}")
         print(f"  Pairs processed: {self.stats['filled_pairs']}")
+        print(f"  Multi-file groups processed: {self.stats['filled_multi_groups']}")
         print(f"  Rule-based decisions: {self.stats['rule_based_decisions']}")
         print(f"  Size-based decisions: {self.stats['size_based_decisions']}")
         print(f"  Manual review needed: {self.stats['manual_review_needed']}")
@@ -421,20 +623,24 @@ class DupGuruProcessor:
         groups_without_keep = 0
         
         try:
-            with open(self.output_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                group_actions = defaultdict(list)
+            with open(self.output_file, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                group_col = header.index('Group ID')
+                action_col = header.index('Action')
+                group_actions = defaultdict(set)
                 
-                for row in reader:
-                    group_actions[row['Group ID']].append(row['Action'].strip())
+                for values in reader:
+                    if values:
+                        group_actions[values[group_col]].add(values[action_col].strip())
                 
                 for group_id, actions in group_actions.items():
                     has_keep = 'Keep' in actions
-                    all_empty = all(action == '' for action in actions)
+                    all_empty = actions == {''}
                     
                     if not has_keep and not all_empty:
                         groups_without_keep += 1
-                        self._log(f"Group {group_id} has no Keep action: {actions}", "ERROR")
+                        self._log(f"Group {group_id} has no Keep action: {sorted(actions)}", "ERROR")
                 
         except Exception as e:
             self._log(f"Error verifying safety: {e}", "ERROR")
@@ -460,6 +666,9 @@ Examples:
   python dupguru.py duplicates.csv --verbose
   python dupguru.py duplicates.csv --no-stats --quiet
 
+Groups with any number of files are resolved; the winner is kept and the
+others are deleted, or left for manual review when no rule separates them.
+
 Decision Rules (in priority order):
   1. Avoid invalid folder structures (0000-00, NPTSI-Z, etc.)
   2. Prefer older files in valid date folders (manual corrections)
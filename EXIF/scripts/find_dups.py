@@ -73,6 +73,16 @@ SCRIPT_ARGUMENTS = {
     'output': {
         'flag': '--output',
         'help': 'Output CSV file (default: .log/find_dups_TIMESTAMP.csv)'
+    },
+    'no_size_filter': {
+        'flag': '--no-size-filter',
+        'action': 'store_true',
+        'help': 'Run EXIF target filename matching even without a same-size target file'
+    },
+    'partial_hash': {
+        'flag': '--partial-hash',
+        'action': 'store_true',
+        'help': 'Also require a same-size target with matching first/last-block hash'
     }
 }
 
@@ -161,7 +171,9 @@ def main():
         finder = DuplicateFinder(
             source_dir=source_path,
             target_dir=target_path,
-            logger=logger
+            logger=logger,
+            size_filter=not resolved_args.get('no_size_filter'),
+            partial_hash=resolved_args.get('partial_hash', False)
         )
         
         logger.info("Starting duplicate detection process")
@@ -189,6 +201,7 @@ def main():
         logger.info(f"Exact matches: {stats.get('exact_matches', 0)}")
         logger.info(f"Partial matches: {stats.get('partial_matches', 0)}")
         logger.info(f"No matches: {stats.get('no_matches', 0)}")
+        logger.info(f"EXIF reads avoided: {stats.get('exif_reads_avoided', 0)}")
         if stats.get('errors', 0) > 0:
             logger.warning(f"Errors encountered: {stats.get('errors', 0)}")
         
@@ -199,6 +212,7 @@ def main():
             print(f"Exact matches: {stats.get('exact_matches', 0)}")
             print(f"Partial matches: {stats.get('partial_matches', 0)}")
             print(f"No matches: {stats.get('no_matches', 0)}")
+            print(f"EXIF reads avoided: {stats.get('exif_reads_avoided', 0)}")
             if stats.get('errors', 0) > 0:
                 print(f"⚠️  Errors encountered: {stats.get('errors', 0)}")
             if not resolved_args.get('dry_run'):
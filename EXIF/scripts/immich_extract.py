@@ -85,6 +85,18 @@ SCRIPT_ARGUMENTS = {
         'dest': 'exif_timezone',
         'default': 'America/New_York',
         'help': 'Timezone of EXIF dates in source files (e.g., America/New_York, UTC, Europe/London). Default: America/New_York'
+    },
+    'workers': {
+        'flag': '--workers',
+        'type': int,
+        'default': 8,
+        'help': 'Concurrent asset detail requests to Immich (default: 8)'
+    },
+    'cache_format': {
+        'flag': '--cache-format',
+        'choices': ['json', 'jsonl'],
+        'default': 'json',
+        'help': 'File format for cached query results; jsonl stores one asset per line (default: json)'
     }
 }
 
@@ -211,6 +223,8 @@ def main():
         force_update_fuzzy=resolved_args.get('force_update_fuzzy', False),
         disable_sidecars=resolved_args.get('disable_sidecars', False),
         exif_timezone=resolved_args.get('exif_timezone'),
+        detail_workers=resolved_args.get('workers') or 8,
+        cache_format=resolved_args.get('cache_format') or 'json',
         logger=logger
     )
     result = extractor.run()    # Log summary output including grouped AUDIT status counts
@@ -233,6 +247,13 @@ def main():
             logger.info("---------------------")
             for status, count in sorted(audit_status_counts.items()):
                 logger.info(f"  {status:15}: {count}")
+        # Per-endpoint Immich API latency
+        http_latency = result.get('http_latency') or []
+        if http_latency:
+            logger.info("\nHTTP LATENCY:")
+            logger.info("-------------")
+            for line in http_latency:
+                logger.info(f"  {line}")
         # Removed 'Error details' section from summary output
         if resolved_args.get("dry_run"):
             logger.info("\nThis was a dry run. No files were actually modified.")
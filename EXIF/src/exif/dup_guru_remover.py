@@ -4,27 +4,58 @@ DupGuru File Remover
 
 Business logic class for processing dupGuru CSV files and moving files
 marked for deletion to a backup directory, preserving folder structure.
+
+In link mode, files marked for deletion are instead replaced in place by a
+hardlink or reflink to the kept file of their group, after verifying the two
+are byte-identical. Every replacement is recorded in a JSON-lines manifest so
+it can be undone.
 """
 
 import csv
+import errno
+import json
 import logging
+import os
 import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+# Import COMMON HashCache with fallback
+try:
+    common_src_path = Path(__file__).parent.parent.parent.parent / "COMMON" / "src"
+    sys.path.insert(0, str(common_src_path))
+    from common.hash_cache import HashCache
+except ImportError:
+    HashCache = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 
 class DupGuruRemover:
     """Remove duplicate files based on dupGuru CSV decisions."""
 
+    # Supported link modes ("auto" tries a reflink, then falls back to a hardlink)
+    LINK_MODES = ("auto", "hardlink", "reflink")
+
+    # ioctl request number for FICLONE (btrfs/XFS copy-on-write clone)
+    FICLONE = 0x40049409
+
     def __init__(
         self,
         csv_file: str,
         target_path: str,
-        dup_path: str,
+        dup_path: Optional[str] = None,
         dry_run: bool = False,
         verbose: bool = False,
         logger=None,
+        link_mode: Optional[str] = None,
+        manifest_path: Optional[str] = None,
+        hash_cache=None,
     ):
         """
         Initialize the duplicate file remover.
@@ -32,17 +63,38 @@ class DupGuruRemover:
         Args:
             csv_file: Path to dupGuru CSV file with Action column
             target_path: Root directory where files to be removed are located
-            dup_path: Directory where removed files will be moved to
+            dup_path: Directory where removed files will be moved to (move mode)
             dry_run: If True, only simulate actions without moving files
             verbose: Enable verbose logging
             logger: Logger instance to use (optional)
+            link_mode: One of LINK_MODES to replace duplicates with links to the
+                kept file instead of moving them (None keeps move mode)
+            manifest_path: JSON-lines file recording link replacements for undo
+                (default: next to the CSV file)
+            hash_cache: HashCache used to verify content equality
+                (default: persistent cache in .log/)
         """
+        if link_mode is not None and link_mode not in self.LINK_MODES:
+            raise ValueError(
+                f"Invalid link mode '{link_mode}', expected one of {self.LINK_MODES}"
+            )
+        if link_mode is None and dup_path is None:
+            raise ValueError("dup_path is required unless link_mode is set")
+
         self.csv_file = Path(csv_file)
         self.target_path = Path(target_path)
-        self.dup_path = Path(dup_path)
+        self.dup_path = Path(dup_path) if dup_path else None
         self.dry_run = dry_run
         self.verbose = verbose
         self.logger = logger
+        self.link_mode = link_mode
+        self.hash_cache = hash_cache
+        if link_mode and manifest_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            manifest_path = self.csv_file.with_name(
+                f"{self.csv_file.stem}_links_{timestamp}.jsonl"
+            )
+        self.manifest_path = Path(manifest_path) if manifest_path else None
 
         # Statistics tracking
         self.stats = {
@@ -53,6 +105,11 @@ class DupGuruRemover:
             "errors": 0,
             "warnings": 0,
             "skipped_rows": 0,
+            "files_linked": 0,
+            "already_linked": 0,
+            "hash_mismatches": 0,
+            "keep_not_found": 0,
+            "bytes_reclaimed": 0,
         }
 
         # Validate inputs
@@ -132,6 +189,13 @@ class DupGuruRemover:
                 f"Target path is not a directory: {self.target_path}"
             )
 
+        if self.link_mode:
+            if self.logger:
+                self.logger.info(
+                    f"Link mode '{self.link_mode}', manifest: {self.manifest_path}"
+                )
+            return
+
         # Create dup_path if it doesn't exist
         if not self.dry_run:
             self.dup_path.mkdir(parents=True, exist_ok=True)
@@ -330,16 +394,21 @@ class DupGuruRemover:
             return False
 
     def process_csv(self):
-        """Process the CSV file and move files marked for deletion."""
+        """Process the CSV file and move (or link) files marked for deletion."""
         if self.logger:
             self.logger.info(f"Processing CSV file: {self.csv_file}")
 
+        if self.link_mode:
+            self._start_link_mode()
+
         try:
             with open(self.csv_file, "r", newline="", encoding="utf-8") as f:
                 reader = csv.DictReader(f)
 
                 # Validate required columns
                 required_columns = ["Filename", "Folder", "Action"]
+                if self.link_mode:
+                    required_columns.append("Group ID")
                 missing_columns = [
                     col for col in required_columns if col not in reader.fieldnames
                 ]
@@ -362,6 +431,10 @@ class DupGuruRemover:
                     action = row.get("Action", "").strip()
                     if action.lower() == "delete":
                         self.stats["delete_actions"] += 1
+                        if self.link_mode:
+                            if self._process_link_row(row, row_num):
+                                self.stats["files_linked"] += 1
+                            continue
                         success = self._process_delete_row(row, row_num)
                         if success:
                             self.stats["files_moved"] += 1
@@ -369,6 +442,9 @@ class DupGuruRemover:
         except Exception as e:
             self._log_error_file_only(f"Error processing CSV: {e}")
             raise
+        finally:
+            if self.link_mode:
+                self._finish_link_mode()
 
     def _process_delete_row(self, row: dict, row_num: int) -> bool:
         """
@@ -402,12 +478,279 @@ class DupGuruRemover:
         # Move the file
         return self._move_file(source_path, dest_path)
 
+    def _start_link_mode(self):
+        """Prepare hash cache, keep-file lookup and manifest for link mode."""
+        if self.hash_cache is None:
+            if HashCache is None:
+                raise RuntimeError("Link mode requires common.hash_cache.HashCache")
+            self.hash_cache = HashCache(HashCache.DEFAULT_PATH, logger=self.logger)
+
+        self._keep_files = self._load_keep_files()
+        self._manifest = None
+        if not self.dry_run:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            self._manifest = open(self.manifest_path, "a", encoding="utf-8")
+
+    def _finish_link_mode(self):
+        """Close the manifest and persist newly computed hashes."""
+        if getattr(self, "_manifest", None):
+            self._manifest.close()
+            self._manifest = None
+        if self.hash_cache is not None:
+            self.hash_cache.save()
+
+    def _load_keep_files(self) -> Dict[str, dict]:
+        """
+        Map each Group ID to the row marked Keep in that group.
+
+        Returns:
+            Dict of group id -> CSV row of the kept file
+        """
+        keep_files = {}
+        with open(self.csv_file, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if (row.get("Action") or "").strip().lower() != "keep":
+                    continue
+                group_id = row.get("Group ID")
+                if group_id in keep_files:
+                    self._log_warning_file_only(
+                        f"Group {group_id} has several Keep rows, using the first"
+                    )
+                    continue
+                keep_files[group_id] = row
+        return keep_files
+
+    def _files_identical(self, first: Path, second: Path) -> bool:
+        """
+        Check that two files have identical content.
+
+        Sizes are compared first; full SHA-1 digests come from the hash cache so
+        repeated runs do not re-read unchanged files.
+        """
+        first_stat = first.stat()
+        second_stat = second.stat()
+        if first_stat.st_size != second_stat.st_size:
+            return False
+        return self.hash_cache.get_hash(
+            first, stat_result=first_stat
+        ) == self.hash_cache.get_hash(second, stat_result=second_stat)
+
+    def _reflink(self, source_path: Path, dest_path: Path):
+        """Create dest_path as a copy-on-write clone of source_path (FICLONE)."""
+        if fcntl is None:
+            raise OSError(errno.EOPNOTSUPP, "FICLONE is not supported on this platform")
+        with open(source_path, "rb") as src, open(dest_path, "xb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                dest_path.unlink()
+                raise
+
+    def _create_link(self, keep_path: Path, temp_path: Path) -> str:
+        """
+        Create temp_path as a link to keep_path according to the link mode.
+
+        Returns:
+            The method used: "reflink" or "hardlink"
+        """
+        if self.link_mode in ("auto", "reflink"):
+            try:
+                self._reflink(keep_path, temp_path)
+                return "reflink"
+            except OSError as e:
+                if self.link_mode == "reflink":
+                    raise
+                self._log_file_only(
+                    f"Reflink not possible for {keep_path} ({e}), using hardlink",
+                    "DEBUG",
+                )
+        os.link(keep_path, temp_path)
+        return "hardlink"
+
+    def _link_file(self, dup_file: Path, keep_file: Path, sha1: str) -> bool:
+        """
+        Atomically replace dup_file with a link to keep_file.
+
+        The link is created under a temporary name in the same directory and
+        renamed over the duplicate, so the duplicate path never disappears.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        original_stat = dup_file.stat()
+        temp_path = dup_file.with_name(f".{dup_file.name}.{os.getpid()}.linktmp")
+        try:
+            method = self._create_link(keep_file, temp_path)
+            if method == "reflink":
+                # A clone is its own inode, so keep the duplicate's timestamps
+                os.utime(
+                    temp_path,
+                    ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns),
+                )
+                os.chmod(temp_path, original_stat.st_mode & 0o7777)
+            os.replace(temp_path, dup_file)
+        except OSError as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            self._log_error_file_only(f"Failed to link {dup_file} -> {keep_file}: {e}")
+            return False
+
+        if method == "hardlink":
+            self.hash_cache.forget(dup_file)
+        self.stats["bytes_reclaimed"] += original_stat.st_size
+        self._manifest.write(
+            json.dumps(
+                {
+                    "duplicate": os.path.abspath(dup_file),
+                    "kept": os.path.abspath(keep_file),
+                    "method": method,
+                    "sha1": sha1,
+                    "size": original_stat.st_size,
+                    "mode": original_stat.st_mode & 0o7777,
+                    "atime_ns": original_stat.st_atime_ns,
+                    "mtime_ns": original_stat.st_mtime_ns,
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+        )
+        self._manifest.flush()
+        self._log_file_only(f"Linked ({method}): {dup_file} -> {keep_file}")
+        return True
+
+    def _process_link_row(self, row: dict, row_num: int) -> bool:
+        """
+        Process a single row marked for deletion in link mode.
+
+        Args:
+            row: CSV row data
+            row_num: Row number for logging
+
+        Returns:
+            True if the duplicate was (or would be) replaced by a link
+        """
+        filename = row["Filename"]
+        folder_path = row["Folder"]
+
+        dup_file = self._find_file_in_target(folder_path, filename)
+        if not dup_file:
+            self.stats["files_not_found"] += 1
+            self._log_warning_file_only(
+                f"Row {row_num}: File not found: {folder_path}/{filename}"
+            )
+            return False
+
+        keep_row = self._keep_files.get(row.get("Group ID"))
+        keep_file = (
+            self._find_file_in_target(keep_row["Folder"], keep_row["Filename"])
+            if keep_row
+            else None
+        )
+        if not keep_file:
+            self.stats["keep_not_found"] += 1
+            self._log_warning_file_only(
+                f"Row {row_num}: No kept file found for group {row.get('Group ID')}, "
+                f"leaving {dup_file}"
+            )
+            return False
+
+        try:
+            if os.path.samefile(dup_file, keep_file):
+                self.stats["already_linked"] += 1
+                self._log_file_only(f"Already linked: {dup_file} -> {keep_file}")
+                return False
+
+            if not self._files_identical(dup_file, keep_file):
+                self.stats["hash_mismatches"] += 1
+                self._log_warning_file_only(
+                    f"Row {row_num}: Content differs, not linking {dup_file} -> {keep_file}"
+                )
+                return False
+            sha1 = self.hash_cache.get_hash(keep_file)
+        except OSError as e:
+            self._log_error_file_only(f"Row {row_num}: Failed to compare {dup_file}: {e}")
+            return False
+
+        if self.dry_run:
+            self._log_file_only(f"DRY RUN: Would link {dup_file} -> {keep_file}")
+            self.stats["bytes_reclaimed"] += dup_file.stat().st_size
+            return True
+
+        return self._link_file(dup_file, keep_file, sha1)
+
+    @classmethod
+    def undo_links(cls, manifest_path: str, dry_run: bool = False, logger=None) -> dict:
+        """
+        Restore independent copies for duplicates recorded in a link manifest.
+
+        Hardlinked duplicates get their own copy of the kept file back (with
+        their original mode and timestamps). Reflinked duplicates are already
+        independent files and are left untouched.
+
+        Args:
+            manifest_path: JSON-lines manifest written by link mode
+            dry_run: If True, only report what would be restored
+            logger: Logger instance to use (optional)
+
+        Returns:
+            Dict with restored/skipped/errors counts
+        """
+        stats = {"restored": 0, "skipped": 0, "errors": 0}
+        log = logger or logging.getLogger(__name__)
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+
+        for entry in entries:
+            dup_file = Path(entry["duplicate"])
+            keep_file = Path(entry["kept"])
+            if entry.get("method") != "hardlink":
+                stats["skipped"] += 1
+                continue
+            try:
+                if not dup_file.exists() or not os.path.samefile(dup_file, keep_file):
+                    log.warning(f"Not linked anymore, skipping: {dup_file}")
+                    stats["skipped"] += 1
+                    continue
+                if dry_run:
+                    log.info(f"DRY RUN: Would restore copy of {keep_file} at {dup_file}")
+                    stats["restored"] += 1
+                    continue
+                temp_path = dup_file.with_name(f".{dup_file.name}.{os.getpid()}.undotmp")
+                shutil.copyfile(keep_file, temp_path)
+                os.chmod(temp_path, entry.get("mode", 0o644))
+                os.utime(
+                    temp_path,
+                    ns=(
+                        entry.get("atime_ns", entry["mtime_ns"]),
+                        entry["mtime_ns"],
+                    ),
+                )
+                os.replace(temp_path, dup_file)
+                log.info(f"Restored copy: {dup_file}")
+                stats["restored"] += 1
+            except OSError as e:
+                log.error(f"Failed to restore {dup_file}: {e}")
+                stats["errors"] += 1
+
+        return stats
+
     def print_statistics(self):
         """Print processing statistics."""
         print("\nDupGuru Removal Results:")
         print(f"  Total rows processed: {self.stats['total_rows']}")
         print(f"  Delete actions found: {self.stats['delete_actions']}")
-        print(f"  Files moved: {self.stats['files_moved']}")
+        if self.link_mode:
+            print(f"  Files linked: {self.stats['files_linked']}")
+            print(f"  Already linked: {self.stats['already_linked']}")
+            print(f"  Content mismatches: {self.stats['hash_mismatches']}")
+            print(f"  Kept file not found: {self.stats['keep_not_found']}")
+            print(
+                f"  Space reclaimed: {self.stats['bytes_reclaimed'] / (1024 * 1024):.1f} MB"
+            )
+        else:
+            print(f"  Files moved: {self.stats['files_moved']}")
         print(f"  Files not found: {self.stats['files_not_found']}")
         print(f"  Warnings: {self.stats['warnings']}")
         print(f"  Errors: {self.stats['errors']}")
@@ -3,6 +3,10 @@ Duplicate finder business logic for finding duplicate images between source and
 
 This module provides the DuplicateFinder class that implements multiple strategies
 for finding duplicates: Target Filename match, Exact match, and Partial Filename match.
+
+The Target Filename strategy needs several exiftool reads per file, so it is only
+attempted when the target tree holds a file of the same byte size (and, optionally,
+the same partial content hash) as the source file.
 """
 
 import logging
@@ -26,15 +30,45 @@ try:
 except ImportError:
     FileManager = None
 
+try:
+    from common.hash_cache import HashCache
+except ImportError:
+    HashCache = None
+
 
 class DuplicateFinder:
     """Handles duplicate detection between source and target directories."""
 
-    def __init__(self, source_dir: Path, target_dir: Path, logger: logging.Logger):
-        """Initialize the duplicate finder with source and target directories."""
+    def __init__(
+        self,
+        source_dir: Path,
+        target_dir: Path,
+        logger: logging.Logger,
+        size_filter: bool = True,
+        partial_hash: bool = False,
+        hash_cache=None,
+    ):
+        """
+        Initialize the duplicate finder with source and target directories.
+
+        Args:
+            source_dir: Directory with files to look up
+            target_dir: Directory to search for duplicates
+            logger: Logger instance
+            size_filter: Only run the EXIF-based Target Filename strategy for
+                sources with a same-size file in the target tree
+            partial_hash: Additionally require a same-size target file with a
+                matching first/last-block hash
+            hash_cache: Optional HashCache for partial hashes (in-memory if None)
+        """
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
         self.logger = logger
+        self.size_filter = size_filter
+        self.partial_hash = partial_hash and HashCache is not None
+        if self.partial_hash and hash_cache is None:
+            hash_cache = HashCache(logger=logger)
+        self.hash_cache = hash_cache
         self.stats = {
             "total_processed": 0,
             "target_filename_matches": 0,
@@ -42,6 +76,7 @@ class DuplicateFinder:
             "partial_matches": 0,
             "no_matches": 0,
             "errors": 0,
+            "exif_reads_avoided": 0,
         }
 
         # Performance optimization caches
@@ -54,6 +89,7 @@ class DuplicateFinder:
         self._target_filename_cache = (
             {}
         )  # Cache getTargetFilename results to avoid EXIF reads
+        self._target_size_index = {}  # size in bytes -> [Path] mapping
         self._indexes_built = False
 
     def get_image_files(self, directory: Path) -> List[Path]:
@@ -162,9 +198,53 @@ class DuplicateFinder:
             # Path index for fast exists check
             self._target_path_index.add(str(target_file))
 
+            # Size index to rule out EXIF reads for sources with no same-size target
+            if self.size_filter:
+                try:
+                    size = target_file.stat().st_size
+                except OSError as e:
+                    self.logger.debug(f"Cannot stat {target_file}: {e}")
+                    continue
+                self._target_size_index.setdefault(size, []).append(target_file)
+
         self._indexes_built = True
         self.logger.info("Performance indexes built successfully")
 
+    def has_content_candidate(self, source_file: Path) -> bool:
+        """
+        Check whether the target tree could hold a byte-identical copy of a file.
+
+        Uses the size index, then (if enabled) partial hashes of the same-size
+        candidates. Always True when the size filter is disabled.
+        """
+        if not self.size_filter:
+            return True
+
+        try:
+            source_stat = source_file.stat()
+        except OSError:
+            return True
+
+        candidates = self._target_size_index.get(source_stat.st_size)
+        if not candidates:
+            return False
+        if not self.partial_hash:
+            return True
+
+        try:
+            source_digest = self.hash_cache.get_partial_hash(
+                source_file, stat_result=source_stat
+            )
+        except OSError:
+            return True
+        for candidate in candidates:
+            try:
+                if self.hash_cache.get_partial_hash(candidate) == source_digest:
+                    return True
+            except OSError as e:
+                self.logger.debug(f"Cannot hash {candidate}: {e}")
+        return False
+
     def find_target_filename_match(self, source_file: Path) -> Optional[Path]:
         """Find match using ImageData.getTargetFilename() with caching to avoid repeated EXIF reads."""
         source_str = str(source_file)
@@ -284,11 +364,15 @@ class DuplicateFinder:
             self.stats["partial_matches"] += 1
             return partial_match, "Partial Filename"
 
-        # Strategy 3: Target Filename match (expensive EXIF reads - last resort)
-        target_match = self.find_target_filename_match(source_file)
-        if target_match:
-            self.stats["target_filename_matches"] += 1
-            return target_match, "Target Filename"
+        # Strategy 3: Target Filename match (expensive EXIF reads - last resort),
+        # only when a same-size (same partial hash) target file exists
+        if self.has_content_candidate(source_file):
+            target_match = self.find_target_filename_match(source_file)
+            if target_match:
+                self.stats["target_filename_matches"] += 1
+                return target_match, "Target Filename"
+        else:
+            self.stats["exif_reads_avoided"] += 1
 
         # No match found
         self.stats["no_matches"] += 1
@@ -400,5 +484,6 @@ class DuplicateFinder:
         self.logger.info(f"Exact matches: {self.stats['exact_matches']}")
         self.logger.info(f"Partial matches: {self.stats['partial_matches']}")
         self.logger.info(f"No matches: {self.stats['no_matches']}")
+        self.logger.info(f"EXIF reads avoided: {self.stats['exif_reads_avoided']}")
         self.logger.info(f"Errors: {self.stats['errors']}")
         self.logger.info("=" * 60)
@@ -2,10 +2,19 @@ import os
 import csv
 import json
 import subprocess
+import sys
 import concurrent.futures
 from pathlib import Path
 from .image_data import ImageData
 
+# Import COMMON row files with fallback (needed for Parquet output)
+try:
+    common_src_path = Path(__file__).parent.parent.parent.parent / "COMMON" / "src"
+    sys.path.insert(0, str(common_src_path))
+    from common.row_store import RowWriter
+except ImportError:
+    RowWriter = None
+
 
 class ImageAnalyzer(ImageData):
     def get_exif(self, image_path):
@@ -466,7 +475,7 @@ class ImageAnalyzer(ImageData):
 
     # Inherit all other methods from ImageAnalyzer
     def save_to_csv(self, csv_path=None, results=None):
-        """Save analysis results to CSV file."""
+        """Save analysis results to CSV file (Parquet for a .parquet path, needs pyarrow)."""
         if csv_path is None:
             csv_path = self.csv_output
 
@@ -501,6 +510,12 @@ class ImageAnalyzer(ImageData):
             "error",
         ]
 
+        if RowWriter is not None:
+            with RowWriter(csv_path, headers) as writer:
+                for result in results:
+                    writer.writerow({header: result.get(header, "") for header in headers})
+            return
+
         with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=headers)
             writer.writeheader()
@@ -1,39 +1,358 @@
-import requests
 import subprocess
 import os
+import sys
 import json
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Import COMMON streaming JSON, HTTP and directory catalog helpers with fallback
+try:
+    common_src_path = Path(__file__).parent.parent.parent.parent / "COMMON" / "src"
+    sys.path.insert(0, str(common_src_path))
+    from common.json_stream import iter_json_members, iter_jsonl, read_jsonl_header, write_jsonl
+    from common.http_client import HttpClient
+    from common.dir_catalog import DirCatalog
+except ImportError:
+    iter_json_members = iter_jsonl = read_jsonl_header = write_jsonl = None
+    HttpClient = None
+    DirCatalog = None
 
 
 class ImmichAPI:
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_size: int = 16,
+        max_retries: int = 3,
+        rate_limit: Optional[float] = None,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update({"x-api-key": api_key})
+        if HttpClient is None:
+            raise ImportError("COMMON http_client is required for ImmichAPI")
+        # Keep-alive pool large enough for concurrent detail fetches; transient
+        # failures of idempotent requests are retried with backoff
+        self.http = HttpClient(
+            self.base_url,
+            headers={"x-api-key": api_key},
+            pool_size=pool_size,
+            max_retries=max_retries,
+            rate_limit=rate_limit,
+        )
+        self.session = self.http.session
 
     def get_album_assets(self, album_id: str) -> List[dict]:
         url = f"{self.base_url}/api/albums/{album_id}"
-        resp = self.session.get(url)
+        resp = self.http.get(url)
         resp.raise_for_status()
         album = resp.json()
         return album.get("assets", [])
 
     def get_asset_details(self, asset_id: str) -> Optional[dict]:
         url = f"{self.base_url}/api/assets/{asset_id}"
-        resp = self.session.get(url)
+        resp = self.http.get(url)
         if resp.status_code == 200:
             return resp.json()
         return None
 
     def list_albums(self) -> list:
         url = f"{self.base_url}/api/albums"
-        resp = self.session.get(url)
+        resp = self.http.get(url)
         resp.raise_for_status()
         return resp.json()
 
 
+class CachedAssets:
+    """Sized, re-iterable view of the assets in a query cache file."""
+
+    def __init__(self, cache: "AssetListCache", count: Optional[int] = None):
+        self.cache = cache
+        self._count = count
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.cache.iter_assets()
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = sum(1 for _ in self.cache.iter_assets())
+        return self._count
+
+
+class AssetListCache:
+    """
+    On-disk cache of the asset list returned by a search or album query.
+
+    The format follows the file extension: .json is a single JSON document
+    ({"count", "query"/"album", "assets": [...]}) read with a streaming parser;
+    .jsonl is a header line followed by one compact asset per line. Either way
+    assets are read one at a time, so memory stays bounded for huge caches.
+    """
+
+    FORMATS = ("json", "jsonl")
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.jsonl = self.path.suffix.lower() == ".jsonl"
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> CachedAssets:
+        """
+        Open the cache, validating its structure without loading the assets.
+
+        Returns:
+            CachedAssets view (raises on unreadable or malformed files)
+        """
+        if self.jsonl and read_jsonl_header is not None:
+            header = read_jsonl_header(self.path)
+            return CachedAssets(self, header.get("count"))
+        if iter_json_members is None:
+            with open(self.path, "r") as f:
+                assets = json.load(f)["assets"]
+            return CachedAssets(self, len(assets))
+
+        header_count = None
+        count = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for key, index, value in iter_json_members(f, stream=("assets",)):
+                if key == "count" and index is None:
+                    header_count = count = value
+                elif key == "assets":
+                    if index is None:
+                        raise ValueError(f"Malformed asset list in {self.path}")
+                    if header_count is not None:
+                        # Count is written ahead of the assets; no need to scan
+                        break
+                    count = index + 1
+        if count is None:
+            raise ValueError(f"No assets in cache file {self.path}")
+        return CachedAssets(self, count)
+
+    def iter_assets(self) -> Iterator[dict]:
+        if self.jsonl and iter_jsonl is not None:
+            yield from iter_jsonl(self.path)
+            return
+        if iter_json_members is None:
+            with open(self.path, "r") as f:
+                yield from json.load(f)["assets"]
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for key, index, value in iter_json_members(f, stream=("assets",)):
+                if key == "assets" and index is not None:
+                    yield value
+
+    def save(self, assets: List[dict], **header):
+        """
+        Write the asset list with header fields such as query or album.
+
+        Args:
+            assets: Assets returned by the query
+            **header: Extra fields stored with the assets
+        """
+        if self.jsonl and write_jsonl is not None:
+            write_jsonl(self.path, assets, header=header)
+            return
+        data = {"count": len(assets)}
+        data.update(header)
+        data["assets"] = assets
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class AlbumMembershipCache:
+    """
+    On-disk asset -> album membership, refreshed incrementally from Immich.
+
+    Stored compactly as {"version", "albums": {id: {"name", "updatedAt",
+    "assetCount"}}, "assets": {asset_id: [album_id, ...]}}. On refresh only
+    albums whose updatedAt or assetCount changed (or that are new) are
+    re-fetched, concurrently with a bounded pool; deleted albums are dropped.
+    Files in the old format (asset id -> album names) are rebuilt.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: Path, logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.logger = logger or logging.getLogger(__name__)
+        self.albums = {}
+        self.assets = {}
+        self.stats = {"albums": 0, "fetched": 0, "unchanged": 0, "removed": 0}
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def load(self) -> bool:
+        """
+        Load the cache file.
+
+        Returns:
+            True if a current-format cache was loaded
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, TypeError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return False
+        self.albums = data.get("albums") or {}
+        self.assets = data.get("assets") or {}
+        return True
+
+    def save(self):
+        """Write the cache file."""
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": self.VERSION, "albums": self.albums, "assets": self.assets},
+                f,
+                separators=(",", ":"),
+            )
+
+    def names_for(self, asset_id: str) -> List[str]:
+        """Return the sorted album names an asset belongs to."""
+        names = {
+            self.albums[album_id]["name"]
+            for album_id in self.assets.get(asset_id, ())
+            if album_id in self.albums
+        }
+        return sorted(names)
+
+    def refresh(self, api: ImmichAPI, max_workers: int = 8):
+        """
+        Bring the cache up to date with the albums on the server.
+
+        Args:
+            api: Immich API client
+            max_workers: Concurrent album fetches
+        """
+        current = {}
+        for album in api.list_albums() or []:
+            album_id = album.get("id")
+            if album_id:
+                current[album_id] = {
+                    "name": (album.get("albumName") or "").strip(),
+                    "updatedAt": album.get("updatedAt"),
+                    "assetCount": album.get("assetCount"),
+                }
+
+        changed = set()
+        for album_id, info in current.items():
+            known = self.albums.get(album_id)
+            if (
+                known is None
+                or info["updatedAt"] is None
+                or known.get("updatedAt") != info["updatedAt"]
+                or known.get("assetCount") != info["assetCount"]
+            ):
+                changed.add(album_id)
+        removed = set(self.albums) - set(current)
+        self.stats.update(
+            albums=len(current),
+            fetched=len(changed),
+            unchanged=len(current) - len(changed),
+            removed=len(removed),
+        )
+
+        if changed or removed:
+            # Drop memberships that are about to be replaced or are gone
+            stale = changed | removed
+            for asset_id in list(self.assets):
+                kept = [a for a in self.assets[asset_id] if a not in stale]
+                if kept:
+                    self.assets[asset_id] = kept
+                else:
+                    del self.assets[asset_id]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                album_id: executor.submit(api.get_album_assets, album_id)
+                for album_id in sorted(changed)
+            }
+            for album_id, future in futures.items():
+                album_assets = future.result()
+                self.logger.debug(f"Got {len(album_assets)} assets for album_id={album_id}")
+                for asset in album_assets:
+                    asset_id = asset.get("id")
+                    if asset_id:
+                        self.assets.setdefault(asset_id, []).append(album_id)
+
+        self.albums = current
+        self.logger.info(
+            f"Albums: {self.stats['albums']} total, {self.stats['fetched']} fetched, "
+            f"{self.stats['unchanged']} unchanged, {self.stats['removed']} removed"
+        )
+
+
+class AssetDetailPrefetcher:
+    """Fetch asset details concurrently, ahead of the processing loop."""
+
+    # Fields the extractor reads from asset details
+    REQUIRED_FIELDS = ("updatedAt", "tags", "exifInfo")
+
+    def __init__(
+        self,
+        api: ImmichAPI,
+        max_workers: int = 8,
+        prefetch: int = 64,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.api = api
+        self.max_workers = max(1, max_workers)
+        self.prefetch = max(self.max_workers, prefetch)
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {"fetched": 0, "skipped": 0}
+
+    @classmethod
+    def has_required_fields(cls, asset: dict) -> bool:
+        """True if a search/album payload already carries everything needed."""
+        return all(field in asset for field in cls.REQUIRED_FIELDS)
+
+    def _needs_fetch(self, asset: dict) -> bool:
+        if not asset.get("id") or not asset.get("originalFileName"):
+            return False
+        return not self.has_required_fields(asset)
+
+    def iter_details(
+        self, assets: Iterable[dict]
+    ) -> Iterator[Tuple[dict, Optional[dict]]]:
+        """
+        Yield (asset, details) pairs in input order.
+
+        details is None when no call was needed (or the asset has no id or
+        filename); callers fall back to the asset itself. At most `prefetch`
+        requests are in flight or buffered at any time.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for asset in assets:
+                if self._needs_fetch(asset):
+                    self.stats["fetched"] += 1
+                    future = executor.submit(self.api.get_asset_details, asset["id"])
+                else:
+                    self.stats["skipped"] += 1
+                    future = None
+                pending.append((asset, future))
+                if len(pending) >= self.prefetch:
+                    yield self._resolve(pending.popleft())
+            while pending:
+                yield self._resolve(pending.popleft())
+        self.logger.debug(
+            f"Asset details: {self.stats['fetched']} fetched, "
+            f"{self.stats['skipped']} served from search payload"
+        )
+
+    @staticmethod
+    def _resolve(item):
+        asset, future = item
+        return asset, future.result() if future is not None else None
+
+
 class ExifToolManager:
 
     @staticmethod
@@ -156,18 +475,158 @@ class ExifToolManager:
     # ... (other methods as in original script)
 
 
+def _parse_datetime(value) -> Optional[datetime]:
+    """Parse an EXIF (2020:01:31 12:00:00) or ISO 8601 date/time, ignoring zone."""
+    if not value or not isinstance(value, str):
+        return None
+    text = value.strip()
+    if len(text) >= 19 and text[4] == ":" and text[7] == ":":
+        text = text[:4] + "-" + text[5:7] + "-" + text[8:]
+    try:
+        return datetime.fromisoformat(text[:19].replace(" ", "T"))
+    except ValueError:
+        return None
+
+
+def _read_exif_date(path: str) -> Optional[str]:
+    from .image_analyzer import ImageAnalyzer
+
+    return ImageAnalyzer().get_exif(path).get("DateTimeOriginal")
+
+
+class FileIndex:
+    """
+    Filename -> paths index of a search path, built with one directory walk.
+
+    With a catalog_path the directory listing is persisted (see
+    common.dir_catalog): on the next build only directories whose mtime
+    changed are listed again (unchanged ones are just stat'ed). Names shared
+    by several files are disambiguated by EXIF date, as FileMatcher does in
+    the IMMICH project.
+    """
+
+    # Exact within a second, otherwise the closest date within an hour
+    EXACT_SECONDS = 1
+    FUZZY_SECONDS = 3600
+
+    def __init__(
+        self,
+        search_path: str,
+        catalog_path: Optional[Path] = None,
+        date_reader: Optional[Callable[[str], Optional[str]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        if DirCatalog is None:
+            raise ImportError("COMMON dir_catalog is required for FileIndex")
+        self.root = os.path.abspath(search_path)
+        self.date_reader = date_reader or _read_exif_date
+        self.logger = logger or logging.getLogger(__name__)
+        self.catalog = DirCatalog(self.root, catalog_path, logger=self.logger)
+        self.by_name = {}
+        self.stats = {"dirs": 0, "listed": 0, "files": 0}
+
+    def save(self):
+        """Persist the directory listing to the catalog file, if configured."""
+        self.catalog.save()
+
+    def build(self) -> "FileIndex":
+        """Walk the search path (reusing unchanged catalog entries) and index it."""
+        self.catalog.build()
+        self.by_name = {}
+        for rel, files in sorted(self.catalog.iter_files()):
+            directory = self.catalog.path_of(rel)
+            for name in files:
+                self.by_name.setdefault(name, []).append(os.path.join(directory, name))
+        self.stats = dict(self.catalog.stats)
+        self.logger.info(
+            f"Indexed {self.stats['files']} files in {self.stats['dirs']} folders "
+            f"({self.stats['listed']} listed, {self.stats['dirs'] - self.stats['listed']} from catalog)"
+        )
+        self.save()
+        return self
+
+    def candidates(self, file_name: str) -> List[str]:
+        return self.by_name.get(file_name, [])
+
+    def iter_paths(self, suffix: str) -> Iterator[str]:
+        """Yield indexed paths whose name ends with suffix."""
+        for name, paths in list(self.by_name.items()):
+            if name.endswith(suffix):
+                yield from list(paths)
+
+    def find(self, file_name: str, asset: Optional[dict] = None) -> Optional[str]:
+        """
+        Return the path for an asset's file name, or None if missing or ambiguous.
+
+        Args:
+            file_name: Original file name of the asset
+            asset: Immich asset (its date disambiguates duplicate names)
+        """
+        candidates = self.candidates(file_name)
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+
+        asset = asset or {}
+        target = _parse_datetime(
+            asset.get("localDateTime")
+            or asset.get("dateTimeOriginal")
+            or (asset.get("exifInfo") or {}).get("dateTimeOriginal")
+        )
+        if target is None:
+            self.logger.debug(f"{file_name}: ambiguous_{len(candidates)}_files (no asset date)")
+            return None
+
+        best_path, best_delta = None, None
+        for path in candidates:
+            file_date = _parse_datetime(self.date_reader(path))
+            if file_date is None:
+                continue
+            delta = abs((target - file_date).total_seconds())
+            if delta <= self.EXACT_SECONDS:
+                return path
+            if best_delta is None or delta < best_delta:
+                best_path, best_delta = path, delta
+        if best_path is not None and best_delta <= self.FUZZY_SECONDS:
+            self.logger.debug(f"{file_name}: exif_date_fuzzy_{int(best_delta)}s -> {best_path}")
+            return best_path
+        self.logger.debug(f"{file_name}: ambiguous_{len(candidates)}_files")
+        return None
+
+    def rename(self, old_path: str, new_path: str):
+        """Update the index after a file was renamed within its folder."""
+        old_path, new_path = os.path.abspath(old_path), os.path.abspath(new_path)
+        old_name, new_name = os.path.basename(old_path), os.path.basename(new_path)
+        paths = self.by_name.get(old_name, [])
+        if old_path in paths:
+            paths.remove(old_path)
+            if not paths:
+                del self.by_name[old_name]
+        self.by_name.setdefault(new_name, []).append(new_path)
+        self.catalog.rename_file(old_path, new_path)
+
+
 def find_image_file(
-    file_name: str, search_path: str, logger: logging.Logger = None
+    file_name: str,
+    search_path: str,
+    logger: logging.Logger = None,
+    index: Optional[FileIndex] = None,
+    asset: Optional[dict] = None,
 ) -> Optional[str]:
     """Search for a file by name under a single search path.
 
     This function intentionally accepts a single path string. The project no longer
     supports passing multiple search paths to this helper; callers should provide
-    a single root folder to search.
+    a single root folder to search. With a FileIndex of that path the lookup is a
+    dictionary hit instead of a directory walk.
     """
     if logger is None:
         logger = logging.getLogger("extract")
 
+    if index is not None:
+        found = index.find(file_name, asset)
+        logger.debug(f"find_image_file: index lookup '{file_name}' -> {found!r}")
+        return found
+
     logger.debug(f"find_image_file: Searching for '{file_name}' in {search_path!r}")
     search_dir = Path(search_path)
     logger.debug(f"Searching directory: {search_dir}")
@@ -1,11 +1,18 @@
 import os
-import json
 import logging
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 from .immich_config import ImmichConfig
-from .immich_extract_support import ImmichAPI, ExifToolManager, find_image_file
+from .immich_extract_support import (
+    ImmichAPI,
+    AlbumMembershipCache,
+    AssetDetailPrefetcher,
+    AssetListCache,
+    ExifToolManager,
+    FileIndex,
+    find_image_file,
+)
 
 
 def exif_date_to_iso(exif_date: str) -> str:
@@ -147,6 +154,8 @@ class ImmichExtractor:
         force_update_fuzzy: bool = False,
         disable_sidecars: bool = False,
         exif_timezone: Optional[str] = None,
+        detail_workers: int = 8,
+        cache_format: str = "json",
         logger: Optional[logging.Logger] = None,
     ):
         self.url = url
@@ -161,8 +170,11 @@ class ImmichExtractor:
         self.dry_run = dry_run
         self.force_update_fuzzy = force_update_fuzzy
         self.disable_sidecars = disable_sidecars
+        self.file_index = None
+        self.detail_workers = detail_workers
+        self.cache_format = cache_format if cache_format in AssetListCache.FORMATS else "json"
         self.logger = logger or logging.getLogger("extract")
-        self.api = ImmichAPI(url, api_key)
+        self.api = ImmichAPI(url, api_key, pool_size=max(detail_workers, 1))
         # Try to get log file path from logger handlers
         self.log_path = None
         if self.logger and hasattr(self.logger, "handlers"):
@@ -237,7 +249,8 @@ class ImmichExtractor:
             # For album queries, use album ID
             cache_key = f"album_{self.album}" if self.album else "albums"
         
-        cache_path = cache_dir / f"immich_cache_{cache_key}.json"
+        cache_path = cache_dir / f"immich_cache_{cache_key}.{self.cache_format}"
+        asset_list_cache = AssetListCache(cache_path)
         album_cache_path = cache_dir / "immich_album_cache.json"  # Backward compatibility
         
         # Determine if we need to refresh
@@ -246,13 +259,12 @@ class ImmichExtractor:
             f"Cache path: {cache_path}, need_refresh={need_refresh}"
         )
         
-        # Try to load from cache
-        cached_data = None
+        # Try to load from cache (assets are streamed from disk when iterated)
+        cached_assets = None
         if not need_refresh:
             try:
                 self.logger.debug(f"Loading cache from {cache_path}...")
-                with open(cache_path, "r") as f:
-                    cached_data = json.load(f)
+                cached_assets = asset_list_cache.load()
                 self.logger.info(f"Using cache from {cache_path}")
             except Exception as e:
                 self.logger.info(
@@ -260,40 +272,24 @@ class ImmichExtractor:
                 )
                 need_refresh = True
         
-        # Load or build album cache (for album name mapping)
-        album_cache = {}
-        if not self.refresh_cache and album_cache_path.exists():
-            try:
-                with open(album_cache_path, "r") as f:
-                    album_cache = json.load(f)
-                self.logger.debug(f"Loaded album cache with {len(album_cache)} entries")
-            except Exception:
-                pass
-        
-        if not album_cache or self.refresh_cache:
-            self.logger.info("Fetching all albums from Immich to build album cache...")
-            albums = self.api.list_albums()
-            self.logger.debug(f"Got {len(albums)} albums from Immich.")
-            asset_to_albums = {}
-            for album in albums:
-                album_name = album.get("albumName", "").strip()
-                album_id = album.get("id")
-                if not album_id:
-                    continue
-                self.logger.debug(f"Fetching assets for album_id={album_id}")
-                album_assets = self.api.get_album_assets(album_id)
-                self.logger.debug(
-                    f"Got {len(album_assets)} assets for album_id={album_id}"
-                )
-                for asset in album_assets:
-                    aid = asset.get("id")
-                    if aid:
-                        asset_to_albums.setdefault(aid, set()).add(album_name)
-            album_cache = {
-                aid: sorted(list(names)) for aid, names in asset_to_albums.items()
-            }
-            with open(album_cache_path, "w") as f:
-                json.dump(album_cache, f, indent=2)
+        # Index the search path once (persisted per path) so file lookups
+        # are dictionary hits instead of a directory walk per asset
+        self.file_index = None
+        if self.search_path and os.path.isdir(self.search_path):
+            index_key = hashlib.md5(os.path.abspath(self.search_path).encode()).hexdigest()[:12]
+            self.file_index = FileIndex(
+                self.search_path,
+                catalog_path=cache_dir / f"immich_file_index_{index_key}.json",
+                logger=self.logger,
+            ).build()
+
+        # Load or build album cache (for album name mapping); on refresh only
+        # albums changed since the last run are re-fetched
+        album_cache = AlbumMembershipCache(album_cache_path, logger=self.logger)
+        if not album_cache.load() or self.refresh_cache:
+            self.logger.info("Fetching albums from Immich to update album cache...")
+            album_cache.refresh(self.api, max_workers=self.detail_workers)
+            album_cache.save()
             self.logger.info(f"Album cache written to {album_cache_path}")
 
         self.logger.debug(f"Album cache loaded with {len(album_cache)} asset entries.")
@@ -303,8 +299,8 @@ class ImmichExtractor:
         assets = []
         if self.search:
             # For search queries, check cache first
-            if cached_data and "assets" in cached_data:
-                assets = cached_data["assets"]
+            if cached_assets is not None:
+                assets = cached_assets
                 self.logger.info(f"Loaded {len(assets)} assets from cache.")
             else:
                 self.logger.info("Searching assets via /api/search/metadata...")
@@ -321,8 +317,10 @@ class ImmichExtractor:
                 try:
                     while True:
                         search_payload["page"] = page
-                        resp = self.api.session.post(
-                            f"{self.api.base_url}/api/search/metadata", json=search_payload
+                        resp = self.api.http.post(
+                            f"{self.api.base_url}/api/search/metadata",
+                            json=search_payload,
+                            idempotent=True,
                         )
                         resp.raise_for_status()
                         assets_raw = resp.json()
@@ -378,8 +376,7 @@ class ImmichExtractor:
                     self.logger.info(f"Found {len(assets)} assets via search.")
                     # Save search results to cache
                     try:
-                        with open(cache_path, "w") as f:
-                            json.dump({"assets": assets, "query": search_payload}, f, indent=2)
+                        asset_list_cache.save(assets, query=search_payload)
                         self.logger.info(f"Search results cached to {cache_path}")
                     except Exception as e:
                         self.logger.warning(f"Could not write cache: {e}")
@@ -398,8 +395,8 @@ class ImmichExtractor:
                     }
         else:
             # For album queries, check cache first
-            if cached_data and "assets" in cached_data:
-                assets = cached_data["assets"]
+            if cached_assets is not None:
+                assets = cached_assets
                 self.logger.info(f"Loaded {len(assets)} assets from cache.")
             else:
                 self.logger.info(f"Fetching assets for album {self.album}...")
@@ -407,8 +404,7 @@ class ImmichExtractor:
                 self.logger.info(f"Found {len(assets)} assets in album.")
                 # Save album assets to cache
                 try:
-                    with open(cache_path, "w") as f:
-                        json.dump({"assets": assets, "album": self.album}, f, indent=2)
+                    asset_list_cache.save(assets, album=self.album)
                     self.logger.info(f"Album assets cached to {cache_path}")
                 except Exception as e:
                     self.logger.warning(f"Could not write cache: {e}")
@@ -447,7 +443,10 @@ class ImmichExtractor:
 
         ExifToolManager._datetimes_equal = _datetimes_equal_with_fuzzy
 
-        for i, asset in enumerate(assets, 1):
+        prefetcher = AssetDetailPrefetcher(
+            self.api, max_workers=self.detail_workers, logger=self.logger
+        )
+        for i, (asset, prefetched) in enumerate(prefetcher.iter_details(assets), 1):
             asset_id = asset.get("id")
             file_name = asset.get("originalFileName")
             self.logger.debug(
@@ -465,7 +464,7 @@ class ImmichExtractor:
                 audit_status_counts[status] = audit_status_counts.get(status, 0) + 1
                 skipped_count += 1
                 continue
-            details = self.api.get_asset_details(asset_id) or asset
+            details = prefetched or asset
             immich_mod_date = details.get("updatedAt", "")
             tags_raw = details.get("tags", [])
             description = details.get("description", "").strip()
@@ -481,7 +480,7 @@ class ImmichExtractor:
                         tags.append(t["value"])
                 elif isinstance(t, str):
                     tags.append(t)
-            album_names = album_cache.get(asset_id, [])
+            album_names = album_cache.names_for(asset_id)
             tags = sorted(set(tags + album_names))
             date_original = details.get("dateTimeOriginal", "")
             timezone_from_api = None
@@ -609,19 +608,23 @@ class ImmichExtractor:
                         f"Asset {i}: Reconstructed path does not exist: {local_path}"
                     )
             if not image_path:
-                from .immich_extract_support import find_image_file
-
                 self.logger.debug(
                     f"Asset {i}: Calling find_image_file for '{file_name}' with search_path={self.search_path!r}"
                 )
                 image_path = find_image_file(
-                    file_name, self.search_path, logger=self.logger
+                    file_name,
+                    self.search_path,
+                    logger=self.logger,
+                    index=self.file_index,
+                    asset=details,
                 )
                 self.logger.debug(
                     f"Asset {i}: find_image_file returned: {image_path!r}"
                 )
             if not image_path:
-                status = "not_found"
+                # Several local files share the name and none matched the asset date
+                ambiguous = self.file_index is not None and len(self.file_index.candidates(file_name)) > 1
+                status = "ambiguous" if ambiguous else "not_found"
                 log_path = file_name
                 current_desc = target_desc = current_tags = target_tags = current_date = target_date = current_offset = target_offset = error_msg = ''
                 self.logger.error(f"[EXIF],{log_path},{status},{current_desc},{target_desc},{current_tags},{target_tags},{exif_date_to_iso(current_date)},{exif_date_to_iso(target_date)},{current_offset},{target_offset},{error_msg}")
@@ -804,8 +807,20 @@ class ImmichExtractor:
             "error_files": error_files,
             "audit_status_counts": audit_status_counts,
             "sidecars_disabled": sidecars_disabled,
+            "http_latency": self.api.http.format_latency_report(),
         }
 
+    def _iter_search_path_files(self, suffix):
+        """Yield files under the search path ending with suffix (from the index when built)."""
+        if self.file_index is not None:
+            return (Path(p) for p in self.file_index.iter_paths(suffix))
+        return Path(self.search_path).rglob(f"*{suffix}")
+
+    def _index_renamed(self, old_path, new_path):
+        """Keep the file index in step with a rename on disk."""
+        if self.file_index is not None:
+            self.file_index.rename(old_path, new_path)
+
     def _disable_sidecar_files(self, processed_files):
         """
         Rename sidecar files (.xmp and .supplemental-metadata.json) to .bak.
@@ -822,10 +837,9 @@ class ImmichExtractor:
         # If no processed files specified, fall back to scanning entire directory tree
         if not processed_files:
             self.logger.debug("No processed files specified, scanning entire search path")
-            search_path = Path(self.search_path)
             
             # Find all .xmp files
-            for xmp_path in search_path.rglob("*.xmp"):
+            for xmp_path in self._iter_search_path_files(".xmp"):
                 xmp_path_str = str(xmp_path)
                 xmp_bak_path = f"{xmp_path_str}.bak"
                 try:
@@ -833,6 +847,7 @@ class ImmichExtractor:
                         self.logger.audit(f"[DRY RUN] Would rename sidecar: {xmp_path.name}")
                     else:
                         os.rename(xmp_path_str, xmp_bak_path)
+                        self._index_renamed(xmp_path_str, xmp_bak_path)
                         self.logger.audit(f"Renamed sidecar: {xmp_path_str} -> {xmp_bak_path}")
                     sidecars_disabled += 1
                     xmp_count += 1
@@ -841,7 +856,7 @@ class ImmichExtractor:
                     error_count += 1
             
             # Find all .supplemental-metadata.json files
-            for json_path in search_path.rglob("*.supplemental-metadata.json"):
+            for json_path in self._iter_search_path_files(".supplemental-metadata.json"):
                 json_path_str = str(json_path)
                 json_bak_path = f"{json_path_str}.bak"
                 try:
@@ -849,6 +864,7 @@ class ImmichExtractor:
                         self.logger.audit(f"[DRY RUN] Would rename sidecar: {json_path.name}")
                     else:
                         os.rename(json_path_str, json_bak_path)
+                        self._index_renamed(json_path_str, json_bak_path)
                         self.logger.audit(f"Renamed sidecar: {json_path_str} -> {json_bak_path}")
                     sidecars_disabled += 1
                     json_count += 1
@@ -871,6 +887,7 @@ class ImmichExtractor:
                             self.logger.audit(f"[DRY RUN] Would rename sidecar: {xmp_path.name}")
                         else:
                             os.rename(xmp_path_str, xmp_bak_path)
+                            self._index_renamed(xmp_path_str, xmp_bak_path)
                             self.logger.audit(f"Renamed sidecar: {xmp_path_str} -> {xmp_bak_path}")
                         sidecars_disabled += 1
                         xmp_count += 1
@@ -888,6 +905,7 @@ class ImmichExtractor:
                             self.logger.audit(f"[DRY RUN] Would rename sidecar: {json_path.name}")
                         else:
                             os.rename(json_path_str, json_bak_path)
+                            self._index_renamed(json_path_str, json_bak_path)
                             self.logger.audit(f"Renamed sidecar: {json_path_str} -> {json_bak_path}")
                         sidecars_disabled += 1
                         json_count += 1
@@ -895,6 +913,9 @@ class ImmichExtractor:
                         self.logger.error(f"Failed to disable sidecar {json_path_str}: {e}")
                         error_count += 1
         
+        if self.file_index is not None and not self.dry_run:
+            self.file_index.save()
+
         # Log summary
         self.logger.audit(f"Sidecar disabling summary:")
         self.logger.audit(f"  .xmp files disabled: {xmp_count}")
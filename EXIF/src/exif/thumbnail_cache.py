@@ -0,0 +1,415 @@
+"""
+Thumbnail Cache for fast visual comparison
+
+Visual duplicate review only needs small previews, yet decoding a 24MP JPEG or a
+RAW file costs hundreds of milliseconds. This module extracts the preview that
+cameras already embed in the file, in order of cost:
+
+- JPEG files: the EXIF IFD1 thumbnail, read by a native APP1 parser (only the
+  first segment of the file is read)
+- RAW/HEIC/TIFF files: PreviewImage/JpgFromRaw/ThumbnailImage through a single
+  stay-open exiftool process
+- Anything else Pillow can open: draft-mode decoding (JPEG DCT scaling) and
+  downsizing
+
+Embedded previews larger than the requested size (a RAW file's JpgFromRaw is
+often full resolution) are downsized the same way before they are cached.
+
+Thumbnails are stored in a content-addressed on-disk cache (keyed by the SHA-1 of
+the source file and the thumbnail size, so byte-identical duplicates share one
+entry) that is bounded in size and evicts least recently used entries.
+"""
+
+import io
+import logging
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Try to import PIL for fallback decoding
+try:
+    from PIL import Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+# Import COMMON modules with fallback
+try:
+    common_src_path = Path(__file__).parent.parent.parent.parent / "COMMON" / "src"
+    sys.path.insert(0, str(common_src_path))
+    from common.file_manager import FileManager
+    from common.hash_cache import HashCache
+except ImportError:
+    FileManager = None
+    HashCache = None
+
+
+def extract_exif_thumbnail(file_path) -> Optional[bytes]:
+    """
+    Extract the EXIF IFD1 thumbnail from a JPEG file without decoding it.
+
+    Walks the JPEG marker segments up to the start of scan, locates the APP1
+    Exif segment and follows IFD0 -> IFD1 to the JPEGInterchangeFormat
+    offset/length pair.
+
+    Args:
+        file_path: Path to a JPEG file
+
+    Returns:
+        Embedded JPEG thumbnail bytes, or None if there is none
+    """
+    with open(file_path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            if marker[1] in (0xD9, 0xDA):  # EOI / start of scan: no more metadata
+                return None
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack(">H", length_bytes)[0]
+            if marker[1] == 0xE1:
+                segment = f.read(length - 2)
+                if segment[:6] == b"Exif\x00\x00":
+                    return _thumbnail_from_tiff(segment[6:])
+            else:
+                f.seek(length - 2, os.SEEK_CUR)
+
+
+def _thumbnail_from_tiff(tiff: bytes) -> Optional[bytes]:
+    """Return the IFD1 JPEG thumbnail from a TIFF-structured EXIF block."""
+    if len(tiff) < 8:
+        return None
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+
+    def ifd_entries(offset: int) -> Tuple[Dict[int, int], int]:
+        count = struct.unpack_from(endian + "H", tiff, offset)[0]
+        entries = {}
+        for i in range(count):
+            tag, _, _, value = struct.unpack_from(
+                endian + "HHII", tiff, offset + 2 + i * 12
+            )
+            entries[tag] = value
+        next_offset = struct.unpack_from(endian + "I", tiff, offset + 2 + count * 12)[0]
+        return entries, next_offset
+
+    try:
+        ifd0_offset = struct.unpack_from(endian + "I", tiff, 4)[0]
+        _, ifd1_offset = ifd_entries(ifd0_offset)
+        if not ifd1_offset:
+            return None
+        ifd1, _ = ifd_entries(ifd1_offset)
+    except struct.error:
+        return None
+
+    offset = ifd1.get(0x0201)  # JPEGInterchangeFormat
+    length = ifd1.get(0x0202)  # JPEGInterchangeFormatLength
+    if not offset or not length or offset + length > len(tiff):
+        return None
+    data = tiff[offset : offset + length]
+    return data if data[:2] == b"\xff\xd8" else None
+
+
+class StayOpenExifTool:
+    """Minimal persistent exiftool process (-stay_open) for binary tag reads."""
+
+    def __init__(self, executable: str = "exiftool"):
+        self.executable = executable
+        self._process = None
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available(executable: str = "exiftool") -> bool:
+        return shutil.which(executable) is not None
+
+    def _start(self):
+        self._process = subprocess.Popen(
+            [self.executable, "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def execute(self, *args: str) -> bytes:
+        """
+        Run one exiftool command in the persistent process.
+
+        Returns:
+            Raw stdout bytes of the command
+        """
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            self._counter += 1
+            sentinel = f"{{ready{self._counter}}}".encode()
+            command = "\n".join(args) + f"\n-execute{self._counter}\n"
+            self._process.stdin.write(command.encode("utf-8"))
+            self._process.stdin.flush()
+
+            output = bytearray()
+            stdout = self._process.stdout
+            while True:
+                chunk = stdout.read1(65536)
+                if not chunk:
+                    raise RuntimeError("exiftool process terminated unexpectedly")
+                output += chunk
+                end = output.rfind(sentinel)
+                if end != -1 and output[end + len(sentinel) :].strip() == b"":
+                    return bytes(output[:end]).rstrip(b"\r\n")
+
+    def close(self):
+        """Stop the persistent process."""
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.write(b"-stay_open\nFalse\n")
+                self._process.stdin.flush()
+                self._process.wait(timeout=5)
+            except Exception:
+                self._process.kill()
+            self._process = None
+
+
+class ThumbnailCache:
+    """Extract embedded previews and keep them in a size-bounded on-disk cache."""
+
+    DEFAULT_CACHE_DIR = Path(".log") / "thumbnails"
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    DEFAULT_SIZE = (320, 320)
+    # Eviction frees space down to this fraction of max_bytes, so a full cache
+    # is not rescanned on every insert
+    EVICT_TO = 0.9
+
+    # Formats Pillow can decode directly (HEIC is not supported by PIL)
+    PILLOW_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif", ".webp"}
+
+    # Embedded preview tags, largest useful preview first
+    EXIFTOOL_PREVIEW_TAGS = ["PreviewImage", "JpgFromRaw", "ThumbnailImage"]
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        size: Tuple[int, int] = DEFAULT_SIZE,
+        use_exiftool: bool = True,
+        hash_cache=None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize the thumbnail cache.
+
+        Args:
+            cache_dir: Directory holding cached thumbnails
+            max_bytes: Total cache size before least recently used entries are evicted
+            size: Maximum thumbnail dimensions for Pillow-decoded fallbacks
+            use_exiftool: Use a stay-open exiftool for RAW/HEIC previews if installed
+            hash_cache: HashCache used for content addresses (persistent if None)
+            logger: Optional logger instance
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.size = size
+        self.logger = logger or logging.getLogger(__name__)
+        self.exiftool = (
+            StayOpenExifTool()
+            if use_exiftool and StayOpenExifTool.available()
+            else None
+        )
+        if hash_cache is None and HashCache is not None:
+            hash_cache = HashCache(HashCache.DEFAULT_PATH, logger=self.logger)
+        self.hash_cache = hash_cache
+
+        self.stats = {
+            "hits": 0,
+            "embedded": 0,
+            "exiftool": 0,
+            "pillow": 0,
+            "failures": 0,
+            "evictions": 0,
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(p.stat().st_size for p in self._cache_files())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Stop exiftool and persist content hashes."""
+        if self.exiftool:
+            self.exiftool.close()
+        if self.hash_cache is not None:
+            self.hash_cache.save()
+
+    @staticmethod
+    def is_supported(file_path: Path) -> bool:
+        """Check whether a file is an image format handled by the cache."""
+        if FileManager:
+            return FileManager.is_image_file(Path(file_path))
+        return Path(file_path).suffix.lower() in ThumbnailCache.PILLOW_EXTENSIONS
+
+    def _cache_files(self) -> List[Path]:
+        return [p for p in self.cache_dir.glob("*/*.jpg") if p.is_file()]
+
+    def _cache_path(self, digest: str) -> Path:
+        width, height = self.size
+        return self.cache_dir / digest[:2] / f"{digest}_{width}x{height}.jpg"
+
+    def get_thumbnail(self, file_path) -> Optional[Path]:
+        """
+        Return the path of a cached JPEG thumbnail for an image, creating it if needed.
+
+        Args:
+            file_path: Source image file
+
+        Returns:
+            Path to the cached thumbnail, or None if no thumbnail could be produced
+        """
+        file_path = Path(file_path)
+        if self.hash_cache is None:
+            raise RuntimeError("ThumbnailCache requires common.hash_cache.HashCache")
+
+        digest = self.hash_cache.get_hash(file_path)
+        cache_path = self._cache_path(digest)
+        if cache_path.exists():
+            self.stats["hits"] += 1
+            os.utime(cache_path)  # mark as recently used
+            return cache_path
+
+        data = self.extract(file_path)
+        if data is None:
+            self.stats["failures"] += 1
+            return None
+
+        self._store(cache_path, data)
+        return cache_path
+
+    def get_thumbnail_bytes(self, file_path) -> Optional[bytes]:
+        """Return cached JPEG thumbnail bytes for an image."""
+        cache_path = self.get_thumbnail(file_path)
+        return cache_path.read_bytes() if cache_path else None
+
+    def extract(self, file_path: Path) -> Optional[bytes]:
+        """
+        Extract a JPEG thumbnail without using the cache.
+
+        Returns:
+            JPEG bytes, or None if every strategy failed
+        """
+        suffix = file_path.suffix.lower()
+
+        if suffix in (".jpg", ".jpeg"):
+            try:
+                data = extract_exif_thumbnail(file_path)
+            except OSError as e:
+                self.logger.debug(f"APP1 thumbnail read failed for {file_path}: {e}")
+                data = None
+            if data:
+                self.stats["embedded"] += 1
+                return self._fit_to_size(data, file_path)
+
+        if self.exiftool and suffix not in (".jpg", ".jpeg", ".png", ".gif", ".bmp"):
+            data = self._extract_with_exiftool(file_path)
+            if data:
+                self.stats["exiftool"] += 1
+                return self._fit_to_size(data, file_path)
+
+        if HAS_PIL and suffix in self.PILLOW_EXTENSIONS:
+            data = self._extract_with_pillow(file_path)
+            if data:
+                self.stats["pillow"] += 1
+                return data
+
+        return None
+
+    def _extract_with_exiftool(self, file_path: Path) -> Optional[bytes]:
+        for tag in self.EXIFTOOL_PREVIEW_TAGS:
+            try:
+                data = self.exiftool.execute("-b", f"-{tag}", str(file_path))
+            except Exception as e:
+                self.logger.debug(f"exiftool preview read failed for {file_path}: {e}")
+                return None
+            if data[:2] == b"\xff\xd8":
+                return data
+        return None
+
+    def _extract_with_pillow(self, file_path: Path) -> Optional[bytes]:
+        try:
+            with Image.open(file_path) as img:
+                return self._thumbnail_jpeg(img)
+        except Exception as e:
+            self.logger.debug(f"Pillow thumbnail failed for {file_path}: {e}")
+            return None
+
+    def _fit_to_size(self, data: bytes, file_path: Path) -> bytes:
+        """Downsize an embedded JPEG preview that is larger than self.size."""
+        if not HAS_PIL:
+            return data
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                if img.width <= self.size[0] and img.height <= self.size[1]:
+                    return data
+                return self._thumbnail_jpeg(img)
+        except Exception as e:
+            self.logger.debug(f"Could not downsize preview of {file_path}: {e}")
+            return data
+
+    def _thumbnail_jpeg(self, img) -> bytes:
+        # Let the JPEG decoder scale down by up to 8x while decoding
+        img.draft("RGB", self.size)
+        img.thumbnail(self.size)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG", quality=85)
+        return buffer.getvalue()
+
+    def _store(self, cache_path: Path, data: bytes):
+        """Write a thumbnail atomically and evict old entries beyond max_bytes."""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+        self._total_bytes += len(data)
+        if self._total_bytes > self.max_bytes:
+            self._evict(keep=cache_path)
+
+    def _evict(self, keep: Optional[Path] = None):
+        """Remove least recently used thumbnails until the cache is below EVICT_TO of max_bytes."""
+        entries = []
+        for path in self._cache_files():
+            st = path.stat()
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        limit = int(self.max_bytes * self.EVICT_TO)
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            if path == keep:
+                continue
+            path.unlink()
+            total -= size
+            self.stats["evictions"] += 1
+        self._total_bytes = total
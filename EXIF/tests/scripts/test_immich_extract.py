@@ -11,7 +11,15 @@ import json
 # Import logging setup to enable audit() method on Logger
 import common.logging
 from common.temp import TempManager
-from exif.immich_extract_support import ImmichAPI, ExifToolManager, find_image_file
+from exif.immich_extract_support import (
+    ImmichAPI,
+    AlbumMembershipCache,
+    AssetDetailPrefetcher,
+    AssetListCache,
+    ExifToolManager,
+    FileIndex,
+    find_image_file,
+)
 from exif.immich_extractor import ImmichExtractor
 
 
@@ -87,7 +95,7 @@ class TestImmichExtractor(unittest.TestCase):
 
 
 class TestImmichAPI(unittest.TestCase):
-    @patch("exif.immich_extract_support.requests.Session")
+    @patch("common.http_client.requests.Session")
     def test_get_album_assets(self, mock_session):
         api = ImmichAPI("http://test", "key")
         mock_resp = MagicMock()
@@ -98,7 +106,7 @@ class TestImmichAPI(unittest.TestCase):
         self.assertEqual(assets, [1, 2, 3])
         api.session.get.assert_called_once()
 
-    @patch("exif.immich_extract_support.requests.Session")
+    @patch("common.http_client.requests.Session")
     def test_get_asset_details(self, mock_session):
         api = ImmichAPI("http://test", "key")
         mock_resp = MagicMock()
@@ -108,7 +116,7 @@ class TestImmichAPI(unittest.TestCase):
         details = api.get_asset_details("assetid")
         self.assertEqual(details, {"id": "assetid"})
 
-    @patch("exif.immich_extract_support.requests.Session")
+    @patch("common.http_client.requests.Session")
     def test_list_albums(self, mock_session):
         api = ImmichAPI("http://test", "key")
         mock_resp = MagicMock()
@@ -119,6 +127,124 @@ class TestImmichAPI(unittest.TestCase):
         self.assertEqual(albums, [{"id": "1"}])
 
 
+class TestAssetDetailPrefetcher(unittest.TestCase):
+    def test_details_yielded_in_order(self):
+        api = MagicMock()
+        api.get_asset_details.side_effect = lambda aid: {"id": aid, "fetched": True}
+        assets = [{"id": f"a{i}", "originalFileName": f"img{i}.jpg"} for i in range(50)]
+        prefetcher = AssetDetailPrefetcher(api, max_workers=4, prefetch=8)
+        results = list(prefetcher.iter_details(assets))
+        self.assertEqual([a["id"] for a, _ in results], [a["id"] for a in assets])
+        self.assertEqual([d["id"] for _, d in results], [a["id"] for a in assets])
+        self.assertEqual(prefetcher.stats["fetched"], 50)
+
+    def test_skips_complete_payload_and_missing_filename(self):
+        api = MagicMock()
+        complete = {
+            "id": "a1",
+            "originalFileName": "img1.jpg",
+            "updatedAt": "2024-01-01T00:00:00Z",
+            "tags": [],
+            "exifInfo": {},
+        }
+        no_name = {"id": "a2"}
+        prefetcher = AssetDetailPrefetcher(api)
+        results = list(prefetcher.iter_details([complete, no_name]))
+        self.assertEqual(results, [(complete, None), (no_name, None)])
+        api.get_asset_details.assert_not_called()
+        self.assertEqual(prefetcher.stats["skipped"], 2)
+
+
+class TestAssetListCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.assets = [{"id": f"a{i}", "originalFileName": f"img{i}.jpg"} for i in range(3)]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_both_formats(self):
+        for ext in AssetListCache.FORMATS:
+            cache = AssetListCache(Path(self.tmpdir.name) / f"immich_cache_x.{ext}")
+            cache.save(self.assets, query={"withExif": True})
+            loaded = cache.load()
+            self.assertEqual(len(loaded), 3)
+            self.assertEqual(list(loaded), self.assets)
+            # Re-iterable: each pass streams from disk again
+            self.assertEqual(list(loaded), self.assets)
+
+    def test_legacy_json_without_count(self):
+        path = Path(self.tmpdir.name) / "immich_cache_old.json"
+        with open(path, "w") as f:
+            json.dump({"assets": self.assets, "album": "albumid"}, f, indent=2)
+        loaded = AssetListCache(path).load()
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual(list(loaded)[2]["id"], "a2")
+
+    def test_malformed_cache_raises(self):
+        path = Path(self.tmpdir.name) / "immich_cache_bad.json"
+        path.write_text('{"assets": [{"id": "a0"}, ')
+        with self.assertRaises(ValueError):
+            AssetListCache(path).load()
+
+
+class TestAlbumMembershipCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "immich_album_cache.json"
+        self.api = MagicMock()
+        self.api.list_albums.return_value = [
+            {"id": "al1", "albumName": "Trip ", "updatedAt": "t1", "assetCount": 2},
+            {"id": "al2", "albumName": "Family", "updatedAt": "t1", "assetCount": 1},
+        ]
+        self.members = {"al1": [{"id": "a1"}, {"id": "a2"}], "al2": [{"id": "a1"}]}
+        self.api.get_album_assets.side_effect = lambda album_id: self.members[album_id]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_refresh_fetches_only_changed_albums(self):
+        cache = AlbumMembershipCache(self.path)
+        cache.refresh(self.api, max_workers=2)
+        cache.save()
+        self.assertEqual(cache.names_for("a1"), ["Family", "Trip"])
+
+        # al1 renamed only, al2 gained an asset, al3 is new
+        self.api.list_albums.return_value = [
+            {"id": "al1", "albumName": "Holiday", "updatedAt": "t1", "assetCount": 2},
+            {"id": "al2", "albumName": "Family", "updatedAt": "t2", "assetCount": 2},
+            {"id": "al3", "albumName": "New", "updatedAt": "t2", "assetCount": 1},
+        ]
+        self.members.update(al2=[{"id": "a1"}, {"id": "a3"}], al3=[{"id": "a2"}])
+        self.api.get_album_assets.reset_mock()
+
+        reloaded = AlbumMembershipCache(self.path)
+        self.assertTrue(reloaded.load())
+        reloaded.refresh(self.api)
+
+        fetched = sorted(c.args[0] for c in self.api.get_album_assets.call_args_list)
+        self.assertEqual(fetched, ["al2", "al3"])
+        self.assertEqual(reloaded.names_for("a1"), ["Family", "Holiday"])
+        self.assertEqual(reloaded.names_for("a2"), ["Holiday", "New"])
+        self.assertEqual(reloaded.names_for("a3"), ["Family"])
+        self.assertEqual(reloaded.stats["unchanged"], 1)
+
+    def test_removed_album_and_legacy_file(self):
+        with open(self.path, "w") as f:
+            json.dump({"a1": ["Trip"]}, f)
+        cache = AlbumMembershipCache(self.path)
+        self.assertFalse(cache.load())
+
+        cache.refresh(self.api)
+        self.api.list_albums.return_value = self.api.list_albums.return_value[1:]
+        cache.refresh(self.api)
+
+        self.assertEqual(cache.names_for("a1"), ["Family"])
+        self.assertEqual(cache.names_for("a2"), [])
+        self.assertNotIn("a2", cache.assets)
+        self.assertEqual(cache.stats["removed"], 1)
+
+
 class TestExifToolManager(unittest.TestCase):
 
     @patch("exif.immich_extract_support.os.path.exists", return_value=True)
@@ -244,6 +370,60 @@ class TestFindImageFile(unittest.TestCase):
                 self.assertIsNone(result)
 
 
+class TestFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name) / "photos"
+        for rel in ("2020/a.jpg", "2020/dup.jpg", "2021/dup.jpg", "2021/a.jpg.xmp"):
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / rel).write_text("x")
+        self.catalog = Path(self.tmpdir.name) / "index.json"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lookup_and_catalog_reuse(self):
+        index = FileIndex(str(self.root), catalog_path=self.catalog).build()
+        self.assertEqual(index.stats["listed"], 3)
+        self.assertEqual(
+            find_image_file("a.jpg", str(self.root), index=index), str(self.root / "2020" / "a.jpg")
+        )
+        self.assertIsNone(index.find("missing.jpg"))
+
+        (self.root / "2021" / "b.jpg").write_text("x")
+        rebuilt = FileIndex(str(self.root), catalog_path=self.catalog).build()
+        # Only the folder that changed is listed again
+        self.assertEqual(rebuilt.stats["listed"], 1)
+        self.assertEqual(rebuilt.find("b.jpg"), str(self.root / "2021" / "b.jpg"))
+
+    def test_duplicate_names_resolved_by_date(self):
+        dates = {
+            str(self.root / "2020" / "dup.jpg"): "2020:05:01 10:00:00",
+            str(self.root / "2021" / "dup.jpg"): "2021:05:01 10:00:00",
+        }
+        index = FileIndex(str(self.root), date_reader=dates.get).build()
+
+        asset = {"exifInfo": {"dateTimeOriginal": "2021-05-01T10:00:00.000Z"}}
+        self.assertEqual(index.find("dup.jpg", asset), str(self.root / "2021" / "dup.jpg"))
+        fuzzy = {"localDateTime": "2020-05-01T10:30:00.000Z"}
+        self.assertEqual(index.find("dup.jpg", fuzzy), str(self.root / "2020" / "dup.jpg"))
+        self.assertIsNone(index.find("dup.jpg", {}))
+        self.assertIsNone(index.find("dup.jpg", {"localDateTime": "2019-01-01T00:00:00Z"}))
+
+    def test_rename_updates_index(self):
+        index = FileIndex(str(self.root), catalog_path=self.catalog).build()
+        old = str(self.root / "2021" / "a.jpg.xmp")
+        os.rename(old, old + ".bak")
+        index.rename(old, old + ".bak")
+        index.save()
+
+        self.assertEqual(list(index.iter_paths(".xmp")), [])
+        self.assertEqual(index.find("a.jpg.xmp.bak"), old + ".bak")
+        reloaded = FileIndex(str(self.root), catalog_path=self.catalog).build()
+        self.assertEqual(reloaded.stats["listed"], 0)
+        self.assertEqual(reloaded.find("a.jpg.xmp.bak"), old + ".bak")
+
+
 class TestDisableSidecars(unittest.TestCase):
     """Tests for the --disable-sidecars feature"""
 
@@ -1068,7 +1248,7 @@ class TestTimestampOffsetEquivalence(unittest.TestCase):
             }
         }
         mock_response.raise_for_status = MagicMock()
-        mock_api.session.post.return_value = mock_response
+        mock_api.http.post.return_value = mock_response
         
         mock_ExifToolManager.check_exiftool.return_value = True
         mock_ExifToolManager.update_exif.return_value = "skipped"
@@ -1207,7 +1387,7 @@ class TestTimestampOffsetEquivalence(unittest.TestCase):
                 extractor.run()
                 
                 # Verify search API was NOT called (cache was used)
-                mock_api.session.post.assert_not_called()
+                mock_api.http.post.assert_not_called()
                 
                 # Verify the cached asset was processed (analyzer was called)
                 self.assertTrue(mock_ImageAnalyzer.return_value.get_exif.called)
@@ -1263,7 +1443,7 @@ class TestTimestampOffsetEquivalence(unittest.TestCase):
             }
         }
         mock_response.raise_for_status = MagicMock()
-        mock_api.session.post.return_value = mock_response
+        mock_api.http.post.return_value = mock_response
         
         mock_ExifToolManager.check_exiftool.return_value = True
         mock_ExifToolManager.update_exif.return_value = "skipped"
@@ -1318,7 +1498,7 @@ class TestTimestampOffsetEquivalence(unittest.TestCase):
                 extractor.run()
                 
                 # Verify search API WAS called (cache was ignored)
-                mock_api.session.post.assert_called()
+                mock_api.http.post.assert_called()
                 
                 # Verify cache was updated with new data
                 with open(cache_file) as f:
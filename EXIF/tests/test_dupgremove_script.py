@@ -15,6 +15,9 @@ from pathlib import Path
 
 import pytest
 
+from exif.dup_guru_remover import DupGuruRemover
+from common.hash_cache import HashCache
+
 
 class TestDupGuruRemover:
     """Test cases for dupgremove.py script."""
@@ -581,5 +584,137 @@ class TestDupGuruRemover:
         # adds complexity. The static check above ensures the handler exists.
 
 
+class TestDupGuruRemoverLinkMode:
+    """Test cases for DupGuruRemover link mode."""
+
+    HEADER = ["Group ID", "Filename", "Folder", "Size (KB)", "Action", "Comments"]
+
+    @pytest.fixture
+    def library(self, tmp_path):
+        """Create a library with one identical and one differing duplicate."""
+        target = tmp_path / "library"
+        keep = target / "2022" / "2022-06" / "photo.jpg"
+        dup = target / "2022" / "misc" / "photo_copy.jpg"
+        other_keep = target / "2022" / "2022-06" / "other.jpg"
+        other_dup = target / "2022" / "misc" / "other_edit.jpg"
+        for path in (keep, dup, other_keep, other_dup):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        content = os.urandom(4096)
+        keep.write_bytes(content)
+        dup.write_bytes(content)
+        other_keep.write_bytes(b"original")
+        other_dup.write_bytes(b"edited!!")
+
+        csv_file = tmp_path / "results.csv"
+        with open(csv_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.HEADER)
+            writer.writerow(["0", "photo.jpg", "X:\\2022\\2022-06", "4", "Keep", ""])
+            writer.writerow(["0", "photo_copy.jpg", "X:\\2022\\misc", "4", "Delete", ""])
+            writer.writerow(["1", "other.jpg", "X:\\2022\\2022-06", "1", "Keep", ""])
+            writer.writerow(["1", "other_edit.jpg", "X:\\2022\\misc", "1", "Delete", ""])
+
+        return {
+            "target": target,
+            "csv": csv_file,
+            "keep": keep,
+            "dup": dup,
+            "other_dup": other_dup,
+            "manifest": tmp_path / "links.jsonl",
+        }
+
+    def make_remover(self, library, **kwargs):
+        return DupGuruRemover(
+            csv_file=str(library["csv"]),
+            target_path=str(library["target"]),
+            link_mode=kwargs.pop("link_mode", "hardlink"),
+            manifest_path=str(library["manifest"]),
+            hash_cache=HashCache(),
+            **kwargs,
+        )
+
+    def test_identical_duplicate_is_hardlinked(self, library):
+        """Identical duplicates are replaced by a hardlink to the kept file."""
+        remover = self.make_remover(library)
+        remover.process_csv()
+
+        assert os.path.samefile(library["dup"], library["keep"])
+        assert remover.stats["files_linked"] == 1
+        assert remover.stats["bytes_reclaimed"] == 4096
+        assert not list(library["dup"].parent.glob(".*linktmp"))
+
+    def test_differing_content_is_not_linked(self, library):
+        """Files whose hashes differ are left untouched."""
+        remover = self.make_remover(library)
+        remover.process_csv()
+
+        assert library["other_dup"].read_bytes() == b"edited!!"
+        assert remover.stats["hash_mismatches"] == 1
+
+    def test_dry_run_does_not_link(self, library):
+        """Dry run reports links without touching files or writing a manifest."""
+        remover = self.make_remover(library, dry_run=True)
+        remover.process_csv()
+
+        assert not os.path.samefile(library["dup"], library["keep"])
+        assert remover.stats["files_linked"] == 1
+        assert not library["manifest"].exists()
+
+    def test_rerun_detects_existing_links(self, library):
+        """A second run recognizes already linked duplicates."""
+        self.make_remover(library).process_csv()
+        remover = self.make_remover(library)
+        remover.process_csv()
+
+        assert remover.stats["files_linked"] == 0
+        assert remover.stats["already_linked"] == 1
+
+    def test_undo_restores_independent_copy(self, library):
+        """Undo replaces the hardlink with an independent copy."""
+        original_mtime = library["dup"].stat().st_mtime_ns
+        self.make_remover(library).process_csv()
+
+        stats = DupGuruRemover.undo_links(str(library["manifest"]))
+
+        assert stats["restored"] == 1
+        assert not os.path.samefile(library["dup"], library["keep"])
+        assert library["dup"].read_bytes() == library["keep"].read_bytes()
+        assert library["dup"].stat().st_mtime_ns == original_mtime
+
+    def test_reflink_mode_requires_support(self, library, monkeypatch):
+        """Strict reflink mode fails cleanly when cloning is unsupported."""
+        def no_reflink(self, source_path, dest_path):
+            raise OSError(95, "Operation not supported")
+
+        monkeypatch.setattr(DupGuruRemover, "_reflink", no_reflink)
+        remover = self.make_remover(library, link_mode="reflink")
+        remover.process_csv()
+
+        assert remover.stats["files_linked"] == 0
+        assert remover.stats["errors"] == 1
+        assert not os.path.samefile(library["dup"], library["keep"])
+
+    def test_auto_mode_falls_back_to_hardlink(self, library, monkeypatch):
+        """Auto mode uses a hardlink when cloning is unsupported."""
+        def no_reflink(self, source_path, dest_path):
+            raise OSError(95, "Operation not supported")
+
+        monkeypatch.setattr(DupGuruRemover, "_reflink", no_reflink)
+        remover = self.make_remover(library, link_mode="auto")
+        remover.process_csv()
+
+        assert os.path.samefile(library["dup"], library["keep"])
+
+    def test_link_mode_requires_group_id(self, library):
+        """Link mode needs the Group ID column to find the kept file."""
+        with open(library["csv"], "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Filename", "Folder", "Action"])
+            writer.writerow(["photo_copy.jpg", "X:\\2022\\misc", "Delete"])
+
+        with pytest.raises(ValueError):
+            self.make_remover(library).process_csv()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -308,6 +308,106 @@ class TestDupGuruScript:
             assert orig["Action"] == new["Action"]
             assert orig["Comments"] == new["Comments"]
 
+    def test_triplicate_group_resolution(self):
+        """Test that groups with more than two files are resolved."""
+        data = [
+            {
+                "Group ID": "0",
+                "Filename": "IMG_001.jpg",
+                "Folder": "X:\\images\\0+\\0000\\0000-00\\Random",
+                "Size (KB)": "500",
+                "Dimensions": "1920 x 1080",
+                "Match %": "99",
+            },
+            {
+                "Group ID": "0",
+                "Filename": "2022-06-15_1200_DEB_1920x1080_IMG_001.jpg",
+                "Folder": "X:\\images\\2020+\\2022\\2022-06\\2022-06_DEB",
+                "Size (KB)": "495",
+                "Dimensions": "1920 x 1080",
+                "Match %": "99",
+            },
+            {
+                "Group ID": "0",
+                "Filename": "IMG_001_copy.jpg",
+                "Folder": "X:\\images\\2020+\\2022\\2022-06\\misc",
+                "Size (KB)": "490",
+                "Dimensions": "1920 x 1080",
+                "Match %": "99",
+            },
+        ]
+
+        self.create_test_csv(data)
+
+        result = self.run_script([self.test_csv])
+        assert result.returncode == 0, f"Script failed: {result.stdout}"
+
+        output_files = list(Path(self.temp_dir).glob("*_processed_*.csv"))
+        output_data = self.read_csv_output(output_files[0])
+
+        actions = {row["Filename"]: row["Action"] for row in output_data}
+        assert actions["2022-06-15_1200_DEB_1920x1080_IMG_001.jpg"] == "Keep"
+        assert actions["IMG_001.jpg"] == "Delete"
+        assert actions["IMG_001_copy.jpg"] == "Delete"
+        assert "Multi-file groups processed: 1" in result.stdout
+
+        # Reasons name files by their position in the group, and the kept one
+        comments = {row["Filename"]: row["Comments"] for row in output_data}
+        assert comments["IMG_001.jpg"] == (
+            "Not keeping: file 1 in invalid folder structure (keeping file 2)"
+        )
+        assert comments["IMG_001_copy.jpg"].endswith("(keeping file 2)")
+
+    def test_multi_group_without_decision_needs_review(self):
+        """Test that indistinguishable members of a large group are left for review."""
+        data = [
+            {
+                "Group ID": "0",
+                "Filename": f"photo{i}.jpg",
+                "Folder": f"X:\\images\\2020+\\2022\\2022-06\\folder{i}",
+                "Size (KB)": "100",
+                "Dimensions": "1920 x 1080",
+                "Match %": "99",
+            }
+            for i in range(3)
+        ]
+
+        self.create_test_csv(data)
+
+        result = self.run_script([self.test_csv])
+        assert result.returncode == 0
+
+        output_files = list(Path(self.temp_dir).glob("*_processed_*.csv"))
+        output_data = self.read_csv_output(output_files[0])
+
+        assert all(row["Action"] == "" for row in output_data)
+        assert all(row["Comments"] == "Manual review needed" for row in output_data)
+
+    def test_non_contiguous_groups(self):
+        """Test that groups split across the file are still resolved together."""
+        self.create_test_csv()
+        with open(self.test_csv, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        # Interleave groups: header, g0, g1, g0, g1
+        reordered = [lines[0], lines[1], lines[3], lines[2], lines[4]]
+        with open(self.test_csv, "w", encoding="utf-8") as f:
+            f.write("\n".join(reordered) + "\n")
+
+        result = self.run_script([self.test_csv, "--verbose"])
+        assert result.returncode == 0
+        assert "[INFO] Output rows are written group by group" in result.stdout
+
+        output_files = list(Path(self.temp_dir).glob("*_processed_*.csv"))
+        output_data = self.read_csv_output(output_files[0])
+
+        assert len(output_data) == 4
+        assert [row["Group ID"] for row in output_data] == ["0", "0", "1", "1"]
+        for group_id in ("0", "1"):
+            actions = sorted(
+                row["Action"] for row in output_data if row["Group ID"] == group_id
+            )
+            assert actions == ["Delete", "Keep"]
+
     # Command line argument tests
 
     def test_output_argument(self):
@@ -62,5 +62,102 @@ class TestFindDupsScript(unittest.TestCase):
         self.assertEqual(finder.logger, logger)
 
 
+class TestDuplicateFinderSizeFilter(unittest.TestCase):
+    """Test the size/partial-hash filter in front of EXIF target filename matching."""
+
+    def setUp(self):
+        """Set up source and target trees with unmatched file names."""
+        import logging
+
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "source"
+        self.target_dir = self.temp_dir / "target" / "2020" / "2020-01"
+        self.source_dir.mkdir()
+        self.target_dir.mkdir(parents=True)
+        self.logger = logging.getLogger("test")
+
+        (self.source_dir / "renamed_photo.jpg").write_bytes(b"A" * 1000)
+        (self.source_dir / "unrelated_shot.jpg").write_bytes(b"B" * 2000)
+        (self.target_dir / "2020-01-01_0000_1x1_organized.jpg").write_bytes(
+            b"A" * 1000
+        )
+
+    def tearDown(self):
+        """Clean up test directories."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+    def make_finder(self, **kwargs):
+        from exif.duplicate_finder import DuplicateFinder
+
+        finder = DuplicateFinder(
+            source_dir=self.source_dir,
+            target_dir=self.temp_dir / "target",
+            logger=self.logger,
+            **kwargs,
+        )
+        finder._build_target_indexes()
+        return finder
+
+    def test_exif_skipped_without_same_size_target(self):
+        """Sources with no same-size target never reach getTargetFilename."""
+        from unittest.mock import patch
+
+        finder = self.make_finder()
+        with patch("exif.duplicate_finder.ImageData.getTargetFilename") as mocked:
+            target, match_type = finder.find_duplicate(
+                self.source_dir / "unrelated_shot.jpg"
+            )
+
+        mocked.assert_not_called()
+        self.assertIsNone(target)
+        self.assertEqual(match_type, "none")
+        self.assertEqual(finder.stats["exif_reads_avoided"], 1)
+
+    def test_exif_used_with_same_size_target(self):
+        """Sources with a same-size target still use EXIF target filename matching."""
+        from unittest.mock import patch
+
+        expected = str(self.target_dir / "2020-01-01_0000_1x1_organized.jpg")
+        finder = self.make_finder()
+        with patch(
+            "exif.duplicate_finder.ImageData.getTargetFilename", return_value=expected
+        ) as mocked:
+            target, match_type = finder.find_duplicate(
+                self.source_dir / "renamed_photo.jpg"
+            )
+
+        mocked.assert_called_once()
+        self.assertEqual(str(target), expected)
+        self.assertEqual(match_type, "Target Filename")
+        self.assertEqual(finder.stats["exif_reads_avoided"], 0)
+
+    def test_partial_hash_rejects_same_size_different_content(self):
+        """Partial hashes rule out same-size files with different content."""
+        from unittest.mock import patch
+
+        (self.source_dir / "same_size_other.jpg").write_bytes(b"C" * 1000)
+        finder = self.make_finder(partial_hash=True)
+        with patch("exif.duplicate_finder.ImageData.getTargetFilename") as mocked:
+            finder.find_duplicate(self.source_dir / "same_size_other.jpg")
+
+        mocked.assert_not_called()
+        self.assertEqual(finder.stats["exif_reads_avoided"], 1)
+
+    def test_size_filter_can_be_disabled(self):
+        """Without the size filter every unmatched source is EXIF-checked."""
+        from unittest.mock import patch
+
+        finder = self.make_finder(size_filter=False)
+        with patch(
+            "exif.duplicate_finder.ImageData.getTargetFilename", return_value=None
+        ) as mocked:
+            finder.find_duplicate(self.source_dir / "unrelated_shot.jpg")
+
+        mocked.assert_called_once()
+        self.assertEqual(finder.stats["exif_reads_avoided"], 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,232 @@
+"""
+Tests for ThumbnailCache - embedded preview extraction and the on-disk cache.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from exif.thumbnail_cache import ThumbnailCache, extract_exif_thumbnail
+from common.hash_cache import HashCache
+
+try:
+    import piexif
+    from PIL import Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+pytestmark = pytest.mark.skipif(not HAS_PIL, reason="PIL and piexif required")
+
+
+def make_jpeg(path: Path, size=(800, 600), color=(200, 30, 30), thumbnail=True):
+    """Create a JPEG, optionally with an embedded EXIF thumbnail."""
+    img = Image.new("RGB", size, color)
+    exif_bytes = None
+    if thumbnail:
+        thumb = Image.new("RGB", (160, 120), color)
+        buffer = io.BytesIO()
+        thumb.save(buffer, "JPEG")
+        exif_bytes = piexif.dump(
+            {"0th": {}, "Exif": {}, "1st": {}, "thumbnail": buffer.getvalue()}
+        )
+    if exif_bytes:
+        img.save(path, "JPEG", exif=exif_bytes)
+    else:
+        img.save(path, "JPEG")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ThumbnailCache(
+        cache_dir=tmp_path / "thumbs", use_exiftool=False, hash_cache=HashCache()
+    ) as thumbnail_cache:
+        yield thumbnail_cache
+
+
+class TestExtractExifThumbnail:
+    """Test cases for the native APP1 thumbnail parser."""
+
+    def test_extracts_embedded_thumbnail(self, tmp_path):
+        """Embedded IFD1 thumbnail is returned as a JPEG."""
+        path = make_jpeg(tmp_path / "photo.jpg")
+
+        data = extract_exif_thumbnail(path)
+
+        assert data[:2] == b"\xff\xd8"
+        with Image.open(io.BytesIO(data)) as thumb:
+            assert thumb.size == (160, 120)
+
+    def test_no_thumbnail(self, tmp_path):
+        """JPEGs without EXIF thumbnail return None."""
+        path = make_jpeg(tmp_path / "plain.jpg", thumbnail=False)
+
+        assert extract_exif_thumbnail(path) is None
+
+    def test_not_a_jpeg(self, tmp_path):
+        """Non-JPEG files return None."""
+        path = tmp_path / "fake.jpg"
+        path.write_bytes(b"not a jpeg at all")
+
+        assert extract_exif_thumbnail(path) is None
+
+
+class TestThumbnailCache:
+    """Test cases for the ThumbnailCache class."""
+
+    def test_embedded_thumbnail_is_cached(self, cache, tmp_path):
+        """First lookup extracts, second lookup is a cache hit."""
+        path = make_jpeg(tmp_path / "photo.jpg")
+
+        first = cache.get_thumbnail(path)
+        second = cache.get_thumbnail(path)
+
+        assert first == second
+        assert first.exists()
+        assert cache.stats["embedded"] == 1
+        assert cache.stats["hits"] == 1
+
+    def test_large_embedded_preview_is_downsized(self, tmp_path):
+        """Embedded previews larger than the cache size are reduced to it."""
+        path = make_jpeg(tmp_path / "photo.jpg")
+        cache = ThumbnailCache(
+            cache_dir=tmp_path / "thumbs", size=(64, 64), use_exiftool=False, hash_cache=HashCache()
+        )
+
+        data = cache.get_thumbnail_bytes(path)
+
+        assert cache.stats["embedded"] == 1
+        with Image.open(io.BytesIO(data)) as thumb:
+            assert max(thumb.size) == 64
+
+    def test_full_size_raw_preview_is_downsized(self, cache, tmp_path):
+        """A full-resolution JpgFromRaw from exiftool is not cached as stored."""
+        raw_path = tmp_path / "photo.nef"
+        raw_path.write_bytes(b"raw data")
+        preview = io.BytesIO()
+        Image.new("RGB", (3000, 2000), (10, 120, 10)).save(preview, "JPEG")
+
+        class FakeExifTool:
+            def execute(self, *args):
+                return preview.getvalue()
+
+            def close(self):
+                pass
+
+        cache.exiftool = FakeExifTool()
+        data = cache.get_thumbnail_bytes(raw_path)
+
+        assert cache.stats["exiftool"] == 1
+        with Image.open(io.BytesIO(data)) as thumb:
+            assert max(thumb.size) <= max(cache.size)
+
+    def test_identical_files_share_entry(self, cache, tmp_path):
+        """Byte-identical duplicates map to the same content address."""
+        path = make_jpeg(tmp_path / "photo.jpg")
+        copy = tmp_path / "copy.jpg"
+        copy.write_bytes(path.read_bytes())
+
+        assert cache.get_thumbnail(path) == cache.get_thumbnail(copy)
+        assert cache.stats["hits"] == 1
+
+    def test_pillow_fallback(self, cache, tmp_path):
+        """Files without embedded previews are decoded in draft mode."""
+        path = make_jpeg(tmp_path / "plain.jpg", size=(2000, 1500), thumbnail=False)
+
+        data = cache.get_thumbnail_bytes(path)
+
+        assert cache.stats["pillow"] == 1
+        with Image.open(io.BytesIO(data)) as thumb:
+            assert max(thumb.size) <= max(cache.size)
+
+    def test_png_fallback(self, cache, tmp_path):
+        """Non-JPEG formats Pillow can read are thumbnailed as JPEG."""
+        path = tmp_path / "image.png"
+        Image.new("RGBA", (640, 480), (0, 0, 255, 128)).save(path, "PNG")
+
+        data = cache.get_thumbnail_bytes(path)
+
+        assert data[:2] == b"\xff\xd8"
+
+    def test_unreadable_file(self, cache, tmp_path):
+        """Files no strategy can read are counted as failures."""
+        path = tmp_path / "broken.jpg"
+        path.write_bytes(b"garbage")
+
+        assert cache.get_thumbnail(path) is None
+        assert cache.stats["failures"] == 1
+
+    def test_eviction_keeps_cache_bounded(self, tmp_path):
+        """Least recently used entries are evicted beyond max_bytes."""
+        paths = [
+            make_jpeg(tmp_path / f"photo{i}.jpg", color=(i * 40, 10, 10))
+            for i in range(4)
+        ]
+        thumb_size = len(extract_exif_thumbnail(paths[0]))
+        cache = ThumbnailCache(
+            cache_dir=tmp_path / "thumbs",
+            max_bytes=int(thumb_size * 2.5),
+            use_exiftool=False,
+            hash_cache=HashCache(),
+        )
+
+        for path in paths:
+            cache.get_thumbnail(path)
+
+        cached = list((tmp_path / "thumbs").glob("*/*.jpg"))
+        assert len(cached) <= 2
+        assert cache.stats["evictions"] >= 2
+        assert cache.get_thumbnail(paths[-1]) in cached
+
+    def test_eviction_frees_space_below_max_bytes(self, tmp_path):
+        """A full cache evicts down to the low-water mark, not just to max_bytes."""
+        paths = [
+            make_jpeg(tmp_path / f"photo{i}.jpg", color=(i * 10, 10, 10))
+            for i in range(22)
+        ]
+        thumb_size = max(len(extract_exif_thumbnail(path)) for path in paths)
+        cache = ThumbnailCache(
+            cache_dir=tmp_path / "thumbs",
+            max_bytes=thumb_size * 20,
+            use_exiftool=False,
+            hash_cache=HashCache(),
+        )
+        scans = []
+        original_evict = cache._evict
+
+        def counting_evict(**kwargs):
+            scans.append(1)
+            original_evict(**kwargs)
+
+        cache._evict = counting_evict
+
+        for path in paths:
+            cache.get_thumbnail(path)
+
+        # One scan made room for the last insert as well
+        assert len(scans) == 1
+        assert cache._total_bytes <= cache.max_bytes
+
+    def test_size_is_part_of_cache_key(self, tmp_path):
+        """Caches with different thumbnail sizes do not share entries."""
+        path = make_jpeg(tmp_path / "plain.jpg", size=(2000, 1500), thumbnail=False)
+        small = ThumbnailCache(
+            cache_dir=tmp_path / "thumbs", size=(64, 64), use_exiftool=False, hash_cache=HashCache()
+        )
+        large = ThumbnailCache(
+            cache_dir=tmp_path / "thumbs", size=(400, 400), use_exiftool=False, hash_cache=HashCache()
+        )
+
+        small_path = small.get_thumbnail(path)
+        large_path = large.get_thumbnail(path)
+
+        assert small_path != large_path
+        assert large.stats["hits"] == 0
+        with Image.open(large_path) as thumb:
+            assert max(thumb.size) > 64
@@ -30,6 +30,9 @@ SCRIPT_INFO = {
         "--source /path/to/photos",
         "/path/to/photos --output /tmp/analyze.csv",
         "--source /path/to/photos --output /tmp/analyze.csv --verbose",
+        "/path/to/photos --executor process --workers 8",
+        "/path/to/photos --incremental .log/analyze_2025-01-01_1200.csv",
+        "/path/to/photos --output .log/analyze.parquet",
     ],
 }
 
@@ -42,7 +45,30 @@ SCRIPT_ARGUMENTS = {
     "output": {
         "flag": "--output",
         "positional": True,
-        "help": "Output CSV file for analysis (default: .log/analyze_YYYY-MM-DD_HHMM.csv)",
+        "help": "Output CSV file for analysis; a .parquet file writes Parquet (needs pyarrow) "
+        "(default: .log/analyze_YYYY-MM-DD_HHMM.csv)",
+    },
+    "executor": {
+        "flag": "--executor",
+        "choices": list(ImageAnalyzer.EXECUTORS),
+        "default": "thread",
+        "help": "thread: analyze each file in a thread pool; process: read EXIF in "
+        "chunks and calculate rows in a process pool (default: thread)",
+    },
+    "workers": {
+        "flag": "--workers",
+        "type": int,
+        "help": "Worker threads or processes (default: based on CPU count)",
+    },
+    "incremental": {
+        "flag": "--incremental",
+        "help": "Previous analyze CSV; rows of files (and sidecars) unchanged since it are reused",
+    },
+    "chunk_size": {
+        "flag": "--chunk-size",
+        "type": int,
+        "default": 200,
+        "help": "Files per exiftool call and process task in process mode (default: 200)",
     },
 }
 
@@ -73,6 +99,8 @@ def main() -> int:
     config_map = {
         "source": "Source Folder",
         "output": "Output CSV file",
+        "executor": "Executor",
+        "incremental": "Previous CSV",
     }
     parser.display_configuration(resolved_args, config_map)
 
@@ -95,17 +123,26 @@ def main() -> int:
     analyzer = ImageAnalyzer(
         source_folder,
         logger,
+        max_workers=resolved_args.get("workers"),
+        executor=resolved_args.get("executor") or "thread",
+        chunk_size=resolved_args.get("chunk_size") or 200,
     )
     try:
-        rows = analyzer.analyze_to_csv(output_file)
+        rows = analyzer.analyze_to_csv(output_file, resolved_args.get("incremental"))
     except Exception as exc:
         logger.error(f"Analyze failed: {exc}")
         print(f"❌ Error: {exc}")
         return 1
 
     logger.info(f"Analysis complete. Rows written: {rows}")
+    if resolved_args.get("incremental"):
+        logger.info(
+            f"Rows reused: {analyzer.stats['reused']}, analyzed: {analyzer.stats['analyzed']}"
+        )
     if not resolved_args.get("quiet"):
         print(f"✅ Analysis complete. Rows written: {rows}")
+        if resolved_args.get("incremental"):
+            print(f"   Reused {analyzer.stats['reused']} unchanged rows, analyzed {analyzer.stats['analyzed']}")
     return 0
 
 
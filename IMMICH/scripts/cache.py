@@ -19,6 +19,7 @@ sys.path.insert(0, str(project_root / "src"))
 sys.path.insert(0, str(project_root.parent / "COMMON" / "src"))
 
 from common.logging import ScriptLogging
+from common.hash_cache import HashCache
 from common.argument_parser import (
     ScriptArgumentParser,
     create_standard_arguments,
@@ -38,6 +39,7 @@ SCRIPT_INFO = {
         '--target /mnt/photos --after 2025-10-24T16:00:00Z',
         '/mnt/photos --album album_id_here',
         '--target /mnt/photos --cache ./custom_cache.json --clear',
+        '/mnt/photos --sync',
         '/mnt/photos --before 2025-12-31T23:59:59Z --verbose'
     ]
 }
@@ -51,7 +53,7 @@ SCRIPT_ARGUMENTS = {
     },
     'cache': {
         'flag': '--cache',
-        'help': 'Path to metadata cache file (default: .log/cache_{target_basename}.json)'
+        'help': 'Path to metadata cache file, .json or .db for SQLite (default: .log/cache_{target_basename}.json)'
     },
     'clear': {
         'flag': '--clear',
@@ -69,6 +71,21 @@ SCRIPT_ARGUMENTS = {
     'album': {
         'flag': '--album',
         'help': 'Only extract assets from this album ID'
+    },
+    'sync': {
+        'flag': '--sync',
+        'action': 'store_true',
+        'help': 'Incremental sync: fetch only assets updated since the last full sync and drop trashed/deleted assets'
+    },
+    'skew': {
+        'flag': '--skew',
+        'type': int,
+        'default': 300,
+        'help': 'Seconds to re-fetch before the sync watermark to cover clock skew (default: 300)'
+    },
+    'hash_cache': {
+        'flag': '--hash-cache',
+        'help': 'Persistent hash cache used to tell same-named files apart by checksum (default: .log/hash_cache.json)'
     }
 }
 
@@ -129,6 +146,11 @@ def main():
     validate_iso8601_date(resolved_args.get('before'), '--before', parser)
     validate_iso8601_date(resolved_args.get('after'), '--after', parser)
     
+    if resolved_args.get('sync') and any(
+        resolved_args.get(name) for name in ('clear', 'before', 'after', 'album')
+    ):
+        parser.error("--sync cannot be combined with --clear, --before, --after or --album")
+    
     # Validate target directory exists
     target_path = Path(resolved_args['target'])
     if not target_path.exists():
@@ -178,6 +200,8 @@ def main():
             logger.info(f"  After: {resolved_args['after']}")
         if resolved_args.get('album'):
             logger.info(f"  Album: {resolved_args['album']}")
+        if resolved_args.get('sync'):
+            logger.info(f"  Sync: incremental (skew {resolved_args.get('skew')}s)")
         logger.info(f"  Immich URL: {url}")
         logger.info("")
     
@@ -210,30 +234,49 @@ def main():
         
         cache.metadata['target_path'] = str(target_path)
         
-        # Search for assets
-        logger.info("Fetching assets from Immich...")
-        assets = connection.search_assets(
-            updated_before=resolved_args.get('before'),
-            updated_after=resolved_args.get('after'),
-            album_id=resolved_args.get('album')
+        # Only a run over the whole library may move the sync watermark
+        previous_watermark = cache.metadata.get('sync_watermark')
+        partial_run = any(
+            resolved_args.get(name) for name in ('before', 'after', 'album')
         )
         
-        logger.info(f"Found {len(assets)} assets")
+        updated_after = resolved_args.get('after')
+        sync_start = None
+        if resolved_args.get('sync'):
+            sync_start = cache.get_sync_start(resolved_args.get('skew') or 0)
+            if sync_start:
+                logger.info(f"Syncing changes since {sync_start}")
+                updated_after = sync_start
+            else:
+                logger.info("No sync watermark in cache, fetching all assets")
         
-        # Initialize file matcher
+        # Initialize file matcher before fetching so matching can start
+        # as soon as the first page arrives
         logger.info("Building file index...")
-        matcher = FileMatcher(str(target_path), logger)
+        hash_cache = HashCache(resolved_args.get('hash_cache') or HashCache.DEFAULT_PATH, logger)
+        # The directory listing is kept next to the cache so reruns only re-list changed directories
+        index_path = Path(cache_path).with_name(f"{Path(cache_path).stem}_files.json")
+        matcher = FileMatcher(str(target_path), logger, hash_cache, index_path=str(index_path))
+        
+        # Stream assets; later pages download while earlier ones are matched
+        logger.info("Fetching assets from Immich and matching files...")
+        assets = connection.iter_search_assets(
+            updated_before=resolved_args.get('before'),
+            updated_after=updated_after,
+            album_id=resolved_args.get('album')
+        )
         
-        # Process each asset
-        logger.info("Processing assets and matching files...")
         stats = {
+            'processed': 0,
             'exact_matches': 0,
             'fuzzy_matches': 0,
             'no_matches': 0,
-            'skipped_older': 0
+            'skipped_older': 0,
+            'removed': 0
         }
         
         for i, asset in enumerate(assets, 1):
+            stats['processed'] = i
             asset_id = asset.get('id', 'unknown')
             filename = asset.get('originalFileName', 'unknown')
             
@@ -264,16 +307,40 @@ def main():
             # AUDIT log
             logger.log(
                 15,  # AUDIT level
-                f"Asset {i}/{len(assets)}: {filename} -> {status} -> {matched_path or 'none'}"
+                f"Asset {i}: {filename} -> {status} -> {matched_path or 'none'}"
             )
             
             # Progress logging
             if i % 100 == 0:
-                logger.info(f"Processed {i}/{len(assets)} assets...")
+                logger.info(f"Processed {i} assets...")
+        
+        # Drop assets trashed or deleted since the last sync
+        if sync_start:
+            logger.info("Checking for trashed and deleted assets...")
+            removed_ids = {
+                asset.get('id') for asset in connection.search_trashed_assets(sync_start)
+            }
+            deleted_ids = connection.get_deleted_asset_ids(sync_start)
+            if deleted_ids is None:
+                logger.warning(
+                    "Server did not report permanently deleted assets; "
+                    "run with --clear periodically to drop them from the cache"
+                )
+            else:
+                removed_ids.update(deleted_ids)
+            
+            for asset_id in sorted(i for i in removed_ids if i):
+                if cache.remove_asset(asset_id):
+                    stats['removed'] += 1
+                    logger.log(15, f"Asset {asset_id} -> removed (trashed/deleted)")
+        
+        if partial_run:
+            cache.metadata['sync_watermark'] = previous_watermark
         
         # Save cache
         logger.info("Saving cache...")
         cache.save()
+        hash_cache.save()
         
         # Display summary
         cache_stats = cache.get_stats()
@@ -281,11 +348,22 @@ def main():
         logger.info("\n" + "="*50)
         logger.info("SUMMARY")
         logger.info("="*50)
-        logger.info(f"Total assets processed: {len(assets)}")
+        logger.info(f"Total assets processed: {stats['processed']}")
         logger.info(f"Exact matches: {stats['exact_matches']}")
         logger.info(f"Fuzzy matches: {stats['fuzzy_matches']}")
         logger.info(f"No matches: {stats['no_matches']}")
         logger.info(f"Skipped (older data): {stats['skipped_older']}")
+        logger.info(
+            f"Duplicate filenames: {matcher.stats['ambiguous']} "
+            f"(resolved by size {matcher.stats['by_size']}, "
+            f"checksum {matcher.stats['by_checksum']}, "
+            f"EXIF date {matcher.stats['by_exif_date']} in {matcher.stats['exif_batches']} exiftool calls)"
+        )
+        if resolved_args.get('sync'):
+            logger.info(f"Removed (trashed/deleted): {stats['removed']}")
+            logger.info(f"Sync watermark: {cache.metadata.get('sync_watermark')}")
+        for line in connection.http.format_latency_report():
+            logger.info(f"HTTP {line}")
         logger.info(f"\nCache statistics:")
         logger.info(f"  Total cached assets: {cache_stats['total_assets']}")
         logger.info(f"  Matched files: {cache_stats['matched_files']}")
@@ -34,6 +34,8 @@ SCRIPT_INFO = {
         "--verbose",
         "--wait",
         "--wait 30",
+        "--wait-idle",
+        "--wait-idle --timeout 3600",
     ],
 }
 
@@ -44,7 +46,17 @@ SCRIPT_ARGUMENTS = {
         "nargs": "?",
         "const": 10,
         "help": "Wait N seconds, then check queues again (default 10 if flag only)",
-    }
+    },
+    "wait_idle": {
+        "flag": "--wait-idle",
+        "action": "store_true",
+        "help": "Poll with adaptive backoff until all queues are idle, reporting drain rate and ETA",
+    },
+    "timeout": {
+        "flag": "--timeout",
+        "type": int,
+        "help": "With --wait-idle, give up after N seconds (exit code 2)",
+    },
 }
 
 ARGUMENTS = merge_arguments(create_standard_arguments(), SCRIPT_ARGUMENTS)
@@ -73,6 +85,18 @@ def main() -> int:
         return 1
 
     checker = QueueChecker(connection, logger)
+
+    if resolved_args.get("wait_idle"):
+        overview = checker.wait_until_idle(
+            timeout=resolved_args.get("timeout"),
+            on_progress=lambda overview, progress: _log_progress(logger, progress),
+        )
+        if overview.is_idle:
+            logger.info("All queues appear idle")
+            return 0
+        logger.warning("Queues did not become idle (timed out or paused)")
+        return 2
+
     overview = checker.fetch_queue_overview()
     _log_queues(logger, overview.queues, only_active=False)
 
@@ -97,6 +121,21 @@ def main() -> int:
     return 2
 
 
+def _log_progress(logger, progress) -> None:
+    busy = [p for p in progress if p.pending]
+    for item in busy:
+        eta = f"{item.eta_seconds:.0f}s" if item.eta_seconds is not None else "unknown"
+        logger.info(
+            "Queue %s pending=%d rate=%.1f/s eta=%s",
+            item.name,
+            item.pending,
+            item.drain_rate,
+            eta,
+        )
+    if not busy:
+        logger.info("No active queues")
+
+
 def _log_queues(logger, queues, only_active: bool) -> None:
     printed = False
     for queue in queues:
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Compare a local library with Immich by file content.
+
+This script hashes every image under the target directory with SHA-1 (reusing
+a persistent hash cache so unchanged files are not re-read) and joins the
+result against the checksums stored in a cache file (created by cache.py).
+Unlike the filename matching done by cache.py, renamed copies are found too.
+
+The CSV report lists:
+  - in_immich:   local files whose content is already in Immich
+  - renamed:     same content in Immich under a different filename
+  - local_only:  local files not in Immich
+  - immich_only: Immich assets with no local file of the same content
+  - no_checksum: Immich assets without a usable checksum
+
+It does NOT modify any files or Immich assets.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project src and COMMON to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root.parent / "COMMON" / "src"))
+
+from common.argument_parser import (
+    ScriptArgumentParser,
+    create_standard_arguments,
+    merge_arguments,
+)
+from common.hash_cache import HashCache
+from immich_cache import ImmichCache
+from checksum_index import ChecksumIndex, CrossLibraryReport
+
+
+SCRIPT_INFO = {
+    'name': 'Crosscheck',
+    'description': 'Compare local files with Immich assets by SHA-1 checksum',
+    'examples': [
+        '/mnt/photos',
+        '/mnt/photos --cache .log/cache_photos.json',
+        '--target /mnt/photos --output duplicates.csv --verbose'
+    ]
+}
+
+SCRIPT_ARGUMENTS = {
+    'target': {
+        'flag': '--target',
+        'positional': True,
+        'required': True,
+        'help': 'Root directory of local library to hash'
+    },
+    'cache': {
+        'flag': '--cache',
+        'help': 'Path to metadata cache file (default: .log/cache_{target_basename}.json)'
+    },
+    'hash_cache': {
+        'flag': '--hash-cache',
+        'help': 'Path to persistent hash cache (default: .log/hash_cache.json)'
+    },
+    'output': {
+        'flag': '--output',
+        'help': 'Report CSV path (default: .log/crosscheck_{target_basename}_{timestamp}.csv)'
+    }
+}
+
+ARGUMENTS = merge_arguments(create_standard_arguments(), SCRIPT_ARGUMENTS)
+
+
+def main():
+    """Main entry point."""
+    parser = ScriptArgumentParser(SCRIPT_INFO, ARGUMENTS)
+    parser.print_header()
+
+    args = parser.parse_args()
+
+    resolved_args = parser.validate_required_args(args, {
+        'target': ['target']
+    })
+
+    target_path = Path(resolved_args['target'])
+    if not target_path.exists():
+        parser.error(f"Target directory does not exist: {target_path}")
+
+    target_basename = target_path.name or "root"
+    cache_path = resolved_args.get('cache') or f".log/cache_{target_basename}.json"
+    hash_cache_path = resolved_args.get('hash_cache') or str(HashCache.DEFAULT_PATH)
+    output_path = resolved_args.get('output') or (
+        f".log/crosscheck_{target_basename}_"
+        f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.csv"
+    )
+    resolved_args['cache'] = cache_path
+    resolved_args['hash_cache'] = hash_cache_path
+    resolved_args['output'] = output_path
+
+    logger = parser.setup_logging(resolved_args, "crosscheck")
+    parser.display_configuration(resolved_args)
+
+    try:
+        if not Path(cache_path).exists():
+            raise FileNotFoundError(
+                f"Cache file not found: {cache_path} (run cache.py first)"
+            )
+
+        logger.info(f"Loading cache from {cache_path}...")
+        cache = ImmichCache(cache_path, logger)
+        cache.load()
+        cache_stats = cache.get_stats()
+        if cache_stats['checksums'] == 0:
+            logger.warning(
+                "Cache contains no asset checksums; re-run cache.py --clear "
+                "to refresh asset data"
+            )
+
+        with HashCache(hash_cache_path, logger) as hash_cache:
+            index = ChecksumIndex(str(target_path), hash_cache, logger).build()
+
+        report = CrossLibraryReport(cache, index, logger)
+        rows = report.build()
+        for row in rows:
+            if row['category'] in ('renamed', 'local_only', 'immich_only'):
+                logger.log(
+                    15,  # AUDIT level
+                    f"{row['category']}: {row['local_path'] or '-'} -> "
+                    f"{row['original_file_name'] or '-'} ({row['asset_id'] or 'none'})"
+                )
+
+        if not report.write_csv(output_path):
+            return 1
+
+        stats = report.stats
+        logger.info("\n" + "=" * 50)
+        logger.info("SUMMARY")
+        logger.info("=" * 50)
+        logger.info(f"Local files indexed: {index.stats['files']}")
+        logger.info(f"  Hashed: {index.stats['hashed']}")
+        logger.info(f"  From hash cache: {index.stats['cached']}")
+        logger.info(f"  Errors: {index.stats['errors']}")
+        logger.info(f"Immich assets in cache: {cache_stats['total_assets']}")
+        logger.info(f"Already in Immich: {stats['in_immich']}")
+        logger.info(f"In Immich under a different name: {stats['renamed']}")
+        logger.info(f"Local only: {stats['local_only']}")
+        logger.info(f"Immich only: {stats['immich_only']}")
+        logger.info(f"Immich assets without checksum: {stats['no_checksum']}")
+        logger.info(f"Local duplicate groups: {stats['local_duplicate_groups']}")
+        logger.info(f"Immich duplicate groups: {stats['immich_duplicate_groups']}")
+        logger.info(f"\nReport saved to: {output_path}")
+
+        if not resolved_args.get('quiet'):
+            print(f"✅ Report written: {output_path}")
+            print(
+                f"   {stats['in_immich']} in Immich, {stats['renamed']} renamed, "
+                f"{stats['local_only']} local only, {stats['immich_only']} Immich only"
+            )
+        return 0
+
+    except Exception as e:
+        logger.error(f"Error during crosscheck: {e}")
+        if not resolved_args.get('quiet'):
+            print(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,10 +9,14 @@ for cleaning up Immich after files have been renamed or reorganized on disk.
 WARNING: This permanently deletes assets from Immich. Use --dry-run first!
 """
 
+import hashlib
+import json
 import os
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 # Add project src and COMMON to path
 project_root = Path(__file__).parent.parent
@@ -36,7 +40,8 @@ SCRIPT_INFO = {
     'examples': [
         '.log/cache_santee-samples.json',
         '--input cache.json --dry-run',
-        'cache.json --force --verbose'
+        'cache.json --force --verbose',
+        'cache.json --workers 8 --batch-size 200'
     ]
 }
 
@@ -51,6 +56,22 @@ SCRIPT_ARGUMENTS = {
         'flag': '--force',
         'action': 'store_true',
         'help': 'Permanently delete (skip trash). Default: move to trash'
+    },
+    'workers': {
+        'flag': '--workers',
+        'type': int,
+        'default': 4,
+        'help': 'Concurrent DELETE requests (default: 4)'
+    },
+    'batch_size': {
+        'flag': '--batch-size',
+        'type': int,
+        'default': 100,
+        'help': 'Initial assets per request; adapts to server latency (default: 100)'
+    },
+    'checkpoint': {
+        'flag': '--checkpoint',
+        'help': 'Resume file for interrupted runs (default: .log/delete_unmatched_{cache hash}.jsonl)'
     }
 }
 
@@ -58,9 +79,29 @@ ARGUMENTS = merge_arguments(create_standard_arguments(), SCRIPT_ARGUMENTS)
 
 
 class AssetDeleter:
-    """Handles deletion of Immich assets."""
+    """
+    Handles deletion of Immich assets.
+    
+    Batches are sent by a small thread pool so several DELETE requests are in
+    flight at once, and the batch size adapts so each request takes about
+    target_seconds. Completed batches are appended to a checkpoint file; a
+    later run with the same checkpoint skips them, so an interrupted purge
+    resumes where it stopped.
+    """
     
-    def __init__(self, connection: ImmichConnection, dry_run: bool = False, logger=None):
+    MIN_BATCH_SIZE = 10
+    MAX_BATCH_SIZE = 1000
+    
+    def __init__(
+        self,
+        connection: ImmichConnection,
+        dry_run: bool = False,
+        logger=None,
+        max_workers: int = 4,
+        batch_size: int = 100,
+        target_seconds: float = 2.0,
+        checkpoint_path: Optional[str] = None
+    ):
         """
         Initialize asset deleter.
         
@@ -68,10 +109,71 @@ class AssetDeleter:
             connection: ImmichConnection instance
             dry_run: If True, simulate deletions without actually deleting
             logger: Logger instance
+            max_workers: Number of concurrent DELETE requests
+            batch_size: Initial number of assets per request
+            target_seconds: Request duration the batch size is tuned towards
+            checkpoint_path: File recording deleted batches (None disables resume)
         """
         self.connection = connection
         self.dry_run = dry_run
         self.logger = logger
+        self.max_workers = max(1, max_workers)
+        self.batch_size = min(max(batch_size, self.MIN_BATCH_SIZE), self.MAX_BATCH_SIZE)
+        self.target_seconds = target_seconds
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+    
+    def load_checkpoint(self, force: bool) -> Set[str]:
+        """
+        Read asset IDs already deleted by an earlier, interrupted run.
+        
+        Args:
+            force: Deletion mode of this run; a checkpoint from the other mode is ignored
+            
+        Returns:
+            Set of deleted asset IDs
+        """
+        done: Set[str] = set()
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return done
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by the interruption
+                    continue
+                if record.get('force') == force:
+                    done.update(record.get('ids', []))
+        return done
+    
+    def _record_batch(self, batch: List[str], force: bool):
+        if not self.checkpoint_path:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'force': force, 'ids': batch}) + "\n")
+            f.flush()
+    
+    def _delete_batch(self, batch: List[str], force: bool) -> Tuple[bool, float]:
+        start = time.monotonic()
+        try:
+            success = self.connection.delete_assets(batch, force=force)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error deleting batch: {e}")
+            success = False
+        return success, time.monotonic() - start
+    
+    def _adapt_batch_size(self, size: int, elapsed: float, success: bool):
+        """Scale the next batch towards target_seconds (at most 2x per step); halve on failure."""
+        if not success:
+            new_size = self.batch_size // 2
+        elif elapsed <= 0:
+            new_size = self.batch_size * 2
+        else:
+            scale = min(2.0, max(0.5, self.target_seconds / elapsed))
+            new_size = int(size * scale)
+        self.batch_size = min(max(new_size, self.MIN_BATCH_SIZE), self.MAX_BATCH_SIZE)
     
     def delete_assets(self, asset_ids: List[str], force: bool = False) -> Dict[str, int]:
         """
@@ -82,46 +184,63 @@ class AssetDeleter:
             force: If True, permanently delete (bypass trash)
             
         Returns:
-            Dictionary with deletion statistics
+            Dictionary with deletion statistics ('deleted', 'failed', 'resumed')
         """
         if not asset_ids:
-            return {'deleted': 0, 'failed': 0}
+            return {'deleted': 0, 'failed': 0, 'resumed': 0}
         
-        deleted = 0
-        failed = 0
-        
-        # Process in batches of 100
-        batch_size = 100
-        for i in range(0, len(asset_ids), batch_size):
-            batch = asset_ids[i:i + batch_size]
-            
-            if self.dry_run:
+        if self.dry_run:
+            for i in range(0, len(asset_ids), self.batch_size):
+                batch = asset_ids[i:i + self.batch_size]
                 if self.logger:
                     self.logger.info(
                         f"[DRY RUN] Would delete {len(batch)} assets "
                         f"(force={force}): {batch[:3]}..."
                     )
-                deleted += len(batch)
-                continue
-            
-            try:
-                # Delete assets via API
-                success = self.connection.delete_assets(batch, force=force)
-                if success:
-                    deleted += len(batch)
-                    if self.logger:
-                        action = "Permanently deleted" if force else "Moved to trash"
-                        self.logger.info(f"{action} {len(batch)} assets")
-                else:
-                    failed += len(batch)
-                    if self.logger:
-                        self.logger.warning(f"Failed to delete batch of {len(batch)} assets")
-            except Exception as e:
-                failed += len(batch)
-                if self.logger:
-                    self.logger.error(f"Error deleting batch: {e}")
+            return {'deleted': len(asset_ids), 'failed': 0, 'resumed': 0}
+        
+        done = self.load_checkpoint(force)
+        pending = [asset_id for asset_id in asset_ids if asset_id not in done]
+        resumed = len(asset_ids) - len(pending)
+        if resumed and self.logger:
+            self.logger.info(f"Resuming: {resumed} assets already deleted per {self.checkpoint_path}")
         
-        return {'deleted': deleted, 'failed': failed}
+        deleted = 0
+        failed = 0
+        position = 0
+        action = "Permanently deleted" if force else "Moved to trash"
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while position < len(pending) or in_flight:
+                # Keep max_workers requests in flight, sized by the latest estimate
+                while position < len(pending) and len(in_flight) < self.max_workers:
+                    batch = pending[position:position + self.batch_size]
+                    position += len(batch)
+                    in_flight[executor.submit(self._delete_batch, batch, force)] = batch
+                
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch = in_flight.pop(future)
+                    success, elapsed = future.result()
+                    self._adapt_batch_size(len(batch), elapsed, success)
+                    if success:
+                        self._record_batch(batch, force)
+                        deleted += len(batch)
+                        if self.logger:
+                            self.logger.info(
+                                f"{action} {len(batch)} assets in {elapsed:.2f}s "
+                                f"({deleted + resumed}/{len(asset_ids)}, next batch {self.batch_size})"
+                            )
+                    else:
+                        failed += len(batch)
+                        if self.logger:
+                            self.logger.warning(f"Failed to delete batch of {len(batch)} assets")
+        
+        if failed == 0 and self.checkpoint_path and self.checkpoint_path.exists():
+            # Everything is deleted; a later purge starts from scratch
+            self.checkpoint_path.unlink()
+        
+        return {'deleted': deleted, 'failed': failed, 'resumed': resumed}
 
 
 def main():
@@ -176,12 +295,8 @@ def main():
         logger.info(f"Matched files: {stats['matched_files']}")
         logger.info(f"Unmatched: {stats['unmatched_files']}")
         
-        # Find unmatched assets
-        unmatched_ids = []
-        for asset_id, asset_data in cache.assets.items():
-            file_mapping = asset_data.get('file_mapping', {})
-            if file_mapping.get('match_confidence') == 'none':
-                unmatched_ids.append(asset_id)
+        # Find unmatched assets via the match confidence index
+        unmatched_ids = cache.find_ids_by_confidence('none')
         
         if not unmatched_ids:
             logger.info("No unmatched assets found in cache")
@@ -214,12 +329,24 @@ def main():
         
         # Delete assets
         logger.info("Deleting unmatched assets...")
-        deleter = AssetDeleter(connection, resolved_args.get('dry_run', False), logger)
+        checkpoint = resolved_args.get('checkpoint')
+        if not checkpoint:
+            cache_hash = hashlib.md5(str(cache_file.resolve()).encode()).hexdigest()[:12]
+            checkpoint = f".log/delete_unmatched_{cache_hash}.jsonl"
+        deleter = AssetDeleter(
+            connection,
+            resolved_args.get('dry_run', False),
+            logger,
+            max_workers=resolved_args.get('workers') or 4,
+            batch_size=resolved_args.get('batch_size') or 100,
+            checkpoint_path=checkpoint
+        )
         results = deleter.delete_assets(unmatched_ids, resolved_args.get('force', False))
         
         # Report results
         logger.info(
-            f"Deletion complete: {results['deleted']} deleted, {results['failed']} failed"
+            f"Deletion complete: {results['deleted']} deleted, {results['failed']} failed, "
+            f"{results['resumed']} deleted by an earlier run"
         )
         
         if not resolved_args.get('quiet'):
@@ -228,8 +355,10 @@ def main():
             else:
                 action = "Permanently deleted" if resolved_args.get('force') else "Moved to trash"
                 print(f"✅ {action} {results['deleted']} assets")
+                if results['resumed'] > 0:
+                    print(f"   ({results['resumed']} more in an earlier, interrupted run)")
                 if results['failed'] > 0:
-                    print(f"⚠️  {results['failed']} assets failed to delete")
+                    print(f"⚠️  {results['failed']} assets failed to delete (rerun to retry)")
         
     except Exception as e:
         logger.error(f"Error during deletion: {e}")
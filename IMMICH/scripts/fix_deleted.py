@@ -65,6 +65,7 @@ def main():
     # Display configuration
     parser.display_configuration(vars(args))
     
+    db = None
     try:
         # Load configuration
         logger.info("Loading Immich configuration...")
@@ -186,6 +187,10 @@ def main():
         if not args.quiet:
             print(f"❌ Error: {e}")
         return 1
+    finally:
+        # Ends the psql session and the shared SSH master connection
+        if db is not None:
+            db.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Convert a metadata cache between storage formats.
+
+The format is chosen by file extension: .json for the whole-file JSON cache,
+.db/.sqlite/.sqlite3 for the SQLite cache. Converting an existing JSON cache
+to SQLite lets cache.py save incrementally instead of rewriting the file.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project src and COMMON to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root.parent / "COMMON" / "src"))
+
+from common.argument_parser import (
+    ScriptArgumentParser,
+    create_standard_arguments,
+    merge_arguments,
+)
+from immich_cache import ImmichCache
+
+
+SCRIPT_INFO = {
+    'name': 'Migrate Cache',
+    'description': 'Convert a metadata cache between JSON and SQLite storage',
+    'examples': [
+        '.log/cache_photos.json .log/cache_photos.db',
+        '--input .log/cache_photos.db --output export.json'
+    ]
+}
+
+SCRIPT_ARGUMENTS = {
+    'input': {
+        'flag': '--input',
+        'positional': True,
+        'required': True,
+        'help': 'Existing cache file (created by cache.py)'
+    },
+    'output': {
+        'flag': '--output',
+        'positional': True,
+        'required': True,
+        'help': 'New cache file; .db/.sqlite/.sqlite3 for SQLite, otherwise JSON'
+    }
+}
+
+ARGUMENTS = merge_arguments(create_standard_arguments(), SCRIPT_ARGUMENTS)
+
+
+def main():
+    """Main entry point."""
+    parser = ScriptArgumentParser(SCRIPT_INFO, ARGUMENTS)
+    parser.print_header()
+
+    args = parser.parse_args()
+
+    resolved_args = parser.validate_required_args(args, {
+        'input': ['input'],
+        'output': ['output']
+    })
+
+    logger = parser.setup_logging(resolved_args, "migrate_cache")
+    parser.display_configuration(resolved_args)
+
+    input_path = Path(resolved_args['input'])
+    output_path = Path(resolved_args['output'])
+    if not input_path.exists():
+        parser.error(f"Cache file not found: {input_path}")
+    if output_path.exists():
+        parser.error(f"Output file already exists: {output_path}")
+
+    if resolved_args.get('dry_run'):
+        logger.info(f"[DRY RUN] Would migrate {input_path} -> {output_path}")
+        return 0
+
+    try:
+        count = ImmichCache.migrate(str(input_path), str(output_path), logger)
+        logger.info(f"Migrated {count} assets to {output_path}")
+        if not resolved_args.get('quiet'):
+            print(f"✅ Migrated {count} assets: {input_path} -> {output_path}")
+        return 0
+    except Exception as e:
+        logger.error(f"Error migrating cache: {e}")
+        if not resolved_args.get('quiet'):
+            print(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -24,6 +24,7 @@ from common.argument_parser import (
 )
 from immich_config import ImmichConfig
 from immich_connection import ImmichConnection
+from queue_checker import QueueChecker
 
 
 SCRIPT_INFO = {
@@ -33,7 +34,9 @@ SCRIPT_INFO = {
         '--list-libraries',
         '59d97602-42a2-4828-95cf-4eae903d8211',
         '--library library_id_here',
-        'library_id --verbose'
+        'library_id --verbose',
+        'library_id --wait-idle',
+        'library_id --wait-idle --timeout 3600'
     ]
 }
 
@@ -48,9 +51,23 @@ SCRIPT_ARGUMENTS = {
         'flag': '--list-libraries',
         'action': 'store_true',
         'help': 'List all available libraries and their IDs'
+    },
+    'wait_idle': {
+        'flag': '--wait-idle',
+        'action': 'store_true',
+        'help': 'Wait until Immich has finished processing the scan (all queues idle)'
+    },
+    'timeout': {
+        'flag': '--timeout',
+        'type': int,
+        'help': 'With --wait-idle, give up after N seconds (exit code 2)'
     }
 }
 
+# Seconds to wait for the scan's jobs to show up in the queues before idle
+# queues are taken to mean the scan has been processed
+SCAN_START_GRACE = 30
+
 ARGUMENTS = merge_arguments(create_standard_arguments(), SCRIPT_ARGUMENTS)
 
 
@@ -138,7 +155,25 @@ def main():
             logger.info(f"Library scan triggered successfully for {library_id}")
             if not args.quiet:
                 print(f"✅ Library scan started for {library_id}")
-                print("   Note: Scanning happens in background. Check Immich UI for progress.")
+                if not args.wait_idle:
+                    print("   Note: Scanning happens in background. Check Immich UI for progress.")
+            
+            if args.wait_idle:
+                logger.info("Waiting for Immich queues to become idle...")
+                overview = QueueChecker(connection, logger).wait_until_idle(
+                    timeout=args.timeout,
+                    start_grace=SCAN_START_GRACE,
+                    on_progress=lambda overview, progress: logger.info(
+                        "Pending jobs: %d", sum(p.pending for p in progress)
+                    )
+                )
+                if not overview.is_idle:
+                    logger.warning("Queues did not become idle; the scan may still be running")
+                    if not args.quiet:
+                        print("⚠️  Library scan still processing - queues not idle")
+                    return 2
+                if not args.quiet:
+                    print("✅ Library scan processed - all queues idle")
         else:
             logger.error(f"Failed to trigger library scan for {library_id}")
             if not args.quiet:
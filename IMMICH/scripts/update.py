@@ -10,6 +10,8 @@ Key features:
 - Uses ScriptArgumentParser for standardized argument handling
 - Uses ScriptLogging for consistent console and file logging
 - Processes selected CSV rows and applies EXIF updates and file moves
+- With --immich, pushes dates, descriptions and tags straight to Immich
+  through its bulk API instead (no file rewrites, no rescan needed)
 """
 
 import sys
@@ -27,6 +29,10 @@ from common.argument_parser import (
 )
 
 from image_updater import ImageUpdater
+from immich_cache import ImmichCache
+from immich_config import ImmichConfig
+from immich_connection import ImmichConnection
+from metadata_pusher import MetadataPusher
 
 
 SCRIPT_INFO = {
@@ -36,6 +42,8 @@ SCRIPT_INFO = {
         ".log/analyze_2025-01-01_1200.csv",
         "--input .log/analyze_2025-01-01_1200.csv --dry-run",
         "--last --dry-run",
+        "--last --immich --cache .log/cache_photos.json",
+        "--input .log/analyze_2025-01-01_1200.csv --undo",
     ],
 }
 
@@ -60,6 +68,25 @@ SCRIPT_ARGUMENTS = {
         "action": "store_true",
         "help": "Force update of calculated values regardless of status",
     },
+    "immich": {
+        "flag": "--immich",
+        "action": "store_true",
+        "help": "Push date, description and tags to Immich via its API instead of rewriting files",
+    },
+    "cache": {
+        "flag": "--cache",
+        "help": "Cache file from cache.py mapping files to Immich assets (required with --immich)",
+    },
+    "workers": {
+        "flag": "--workers",
+        "type": int,
+        "help": "Concurrent workers (default: 4-8 based on CPU count)",
+    },
+    "undo": {
+        "flag": "--undo",
+        "action": "store_true",
+        "help": "Reverse the renames/moves journaled for this CSV (<csv>.moves.jsonl)",
+    },
 }
 
 ARGUMENTS = merge_arguments(create_standard_arguments(), SCRIPT_ARGUMENTS)
@@ -69,7 +96,7 @@ def _find_latest_analyze_csv(log_dir: Path) -> Path | None:
     if not log_dir.exists():
         return None
 
-    candidates = list(log_dir.glob("analyze_*.csv"))
+    candidates = list(log_dir.glob("analyze_*.csv")) + list(log_dir.glob("analyze_*.parquet"))
     if not candidates:
         return None
 
@@ -109,6 +136,9 @@ def main() -> int:
         "last": "Use latest CSV",
         "all": "Process all rows",
         "force": "Force update",
+        "immich": "Push to Immich API",
+        "cache": "Cache file",
+        "undo": "Undo moves",
         "dry_run": "Dry run",
     }
     for arg_key, display_label in config_map.items():
@@ -118,6 +148,12 @@ def main() -> int:
     if resolved_args.get("dry_run"):
         logger.info("Mode: DRY RUN (simulation only)")
 
+    if resolved_args.get("immich"):
+        return _push_to_immich(resolved_args, input_value, logger)
+
+    if resolved_args.get("undo"):
+        return _undo_moves(resolved_args, input_value, logger)
+
     try:
         updater = ImageUpdater(
             csv_path=input_value,
@@ -125,6 +161,7 @@ def main() -> int:
             dry_run=resolved_args.get("dry_run", False),
             all_rows=resolved_args.get("all", False),
             force=resolved_args.get("force", False),
+            max_workers=resolved_args.get("workers"),
         )
         stats = updater.process()
     except Exception as exc:
@@ -133,7 +170,7 @@ def main() -> int:
 
     logger.info(
         "Update complete. Total=%d Selected=%d EXIF Updated=%d Renamed=%d Moved=%d "
-        "Sidecar Renamed=%d Sidecar Moved=%d Sidecar Errors=%d Errors=%d",
+        "Sidecar Renamed=%d Sidecar Moved=%d Sidecar Errors=%d Conflicts=%d Resumed=%d Errors=%d",
         stats.get("rows_total", 0),
         stats.get("rows_selected", 0),
         stats.get("exif_updated", 0),
@@ -142,6 +179,8 @@ def main() -> int:
         stats.get("sidecar_renamed", 0),
         stats.get("sidecar_moved", 0),
         stats.get("sidecar_errors", 0),
+        stats.get("move_conflicts", 0),
+        stats.get("resumed", 0),
         stats.get("errors", 0),
     )
 
@@ -154,5 +193,77 @@ def main() -> int:
     return 0
 
 
+def _undo_moves(resolved_args, input_value: str, logger) -> int:
+    """Reverse the journaled renames/moves of an earlier update of this CSV (--undo)."""
+    updater = ImageUpdater(
+        csv_path=input_value,
+        logger=logger,
+        dry_run=resolved_args.get("dry_run", False),
+    )
+    if not updater.journal.path.exists():
+        logger.error(f"No move journal found: {updater.journal.path}")
+        return 1
+
+    result = updater.undo_moves()
+    logger.info(
+        "Undo complete. Restored=%d Skipped=%d Errors=%d",
+        result["restored"],
+        result["skipped"],
+        result["errors"],
+    )
+    return 1 if result["errors"] else 0
+
+
+def _push_to_immich(resolved_args, input_value: str, logger) -> int:
+    """Apply the CSV through the Immich API (--immich)."""
+    cache_path = resolved_args.get("cache")
+    if not cache_path or not Path(cache_path).exists():
+        logger.error("--immich requires --cache with an existing cache file (see cache.py)")
+        return 1
+
+    try:
+        config = ImmichConfig()
+        connection = ImmichConnection(config.immich_url, config.immich_api_key, logger)
+        if not connection.validate_connection():
+            logger.error("Failed to connect to Immich server")
+            return 1
+
+        cache = ImmichCache(cache_path, logger)
+        if not cache.load():
+            logger.error(f"Could not load cache {cache_path}")
+            return 1
+
+        pusher = MetadataPusher(
+            csv_path=input_value,
+            connection=connection,
+            cache=cache,
+            logger=logger,
+            dry_run=resolved_args.get("dry_run", False),
+            all_rows=resolved_args.get("all", False),
+            force=resolved_args.get("force", False),
+            max_workers=resolved_args.get("workers"),
+        )
+        stats = pusher.process()
+    except Exception as exc:
+        logger.error(f"Update failed: {exc}")
+        return 1
+
+    logger.info(
+        "Immich update complete. Total=%d Selected=%d Assets Updated=%d Tags Applied=%d "
+        "Not In Cache=%d Requests=%d Errors=%d",
+        stats.get("rows_total", 0),
+        stats.get("rows_selected", 0),
+        stats.get("assets_updated", 0),
+        stats.get("tags_applied", 0),
+        stats.get("not_in_cache", 0),
+        stats.get("requests", 0),
+        stats.get("errors", 0),
+    )
+    for line in connection.http.format_latency_report():
+        logger.info(f"HTTP {line}")
+
+    return 1 if stats.get("errors", 0) else 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,462 @@
+"""Storage backends for the Immich metadata cache.
+
+The JSON backend keeps the whole cache in memory and rewrites the file on
+save. The SQLite backend keeps assets as rows with indexed lookup tables:
+entries are read on demand, writes are upserted inside a transaction that is
+committed on save, and the indices are answered by SQL queries.
+
+The backend is chosen from the cache file extension (see create_storage).
+"""
+
+import base64
+import binascii
+import json
+import logging
+import sqlite3
+import sys
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Add COMMON/src to sys.path for robust import
+common_src = Path(__file__).resolve().parents[2] / "COMMON" / "src"
+if str(common_src) not in sys.path:
+    sys.path.insert(0, str(common_src))
+from common.json_stream import iter_json_members
+
+
+SQLITE_EXTENSIONS = {".db", ".sqlite", ".sqlite3"}
+
+INDEX_NAMES = ("by_filename", "by_path", "by_album", "by_tag", "by_checksum", "by_confidence")
+
+
+def normalize_checksum(checksum: Optional[str]) -> Optional[str]:
+    """
+    Normalize an Immich asset checksum to a lowercase SHA-1 hex digest.
+
+    Immich returns the SHA-1 of the original file base64-encoded; hex digests
+    are accepted as well so local hashes and API values compare directly.
+
+    Args:
+        checksum: Base64 or hex encoded SHA-1
+
+    Returns:
+        40-character hex digest, or None if the value is not a SHA-1
+    """
+    if not checksum or not isinstance(checksum, str):
+        return None
+    value = checksum.strip()
+    if len(value) == 40:
+        try:
+            int(value, 16)
+            return value.lower()
+        except ValueError:
+            pass
+    try:
+        raw = base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    return raw.hex() if len(raw) == 20 else None
+
+
+def asset_index_keys(asset_entry: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Return the index keys an asset entry is filed under.
+
+    Args:
+        asset_entry: Asset entry with immich_data and file_mapping
+
+    Returns:
+        Dictionary of index name to list of keys (by_path excluded)
+    """
+    immich_data = asset_entry.get("immich_data", {})
+
+    tag_names = []
+    tags = immich_data.get("tags", [])
+    if isinstance(tags, list):
+        for tag in tags:
+            # Handle both string tags and dict tags
+            tag_name = tag if isinstance(tag, str) else tag.get("name", "")
+            if tag_name:
+                tag_names.append(tag_name)
+
+    filename = immich_data.get("originalFileName", "")
+    checksum = normalize_checksum(immich_data.get("checksum"))
+    confidence = asset_entry.get("file_mapping", {}).get("match_confidence")
+    return {
+        "by_filename": [filename] if filename else [],
+        "by_album": list(immich_data.get("albums", [])),
+        "by_tag": tag_names,
+        "by_checksum": [checksum] if checksum else [],
+        "by_confidence": [confidence] if confidence else [],
+    }
+
+
+def create_storage(cache_path: Path, logger: Optional[logging.Logger] = None):
+    """
+    Create the storage backend for a cache file based on its extension.
+
+    Args:
+        cache_path: Cache file path (.db/.sqlite/.sqlite3 for SQLite, else JSON)
+        logger: Optional logger instance
+
+    Returns:
+        JsonCacheStorage or SqliteCacheStorage
+    """
+    if Path(cache_path).suffix.lower() in SQLITE_EXTENSIONS:
+        return SqliteCacheStorage(cache_path, logger)
+    return JsonCacheStorage(cache_path, logger)
+
+
+class JsonCacheStorage:
+    """Whole-file JSON storage; assets and indices live in memory."""
+
+    # Indices are built in memory by ImmichCache
+    lazy = False
+
+    def __init__(self, cache_path: Path, logger: Optional[logging.Logger] = None):
+        """
+        Initialize JSON storage.
+
+        Args:
+            cache_path: Path to cache JSON file
+            logger: Optional logger instance
+        """
+        self.cache_path = Path(cache_path)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def exists(self) -> bool:
+        return self.cache_path.exists()
+
+    def load(
+        self, on_asset: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Read the cache file, streaming assets one at a time.
+
+        Args:
+            on_asset: Called with (asset_id, entry) as each asset is read,
+                so indices can be built without a second pass
+
+        Returns:
+            (metadata or None, assets dictionary)
+        """
+        metadata = None
+        assets: Dict[str, Dict[str, Any]] = {}
+        with open(self.cache_path, 'r', encoding='utf-8') as f:
+            for key, asset_id, value in iter_json_members(f, stream=("assets",)):
+                if key == "metadata":
+                    metadata = value
+                elif key == "assets" and asset_id is not None:
+                    assets[asset_id] = value
+                    if on_asset:
+                        on_asset(asset_id, value)
+        return metadata, assets
+
+    def save(self, metadata: Dict[str, Any], assets: Dict[str, Dict[str, Any]]):
+        """
+        Rewrite the cache file.
+
+        Args:
+            metadata: Cache metadata
+            assets: All asset entries
+        """
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Prepare data (no indices in saved file)
+        data = {
+            "metadata": metadata,
+            "assets": assets
+        }
+
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def clear(self):
+        """Nothing to do; the file is rewritten on the next save."""
+
+    def close(self):
+        """Nothing to release."""
+
+
+class SqliteCacheStorage:
+    """SQLite storage with indexed lookup tables and on-demand asset reads."""
+
+    # Assets and indices are views over the database
+    lazy = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS assets (
+            id TEXT PRIMARY KEY,
+            filename TEXT,
+            matched_path TEXT,
+            checksum TEXT,
+            match_confidence TEXT,
+            immich_data TEXT NOT NULL,
+            file_mapping TEXT NOT NULL,
+            updated_seq INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_assets_filename ON assets(filename);
+        CREATE INDEX IF NOT EXISTS idx_assets_matched_path ON assets(matched_path);
+        CREATE INDEX IF NOT EXISTS idx_assets_checksum ON assets(checksum);
+        CREATE INDEX IF NOT EXISTS idx_assets_match_confidence ON assets(match_confidence);
+        CREATE INDEX IF NOT EXISTS idx_assets_updated_seq ON assets(updated_seq);
+        CREATE TABLE IF NOT EXISTS asset_albums (
+            asset_id TEXT NOT NULL,
+            album_id TEXT NOT NULL,
+            UNIQUE (album_id, asset_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_asset_albums_asset ON asset_albums(asset_id);
+        CREATE TABLE IF NOT EXISTS asset_tags (
+            asset_id TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            UNIQUE (tag, asset_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_asset_tags_asset ON asset_tags(asset_id);
+    """
+
+    def __init__(self, cache_path: Path, logger: Optional[logging.Logger] = None):
+        """
+        Initialize SQLite storage. The database is opened on first use.
+
+        Args:
+            cache_path: Path to SQLite database file
+            logger: Optional logger instance
+        """
+        self.cache_path = Path(cache_path)
+        self.logger = logger or logging.getLogger(__name__)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database (creating the schema) on first access."""
+        if self._conn is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._add_missing_columns(self._conn)
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection):
+        """Add match_confidence/updated_seq to databases created before they existed."""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(assets)")]
+        if columns and "match_confidence" not in columns:
+            conn.execute("ALTER TABLE assets ADD COLUMN match_confidence TEXT")
+            conn.execute(
+                "UPDATE assets SET match_confidence = "
+                "json_extract(file_mapping, '$.match_confidence')"
+            )
+        if columns and "updated_seq" not in columns:
+            conn.execute("ALTER TABLE assets ADD COLUMN updated_seq INTEGER NOT NULL DEFAULT 0")
+            conn.execute("UPDATE assets SET updated_seq = rowid")
+
+    def exists(self) -> bool:
+        return self.cache_path.exists()
+
+    def assets_view(self) -> "SqliteAssetMap":
+        return SqliteAssetMap(self)
+
+    def index_views(self) -> Dict[str, "SqliteIndex"]:
+        return {name: SqliteIndex(self, name) for name in INDEX_NAMES}
+
+    def load(self, on_asset=None) -> Tuple[Optional[Dict[str, Any]], "SqliteAssetMap"]:
+        """
+        Read cache metadata; assets are read on demand (on_asset is unused).
+
+        Returns:
+            (metadata or None, lazy asset mapping)
+        """
+        rows = self.conn.execute("SELECT key, value FROM metadata").fetchall()
+        metadata = {key: json.loads(value) for key, value in rows} or None
+        return metadata, self.assets_view()
+
+    def save(self, metadata: Dict[str, Any], assets=None):
+        """
+        Write metadata and commit all pending asset upserts.
+
+        Args:
+            metadata: Cache metadata
+            assets: Unused; asset writes are already in the transaction
+        """
+        self.conn.executemany(
+            "INSERT INTO metadata (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, json.dumps(value)) for key, value in metadata.items()]
+        )
+        self.conn.commit()
+
+    def clear(self):
+        """Delete all rows (committed on the next save)."""
+        for table in ("metadata", "assets", "asset_albums", "asset_tags"):
+            self.conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        """Roll back uncommitted writes and close the database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def upsert(self, asset_id: str, asset_entry: Dict[str, Any]):
+        """
+        Insert or replace one asset and its album/tag rows.
+
+        Every upsert takes the next updated_seq, which orders assets by when
+        they were last stored (an update keeps the row's original rowid).
+        """
+        immich_data = asset_entry.get("immich_data", {})
+        file_mapping = asset_entry.get("file_mapping", {})
+        keys = asset_index_keys(asset_entry)
+        conn = self.conn
+        conn.execute(
+            "INSERT INTO assets (id, filename, matched_path, checksum, match_confidence, "
+            "immich_data, file_mapping, updated_seq) VALUES (?, ?, ?, ?, ?, ?, ?, "
+            "(SELECT COALESCE(MAX(updated_seq), 0) + 1 FROM assets)) "
+            "ON CONFLICT(id) DO UPDATE SET filename = excluded.filename, "
+            "matched_path = excluded.matched_path, checksum = excluded.checksum, "
+            "match_confidence = excluded.match_confidence, "
+            "immich_data = excluded.immich_data, file_mapping = excluded.file_mapping, "
+            "updated_seq = excluded.updated_seq",
+            (
+                asset_id,
+                immich_data.get("originalFileName") or None,
+                file_mapping.get("matched_path") or None,
+                (keys["by_checksum"] or [None])[0],
+                (keys["by_confidence"] or [None])[0],
+                json.dumps(immich_data, ensure_ascii=False),
+                json.dumps(file_mapping, ensure_ascii=False),
+            )
+        )
+        conn.execute("DELETE FROM asset_albums WHERE asset_id = ?", (asset_id,))
+        conn.execute("DELETE FROM asset_tags WHERE asset_id = ?", (asset_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO asset_albums (asset_id, album_id) VALUES (?, ?)",
+            [(asset_id, album_id) for album_id in keys["by_album"]]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO asset_tags (asset_id, tag) VALUES (?, ?)",
+            [(asset_id, tag) for tag in keys["by_tag"]]
+        )
+
+    def delete(self, asset_id: str) -> bool:
+        """Delete one asset and its album/tag rows."""
+        conn = self.conn
+        cursor = conn.execute("DELETE FROM assets WHERE id = ?", (asset_id,))
+        conn.execute("DELETE FROM asset_albums WHERE asset_id = ?", (asset_id,))
+        conn.execute("DELETE FROM asset_tags WHERE asset_id = ?", (asset_id,))
+        return cursor.rowcount > 0
+
+
+def _entry_from_row(immich_data: str, file_mapping: str) -> Dict[str, Any]:
+    return {
+        "immich_data": json.loads(immich_data),
+        "file_mapping": json.loads(file_mapping),
+    }
+
+
+class SqliteAssetMap(MutableMapping):
+    """Dictionary-like view of the assets table (asset ID -> entry)."""
+
+    def __init__(self, storage: SqliteCacheStorage):
+        self.storage = storage
+
+    def __getitem__(self, asset_id: str) -> Dict[str, Any]:
+        row = self.storage.conn.execute(
+            "SELECT immich_data, file_mapping FROM assets WHERE id = ?", (asset_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(asset_id)
+        return _entry_from_row(*row)
+
+    def __setitem__(self, asset_id: str, asset_entry: Dict[str, Any]):
+        self.storage.upsert(asset_id, asset_entry)
+
+    def __delitem__(self, asset_id: str):
+        if not self.storage.delete(asset_id):
+            raise KeyError(asset_id)
+
+    def __contains__(self, asset_id) -> bool:
+        return self.storage.conn.execute(
+            "SELECT 1 FROM assets WHERE id = ?", (asset_id,)
+        ).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (asset_id,) in self.storage.conn.execute("SELECT id FROM assets ORDER BY rowid"):
+            yield asset_id
+
+    def __len__(self) -> int:
+        return self.storage.conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+    def items(self):
+        """Stream (asset ID, entry) pairs without a lookup per asset."""
+        cursor = self.storage.conn.execute(
+            "SELECT id, immich_data, file_mapping FROM assets ORDER BY rowid"
+        )
+        for asset_id, immich_data, file_mapping in cursor:
+            yield asset_id, _entry_from_row(immich_data, file_mapping)
+
+    def values(self):
+        for _, entry in self.items():
+            yield entry
+
+
+class SqliteIndex(Mapping):
+    """Read-only index view answered by SQL (key -> asset IDs)."""
+
+    # index name -> (table, key column, asset id column)
+    QUERIES = {
+        "by_filename": ("assets", "filename", "id"),
+        "by_path": ("assets", "matched_path", "id"),
+        "by_album": ("asset_albums", "album_id", "asset_id"),
+        "by_tag": ("asset_tags", "tag", "asset_id"),
+        "by_checksum": ("assets", "checksum", "id"),
+        "by_confidence": ("assets", "match_confidence", "id"),
+    }
+
+    def __init__(self, storage: SqliteCacheStorage, name: str):
+        self.storage = storage
+        self.name = name
+        self.table, self.column, self.id_column = self.QUERIES[name]
+
+    def __getitem__(self, key):
+        if self.name == "by_path":
+            # Path index maps to the most recently stored asset, like the JSON index
+            row = self.storage.conn.execute(
+                "SELECT id FROM assets WHERE matched_path = ? "
+                "ORDER BY updated_seq DESC LIMIT 1",
+                (key,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(key)
+            return row[0]
+
+        ids = [
+            asset_id for (asset_id,) in self.storage.conn.execute(
+                f"SELECT {self.id_column} FROM {self.table} "
+                f"WHERE {self.column} = ? ORDER BY rowid",
+                (key,)
+            )
+        ]
+        if not ids:
+            raise KeyError(key)
+        return ids
+
+    def __iter__(self):
+        cursor = self.storage.conn.execute(
+            f"SELECT DISTINCT {self.column} FROM {self.table} "
+            f"WHERE {self.column} IS NOT NULL"
+        )
+        for (key,) in cursor:
+            yield key
+
+    def __len__(self) -> int:
+        return self.storage.conn.execute(
+            f"SELECT COUNT(DISTINCT {self.column}) FROM {self.table}"
+        ).fetchone()[0]
@@ -0,0 +1,253 @@
+"""Content checksum index for joining local files against Immich assets."""
+
+import csv
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+# Add COMMON/src to sys.path for robust import
+common_src = Path(__file__).resolve().parents[2] / "COMMON" / "src"
+if str(common_src) not in sys.path:
+    sys.path.insert(0, str(common_src))
+from common.hash_cache import HashCache
+
+from file_matcher import FileMatcher
+from immich_cache import ImmichCache, normalize_checksum
+
+
+class ChecksumIndex:
+    """Index of local image files by SHA-1 of their content."""
+
+    def __init__(
+        self,
+        target_path: str,
+        hash_cache: Optional[HashCache] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize checksum index.
+
+        Args:
+            target_path: Root directory to hash
+            hash_cache: Persistent hash cache (in-memory cache if None)
+            logger: Optional logger instance
+        """
+        self.target_path = Path(target_path)
+        self.hash_cache = hash_cache if hash_cache is not None else HashCache()
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.by_checksum: Dict[str, List[str]] = {}
+        self.by_path: Dict[str, str] = {}
+        self.stats = {
+            'files': 0,
+            'hashed': 0,
+            'cached': 0,
+            'errors': 0
+        }
+
+    def build(self) -> 'ChecksumIndex':
+        """
+        Hash every image file under the target path.
+
+        Unchanged files are served from the hash cache, so only new or
+        modified files are read.
+
+        Returns:
+            self, for chaining
+        """
+        if not self.target_path.exists():
+            self.logger.warning(f"Target path does not exist: {self.target_path}")
+            return self
+
+        self.logger.info(f"Building checksum index for {self.target_path}...")
+        misses_before = self.hash_cache.stats['misses']
+
+        for root, dirs, files in os.walk(self.target_path):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() not in FileMatcher.IMAGE_EXTENSIONS:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    checksum = self.hash_cache.get_hash(path, "sha1")
+                except OSError as e:
+                    self.stats['errors'] += 1
+                    self.logger.warning(f"Cannot hash {path}: {e}")
+                    continue
+                self.add(path, checksum)
+
+                if self.stats['files'] % 1000 == 0:
+                    self.logger.debug(f"Hashed {self.stats['files']} files...")
+
+        self.stats['hashed'] = self.hash_cache.stats['misses'] - misses_before
+        self.stats['cached'] = self.stats['files'] - self.stats['hashed']
+        self.logger.info(
+            f"Indexed {self.stats['files']} files "
+            f"({len(self.by_checksum)} unique checksums, "
+            f"{self.stats['hashed']} hashed, {self.stats['cached']} from cache)"
+        )
+        return self
+
+    def add(self, path: str, checksum: str):
+        """
+        Add a file with a known checksum to the index.
+
+        Args:
+            path: File path
+            checksum: SHA-1 hex digest of the file content
+        """
+        self.by_checksum.setdefault(checksum, []).append(path)
+        self.by_path[path] = checksum
+        self.stats['files'] += 1
+
+    def find(self, checksum: str) -> List[str]:
+        """
+        Find local files by checksum.
+
+        Args:
+            checksum: SHA-1 of the content (hex or base64)
+
+        Returns:
+            List of matching file paths
+        """
+        return self.by_checksum.get(normalize_checksum(checksum), [])
+
+
+class CrossLibraryReport:
+    """Joins a local checksum index against cached Immich assets."""
+
+    CATEGORIES = (
+        'in_immich',       # local file content exists in Immich under the same name
+        'renamed',         # same content in Immich under a different name
+        'local_only',      # local file content not found in Immich
+        'immich_only',     # Immich asset with no local file of the same content
+        'no_checksum',     # Immich asset without a usable content checksum
+    )
+
+    FIELDNAMES = [
+        'category', 'checksum', 'local_path', 'asset_id',
+        'original_file_name', 'original_path', 'local_copies', 'immich_copies'
+    ]
+
+    def __init__(
+        self,
+        cache: ImmichCache,
+        index: ChecksumIndex,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize report.
+
+        Args:
+            cache: Loaded ImmichCache
+            index: Built ChecksumIndex for the local library
+            logger: Optional logger instance
+        """
+        self.cache = cache
+        self.index = index
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.rows: List[Dict[str, Any]] = []
+        self.stats = {category: 0 for category in self.CATEGORIES}
+        self.stats['local_duplicate_groups'] = 0
+        self.stats['immich_duplicate_groups'] = 0
+
+    def build(self) -> List[Dict[str, Any]]:
+        """
+        Join local files and Immich assets on checksum.
+
+        Returns:
+            Report rows (one per local file and per unmatched Immich asset)
+        """
+        self.rows = []
+        self.stats = {key: 0 for key in self.stats}
+
+        immich_by_checksum = self.cache.indices["by_checksum"]
+
+        for checksum, paths in self.index.by_checksum.items():
+            asset_ids = immich_by_checksum.get(checksum, [])
+            if len(paths) > 1:
+                self.stats['local_duplicate_groups'] += 1
+            if len(asset_ids) > 1:
+                self.stats['immich_duplicate_groups'] += 1
+
+            for path in paths:
+                if not asset_ids:
+                    self._add_row('local_only', checksum, path, None, len(paths), 0)
+                    continue
+
+                # Prefer an asset with the same filename when several match
+                name = os.path.basename(path)
+                assets = [self.cache.assets[aid] for aid in asset_ids]
+                same_name = [
+                    a for a in assets
+                    if a["immich_data"].get("originalFileName") == name
+                ]
+                category = 'in_immich' if same_name else 'renamed'
+                asset = (same_name or assets)[0]
+                self._add_row(
+                    category, checksum, path, asset, len(paths), len(asset_ids)
+                )
+
+        for asset_id, asset in self.cache.assets.items():
+            checksum = normalize_checksum(asset["immich_data"].get("checksum"))
+            if not checksum:
+                self._add_row('no_checksum', '', '', asset, 0, 0)
+            elif checksum not in self.index.by_checksum:
+                copies = len(immich_by_checksum.get(checksum, []))
+                self._add_row('immich_only', checksum, '', asset, 0, copies)
+
+        self.logger.info(
+            "Cross-library report: " + ", ".join(
+                f"{category}={self.stats[category]}" for category in self.CATEGORIES
+            )
+        )
+        return self.rows
+
+    def _add_row(
+        self,
+        category: str,
+        checksum: str,
+        local_path: str,
+        asset: Optional[Dict[str, Any]],
+        local_copies: int,
+        immich_copies: int
+    ):
+        """Append a report row and count it."""
+        immich_data = asset.get("immich_data", {}) if asset else {}
+        self.rows.append({
+            'category': category,
+            'checksum': checksum,
+            'local_path': local_path,
+            'asset_id': immich_data.get("id", ""),
+            'original_file_name': immich_data.get("originalFileName", ""),
+            'original_path': immich_data.get("originalPath", ""),
+            'local_copies': local_copies,
+            'immich_copies': immich_copies
+        })
+        self.stats[category] += 1
+
+    def write_csv(self, output_path: str) -> bool:
+        """
+        Write report rows to CSV.
+
+        Args:
+            output_path: Destination CSV path
+
+        Returns:
+            True if written successfully, False otherwise
+        """
+        try:
+            output = Path(output_path)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            with open(output, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
+                writer.writeheader()
+                writer.writerows(self.rows)
+            self.logger.info(f"Wrote {len(self.rows)} report rows to {output}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error writing report: {e}")
+            return False
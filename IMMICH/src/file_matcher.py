@@ -1,12 +1,24 @@
 """File matching utilities with EXIF support."""
 
 import logging
+import os
+from collections.abc import Mapping
 import subprocess
+import sys
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 
+# Add COMMON/src to sys.path for robust import
+common_src = Path(__file__).resolve().parents[2] / "COMMON" / "src"
+if str(common_src) not in sys.path:
+    sys.path.insert(0, str(common_src))
+from common.dir_catalog import DirCatalog
+from common.hash_cache import HashCache
+
+from cache_storage import normalize_checksum
+
 
 class ExifReader:
     """Simple EXIF reader using exiftool."""
@@ -38,6 +50,39 @@ class ExifReader:
         except (subprocess.CalledProcessError, json.JSONDecodeError, FileNotFoundError):
             return {}
     
+    @staticmethod
+    def read_exif_batch(file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read EXIF data from several files with a single exiftool call.
+        
+        Args:
+            file_paths: Paths to files
+            
+        Returns:
+            Dictionary of file path to EXIF data (files exiftool could not
+            read are missing)
+        """
+        if not file_paths:
+            return {}
+        try:
+            # exiftool exits non-zero if any file fails; the JSON still covers the rest
+            result = subprocess.run(
+                ["exiftool", "-j", "-DateTimeOriginal", "-FileSize", *file_paths],
+                capture_output=True,
+                text=True
+            )
+            data = json.loads(result.stdout or "[]")
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+        
+        by_name = {os.path.normpath(path): path for path in file_paths}
+        results = {}
+        for item in data:
+            path = by_name.get(os.path.normpath(item.get("SourceFile", "")))
+            if path:
+                results[path] = item
+        return results
+    
     @staticmethod
     def parse_exif_datetime(exif_date: Optional[str]) -> Optional[datetime]:
         """
@@ -71,23 +116,132 @@ class ExifReader:
         return None
 
 
+class FilenameIndex(Mapping):
+    """
+    Files under a root directory by filename (filename -> list of paths).
+    
+    Held compactly as a table of directory paths plus filename -> directory
+    ids. The directory listing comes from a DirCatalog, so with a catalog
+    path the next build only re-lists directories whose mtime changed (a file
+    added, removed or renamed in it) and startup costs one stat per directory
+    instead of a walk over every file.
+    """
+    
+    def __init__(
+        self,
+        root: Path,
+        extensions,
+        catalog_path: Optional[str] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Args:
+            root: Directory to index
+            extensions: Lowercase file extensions to include
+            catalog_path: JSON file persisting the directory listing (None keeps it in memory)
+            logger: Optional logger instance
+        """
+        self.root = Path(root)
+        self.extensions = extensions
+        self.logger = logger or logging.getLogger(__name__)
+        self.catalog = DirCatalog(
+            self.root,
+            catalog_path,
+            file_filter=lambda name: os.path.splitext(name)[1].lower() in self.extensions,
+            logger=self.logger,
+        )
+        self.dirs: List[str] = []
+        self.names: Dict[str, List[int]] = {}
+        self.file_count = 0
+        self.stats = {'dirs': 0, 'listed': 0, 'files': 0}
+    
+    def build(self) -> "FilenameIndex":
+        """
+        Index the root, re-listing only directories changed since the catalog.
+        
+        Returns:
+            self, for chaining
+        """
+        self.catalog.build()
+        dirs: List[str] = []
+        names: Dict[str, List[int]] = {}
+        for rel, files in self.catalog.iter_files():
+            if not files:
+                continue
+            dir_id = len(dirs)
+            dirs.append(rel)
+            for name in files:
+                names.setdefault(name, []).append(dir_id)
+        
+        self.dirs, self.names = dirs, names
+        self.file_count = self.catalog.stats['files']
+        self.stats = dict(self.catalog.stats)
+        return self
+    
+    def save(self) -> bool:
+        """
+        Persist the directory listing to the catalog path.
+        
+        Returns:
+            True if saved, False if there is no catalog path or on error
+        """
+        return self.catalog.save()
+    
+    def __getitem__(self, name: str) -> List[Path]:
+        return [self.root / self.dirs[dir_id] / name for dir_id in self.names[name]]
+    
+    def __contains__(self, name) -> bool:
+        return name in self.names
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+
+
 class FileMatcher:
     """Matches Immich assets to files in target directory."""
     
-    def __init__(self, target_path: str, logger: Optional[logging.Logger] = None):
+    # Common image extensions
+    IMAGE_EXTENSIONS = {
+        '.jpg', '.jpeg', '.png', '.heic', '.heif', 
+        '.raw', '.cr2', '.nef', '.arw', '.dng',
+        '.gif', '.bmp', '.tiff', '.tif'
+    }
+    
+    def __init__(
+        self,
+        target_path: str,
+        logger: Optional[logging.Logger] = None,
+        hash_cache: Optional[HashCache] = None,
+        index_path: Optional[str] = None
+    ):
         """
         Initialize file matcher.
         
         Args:
             target_path: Root directory to search for files
             logger: Optional logger instance
+            hash_cache: Persistent hash cache for checksum matching (in-memory if None)
+            index_path: File persisting the filename index between runs (None rebuilds it)
         """
         self.target_path = Path(target_path)
         self.logger = logger or logging.getLogger(__name__)
         self.exif_reader = ExifReader()
+        self.hash_cache = hash_cache if hash_cache is not None else HashCache()
+        self.stats = {
+            'ambiguous': 0,
+            'by_size': 0,
+            'by_checksum': 0,
+            'by_exif_date': 0,
+            'exif_batches': 0
+        }
         
         # Build filename index for faster lookups
-        self.filename_index: Dict[str, List[Path]] = {}
+        self.filename_index = FilenameIndex(
+            self.target_path, self.IMAGE_EXTENSIONS, index_path, self.logger
+        )
         self._build_filename_index()
     
     def _build_filename_index(self):
@@ -98,27 +252,12 @@ class FileMatcher:
         
         self.logger.info(f"Building filename index for {self.target_path}...")
         
-        # Common image extensions
-        image_extensions = {
-            '.jpg', '.jpeg', '.png', '.heic', '.heif', 
-            '.raw', '.cr2', '.nef', '.arw', '.dng',
-            '.gif', '.bmp', '.tiff', '.tif'
-        }
-        
-        count = 0
-        for file_path in self.target_path.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                filename = file_path.name
-                if filename not in self.filename_index:
-                    self.filename_index[filename] = []
-                self.filename_index[filename].append(file_path)
-                count += 1
-                
-                if count % 1000 == 0:
-                    self.logger.debug(f"Indexed {count} files...")
+        index = self.filename_index.build()
+        index.save()
         
         self.logger.info(
-            f"Indexed {count} files ({len(self.filename_index)} unique filenames)"
+            f"Indexed {index.file_count} files ({len(index)} unique filenames, "
+            f"listed {index.stats['listed']} of {index.stats['dirs']} directories)"
         )
     
     def match_asset(
@@ -151,8 +290,80 @@ class FileMatcher:
             # Single match - high confidence
             return str(candidates[0]), "exact", "unique_filename"
         
-        # Multiple candidates - use EXIF date to disambiguate
-        return self._match_by_exif_date(candidates, asset_data)
+        # Multiple candidates - cheapest evidence first: size, checksum, EXIF date
+        self.stats['ambiguous'] += 1
+        candidates = sorted(candidates)
+        candidates = self._filter_by_size(candidates, asset_data)
+        if len(candidates) == 1:
+            self.stats['by_size'] += 1
+            return str(candidates[0]), "exact", "file_size"
+        
+        match = self._match_by_checksum(candidates, asset_data)
+        if match:
+            self.stats['by_checksum'] += 1
+            return match
+        
+        match = self._match_by_exif_date(candidates, asset_data)
+        if match[0]:
+            self.stats['by_exif_date'] += 1
+        return match
+    
+    def _filter_by_size(
+        self,
+        candidates: List[Path],
+        asset_data: Dict[str, Any]
+    ) -> List[Path]:
+        """
+        Keep candidates whose size equals the asset's exifInfo.fileSizeInByte.
+        
+        All candidates are kept if the asset has no size or none has that size
+        (e.g. the local file's EXIF was rewritten since Immich indexed it).
+        """
+        expected = (asset_data.get("exifInfo") or {}).get("fileSizeInByte")
+        if not expected:
+            return candidates
+        
+        same_size = []
+        for candidate in candidates:
+            try:
+                if os.stat(candidate).st_size == int(expected):
+                    same_size.append(candidate)
+            except (OSError, TypeError, ValueError):
+                continue
+        return same_size or candidates
+    
+    def _match_by_checksum(
+        self,
+        candidates: List[Path],
+        asset_data: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Match the candidate whose SHA-1 equals the asset checksum.
+        
+        Hashes go through the hash cache, so unchanged files are hashed once
+        across runs.
+        
+        Returns:
+            (matched_path, "exact", method) or None if no candidate matches
+        """
+        checksum = normalize_checksum(asset_data.get("checksum"))
+        if not checksum:
+            return None
+        
+        matches = []
+        for candidate in candidates:
+            try:
+                if self.hash_cache.get_hash(candidate, "sha1") == checksum:
+                    matches.append(candidate)
+            except OSError as e:
+                self.logger.debug(f"Cannot hash {candidate}: {e}")
+        
+        if not matches:
+            return None
+        if len(matches) == 1:
+            return str(matches[0]), "exact", "checksum"
+        # Identical copies; any of them is the asset's content
+        return str(matches[0]), "exact", f"checksum_{len(matches)}_copies"
     
     def _match_by_exif_date(
         self, 
@@ -184,12 +395,15 @@ class FileMatcher:
         if not immich_date:
             return None, "none", f"ambiguous_{len(candidates)}_files"
         
-        # Check each candidate
+        # Read all candidates with one exiftool call
+        exif_by_path = self.exif_reader.read_exif_batch([str(c) for c in candidates])
+        self.stats['exif_batches'] += 1
+        
         best_match = None
         best_delta = None
         
         for candidate in candidates:
-            exif_data = self.exif_reader.read_exif(str(candidate))
+            exif_data = exif_by_path.get(str(candidate), {})
             file_date_str = exif_data.get("DateTimeOriginal")
             
             if not file_date_str:
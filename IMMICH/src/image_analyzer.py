@@ -3,18 +3,27 @@
 
 from __future__ import annotations
 
-import csv
 import json
+import logging
+import multiprocessing
 import os
 import re
 import shutil
 import subprocess
+import sys
 import xml.etree.ElementTree as ET
-from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Add COMMON/src to sys.path for robust import
+common_src = Path(__file__).resolve().parents[2] / "COMMON" / "src"
+if str(common_src) not in sys.path:
+    sys.path.insert(0, str(common_src))
+from common.row_store import RowReader, RowWriter
 
 from naming_policy import NamingPolicy
 
@@ -163,76 +172,276 @@ class ImageRow:
     calc_status: str
 
 
+# (file, sidecar, sidecar EXIF, image EXIF) read ahead of row calculation
+FileMetadata = Tuple[Path, Optional[Path], Dict, Dict]
+
+
 class ImageAnalyzer:
     """Analyze image library files and emit CSV rows."""
 
+    EXECUTORS = ("thread", "process")
+
     def __init__(
         self,
         source_root: str,
         logger,
         max_workers: Optional[int] = None,
+        executor: str = "thread",
+        chunk_size: int = 200,
     ):
+        """
+        Args:
+            source_root: Root folder of the image library
+            logger: Logger instance
+            max_workers: Worker threads, or processes in process mode
+            executor: "thread" analyzes each file in a thread pool; "process"
+                reads EXIF for chunks of files with one exiftool call each and
+                calculates rows in a process pool, writing them in file order
+            chunk_size: Files per exiftool call and per process task
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"executor must be one of {self.EXECUTORS}, got {executor!r}")
         self.source_root = Path(source_root)
         self.logger = logger
-        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.executor = executor
+        self.chunk_size = max(1, chunk_size)
+        if executor == "process":
+            self.max_workers = max_workers or os.cpu_count() or 1
+        else:
+            self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
         self.exif_timeout_files: List[Path] = []
+        self.stats = {"analyzed": 0, "reused": 0}
         self.exiftool_available = shutil.which("exiftool") is not None
 
         if not self.exiftool_available:
             self.logger.warning("exiftool not found on PATH; EXIF fields will be blank")
 
-    def analyze_to_csv(self, output_csv: str) -> int:
+    def analyze_to_csv(self, output_csv: str, previous_csv: Optional[str] = None) -> int:
+        """
+        Analyze the library and write one CSV row per image.
+
+        A .parquet output_csv writes Parquet instead (needs pyarrow). Alongside
+        the CSV, a manifest (see manifest_path) records each file's
+        and sidecar's size and mtime. With previous_csv, rows of files whose
+        file and sidecar are unchanged since that CSV's manifest are copied
+        through as-is (including Select) and only the rest are analyzed.
+
+        Args:
+            output_csv: CSV file to write
+            previous_csv: Earlier analyze CSV to reuse unchanged rows from
+
+        Returns:
+            Number of rows written; stats holds analyzed and reused counts
+        """
         output_path = Path(output_csv)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        rows = 0
-        progress_interval = 50
-        max_in_flight = self.max_workers * 4
-        file_iter = iter(self._iter_image_files())
+        # Load before writing, in case the output replaces the previous CSV
+        previous_rows, previous_files = self._load_previous(previous_csv) if previous_csv else ({}, {})
+        files: Dict[str, list] = {}
+        reused_before = self.stats["reused"]
 
-        with output_path.open("w", newline="", encoding="utf-8") as csv_file:
-            writer = csv.DictWriter(csv_file, fieldnames=self._csv_headers())
-            writer.writeheader()
+        with RowWriter(output_path, self._csv_headers()) as writer:
+            changed = self._iter_changed_files(writer, previous_rows, previous_files, files)
+            if self.executor == "process":
+                image_rows = self._iter_rows_in_processes(changed)
+            else:
+                image_rows = self._iter_rows_in_threads(changed)
+            rows = self._write_rows(writer, image_rows) + self.stats["reused"] - reused_before
 
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = set()
+        if previous_csv:
+            self.logger.info(
+                f"Reused {self.stats['reused']} unchanged rows; analyzed {self.stats['analyzed']} files"
+            )
 
-                def submit_next():
-                    try:
-                        next_path = next(file_iter)
-                    except StopIteration:
-                        return False
-                    futures.add(executor.submit(self._analyze_file, next_path))
-                    return True
+        # Rows of files whose EXIF read timed out were written with blank EXIF;
+        # leaving them out of the manifest makes the next incremental run re-analyze them
+        timed_out = {str(path) for path in self.exif_timeout_files}
+        for key, signature in list(files.items()):
+            sidecar = str(Path(key).with_name(signature[2])) if signature[2] else None
+            if key in timed_out or sidecar in timed_out:
+                del files[key]
+        self._save_manifest(output_path, files)
 
-                for _ in range(max_in_flight):
-                    if not submit_next():
-                        break
+        if self.exif_timeout_files:
+            self._retry_exif_timeouts()
 
-                while futures:
-                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
-                    for future in done:
-                        row = future.result()
-                        writer.writerow(self._row_to_dict(row))
-                        rows += 1
+        return rows
 
-                        self.logger.audit(
-                            f"AUDIT file={row.filename} exif_date={row.exif_date} "
-                            f"sidecar_date={row.sidecar_date} status=ok"
-                        )
+    def _iter_changed_files(
+        self,
+        writer: RowWriter,
+        previous_rows: Dict[str, Dict[str, str]],
+        previous_files: Dict[str, list],
+        files: Dict[str, list],
+    ) -> Iterator[Path]:
+        """
+        Yield files that need analysis, writing reusable previous rows as they are found.
 
-                        if rows % progress_interval == 0:
-                            self.logger.info(f"Progress: {rows} files processed")
+        Consumed lazily by the row pipeline, so analysis starts with the first
+        file instead of after a stat of the whole library. Each file's
+        signature is recorded in files for the manifest.
+        """
+        for path in self._iter_image_files():
+            key = str(path)
+            try:
+                signature = self._file_signature(path)
+                files[key] = signature
+            except OSError:
+                signature = None
+            previous_row = previous_rows.get(key)
+            if previous_row is not None and previous_files.get(key) == signature:
+                writer.writerow(previous_row)
+                self.stats["reused"] += 1
+                self.logger.audit(f"AUDIT file={key} status=reused")
+            else:
+                yield path
 
-                    while len(futures) < max_in_flight:
-                        if not submit_next():
-                            break
+    @staticmethod
+    def manifest_path(csv_path) -> Path:
+        """Manifest of file sizes/mtimes written next to an analyze CSV (<csv>.files.json)."""
+        return Path(csv_path).with_name(Path(csv_path).name + ".files.json")
+
+    def _file_signature(self, path: Path) -> list:
+        """[size, mtime_ns, sidecar, sidecar size, sidecar mtime_ns] for change detection."""
+        stat = path.stat()
+        sidecar = self._find_sidecar(path)
+        if not sidecar:
+            return [stat.st_size, stat.st_mtime_ns, "", 0, 0]
+        sidecar_stat = sidecar.stat()
+        return [stat.st_size, stat.st_mtime_ns, sidecar.name, sidecar_stat.st_size, sidecar_stat.st_mtime_ns]
+
+    def _load_previous(self, previous_csv: str) -> Tuple[Dict[str, Dict[str, str]], Dict[str, list]]:
+        """Rows of a previous CSV and its manifest, keyed by path; empty if unusable."""
+        csv_path = Path(previous_csv)
+        manifest = self.manifest_path(csv_path)
+        if not csv_path.exists() or not manifest.exists():
+            self.logger.warning(
+                f"No previous CSV and manifest at {csv_path}; analyzing every file"
+            )
+            return {}, {}
 
-        if self.exif_timeout_files:
-            self._retry_exif_timeouts()
+        try:
+            with manifest.open(encoding="utf-8") as f:
+                files = json.load(f).get("files", {})
+            with RowReader(csv_path) as reader:
+                if reader.fieldnames != self._csv_headers():
+                    self.logger.warning(
+                        f"Previous CSV {csv_path} has different columns; analyzing every file"
+                    )
+                    return {}, {}
+                rows = {row["Filenanme"]: row for row in reader.iter_rows()}
+        except (OSError, ValueError) as exc:
+            self.logger.warning(f"Cannot read previous analysis {csv_path}: {exc}")
+            return {}, {}
+
+        self.logger.info(f"Loaded {len(rows)} rows from previous CSV {csv_path}")
+        return rows, files
+
+    def _save_manifest(self, output_path: Path, files: Dict[str, list]) -> None:
+        manifest = self.manifest_path(output_path)
+        try:
+            with manifest.open("w", encoding="utf-8") as f:
+                json.dump({"version": 1, "files": files}, f, separators=(",", ":"))
+        except OSError as exc:
+            self.logger.warning(f"Could not write analyze manifest {manifest}: {exc}")
+
+    def _write_rows(self, writer: RowWriter, image_rows: Iterable[ImageRow]) -> int:
+        rows = 0
+        progress_interval = 50
+        for row in image_rows:
+            writer.writerow(self._row_to_dict(row))
+            rows += 1
+            self.stats["analyzed"] += 1
+
+            self.logger.audit(
+                f"AUDIT file={row.filename} exif_date={row.exif_date} "
+                f"sidecar_date={row.sidecar_date} status=ok"
+            )
 
+            if rows % progress_interval == 0:
+                self.logger.info(f"Progress: {rows} files processed")
         return rows
 
+    def _iter_rows_in_threads(self, paths: Iterable[Path]) -> Iterator[ImageRow]:
+        """Analyze files in a thread pool, yielding rows as they complete."""
+        max_in_flight = self.max_workers * 4
+        file_iter = iter(paths)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = set()
+
+            def submit_next():
+                try:
+                    next_path = next(file_iter)
+                except StopIteration:
+                    return False
+                futures.add(executor.submit(self._analyze_file, next_path))
+                return True
+
+            for _ in range(max_in_flight):
+                if not submit_next():
+                    break
+
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+                while len(futures) < max_in_flight:
+                    if not submit_next():
+                        break
+
+    def _iter_rows_in_processes(self, paths: Iterable[Path]) -> Iterator[ImageRow]:
+        """
+        Read metadata for chunks of files in threads, calculate rows in a
+        process pool, and yield rows in file order.
+
+        Each chunk's metadata read hands the chunk straight to the process
+        pool, so exiftool runs for later chunks overlap row calculation for
+        earlier ones. At most two chunks per worker are in flight.
+        """
+        chunks = self._iter_chunks(paths)
+        max_in_flight = self.max_workers * 2
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as readers, ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Workers start from reader threads; forking a threaded parent is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_row_worker,
+            initargs=(str(self.source_root),),
+        ) as workers:
+
+            def read_and_submit(chunk: List[Path]):
+                return workers.submit(_calculate_rows, self._read_chunk_metadata(chunk))
+
+            def submit_next():
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return False
+                pending.append(readers.submit(read_and_submit, chunk))
+                return True
+
+            for _ in range(max_in_flight):
+                if not submit_next():
+                    break
+
+            while pending:
+                # Waiting on the oldest chunk keeps rows in file order
+                yield from pending.popleft().result().result()
+                submit_next()
+
+    def _iter_chunks(self, paths: Iterable[Path]) -> Iterator[List[Path]]:
+        chunk: List[Path] = []
+        for path in paths:
+            chunk.append(path)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
     def _iter_image_files(self) -> Iterable[Path]:
         for path in self.source_root.rglob("*"):
             if not path.is_file():
@@ -243,10 +452,73 @@ class ImageAnalyzer:
                 yield path
 
     def _analyze_file(self, file_path: Path) -> ImageRow:
+        return self._calculate_row(*self._read_metadata(file_path))
+
+    def _read_metadata(self, file_path: Path) -> FileMetadata:
         sidecar_path = self._find_sidecar(file_path)
         sidecar_exif = self._read_exif(sidecar_path) if sidecar_path else {}
         image_exif = self._read_exif(file_path)
+        return file_path, sidecar_path, sidecar_exif, image_exif
+
+    def _read_chunk_metadata(self, paths: List[Path]) -> List[FileMetadata]:
+        """Read metadata for a chunk of files with a single exiftool call."""
+        sidecars = [self._find_sidecar(path) for path in paths]
+        to_read = list(paths) + [sidecar for sidecar in sidecars if sidecar]
+        exif_by_path = self._read_exif_batch(to_read)
+        if exif_by_path is None:
+            return [self._read_metadata(path) for path in paths]
+
+        return [
+            (
+                path,
+                sidecar,
+                exif_by_path.get(str(sidecar), {}) if sidecar else {},
+                exif_by_path.get(str(path), {}),
+            )
+            for path, sidecar in zip(paths, sidecars)
+        ]
+
+    def _read_exif_batch(self, paths: List[Path]) -> Optional[Dict[str, Dict]]:
+        """
+        Read EXIF for many files in one exiftool run, keyed by path string.
+
+        Returns None if the batch times out or fails, so the caller can fall
+        back to per-file reads (which track timeouts for retry).
+        """
+        if not paths or not self.exiftool_available:
+            return {}
+        cmd = ["exiftool", "-j", *[str(path) for path in paths]]
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=10 + len(paths)
+            )
+        except subprocess.TimeoutExpired:
+            self.logger.warning(
+                f"Batched EXIF extraction timed out for {len(paths)} files; reading individually"
+            )
+            return None
+        except Exception as exc:
+            self.logger.error(f"Batched EXIF extraction failed: {exc}")
+            return None
+
+        # exiftool exits non-zero if any file failed but still reports the rest
+        try:
+            data = json.loads(result.stdout) if result.stdout else []
+        except json.JSONDecodeError:
+            return None
+        return {
+            entry.get("SourceFile", ""): entry
+            for entry in data
+            if isinstance(entry, dict)
+        }
 
+    def _calculate_row(
+        self,
+        file_path: Path,
+        sidecar_path: Optional[Path],
+        sidecar_exif: Dict,
+        image_exif: Dict,
+    ) -> ImageRow:
         folder_date = self._extract_folder_date(file_path.parent.name)
         filename_date = self._extract_filename_date(file_path.name)
 
@@ -1010,3 +1282,18 @@ class ImageAnalyzer:
             "Calc Status": row.calc_status,
             "Select": "",
         }
+
+
+_ROW_ANALYZER: Optional[ImageAnalyzer] = None
+
+
+def _init_row_worker(source_root: str) -> None:
+    """Process pool initializer: one analyzer per worker for row calculation."""
+    global _ROW_ANALYZER
+    logger = logging.getLogger(__name__)
+    logger.addHandler(logging.NullHandler())
+    _ROW_ANALYZER = ImageAnalyzer(source_root, logger, max_workers=1)
+
+
+def _calculate_rows(metadata: List[FileMetadata]) -> List[ImageRow]:
+    return [_ROW_ANALYZER._calculate_row(*entry) for entry in metadata]
@@ -3,18 +3,29 @@
 
 from __future__ import annotations
 
-import csv
+import errno
+import json
 import os
 import re
 import shutil
 import subprocess
+import sys
+import threading
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from zoneinfo import ZoneInfo
 
+# Add COMMON/src to sys.path for robust import
+common_src = Path(__file__).resolve().parents[2] / "COMMON" / "src"
+if str(common_src) not in sys.path:
+    sys.path.insert(0, str(common_src))
+from common.row_store import RowReader
+
 from naming_policy import NamingPolicy
 
 
@@ -23,7 +34,71 @@ HEIC_EXTENSIONS = {".heic", ".heif"}
 SIDECAR_EXTENSIONS = {".xmp", ".XMP", ".json", ".JSON", ".disabled",".possible", ".unknown"}
 
 
+@dataclass
+class PlannedMove:
+    """A file rename/move (plus its sidecars) planned for the move phase."""
+
+    row: Dict[str, str]
+    source: Path
+    target: Path
+    action: str
+    sidecars: List[Tuple[Path, Path]] = field(default_factory=list)
+
+
+class MoveJournal:
+    """
+    Append-only JSON Lines record of completed renames and moves.
+
+    Each line is {"kind": ..., "src": ..., "dst": ...} where kind is
+    "extension" (phase 1 extension fix), "move" (phase 2 file) or "sidecar".
+    A later run uses it to find files an interrupted run already moved, and
+    undo replays it backwards.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, str]]:
+        entries: List[Dict[str, str]] = []
+        if not self.path.exists():
+            return entries
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by the interruption
+                    continue
+        return entries
+
+    def record(self, kind: str, src, dst) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"kind": kind, "src": str(src), "dst": str(dst)}) + "\n")
+                f.flush()
+
+
 class ImageUpdater:
+    # Analyze columns read by the update (and push) steps; others are not loaded
+    ROW_COLUMNS = [
+        "Filenanme",
+        "Filename",
+        "File",
+        "Sidecar Offset",
+        "EXIF Offset",
+        "Calc Date",
+        "Calc Time Used",
+        "Calc Offset",
+        "Calc Timezone",
+        "Calc Description",
+        "Calc Tags",
+        "Calc Filename",
+        "Calc Path",
+        "Calc Status",
+    ]
+
     def _format_exif_datetime(self, calc_date: str, calc_filename: str) -> str:
         """
         Normalize various date formats to EXIF datetime (YYYY:MM:DD HH:MM:SS).
@@ -72,8 +147,12 @@ class ImageUpdater:
 
         return f"{date_part} {time_part}"
 
-    def __init__(self, csv_path: str, logger, dry_run: bool = False, all_rows: bool = False, max_workers: Optional[int] = None, force: bool = False) -> None:
+    def __init__(self, csv_path: str, logger, dry_run: bool = False, all_rows: bool = False, max_workers: Optional[int] = None, force: bool = False, journal_path: Optional[str] = None) -> None:
         self.csv_path = Path(csv_path)
+        # Renames/moves are journaled next to the CSV so an interrupted run can resume and be undone
+        self.journal = MoveJournal(journal_path or self.csv_path.with_name(self.csv_path.name + ".moves.jsonl"))
+        self._moved_to: Dict[str, List[Tuple[int, str, str]]] = {}
+        self._stats_lock = threading.Lock()
         self.logger = logger
         self.dry_run = dry_run
         self.all_rows = all_rows
@@ -93,6 +172,8 @@ class ImageUpdater:
             "sidecar_renamed": 0,
             "sidecar_moved": 0,
             "sidecar_errors": 0,
+            "move_conflicts": 0,
+            "resumed": 0,
             "errors": 0,
         }
         self.exiftool_available = shutil.which("exiftool") is not None
@@ -104,7 +185,8 @@ class ImageUpdater:
         if not self.csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
 
-        # Phase 0: Load and validate all selected rows
+        # Phase 0: Load and validate all selected rows, following moves of earlier runs
+        self._load_journal()
         rows = self._load_selected_rows()
         if not rows:
             self.logger.info("No rows to process")
@@ -116,34 +198,42 @@ class ImageUpdater:
         self.logger.info(f"Phase 1: Updating EXIF metadata ({self.max_workers} workers)...")
         self._process_exif_batch(rows)
         
-        # Phase 2: Move files serially (to avoid conflicts)
-        self.logger.info("Phase 2: Moving files to final locations...")
+        # Phase 2: Plan moves, then move independent destination directories concurrently
+        self.logger.info(f"Phase 2: Moving files to final locations ({self.max_workers} workers)...")
         self._process_moves_batch(rows)
 
         return self.stats
 
     def _load_selected_rows(self) -> List[Dict[str, str]]:
-        """Load and filter rows from CSV based on selection criteria."""
+        """
+        Load and filter rows from the CSV (or Parquet) file based on selection criteria.
+
+        Only ROW_COLUMNS are kept. Unless all_rows or force is set, rows are
+        filtered on the select column while reading; for Parquet both happen
+        in pyarrow before rows are built.
+        """
         rows = []
-        with self.csv_path.open(newline="", encoding="utf-8") as csv_file:
-            reader = csv.DictReader(csv_file)
-            select_col = None
+        with RowReader(self.csv_path) as reader:
+            where = None
             if not self.all_rows:
-                select_col = self._select_column(reader.fieldnames or [])
-
-            for row in reader:
-                self.stats["rows_total"] += 1
+                select_col = self._select_column(reader.fieldnames)
                 # Only skip unselected if not all_rows and not force
-                if not self.all_rows and not self.force and not self._is_selected(row.get(select_col, "")):
-                    continue
+                if not self.force:
+                    where = (select_col, SELECTED_VALUES)
 
+            for row in reader.iter_rows(columns=self.ROW_COLUMNS, where=where):
                 self.stats["rows_selected"] += 1
+                if self._resume_row(row):
+                    self.stats["resumed"] += 1
+                    continue
                 # Validate row can be processed
                 if self._validate_row(row):
                     rows.append(row)
                 else:
                     self.stats["errors"] += 1
 
+            self.stats["rows_total"] += reader.rows_read
+
         return rows
 
     def _validate_row(self, row: Dict[str, str]) -> bool:
@@ -233,54 +323,343 @@ class ImageUpdater:
 
         return exif_status, new_calc_path, exif_datetime, file_path
 
+    def _load_journal(self) -> None:
+        """Index file renames/moves recorded by earlier runs of this CSV by source path, in journal order."""
+        self._moved_to = defaultdict(list)
+        for index, entry in enumerate(self.journal.load()):
+            if entry.get("kind") in {"extension", "move"} and "src" in entry and "dst" in entry:
+                self._moved_to[entry["src"]].append((index, entry["kind"], entry["dst"]))
+
+    def _resume_row(self, row: Dict[str, str]) -> bool:
+        """
+        Point a row whose file an earlier run already renamed or moved at the
+        file's current path. Returns True if the file already went through
+        the move phase, so the row needs no further work.
+
+        The journal is followed in order from the row's path even if a file
+        exists there: another move may have landed on a path this row's file
+        vacated, and that file must not be mistaken for the row's own.
+        """
+        key = "Filenanme" if "Filenanme" in row else "Filename" if "Filename" in row else "File"
+        path = row.get(key) or ""
+        if not path or path not in self._moved_to:
+            return False
+
+        kind = ""
+        position = -1
+        while True:
+            # The first rename/move of this path after the file arrived there
+            step = next((entry for entry in self._moved_to.get(path, []) if entry[0] > position), None)
+            if step is None:
+                break
+            position, kind, path = step
+        if not os.path.exists(path):
+            return False
+
+        row[key] = path
+        if kind == "move":
+            self.logger.info(f"Already moved by an earlier run: {path}")
+            return True
+        return False
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[stat] += amount
+
     def _process_moves_batch(self, rows: List[Dict[str, str]]) -> None:
-        """Move files serially after EXIF updates are complete."""
-        for idx, row in enumerate(rows, 1):
-            self._process_row_for_move(row)
-            
-            if idx % 50 == 0:
-                self.logger.info(f"Move Progress: {idx}/{len(rows)} files processed")
+        """
+        Move files after EXIF updates are complete.
 
-    def _process_row_for_move(self, row: Dict[str, str]) -> None:
-        """Handle file move phase after EXIF updates."""
-        file_path = row.get("Filenanme") or row.get("Filename") or row.get("File") or ""
-        calc_status = row.get("Calc Status", "")
-        
-        # Use new calc_path if it was recalculated due to placeholder date, otherwise use original
-        calc_path = row.get("_new_calc_path", "") or row.get("Calc Path", "")
-        calc_filename = row.get("Calc Filename", "")
-        
-        # Use the exif_datetime that was computed during EXIF phase
-        exif_datetime = row.get("_exif_datetime", "")
-        
-        calc_filename = self._normalize_calc_filename(
-            calc_filename,
-            row.get("Calc Date", ""),
-            calc_path,
-            exif_datetime,
+        All targets are planned up front (_plan_moves). Moves into different
+        destination directories run concurrently, each directory's moves in
+        row order; moves onto a file that another move vacates run afterwards,
+        one at a time.
+        """
+        partitions, deferred = self._plan_moves(rows)
+        planned = sum(len(moves) for moves in partitions.values()) + len(deferred)
+        self.logger.info(
+            f"Planned {planned} moves into {len(partitions)} directories "
+            f"({len(deferred)} deferred, {self.stats['move_conflicts']} conflicts)"
         )
-        target_path = self._resolve_target_path(file_path, calc_status, calc_path, calc_filename)
 
-        if target_path:
-            self._move_sidecars(file_path, target_path)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._execute_moves, moves) for moves in partitions.values()]
+            for future in as_completed(futures):
+                try:
+                    done += future.result()
+                except Exception as exc:
+                    self.logger.error(f"Move partition failed: {exc}")
+                    self._count("errors")
+                self.logger.info(f"Move Progress: {done}/{planned} files processed")
 
-        file_status = self._apply_file_action(
-            file_path,
-            calc_status,
-            calc_path,
-            calc_filename,
-        )
+        done += self._execute_moves(deferred)
+        if deferred:
+            self.logger.info(f"Move Progress: {done}/{planned} files processed")
+
+    def _plan_moves(
+        self, rows: List[Dict[str, str]]
+    ) -> Tuple[Dict[Path, List[PlannedMove]], List[PlannedMove]]:
+        """
+        Resolve every row's target and reject conflicting moves.
+
+        A move is rejected (move_conflicts, error) if an earlier row already
+        claims its target, or if the target exists and is neither the source
+        itself nor the source of another planned move. Moves whose target is
+        another move's source are deferred until the partitions finish and
+        ordered so each runs after the move that vacates its target.
+
+        Returns:
+            (moves by destination directory, deferred moves)
+        """
+        moves: List[PlannedMove] = []
+        for row in rows:
+            file_path = row.get("Filenanme") or row.get("Filename") or row.get("File") or ""
+            status = (row.get("Calc Status", "") or "").strip().upper()
+            if status not in {"RENAME", "MOVE"}:
+                self._finish_move(row, file_path, "none")
+                continue
+
+            # Use new calc_path if it was recalculated due to placeholder date, otherwise use original
+            calc_path = row.get("_new_calc_path", "") or row.get("Calc Path", "")
+            calc_filename = self._normalize_calc_filename(
+                row.get("Calc Filename", ""),
+                row.get("Calc Date", ""),
+                calc_path,
+                row.get("_exif_datetime", ""),
+            )
+            if not calc_path or not calc_filename:
+                self.logger.error(f"Missing calc path/filename for {file_path}")
+                self._finish_move(row, file_path, "error")
+                continue
+
+            action = "moved" if status == "MOVE" else "renamed"
+            moves.append(PlannedMove(row, Path(file_path), Path(calc_path) / calc_filename, action))
+
+        sources = {os.path.abspath(move.source) for move in moves}
+        claimed: Dict[str, Path] = {}
+        partitions: Dict[Path, List[PlannedMove]] = defaultdict(list)
+        deferred: List[PlannedMove] = []
+
+        for move in moves:
+            target_key = os.path.abspath(move.target)
+            same_file = self._same_file(move.source, move.target)
+            conflict = None
+            if target_key in claimed:
+                conflict = f"target also planned for {claimed[target_key]}"
+            elif move.target.exists() and not same_file and target_key not in sources:
+                conflict = "target already exists"
+            if conflict:
+                self._reject_move(move, conflict)
+                continue
+
+            claimed[target_key] = move.source
+            if not self._is_noop_move(move.source, move.target):
+                move.sidecars = self._plan_sidecars(move, claimed)
+            if target_key in sources and not same_file:
+                deferred.append(move)
+            else:
+                partitions[move.target.parent].append(move)
+
+        return partitions, self._order_deferred(deferred)
+
+    def _order_deferred(self, deferred: List[PlannedMove]) -> List[PlannedMove]:
+        """
+        Order deferred moves so each runs after the move that vacates its target.
+
+        Each target is claimed once, so dependencies form chains; a chain that
+        loops back on itself (A -> B -> A) can never run and is rejected, as
+        are moves waiting on such a cycle.
+        """
+        by_source = {os.path.abspath(move.source): move for move in deferred}
+        ordered: List[PlannedMove] = []
+        done = set()
+        rejected = set()
+        for move in deferred:
+            chain: List[PlannedMove] = []
+            on_chain = set()
+            current = move
+            while current is not None and id(current) not in done and id(current) not in on_chain:
+                on_chain.add(id(current))
+                chain.append(current)
+                current = by_source.get(os.path.abspath(current.target))
+
+            if current is not None and (id(current) in on_chain or id(current) in rejected):
+                cycle_start = chain.index(current) if id(current) in on_chain else len(chain)
+                for position, blocked in enumerate(chain):
+                    reason = "rename cycle" if position >= cycle_start else "target held by a rename cycle"
+                    self._reject_move(blocked, reason)
+                    done.add(id(blocked))
+                    rejected.add(id(blocked))
+                continue
+
+            for ready in reversed(chain):
+                ordered.append(ready)
+                done.add(id(ready))
+        return ordered
+
+    def _reject_move(self, move: PlannedMove, reason: str) -> None:
+        self.logger.error(f"Move conflict: {move.source} -> {move.target}: {reason}")
+        self.stats["move_conflicts"] += 1
+        self._finish_move(move.row, str(move.source), "error")
+
+    def _plan_sidecars(self, move: PlannedMove, claimed: Dict[str, Path]) -> List[Tuple[Path, Path]]:
+        """Sidecars to move with a file; a sidecar target claimed by another move is an error."""
+        sidecars = []
+        target_base = move.target.with_suffix("")
+        for ext in SIDECAR_EXTENSIONS:
+            sidecar = move.source.with_suffix(ext)
+            if not sidecar.exists():
+                continue
+            target_sidecar = target_base.with_suffix(ext)
+            if self._is_noop_move(sidecar, target_sidecar):
+                continue
+            target_key = os.path.abspath(target_sidecar)
+            if target_key in claimed:
+                self.stats["sidecar_errors"] += 1
+                self.logger.error(
+                    f"Failed to move sidecar {sidecar} -> {target_sidecar}: "
+                    f"target also planned for {claimed[target_key]}"
+                )
+                continue
+            claimed[target_key] = sidecar
+            sidecars.append((sidecar, target_sidecar))
+        return sidecars
+
+    @staticmethod
+    def _same_file(source: Path, target: Path) -> bool:
+        try:
+            return os.path.samefile(source, target)
+        except OSError:
+            return os.path.abspath(source) == os.path.abspath(target)
+
+    def _is_noop_move(self, source: Path, target: Path) -> bool:
+        """
+        True if source already is target. On case-insensitive filesystems a
+        rename that only changes letter case is the same file but still needs
+        the rename.
+        """
+        return self._same_file(source, target) and source.name == target.name
+
+    def _execute_moves(self, moves: List[PlannedMove]) -> int:
+        """Move the files (sidecars first) of one partition in order; returns moves handled."""
+        created = set()
+        for move in moves:
+            if not self.dry_run and move.target.parent not in created:
+                move.target.parent.mkdir(parents=True, exist_ok=True)
+                created.add(move.target.parent)
+
+            for sidecar, target_sidecar in move.sidecars:
+                self._move_sidecar(sidecar, target_sidecar)
+
+            if self.dry_run:
+                status = move.action
+            else:
+                try:
+                    if not self._is_noop_move(move.source, move.target):
+                        if move.target.exists() and not self._same_file(move.source, move.target):
+                            # A deferred move whose target was not vacated (its move failed)
+                            raise FileExistsError(f"target still exists: {move.target}")
+                        self._move_path(move.source, move.target)
+                        self.journal.record("move", move.source, move.target)
+                    status = move.action
+                except Exception as exc:
+                    self.logger.error(f"Failed to move {move.source} -> {move.target}: {exc}")
+                    status = "error"
+            self._finish_move(move.row, str(move.source), status)
+        return len(moves)
+
+    def _move_sidecar(self, sidecar: Path, target_sidecar: Path) -> None:
+        same_dir = sidecar.parent.resolve() == target_sidecar.parent.resolve()
+        if self.dry_run:
+            self.logger.audit(
+                "AUDIT sidecar=%s sidecar_action=%s target=%s",
+                sidecar,
+                "would_rename" if same_dir else "would_move",
+                target_sidecar,
+            )
+            return
+
+        try:
+            if target_sidecar.exists() and not self._same_file(sidecar, target_sidecar):
+                raise FileExistsError(f"target exists: {target_sidecar}")
+            target_sidecar.parent.mkdir(parents=True, exist_ok=True)
+            self._move_path(sidecar, target_sidecar)
+            self.journal.record("sidecar", sidecar, target_sidecar)
+            self._count("sidecar_renamed" if same_dir else "sidecar_moved")
+            self.logger.audit(
+                "AUDIT sidecar=%s sidecar_action=%s target=%s",
+                sidecar,
+                "renamed" if same_dir else "moved",
+                target_sidecar,
+            )
+        except Exception as exc:
+            self._count("sidecar_errors")
+            self.logger.error(
+                f"Failed to move sidecar {sidecar} -> {target_sidecar}: {exc}"
+            )
+
+    @staticmethod
+    def _move_path(source: Path, target: Path) -> None:
+        """Rename in place when on the same filesystem, otherwise copy and delete."""
+        try:
+            os.rename(source, target)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+            shutil.move(str(source), str(target))
+
+    def _finish_move(self, row: Dict[str, str], file_path: str, file_status: str) -> None:
         if file_status == "renamed":
-            self.stats["renamed"] += 1
+            self._count("renamed")
         elif file_status == "moved":
-            self.stats["moved"] += 1
+            self._count("moved")
         elif file_status == "error":
-            self.stats["errors"] += 1
+            self._count("errors")
 
         self.logger.audit(
             f"AUDIT file={file_path} exif={row.get('_exif_status', 'none')} file_action={file_status}"
         )
 
+    def undo_moves(self) -> Dict[str, int]:
+        """
+        Reverse the renames and moves recorded in the journal, newest first.
+
+        An entry is restored only if its destination exists and its source
+        does not. The journal is removed once every entry was restored.
+
+        Returns:
+            Counts of restored, skipped and failed entries
+        """
+        result = {"restored": 0, "skipped": 0, "errors": 0}
+        for entry in reversed(self.journal.load()):
+            src, dst = entry.get("src"), entry.get("dst")
+            if (
+                not src
+                or not dst
+                or not os.path.exists(dst)
+                or (os.path.exists(src) and not self._same_file(Path(src), Path(dst)))
+            ):
+                self.logger.warning(f"Cannot undo {src} -> {dst}: source exists or destination missing")
+                result["skipped"] += 1
+                continue
+            if self.dry_run:
+                self.logger.info(f"[DRY RUN] Would restore {dst} -> {src}")
+                result["restored"] += 1
+                continue
+            try:
+                Path(src).parent.mkdir(parents=True, exist_ok=True)
+                self._move_path(Path(dst), Path(src))
+                result["restored"] += 1
+                self.logger.audit(f"AUDIT file={dst} file_action=restored target={src}")
+            except Exception as exc:
+                self.logger.error(f"Failed to restore {dst} -> {src}: {exc}")
+                result["errors"] += 1
+
+        if not self.dry_run and result["skipped"] == 0 and result["errors"] == 0 and self.journal.path.exists():
+            self.journal.path.unlink()
+        return result
+
     def _select_column(self, fieldnames: List[str]) -> str:
         if "Selected" in fieldnames:
             return "Selected"
@@ -365,77 +744,6 @@ class ImageUpdater:
         )
         return new_calc_path
 
-    def _resolve_target_path(
-        self,
-        file_path: str,
-        calc_status: str,
-        calc_path: str,
-        calc_filename: str,
-    ) -> Path | None:
-        status = (calc_status or "").strip().upper()
-        if status not in {"RENAME", "MOVE"}:
-            return Path(file_path)
-        if not calc_path or not calc_filename:
-            return None
-        return Path(calc_path) / calc_filename
-
-    def _move_sidecars(self, source_path: str, target_path: Path) -> None:
-        source = Path(source_path)
-        if not source.exists():
-            return
-
-        if source.resolve() == target_path.resolve():
-            return
-
-        target_base = target_path.with_suffix("")
-
-        for ext in SIDECAR_EXTENSIONS:
-            sidecar = source.with_suffix(ext)
-            if not sidecar.exists():
-                continue
-
-            target_sidecar = target_base.with_suffix(ext)
-            if self.dry_run:
-                sidecar_action = (
-                    "would_rename"
-                    if sidecar.parent.resolve() == target_sidecar.parent.resolve()
-                    else "would_move"
-                )
-                self.logger.audit(
-                    "AUDIT sidecar=%s sidecar_action=%s target=%s",
-                    sidecar,
-                    sidecar_action,
-                    target_sidecar,
-                )
-                continue
-
-            if sidecar.resolve() == target_sidecar.resolve():
-                continue
-
-            try:
-                target_sidecar.parent.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(sidecar), str(target_sidecar))
-                sidecar_action = (
-                    "renamed"
-                    if sidecar.parent.resolve() == target_sidecar.parent.resolve()
-                    else "moved"
-                )
-                if sidecar_action == "renamed":
-                    self.stats["sidecar_renamed"] += 1
-                else:
-                    self.stats["sidecar_moved"] += 1
-                self.logger.audit(
-                    "AUDIT sidecar=%s sidecar_action=%s target=%s",
-                    sidecar,
-                    sidecar_action,
-                    target_sidecar,
-                )
-            except Exception as exc:
-                self.stats["sidecar_errors"] += 1
-                self.logger.error(
-                    f"Failed to move sidecar {sidecar} -> {target_sidecar}: {exc}"
-                )
-
     def _resolve_calc_offset(self, row: Dict[str, str], exif_datetime: str) -> str:
         calc_offset = (row.get("Calc Offset") or "").strip()
         if calc_offset:
@@ -510,6 +818,7 @@ class ImageUpdater:
         new_path = current_path.with_suffix(calc_ext)
         try:
             current_path.rename(new_path)
+            self.journal.record("extension", current_path, new_path)
             self.logger.info(f"Renamed {current_path.name} to {new_path.name}")
             return str(new_path)
         except Exception as exc:
@@ -629,30 +938,3 @@ class ImageUpdater:
         except Exception as exc:
             self.logger.error(f"Error updating EXIF for {file_path}: {exc}")
             return "error"
-
-    def _apply_file_action(
-        self,
-        file_path: str,
-        calc_status: str,
-        calc_path: str,
-        calc_filename: str,
-    ) -> str:
-        status = (calc_status or "").strip().upper()
-        if status not in {"RENAME", "MOVE"}:
-            return "none"
-
-        if not calc_path or not calc_filename:
-            self.logger.error(f"Missing calc path/filename for {file_path}")
-            return "error"
-
-        target_path = Path(calc_path) / calc_filename
-        if self.dry_run:
-            return "moved" if status == "MOVE" else "renamed"
-
-        try:
-            target_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(file_path, str(target_path))
-            return "moved" if status == "MOVE" else "renamed"
-        except Exception as exc:
-            self.logger.error(f"Failed to move {file_path} -> {target_path}: {exc}")
-            return "error"
@@ -1,33 +1,56 @@
 """Immich metadata cache management."""
 
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from cache_storage import asset_index_keys, create_storage, normalize_checksum
 
 
 class ImmichCache:
     """Manages CRUD operations on Immich metadata cache."""
     
-    def __init__(self, cache_path: str, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        cache_path: str,
+        logger: Optional[logging.Logger] = None,
+        storage=None
+    ):
         """
         Initialize cache manager.
         
         Args:
-            cache_path: Path to cache JSON file
+            cache_path: Path to cache file (.json, or .db/.sqlite for SQLite)
             logger: Optional logger instance
+            storage: Optional storage backend (default: chosen by file extension)
         """
         self.cache_path = Path(cache_path)
         self.logger = logger or logging.getLogger(__name__)
+        self.storage = storage or create_storage(self.cache_path, self.logger)
         
         # Cache structure
-        self.metadata: Dict[str, Any] = {
-            "created": None,
+        self.metadata: Dict[str, Any] = self._new_metadata(created=None)
+        self._reset_assets()
+    
+    @staticmethod
+    def _new_metadata(created: Optional[str]) -> Dict[str, Any]:
+        return {
+            "created": created,
             "last_updated": None,
             "target_path": None,
-            "total_assets": 0
+            "total_assets": 0,
+            "sync_watermark": None
         }
+    
+    def _reset_assets(self):
+        """Point assets and indices at empty containers or storage views."""
+        if self.storage.lazy:
+            # Rows and indices live in the database
+            self.assets = self.storage.assets_view()
+            self.indices = self.storage.index_views()
+            return
+        
         self.assets: Dict[str, Dict[str, Any]] = {}
         
         # Indices (built on-the-fly, not persisted)
@@ -35,29 +58,31 @@ class ImmichCache:
             "by_filename": {},
             "by_path": {},
             "by_album": {},
-            "by_tag": {}
+            "by_tag": {},
+            "by_checksum": {},
+            "by_confidence": {}
         }
     
     def load(self) -> bool:
         """
-        Load cache from JSON file and rebuild indices.
+        Load cache from storage, building indices incrementally.
+        
+        With SQLite storage only metadata is read; assets are fetched on demand.
         
         Returns:
             True if loaded successfully, False if file doesn't exist or error
         """
-        if not self.cache_path.exists():
+        if not self.storage.exists():
             self.logger.info(f"Cache file not found: {self.cache_path}")
             return False
         
         try:
-            with open(self.cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Indices are built as assets stream in (JSON) or live in the database
+            self._reset_assets()
+            metadata, assets = self.storage.load(on_asset=self._update_indices_for_asset)
             
-            self.metadata = data.get("metadata", self.metadata)
-            self.assets = data.get("assets", {})
-            
-            # Rebuild indices from loaded data
-            self.rebuild_indices()
+            self.metadata = metadata or self.metadata
+            self.assets = assets
             
             self.logger.info(
                 f"Loaded cache with {len(self.assets)} assets from {self.cache_path}"
@@ -70,7 +95,7 @@ class ImmichCache:
     
     def save(self) -> bool:
         """
-        Save cache to JSON file.
+        Save cache to storage.
         
         Returns:
             True if saved successfully, False otherwise
@@ -80,18 +105,7 @@ class ImmichCache:
             self.metadata["last_updated"] = datetime.now().isoformat() + "Z"
             self.metadata["total_assets"] = len(self.assets)
             
-            # Create cache directory if it doesn't exist
-            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Prepare data (no indices in saved file)
-            data = {
-                "metadata": self.metadata,
-                "assets": self.assets
-            }
-            
-            # Write to file
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.storage.save(self.metadata, self.assets)
             
             self.logger.info(f"Saved cache with {len(self.assets)} assets to {self.cache_path}")
             return True
@@ -100,23 +114,53 @@ class ImmichCache:
             self.logger.error(f"Error saving cache: {e}")
             return False
     
+    def close(self):
+        """Release the storage backend (unsaved SQLite writes are discarded)."""
+        self.storage.close()
+    
     def clear(self):
         """Clear all cache data."""
-        self.metadata = {
-            "created": datetime.now().isoformat() + "Z",
-            "last_updated": None,
-            "target_path": None,
-            "total_assets": 0
-        }
-        self.assets = {}
-        self.indices = {
-            "by_filename": {},
-            "by_path": {},
-            "by_album": {},
-            "by_tag": {}
-        }
+        self.metadata = self._new_metadata(created=datetime.now().isoformat() + "Z")
+        self.storage.clear()
+        self._reset_assets()
         self.logger.info("Cache cleared")
     
+    @classmethod
+    def migrate(
+        cls,
+        source_path: str,
+        dest_path: str,
+        logger: Optional[logging.Logger] = None
+    ) -> int:
+        """
+        Copy a cache between storage formats (e.g. JSON to SQLite).
+        
+        Args:
+            source_path: Existing cache file
+            dest_path: New cache file; format chosen by extension
+            logger: Optional logger instance
+            
+        Returns:
+            Number of assets migrated
+        """
+        source = cls(source_path, logger)
+        if not source.load():
+            raise FileNotFoundError(f"Cannot load cache: {source_path}")
+        
+        dest = cls(dest_path, logger)
+        dest.clear()
+        dest.metadata = dict(source.metadata)
+        count = 0
+        for asset_id, asset_entry in source.assets.items():
+            dest.assets[asset_id] = asset_entry
+            dest._update_indices_for_asset(asset_id, asset_entry)
+            count += 1
+        if not dest.save():
+            raise IOError(f"Cannot save cache: {dest_path}")
+        dest.close()
+        source.close()
+        return count
+    
     def add_asset(
         self, 
         asset_data: Dict[str, Any], 
@@ -139,8 +183,8 @@ class ImmichCache:
             return
         
         # Check if we should update (if asset already exists)
-        if asset_id in self.assets:
-            existing = self.assets[asset_id]
+        existing = self.assets.get(asset_id)
+        if existing is not None:
             existing_updated_at = existing.get("immich_data", {}).get("updatedAt", "")
             new_updated_at = asset_data.get("updatedAt", "")
             
@@ -162,13 +206,66 @@ class ImmichCache:
             }
         }
         
+        if existing is not None:
+            self._remove_indices_for_asset(asset_id, existing)
+            if not self.storage.lazy:
+                # Keep assets in store order, so a reload indexes paths the same way
+                del self.assets[asset_id]
         self.assets[asset_id] = asset_entry
         
         # Update indices
         self._update_indices_for_asset(asset_id, asset_entry)
+        self._advance_watermark(asset_data.get("updatedAt", ""))
         
         self.logger.debug(f"Added/updated asset {asset_id}")
     
+    def remove_asset(self, asset_id: str) -> bool:
+        """
+        Remove an asset (deleted or trashed in Immich) from cache.
+        
+        Args:
+            asset_id: Asset ID
+            
+        Returns:
+            True if the asset was cached and removed
+        """
+        asset_entry = self.assets.pop(asset_id, None)
+        if asset_entry is None:
+            return False
+        self._remove_indices_for_asset(asset_id, asset_entry)
+        self.logger.debug(f"Removed asset {asset_id}")
+        return True
+    
+    def get_sync_start(self, skew_seconds: int = 300) -> Optional[str]:
+        """
+        Return the updatedAfter value for an incremental sync.
+        
+        The watermark is moved back by skew_seconds so that assets updated
+        while the previous sync was running are not missed; re-fetched assets
+        are merged idempotently by add_asset.
+        
+        Args:
+            skew_seconds: Safety margin subtracted from the watermark
+            
+        Returns:
+            ISO 8601 UTC timestamp, or None if the cache was never synced
+        """
+        watermark = self.metadata.get("sync_watermark")
+        if not watermark:
+            return None
+        try:
+            dt = datetime.fromisoformat(watermark.replace("Z", "+00:00"))
+        except ValueError:
+            self.logger.warning(f"Invalid sync watermark in cache: {watermark}")
+            return None
+        start = dt - timedelta(seconds=skew_seconds)
+        return start.strftime("%Y-%m-%dT%H:%M:%S.") + f"{start.microsecond // 1000:03d}Z"
+    
+    def _advance_watermark(self, updated_at: str):
+        """Raise the sync watermark to updated_at if it is newer."""
+        if updated_at and updated_at > (self.metadata.get("sync_watermark") or ""):
+            self.metadata["sync_watermark"] = updated_at
+    
     def get_asset(self, asset_id: str) -> Optional[Dict[str, Any]]:
         """
         Get asset by ID.
@@ -207,6 +304,19 @@ class ImmichCache:
         asset_id = self.indices["by_path"].get(path)
         return self.assets.get(asset_id) if asset_id else None
     
+    def find_by_checksum(self, checksum: str) -> List[Dict[str, Any]]:
+        """
+        Find assets by content checksum.
+        
+        Args:
+            checksum: SHA-1 of the original file (hex or base64)
+            
+        Returns:
+            List of matching assets
+        """
+        asset_ids = self.indices["by_checksum"].get(normalize_checksum(checksum), [])
+        return [self.assets[aid] for aid in asset_ids if aid in self.assets]
+    
     def find_by_album(self, album_id: str) -> List[Dict[str, Any]]:
         """
         Find all assets in an album.
@@ -233,13 +343,31 @@ class ImmichCache:
         asset_ids = self.indices["by_tag"].get(tag, [])
         return [self.assets[aid] for aid in asset_ids if aid in self.assets]
     
+    def find_ids_by_confidence(self, confidence: str) -> List[str]:
+        """
+        Find asset IDs by file match confidence without reading the entries.
+        
+        Args:
+            confidence: Match confidence (e.g. 'none' for unmatched assets)
+            
+        Returns:
+            List of asset IDs
+        """
+        return list(self.indices["by_confidence"].get(confidence, []))
+    
     def rebuild_indices(self):
         """Rebuild all search indices from assets."""
+        if self.storage.lazy:
+            # Database indices are maintained on write
+            return
+        
         self.indices = {
             "by_filename": {},
             "by_path": {},
             "by_album": {},
-            "by_tag": {}
+            "by_tag": {},
+            "by_checksum": {},
+            "by_confidence": {}
         }
         
         for asset_id, asset_entry in self.assets.items():
@@ -255,41 +383,47 @@ class ImmichCache:
             asset_id: Asset ID
             asset_entry: Asset entry with immich_data and file_mapping
         """
-        immich_data = asset_entry.get("immich_data", {})
-        file_mapping = asset_entry.get("file_mapping", {})
+        if self.storage.lazy:
+            return
         
-        # Index by filename
-        filename = immich_data.get("originalFileName", "")
-        if filename:
-            if filename not in self.indices["by_filename"]:
-                self.indices["by_filename"][filename] = []
-            if asset_id not in self.indices["by_filename"][filename]:
-                self.indices["by_filename"][filename].append(asset_id)
+        # Buckets are insertion-ordered sets (dict keys): O(1) add and remove
+        for index_name, keys in asset_index_keys(asset_entry).items():
+            index = self.indices[index_name]
+            for key in keys:
+                bucket = index.get(key)
+                if bucket is None:
+                    bucket = index[key] = {}
+                bucket[asset_id] = None
         
         # Index by path
-        matched_path = file_mapping.get("matched_path", "")
+        matched_path = asset_entry.get("file_mapping", {}).get("matched_path", "")
         if matched_path:
             self.indices["by_path"][matched_path] = asset_id
+    
+    def _remove_indices_for_asset(self, asset_id: str, asset_entry: Dict[str, Any]):
+        """
+        Remove an asset from all indices.
+        
+        Args:
+            asset_id: Asset ID
+            asset_entry: Asset entry as currently indexed
+        """
+        if self.storage.lazy:
+            return
+        
+        keys = asset_index_keys(asset_entry)
+        for index_name, index_keys in keys.items():
+            index = self.indices[index_name]
+            for key in index_keys:
+                bucket = index.get(key)
+                if bucket is not None and asset_id in bucket:
+                    del bucket[asset_id]
+                    if not bucket:
+                        del index[key]
         
-        # Index by album
-        albums = immich_data.get("albums", [])
-        for album_id in albums:
-            if album_id not in self.indices["by_album"]:
-                self.indices["by_album"][album_id] = []
-            if asset_id not in self.indices["by_album"][album_id]:
-                self.indices["by_album"][album_id].append(asset_id)
-        
-        # Index by tag
-        tags = immich_data.get("tags", [])
-        if isinstance(tags, list):
-            for tag in tags:
-                # Handle both string tags and dict tags
-                tag_name = tag if isinstance(tag, str) else tag.get("name", "")
-                if tag_name:
-                    if tag_name not in self.indices["by_tag"]:
-                        self.indices["by_tag"][tag_name] = []
-                    if asset_id not in self.indices["by_tag"][tag_name]:
-                        self.indices["by_tag"][tag_name].append(asset_id)
+        matched_path = asset_entry.get("file_mapping", {}).get("matched_path", "")
+        if matched_path and self.indices["by_path"].get(matched_path) == asset_id:
+            del self.indices["by_path"][matched_path]
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -298,19 +432,19 @@ class ImmichCache:
         Returns:
             Dictionary with statistics
         """
-        matched = sum(
-            1 for a in self.assets.values() 
-            if a.get("file_mapping", {}).get("match_confidence") != "none"
-        )
+        total = len(self.assets)
+        unmatched = len(self.indices["by_confidence"].get("none", []))
         
         return {
-            "total_assets": len(self.assets),
-            "matched_files": matched,
-            "unmatched_files": len(self.assets) - matched,
+            "total_assets": total,
+            "matched_files": total - unmatched,
+            "unmatched_files": unmatched,
             "unique_filenames": len(self.indices["by_filename"]),
             "albums": len(self.indices["by_album"]),
             "tags": len(self.indices["by_tag"]),
+            "checksums": len(self.indices["by_checksum"]),
             "created": self.metadata.get("created"),
             "last_updated": self.metadata.get("last_updated"),
-            "target_path": self.metadata.get("target_path")
+            "target_path": self.metadata.get("target_path"),
+            "sync_watermark": self.metadata.get("sync_watermark")
         }
@@ -1,14 +1,38 @@
 """Immich API connection and data extraction."""
 
 import logging
+import sys
 import requests
-from typing import List, Optional, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+
+# Add COMMON/src to sys.path for robust import
+common_src = Path(__file__).resolve().parents[2] / "COMMON" / "src"
+if str(common_src) not in sys.path:
+    sys.path.insert(0, str(common_src))
+from common.http_client import HttpClient
 
 
 class ImmichConnection:
     """Handles connection and data extraction from Immich API."""
     
-    def __init__(self, url: str, api_key: str, logger: Optional[logging.Logger] = None):
+    # Assets requested per search page (Immich maximum is 1000)
+    SEARCH_PAGE_SIZE = 1000
+    
+    # Search pages kept in flight once pages are known to be full
+    SEARCH_PREFETCH_PAGES = 4
+    
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        logger: Optional[logging.Logger] = None,
+        pool_size: int = 16,
+        max_retries: int = 3,
+        rate_limit: Optional[float] = None
+    ):
         """
         Initialize Immich API connection.
         
@@ -16,12 +40,22 @@ class ImmichConnection:
             url: Base URL of Immich server
             api_key: API key for authentication
             logger: Optional logger instance
+            pool_size: Keep-alive connections for concurrent requests
+            max_retries: Retries for transient failures of idempotent requests
+            rate_limit: Maximum requests per second (None: unlimited)
         """
         self.base_url = url.rstrip("/")
         self.api_key = api_key
         self.logger = logger or logging.getLogger(__name__)
-        self.session = requests.Session()
-        self.session.headers.update({"x-api-key": api_key})
+        self.http = HttpClient(
+            self.base_url,
+            headers={"x-api-key": api_key},
+            pool_size=pool_size,
+            max_retries=max_retries,
+            rate_limit=rate_limit,
+            logger=self.logger
+        )
+        self.session = self.http.session
     
     def validate_connection(self) -> bool:
         """
@@ -31,7 +65,8 @@ class ImmichConnection:
             True if connection is successful, False otherwise
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/server/ping")
+            # Fail fast at startup rather than backing off on a bad URL
+            resp = self.http.get(f"{self.base_url}/api/server/ping", max_retries=0)
             return resp.status_code == 200
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Connection validation failed: {e}")
@@ -54,9 +89,32 @@ class ImmichConnection:
         Returns:
             List of asset dictionaries
         """
+        return list(self.iter_search_assets(updated_before, updated_after, album_id))
+    
+    def iter_search_assets(
+        self,
+        updated_before: Optional[str] = None,
+        updated_after: Optional[str] = None,
+        album_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Search for assets like search_assets, yielding them as pages arrive.
+        
+        Later pages are downloaded in the background while the caller
+        processes earlier ones.
+        
+        Args:
+            updated_before: ISO 8601 date/time - only assets updated before this time
+            updated_after: ISO 8601 date/time - only assets updated after this time
+            album_id: Only assets from this album
+            
+        Yields:
+            Asset dictionaries in page order
+        """
         # If album_id is specified, use album endpoint instead of search
         if album_id:
-            return self._get_album_assets(album_id)
+            yield from self._get_album_assets(album_id)
+            return
         
         # Use search endpoint with filters
         search_payload: Dict[str, Any] = {"withExif": True}
@@ -67,44 +125,172 @@ class ImmichConnection:
         if updated_before:
             search_payload["updatedBefore"] = updated_before
         
-        assets = []
-        page = 1
+        yield from self._iter_search_metadata(search_payload)
+    
+    def search_trashed_assets(self, trashed_after: str) -> List[Dict[str, Any]]:
+        """
+        Search for assets moved to trash after a point in time.
+        
+        Args:
+            trashed_after: ISO 8601 date/time - only assets trashed after this time
+            
+        Returns:
+            List of trashed asset dictionaries
+        """
+        return self._search_metadata({
+            "trashedAfter": trashed_after,
+            "withDeleted": True
+        })
+    
+    def get_deleted_asset_ids(self, updated_after: str) -> Optional[List[str]]:
+        """
+        Get IDs of assets permanently deleted after a point in time.
+        
+        Uses the delta sync endpoint for the API key's user. Permanently
+        deleted assets cannot be found through search.
         
+        Args:
+            updated_after: ISO 8601 date/time to sync from
+            
+        Returns:
+            List of deleted asset IDs, or None if the server cannot provide a
+            delta (endpoint unavailable or a full sync is required)
+        """
         try:
-            while True:
-                search_payload["page"] = page
-                resp = self.session.post(
-                    f"{self.base_url}/api/search/metadata", 
-                    json=search_payload
-                )
-                resp.raise_for_status()
-                
-                data = resp.json()
-                
-                # Handle nested response structure
-                while isinstance(data, dict) and "data" in data:
-                    data = data["data"]
-                
-                # Extract assets from various response formats
-                page_assets = self._extract_assets_from_response(data)
-                
-                if not page_assets:
-                    break
-                
-                assets.extend(page_assets)
-                
-                if len(assets) % 1000 == 0:
-                    self.logger.info(f"Fetched {len(assets)} assets so far...")
-                
-                # Check for next page
-                next_page = self._get_next_page(data)
-                if next_page is None:
-                    break
-                
-                page = next_page
+            resp = self.http.get(f"{self.base_url}/api/users/me")
+            resp.raise_for_status()
+            user_id = resp.json().get("id")
+            if not user_id:
+                return None
             
-            self.logger.info(f"Total assets fetched: {len(assets)}")
-            return assets
+            resp = self.http.post(
+                f"{self.base_url}/api/sync/delta-sync",
+                json={"updatedAfter": updated_after, "userIds": [user_id]},
+                idempotent=True
+            )
+            if resp.status_code != 200:
+                self.logger.debug(f"Delta sync unavailable: HTTP {resp.status_code}")
+                return None
+            
+            data = resp.json()
+            if data.get("needsFullSync"):
+                return None
+            return list(data.get("deleted", []))
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Error fetching deleted assets: {e}")
+            return None
+    
+    def _search_metadata(self, search_payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run a metadata search, following pagination.
+        
+        Args:
+            search_payload: Search filters for /api/search/metadata
+            
+        Returns:
+            List of asset dictionaries
+        """
+        return list(self._iter_search_metadata(search_payload))
+    
+    def _fetch_search_page(
+        self, search_payload: Dict[str, Any], page: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Fetch one page of a metadata search.
+        
+        Args:
+            search_payload: Search filters for /api/search/metadata
+            page: Page number (1-based)
+            
+        Returns:
+            Tuple of (assets on the page, next page number or None)
+        """
+        resp = self.http.post(
+            f"{self.base_url}/api/search/metadata", 
+            json=dict(search_payload, page=page),
+            idempotent=True
+        )
+        resp.raise_for_status()
+        
+        data = resp.json()
+        
+        # Handle nested response structure
+        while isinstance(data, dict) and "data" in data:
+            data = data["data"]
+        
+        # Extract assets from various response formats
+        return self._extract_assets_from_response(data), self._get_next_page(data)
+    
+    def _iter_search_metadata(
+        self,
+        search_payload: Dict[str, Any],
+        page_size: Optional[int] = None,
+        prefetch_pages: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run a metadata search, yielding assets page by page.
+        
+        The first page is fetched alone. If it comes back full, the server
+        has more pages of the same size, so up to prefetch_pages following
+        pages are kept in flight. A short page, an empty page or a missing
+        nextPage ends the search; pages requested past the end are discarded.
+        
+        Args:
+            search_payload: Search filters for /api/search/metadata
+            page_size: Assets per page (default: SEARCH_PAGE_SIZE)
+            prefetch_pages: Concurrent page requests (default: SEARCH_PREFETCH_PAGES)
+            
+        Yields:
+            Asset dictionaries in page order
+        """
+        page_size = page_size or self.SEARCH_PAGE_SIZE
+        prefetch_pages = prefetch_pages or self.SEARCH_PREFETCH_PAGES
+        search_payload = dict(search_payload, size=page_size)
+        fetched = 0
+        
+        def emit(page_assets):
+            nonlocal fetched
+            for asset in page_assets:
+                yield asset
+                fetched += 1
+                if fetched % 1000 == 0:
+                    self.logger.info(f"Fetched {fetched} assets so far...")
+        
+        try:
+            page_assets, next_page = self._fetch_search_page(search_payload, 1)
+            yield from emit(page_assets)
+            
+            if len(page_assets) < page_size or prefetch_pages <= 1:
+                # Page size unknown or no pipelining: follow nextPage links
+                while page_assets and next_page is not None:
+                    page_assets, next_page = self._fetch_search_page(
+                        search_payload, next_page
+                    )
+                    yield from emit(page_assets)
+            elif next_page is not None:
+                with ThreadPoolExecutor(max_workers=prefetch_pages) as executor:
+                    pending = deque()
+                    to_request = next_page
+                    while len(pending) < prefetch_pages:
+                        pending.append(executor.submit(
+                            self._fetch_search_page, search_payload, to_request
+                        ))
+                        to_request += 1
+                    
+                    while pending:
+                        page_assets, next_page = pending.popleft().result()
+                        yield from emit(page_assets)
+                        if next_page is None or len(page_assets) < page_size:
+                            for future in pending:
+                                future.cancel()
+                            break
+                        pending.append(executor.submit(
+                            self._fetch_search_page, search_payload, to_request
+                        ))
+                        to_request += 1
+            
+            self.logger.info(f"Total assets fetched: {fetched}")
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error searching assets: {e}")
@@ -121,7 +307,7 @@ class ImmichConnection:
             List of asset dictionaries
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/albums/{album_id}")
+            resp = self.http.get(f"{self.base_url}/api/albums/{album_id}")
             resp.raise_for_status()
             album_data = resp.json()
             assets = album_data.get("assets", [])
@@ -197,7 +383,7 @@ class ImmichConnection:
             Asset details dictionary or None if not found
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/assets/{asset_id}")
+            resp = self.http.get(f"{self.base_url}/api/assets/{asset_id}")
             if resp.status_code == 200:
                 return resp.json()
             return None
@@ -216,7 +402,7 @@ class ImmichConnection:
             Album information dictionary or None if not found
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/albums/{album_id}")
+            resp = self.http.get(f"{self.base_url}/api/albums/{album_id}")
             if resp.status_code == 200:
                 return resp.json()
             return None
@@ -243,7 +429,7 @@ class ImmichConnection:
                 "ids": asset_ids,
                 "force": force
             }
-            resp = self.session.delete(
+            resp = self.http.delete(
                 f"{self.base_url}/api/assets",
                 json=payload
             )
@@ -253,6 +439,83 @@ class ImmichConnection:
             self.logger.error(f"Error deleting assets: {e}")
             return False
 
+    def update_assets(self, asset_ids: List[str], **fields: Any) -> bool:
+        """
+        Set the same metadata on several assets (PUT /api/assets).
+        
+        Args:
+            asset_ids: List of asset IDs to update
+            **fields: AssetBulkUpdateDto fields, e.g. dateTimeOriginal, description
+            
+        Returns:
+            True if update successful, False otherwise
+        """
+        if not asset_ids:
+            return True
+        
+        try:
+            resp = self.http.put(
+                f"{self.base_url}/api/assets",
+                json=dict(fields, ids=asset_ids)
+            )
+            resp.raise_for_status()
+            return True
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error updating assets: {e}")
+            return False
+    
+    def upsert_tags(self, names: List[str]) -> Dict[str, str]:
+        """
+        Create tags that do not exist yet (PUT /api/tags).
+        
+        Args:
+            names: Tag values; '/' separates parent and child tags
+            
+        Returns:
+            Dictionary of tag value to tag ID (empty on error)
+        """
+        if not names:
+            return {}
+        
+        try:
+            resp = self.http.put(
+                f"{self.base_url}/api/tags",
+                json={"tags": list(names)}
+            )
+            resp.raise_for_status()
+            return {
+                tag.get("value") or tag.get("name"): tag["id"]
+                for tag in resp.json() if tag.get("id")
+            }
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.logger.error(f"Error creating tags: {e}")
+            return {}
+    
+    def tag_assets(self, tag_ids: List[str], asset_ids: List[str]) -> bool:
+        """
+        Add tags to assets (PUT /api/tags/assets); existing tags are kept.
+        
+        Args:
+            tag_ids: Tag IDs to add
+            asset_ids: Asset IDs to tag
+            
+        Returns:
+            True if tagging successful, False otherwise
+        """
+        if not tag_ids or not asset_ids:
+            return True
+        
+        try:
+            resp = self.http.put(
+                f"{self.base_url}/api/tags/assets",
+                json={"tagIds": tag_ids, "assetIds": asset_ids}
+            )
+            resp.raise_for_status()
+            return True
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error tagging assets: {e}")
+            return False
+
     def get_queues(self) -> List[Dict[str, Any]]:
         """
         Get queue status for all queues.
@@ -261,7 +524,7 @@ class ImmichConnection:
             List of queue dictionaries
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/queues")
+            resp = self.http.get(f"{self.base_url}/api/queues")
             resp.raise_for_status()
             data = resp.json()
             return data if isinstance(data, list) else []
@@ -277,7 +540,7 @@ class ImmichConnection:
             List of library dictionaries with id, name, type, etc.
         """
         try:
-            resp = self.session.get(f"{self.base_url}/api/libraries")
+            resp = self.http.get(f"{self.base_url}/api/libraries")
             resp.raise_for_status()
             return resp.json()
         except requests.exceptions.RequestException as e:
@@ -295,7 +558,7 @@ class ImmichConnection:
             True if scan triggered successfully, False otherwise
         """
         try:
-            resp = self.session.post(
+            resp = self.http.post(
                 f"{self.base_url}/api/libraries/{library_id}/scan"
             )
             # 204 No Content is the expected success response
@@ -1,14 +1,163 @@
 """Immich database operations via SSH and Docker."""
 
+import os
+import queue
 import subprocess
 import logging
 import shlex
-from typing import Optional, Dict, Any
+import tempfile
+import threading
+from typing import Optional, Dict, Any, List
+
+
+class PsqlSession:
+    """
+    One long-lived psql process fed SQL over a pipe.
+
+    psql runs unaligned and tuples-only (-A -t -F <unit separator>), so each
+    output line is one row. After every statement the session echoes a marker
+    carrying psql's :ERROR flag, which delimits per-statement results without
+    relying on stderr ordering. Statements are sent unchanged and may span
+    lines; result values with embedded newlines are not supported.
+    """
+    
+    FIELD_SEPARATOR = "\x1f"
+    
+    MARKER = "__IMMICH_SQL__"
+    
+    def __init__(
+        self,
+        command: List[str],
+        timeout: float = 60.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Args:
+            command: Command starting psql (possibly via ssh/docker) reading stdin
+            timeout: Seconds to wait for a batch to finish
+            logger: Optional logger instance
+        """
+        self.command = command
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.process: Optional[subprocess.Popen] = None
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.batch = 0
+        self.stats = {'started': 0, 'batches': 0, 'statements': 0}
+    
+    def start(self):
+        """Start psql if it is not running."""
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.logger.debug(f"Starting psql session: {shlex.join(self.command)}")
+        # stderr is inherited so ssh can still prompt for a password
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        self.lines = queue.Queue()
+        threading.Thread(
+            target=self._read_stdout, args=(self.process.stdout, self.lines), daemon=True
+        ).start()
+        self.stats['started'] += 1
+    
+    @staticmethod
+    def _read_stdout(stream, lines):
+        for line in stream:
+            lines.put(line.rstrip("\n"))
+        lines.put(None)
+    
+    def close(self):
+        """End psql."""
+        if self.process is None:
+            return
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.write("\\q\n")
+                self.process.stdin.flush()
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        self.process = None
+    
+    def __enter__(self) -> "PsqlSession":
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def run(self, statements: List[str], transaction: bool = True) -> Dict[str, Any]:
+        """
+        Run statements in one round trip.
+        
+        Args:
+            statements: SQL statements
+            transaction: Wrap them in BEGIN/COMMIT (an error rolls back all)
+            
+        Returns:
+            Dictionary with 'success', 'results' (rows per statement, each row
+            a list of strings) and 'error' keys
+        """
+        self.start()
+        self.batch += 1
+        prefix = f"{self.MARKER}{self.batch}:"
+        script = ["BEGIN;"] if transaction else []
+        for index, statement in enumerate(statements):
+            statement = statement.strip()
+            if not statement.endswith(";"):
+                # On its own line, so a trailing -- comment cannot swallow it
+                statement += "\n;"
+            script.append(statement)
+            script.append(f"\\echo {prefix}{index} :ERROR :LAST_ERROR_MESSAGE")
+        if transaction:
+            script.append("COMMIT;")
+        script.append(f"\\echo {prefix}end :ERROR :LAST_ERROR_MESSAGE")
+        
+        self.stats['batches'] += 1
+        self.stats['statements'] += len(statements)
+        results: List[List[List[str]]] = []
+        rows: List[List[str]] = []
+        error = None
+        try:
+            self.process.stdin.write("\n".join(script) + "\n")
+            self.process.stdin.flush()
+            while True:
+                line = self.lines.get(timeout=self.timeout)
+                if line is None:
+                    self.process = None
+                    return {'success': False, 'results': results, 'error': error or 'psql exited'}
+                if not line.startswith(prefix):
+                    rows.append(line.split(self.FIELD_SEPARATOR))
+                    continue
+                tag, failed, message = (line[len(prefix):].split(" ", 2) + ["", ""])[:3]
+                if failed == "true" and error is None:
+                    error = message or f"statement {tag} failed"
+                if tag == "end":
+                    break
+                results.append(rows)
+                rows = []
+        except queue.Empty:
+            self.logger.error("psql session timed out")
+            self.process.kill()
+            self.process = None
+            return {'success': False, 'results': results, 'error': 'SQL execution timeout'}
+        except OSError as e:
+            self.process = None
+            return {'success': False, 'results': results, 'error': str(e)}
+        
+        return {'success': error is None, 'results': results, 'error': error}
 
 
 class ImmichDatabase:
     """Handles database operations on remote Immich PostgreSQL via SSH/Docker."""
     
+    DELETED_COUNT_SQL = 'SELECT COUNT(*) FROM asset WHERE "deletedAt" IS NOT NULL;'
+    
     def __init__(
         self,
         ssh_host: str,
@@ -17,11 +166,16 @@ class ImmichDatabase:
         container_name: str = "immich_postgres",
         db_user: str = "postgres",
         db_name: str = "immich",
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        control_persist: int = 300,
+        psql_command: Optional[List[str]] = None
     ):
         """
         Initialize Immich database handler.
         
+        SSH connections share one ControlMaster socket, so a password is asked
+        for at most once, and all SQL goes through a single psql session.
+        
         Args:
             ssh_host: SSH hostname or IP address
             ssh_user: SSH username
@@ -30,6 +184,9 @@ class ImmichDatabase:
             db_user: PostgreSQL username (default: postgres)
             db_name: Database name (default: immich)
             logger: Optional logger instance
+            control_persist: Seconds the SSH master stays open when idle
+            psql_command: Run this psql (or stand-in) command locally instead
+                of psql over SSH/Docker
         """
         self.ssh_host = ssh_host
         self.ssh_user = ssh_user
@@ -38,27 +195,56 @@ class ImmichDatabase:
         self.db_user = db_user
         self.db_name = db_name
         self.logger = logger or logging.getLogger(__name__)
+        self.control_persist = control_persist
+        self.control_path = os.path.join(tempfile.gettempdir(), "immich-ssh-%C")
+        self.psql_command = psql_command
+        self.session: Optional[PsqlSession] = None
+    
+    def ssh_command(self, *remote: str) -> List[str]:
+        """Build an ssh command that shares the ControlMaster connection."""
+        return [
+            "ssh",
+            "-p", str(self.ssh_port),
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_path}",
+            "-o", f"ControlPersist={self.control_persist}",
+            f"{self.ssh_user}@{self.ssh_host}",
+            *remote
+        ]
+    
+    def session_command(self) -> List[str]:
+        """Build the command starting the long-lived psql session."""
+        psql = [
+            "psql", f"postgresql://{self.db_user}@localhost/{self.db_name}",
+            "-X", "-q", "-t", "-A",
+            "-F", PsqlSession.FIELD_SEPARATOR,
+            "-P", "pager=off"
+        ]
+        if self.psql_command:
+            return list(self.psql_command) + psql[2:]
+        return self.ssh_command(
+            f"docker exec -i {shlex.quote(self.container_name)} {shlex.join(psql)}"
+        )
     
     def test_ssh_connection(self) -> bool:
         """
         Test SSH connection to the server.
-        Allows interactive password entry if needed.
+        Allows interactive password entry if needed, and leaves the SSH master
+        running for later queries.
         
         Returns:
             True if connection successful, False otherwise
         """
         import sys
+        if self.psql_command:
+            return True
         try:
             self.logger.info(f"Testing SSH connection (you may be prompted for password)...")
             # Don't capture output to allow interactive password prompt
+            command = self.ssh_command("echo 'OK'")
+            command[3:3] = ["-o", "ConnectTimeout=5"]
             result = subprocess.run(
-                [
-                    "ssh",
-                    "-p", str(self.ssh_port),
-                    "-o", "ConnectTimeout=5",
-                    f"{self.ssh_user}@{self.ssh_host}",
-                    "echo 'OK'"
-                ],
+                command,
                 stdin=sys.stdin,
                 stdout=subprocess.PIPE,
                 stderr=sys.stderr,
@@ -79,6 +265,49 @@ class ImmichDatabase:
             self.logger.error(f"SSH connection error: {e}")
             return False
     
+    def close(self):
+        """End the psql session and the SSH master."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        if self.psql_command:
+            return
+        try:
+            subprocess.run(
+                self.ssh_command()[:-1] + ["-O", "exit", f"{self.ssh_user}@{self.ssh_host}"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.logger.debug(f"Could not stop SSH master: {e}")
+    
+    def __enter__(self) -> "ImmichDatabase":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def execute_batch(self, statements: List[str], transaction: bool = True) -> Dict[str, Any]:
+        """
+        Execute several SQL statements in one round trip.
+        
+        Args:
+            statements: SQL statements
+            transaction: Run them in a single transaction
+            
+        Returns:
+            Dictionary with 'success', 'results' (rows per statement) and 'error' keys
+        """
+        if self.session is None:
+            self.session = PsqlSession(self.session_command(), logger=self.logger)
+        for statement in statements:
+            self.logger.debug(f"Executing SQL: {statement}")
+        try:
+            return self.session.run(statements, transaction=transaction)
+        except Exception as e:
+            return {'success': False, 'results': [], 'error': str(e)}
+    
     def execute_sql(self, sql: str) -> Dict[str, Any]:
         """
         Execute SQL command on remote Immich database.
@@ -87,52 +316,23 @@ class ImmichDatabase:
             sql: SQL command to execute
             
         Returns:
-            Dictionary with 'success', 'output', and 'error' keys
+            Dictionary with 'success', 'output', and 'error' keys; output has
+            one line per row, fields separated by PsqlSession.FIELD_SEPARATOR
         """
-        import sys
-        try:
-            # Build the complete docker command as a string that will be executed on remote
-            #docker_cmd = f"docker exec {shlex.quote(self.container_name)} psql -U {shlex.quote(self.db_user)} -d {shlex.quote(self.db_name)} -t -c {shlex.quote(sql)}"
-            
-            # Alternative: Use psql connection string format which handles special chars better
-            docker_cmd = f"docker exec {self.container_name} psql postgresql://{self.db_user}@localhost/{shlex.quote(self.db_name)} -t -c {shlex.quote(sql)}"
-            
-            self.logger.debug(f"Executing SQL: {sql}")
-            self.logger.debug(f"Docker command: {docker_cmd}")
-            
-            # Execute via SSH - allow password prompt
-            result = subprocess.run(
-                [
-                    "ssh",
-                    "-p", str(self.ssh_port),
-                    f"{self.ssh_user}@{self.ssh_host}",
-                    docker_cmd
-                ],
-                stdin=sys.stdin,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=30
-            )
-            
-            return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'output': '',
-                'error': 'SQL execution timeout'
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'output': '',
-                'error': str(e)
-            }
+        result = self.execute_batch([sql], transaction=False)
+        rows = result['results'][0] if result['results'] else []
+        return {
+            'success': result['success'],
+            'output': "\n".join(PsqlSession.FIELD_SEPARATOR.join(row) for row in rows),
+            'error': result['error'] or ''
+        }
+    
+    @staticmethod
+    def _parse_count(rows: List[List[str]]) -> Optional[int]:
+        for row in rows:
+            if row and row[0].strip().isdigit():
+                return int(row[0].strip())
+        return None
     
     def get_deleted_count(self) -> Optional[int]:
         """
@@ -141,56 +341,32 @@ class ImmichDatabase:
         Returns:
             Number of deleted assets, or None if query failed
         """
-        result = self.execute_sql(
-            'SELECT COUNT(*) FROM asset WHERE "deletedAt" IS NOT NULL;'
-        )
+        result = self.execute_batch([self.DELETED_COUNT_SQL], transaction=False)
         
         if not result['success']:
             self.logger.error(f"Failed to query deleted count: {result['error']}")
             return None
         
-        try:
-            # Parse output like "count\n-----\n   48\n(1 row)"
-            lines = result['output'].strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.isdigit():
-                    return int(line)
-            return None
-        except Exception as e:
-            self.logger.error(f"Error parsing deleted count: {e}")
-            return None
+        count = self._parse_count(result['results'][0])
+        if count is None:
+            self.logger.error(f"Error parsing deleted count: {result['results'][0]}")
+        return count
     
     def clear_deletion_records(self) -> Dict[str, Any]:
         """
         Clear deletedAt timestamps from all assets.
         
+        The count, update and verification run in one transaction and one
+        round trip.
+        
         Returns:
             Dictionary with 'success', 'affected_rows', and 'error' keys
         """
-        # Get count before clearing
-        before_count = self.get_deleted_count()
-        
-        if before_count is None:
-            return {
-                'success': False,
-                'affected_rows': 0,
-                'error': 'Failed to query initial deleted count'
-            }
-        
-        self.logger.info(f"Found {before_count} deleted assets")
-        
-        if before_count == 0:
-            return {
-                'success': True,
-                'affected_rows': 0,
-                'error': None
-            }
-        
-        # Execute the UPDATE
-        result = self.execute_sql(
-            'UPDATE asset SET "deletedAt" = NULL WHERE "deletedAt" IS NOT NULL;'
-        )
+        result = self.execute_batch([
+            self.DELETED_COUNT_SQL,
+            'UPDATE asset SET "deletedAt" = NULL WHERE "deletedAt" IS NOT NULL;',
+            self.DELETED_COUNT_SQL,
+        ])
         
         if not result['success']:
             return {
@@ -199,20 +375,19 @@ class ImmichDatabase:
                 'error': result['error']
             }
         
-        # Verify the update
-        after_count = self.get_deleted_count()
-        
-        if after_count is None:
+        before_count = self._parse_count(result['results'][0])
+        after_count = self._parse_count(result['results'][2])
+        if before_count is None or after_count is None:
             return {
                 'success': False,
                 'affected_rows': 0,
                 'error': 'Failed to verify deletion was cleared'
             }
         
-        affected_rows = before_count - after_count
+        self.logger.info(f"Found {before_count} deleted assets")
         
         return {
             'success': True,
-            'affected_rows': affected_rows,
+            'affected_rows': before_count - after_count,
             'error': None
         }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Push analyze CSV metadata straight to Immich instead of rewriting files."""
+
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from image_updater import ImageUpdater
+
+
+class MetadataPusher(ImageUpdater):
+    """
+    Apply the date, description and tags of selected analyze CSV rows through
+    Immich's bulk APIs.
+
+    Rows are selected and dates/offsets computed exactly as ImageUpdater does,
+    but nothing on disk changes and no rescan is needed. Asset IDs come from
+    the cache (ImmichCache.find_by_path). Assets that share a date and
+    description are updated in one PUT /api/assets request, and tags are added
+    with one PUT /api/tags/assets request per tag. Requests run concurrently.
+
+    Unlike the EXIF rewrite, existing Immich tags are kept (tags are only
+    added), and file renames/moves from the CSV are not applied.
+    """
+
+    def __init__(
+        self,
+        csv_path: str,
+        connection,
+        cache,
+        logger,
+        dry_run: bool = False,
+        all_rows: bool = False,
+        max_workers: Optional[int] = None,
+        force: bool = False,
+        batch_size: int = 500,
+    ) -> None:
+        super().__init__(
+            csv_path,
+            logger,
+            dry_run=dry_run,
+            all_rows=all_rows,
+            max_workers=max_workers,
+            force=force,
+        )
+        self.connection = connection
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.stats.update({
+            "not_in_cache": 0,
+            "assets_updated": 0,
+            "tags_applied": 0,
+            "requests": 0,
+        })
+
+    def process(self) -> Dict[str, int]:
+        if not self.csv_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+
+        rows = self._load_selected_rows()
+        if not rows:
+            self.logger.info("No rows to process")
+            return self.stats
+
+        updates, tags = self._collect_changes(rows)
+        jobs = self._update_jobs(updates)
+        jobs.extend(self._tag_jobs(tags))
+
+        self.logger.info(
+            f"Pushing metadata for {sum(len(ids) for ids in updates.values())} assets "
+            f"and {len(tags)} tags in {len(jobs)} requests ({self.max_workers} workers)..."
+        )
+        self._run_jobs(jobs)
+        return self.stats
+
+    def _collect_changes(
+        self, rows: List[Dict[str, str]]
+    ) -> Tuple[Dict[Tuple[Tuple[str, str], ...], List[str]], Dict[str, List[str]]]:
+        """Group asset IDs by identical field values, and by tag."""
+        updates: Dict[Tuple[Tuple[str, str], ...], List[str]] = defaultdict(list)
+        tags: Dict[str, List[str]] = defaultdict(list)
+
+        for row in rows:
+            file_path = row.get("Filenanme") or row.get("Filename") or row.get("File") or ""
+            asset_id = self._resolve_asset_id(file_path)
+            if not asset_id:
+                self.stats["not_in_cache"] += 1
+                self.logger.warning(f"No cached Immich asset for {file_path}")
+                continue
+
+            exif_datetime = self._format_exif_datetime(
+                row.get("Calc Date", ""), row.get("Calc Filename", "")
+            )
+            fields = {}
+            if exif_datetime:
+                offset = self._resolve_calc_offset(row, exif_datetime)
+                fields["dateTimeOriginal"] = self._immich_datetime(exif_datetime, offset)
+            description = row.get("Calc Description", "")
+            if description:
+                fields["description"] = description
+            if fields:
+                updates[tuple(sorted(fields.items()))].append(asset_id)
+
+            for tag in self._split_tags(row.get("Calc Tags", "")):
+                tags[tag].append(asset_id)
+
+            self.logger.audit(f"AUDIT file={file_path} asset={asset_id} fields={sorted(fields)}")
+
+        return updates, tags
+
+    def _resolve_asset_id(self, file_path: str) -> Optional[str]:
+        """Find the asset whose matched path is file_path (as given, absolute, or under the cache target)."""
+        candidates = [file_path, os.path.abspath(file_path)]
+        target = self.cache.metadata.get("target_path")
+        if target:
+            try:
+                relative = Path(os.path.abspath(file_path)).relative_to(os.path.abspath(target))
+                candidates.append(str(Path(target) / relative))
+            except ValueError:
+                pass
+        for candidate in candidates:
+            asset = self.cache.find_by_path(candidate)
+            if asset:
+                return asset.get("immich_data", {}).get("id")
+        return None
+
+    @staticmethod
+    def _immich_datetime(exif_datetime: str, offset: str) -> str:
+        """Convert 'YYYY:MM:DD HH:MM:SS' plus '+HH:MM' to ISO 8601."""
+        date_part, _, time_part = exif_datetime.partition(" ")
+        return f"{date_part.replace(':', '-')}T{time_part or '00:00:00'}{offset}"
+
+    def _chunks(self, ids: List[str]) -> List[List[str]]:
+        return [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+
+    def _update_jobs(self, updates) -> List[Tuple[str, int, Callable[[], bool]]]:
+        jobs = []
+        for key, asset_ids in updates.items():
+            fields = dict(key)
+            for chunk in self._chunks(asset_ids):
+                jobs.append((
+                    "assets_updated",
+                    len(chunk),
+                    lambda chunk=chunk, fields=fields: self.connection.update_assets(chunk, **fields),
+                ))
+        return jobs
+
+    def _tag_jobs(self, tags: Dict[str, List[str]]) -> List[Tuple[str, int, Callable[[], bool]]]:
+        if not tags:
+            return []
+        if self.dry_run:
+            tag_ids = {name: name for name in tags}
+        else:
+            # One request creates any missing tags and returns every ID
+            tag_ids = self.connection.upsert_tags(sorted(tags))
+            self.stats["requests"] += 1
+
+        jobs = []
+        for name, asset_ids in tags.items():
+            tag_id = tag_ids.get(name)
+            if not tag_id:
+                self.logger.error(f"Could not create tag {name}")
+                self.stats["errors"] += 1
+                continue
+            for chunk in self._chunks(asset_ids):
+                jobs.append((
+                    "tags_applied",
+                    len(chunk),
+                    lambda chunk=chunk, tag_id=tag_id: self.connection.tag_assets([tag_id], chunk),
+                ))
+        return jobs
+
+    def _run_jobs(self, jobs: List[Tuple[str, int, Callable[[], bool]]]) -> None:
+        if self.dry_run:
+            for stat, count, _ in jobs:
+                self.stats[stat] += count
+            self.logger.info(f"[DRY RUN] Would send {len(jobs)} requests")
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(job): (stat, count) for stat, count, job in jobs}
+            for idx, future in enumerate(as_completed(futures), 1):
+                stat, count = futures[future]
+                self.stats["requests"] += 1
+                try:
+                    ok = future.result()
+                except Exception as exc:
+                    self.logger.error(f"Immich update request failed: {exc}")
+                    ok = False
+                if ok:
+                    self.stats[stat] += count
+                else:
+                    self.stats["errors"] += 1
+
+                if idx % 50 == 0:
+                    self.logger.info(f"Push Progress: {idx}/{len(jobs)} requests")
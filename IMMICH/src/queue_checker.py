@@ -3,8 +3,9 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 
 @dataclass(frozen=True)
@@ -21,12 +22,65 @@ class QueueInfo:
     def is_idle(self) -> bool:
         return self.active == 0 and self.waiting == 0 and self.delayed == 0
 
+    @property
+    def pending(self) -> int:
+        return self.active + self.waiting + self.delayed
+
 
 @dataclass(frozen=True)
 class QueueOverview:
     queues: List[QueueInfo]
     all_idle: bool
 
+    @property
+    def is_idle(self) -> bool:
+        return self.all_idle
+
+
+@dataclass(frozen=True)
+class QueueProgress:
+    """Drain rate (jobs/second) and ETA of one queue between two snapshots."""
+
+    name: str
+    pending: int
+    drain_rate: float
+    eta_seconds: Optional[float]
+
+
+class DrainTracker:
+    """Estimate per-queue drain rate and ETA from successive snapshots."""
+
+    def __init__(self, smoothing: float = 0.5) -> None:
+        self.smoothing = smoothing
+        self.rates: Dict[str, float] = {}
+        self._previous: Optional[QueueOverview] = None
+        self._previous_time = 0.0
+
+    def update(self, overview: QueueOverview, now: float) -> List[QueueProgress]:
+        previous = {}
+        elapsed = 0.0
+        if self._previous is not None:
+            previous = {queue.name: queue for queue in self._previous.queues}
+            elapsed = now - self._previous_time
+        self._previous, self._previous_time = overview, now
+
+        progress = []
+        for queue in overview.queues:
+            before = previous.get(queue.name)
+            if before is not None and elapsed > 0:
+                # Finished jobs, or the pending drop when counters are not reported
+                finished = (queue.completed - before.completed) + (queue.failed - before.failed)
+                drained = max(finished, before.pending - queue.pending, 0)
+                sample = drained / elapsed
+                old = self.rates.get(queue.name)
+                self.rates[queue.name] = sample if old is None else (
+                    self.smoothing * sample + (1 - self.smoothing) * old
+                )
+            rate = self.rates.get(queue.name, 0.0)
+            eta = queue.pending / rate if rate > 0 else (0.0 if queue.is_idle else None)
+            progress.append(QueueProgress(queue.name, queue.pending, rate, eta))
+        return progress
+
 
 class QueueChecker:
     """Evaluate Immich queues to determine whether the system is idle."""
@@ -34,11 +88,102 @@ class QueueChecker:
     def __init__(self, connection, logger) -> None:
         self.connection = connection
         self.logger = logger
+        self._sleep = time.sleep
+        self._clock = time.monotonic
 
     def fetch_queue_overview(self) -> QueueOverview:
         queues = self.connection.get_queues()
         return self.summarize(queues)
 
+    def wait_until_idle(
+        self,
+        timeout: Optional[float] = None,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+        confirm_polls: int = 2,
+        start_grace: float = 0.0,
+        on_progress: Optional[Callable[[QueueOverview, List[QueueProgress]], None]] = None,
+    ) -> QueueOverview:
+        """
+        Poll the queues until every one is idle.
+
+        The poll interval grows by backoff while queues are busy, is capped
+        at a quarter of the longest ETA (so a nearly drained queue is checked
+        again soon), and stays within [min_interval, max_interval]. Idle must
+        be seen on confirm_polls consecutive polls, since Immich can leave
+        short gaps between the jobs it chains after a scan. A failed poll is
+        logged and retried with the same backoff.
+
+        With start_grace, idle polls only count once some queue was seen busy
+        or start_grace seconds have passed, so waiting right after a request
+        does not finish before Immich has queued its jobs. A paused queue with
+        pending jobs cannot drain, so the wait stops with a warning.
+
+        Args:
+            timeout: Give up after this many seconds (None waits forever)
+            min_interval: Shortest wait between polls in seconds
+            max_interval: Longest wait between polls in seconds
+            backoff: Interval growth factor while queues stay busy
+            confirm_polls: Consecutive idle polls required
+            start_grace: Seconds to wait for queues to become busy first
+            on_progress: Called with each overview and its per-queue progress
+
+        Returns:
+            The last overview; its is_idle is False if the timeout expired
+            or a paused queue holds pending jobs
+        """
+        tracker = DrainTracker()
+        start = self._clock()
+        interval = min_interval
+        idle_polls = 0
+        started = start_grace <= 0
+        overview = QueueOverview(queues=[], all_idle=False)
+
+        while True:
+            try:
+                overview = self.fetch_queue_overview()
+            except Exception as exc:
+                self.logger.warning("Failed to fetch queues: %s", exc)
+                idle_polls = 0
+                interval = min(interval * backoff, max_interval)
+            else:
+                progress = tracker.update(overview, self._clock())
+                if on_progress is not None:
+                    on_progress(overview, progress)
+                paused = [q for q in overview.queues if q.is_paused and q.pending]
+                for queue in paused:
+                    self.logger.warning(
+                        "Queue %s is paused with %d pending jobs; resume it in Immich",
+                        queue.name,
+                        queue.pending,
+                    )
+                if paused:
+                    return QueueOverview(queues=overview.queues, all_idle=False)
+                if not started:
+                    started = not overview.is_idle or self._clock() - start >= start_grace
+                if overview.is_idle and not started:
+                    interval = min_interval
+                elif overview.is_idle:
+                    idle_polls += 1
+                    if idle_polls >= confirm_polls:
+                        return overview
+                    interval = min_interval
+                else:
+                    idle_polls = 0
+                    interval = min(interval * backoff, max_interval)
+                    etas = [p.eta_seconds for p in progress if p.eta_seconds]
+                    if etas:
+                        interval = min(interval, max(etas) / 4)
+                    interval = max(interval, min_interval)
+
+            if timeout is not None:
+                remaining = timeout - (self._clock() - start)
+                if remaining <= 0:
+                    return QueueOverview(queues=overview.queues, all_idle=False)
+                interval = min(interval, remaining)
+            self._sleep(interval)
+
     def summarize(self, queues: List[Dict[str, Any]]) -> QueueOverview:
         queue_infos = [self._to_queue_info(queue) for queue in queues]
         all_idle = all(queue.is_idle for queue in queue_infos)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark ImmichCache.load() on a synthetic cache.
+
+Generates a cache shaped like a real library (a few very large albums, popular
+tags, unique filenames) and times load() and rebuild_indices(). Not collected
+by pytest; run directly:
+
+    python tests/benchmark_cache_load.py            # 500k assets
+    python tests/benchmark_cache_load.py 100000 --keep /tmp/cache_100k.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from immich_cache import ImmichCache
+
+
+def build_synthetic_cache(path: Path, count: int):
+    """Write a cache file with `count` assets."""
+    assets = {}
+    for i in range(count):
+        asset_id = f"asset-{i:08d}"
+        assets[asset_id] = {
+            "immich_data": {
+                "id": asset_id,
+                "originalFileName": f"IMG_{i % 9999:04d}_{i // 9999}.jpg",
+                "updatedAt": f"2025-{1 + i % 12:02d}-01T00:00:00.000Z",
+                # One album per 10k assets plus one huge album for every 3rd asset
+                "albums": [f"album-{i // 10000}"] + (["album-all"] if i % 3 == 0 else []),
+                "tags": [{"name": f"tag-{i % 50}"}, {"name": "popular"}],
+            },
+            "file_mapping": {
+                "matched_path": f"/photos/{i // 1000}/IMG_{i}.jpg",
+                "match_confidence": "exact",
+                "matched_at": "2025-10-25T00:00:00Z",
+                "match_method": "unique_filename",
+            },
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"metadata": {"total_assets": count}, "assets": assets}, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("count", nargs="?", type=int, default=500_000)
+    parser.add_argument("--keep", help="Write the synthetic cache here and keep it")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(args.keep) if args.keep else Path(tmpdir) / "cache.json"
+        if not path.exists():
+            start = time.perf_counter()
+            build_synthetic_cache(path, args.count)
+            print(f"Generated {args.count} assets in {time.perf_counter() - start:.1f}s "
+                  f"({path.stat().st_size / 1e6:.0f} MB)")
+
+        cache = ImmichCache(str(path))
+        start = time.perf_counter()
+        cache.load()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache.rebuild_indices()
+        index_time = time.perf_counter() - start
+
+        print(f"load():            {load_time:.2f}s")
+        print(f"rebuild_indices(): {index_time:.2f}s")
+        print(f"albums: {len(cache.indices['by_album'])}, "
+              f"largest: {len(cache.indices['by_album'].get('album-all', ()))} assets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Immich-facing scripts against the local fake Immich server.
+
+Starts fake_immich_server.FakeImmichServer with a synthetic library, writes
+local copies of a fraction of its assets (content matches the asset checksum),
+then runs IMMICH scripts/cache.py and EXIF scripts/immich_extract.py --dry-run
+against it and reports wall time and requests per endpoint. Not collected by
+pytest; run directly:
+
+    python tests/benchmark_immich_scripts.py                     # 10k assets
+    python tests/benchmark_immich_scripts.py 50000 --latency 0.02 --error-rate 0.01
+    python tests/benchmark_immich_scripts.py 5000 --scripts cache --keep /tmp/bench
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_immich_server import FakeImmichServer, SyntheticLibrary
+
+IMMICH_ROOT = Path(__file__).resolve().parent.parent
+EXIF_ROOT = IMMICH_ROOT.parent / "EXIF"
+
+API_KEY = "benchmark-key"
+
+
+def write_local_library(library: SyntheticLibrary, target: Path, match_ratio: float) -> int:
+    """Write local copies of every n-th asset; returns the number of files."""
+    step = max(1, round(1 / match_ratio)) if match_ratio > 0 else 0
+    written = 0
+    if not step:
+        target.mkdir(parents=True, exist_ok=True)
+        return 0
+    for index in range(0, library.count, step):
+        path = target / library.relative_path(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(library.content(index))
+        written += 1
+    return written
+
+
+def script_command(script: Path, *args: str):
+    """
+    Command running a script via runpy, so the script's own directory is not
+    put first on sys.path (EXIF/scripts/select.py would shadow stdlib select).
+    """
+    launcher = "import runpy, sys; sys.argv = sys.argv[1:]; runpy.run_path(sys.argv[0], run_name='__main__')"
+    return [sys.executable, "-c", launcher, str(script), *args]
+
+
+def run_script(name: str, command, workdir: Path, server: FakeImmichServer, verbose: bool):
+    """Run one script against the server and print its timing."""
+    env = dict(os.environ, IMMICH_URL=server.url, IMMICH_API_KEY=API_KEY)
+    server.requests.clear()
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    total = sum(server.requests.values())
+    status = "✅" if result.returncode == 0 else f"❌ exit {result.returncode}"
+    print(f"\n{name}: {elapsed:.2f}s, {total} requests ({total / elapsed:.0f}/s) {status}")
+    for endpoint, count in server.requests.most_common():
+        print(f"  {endpoint}: {count}")
+    if result.returncode != 0 or verbose:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("count", nargs="?", type=int, default=10_000, help="Library size")
+    parser.add_argument("--albums", type=int, default=10, help="Number of albums")
+    parser.add_argument("--match-ratio", type=float, default=1.0,
+                        help="Fraction of assets with a local copy")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--scripts", default="cache,extract",
+                        help="Comma-separated scripts to run: cache, extract")
+    parser.add_argument("--keep", help="Work in this directory and keep it")
+    parser.add_argument("--verbose", action="store_true", help="Print script output")
+    args = parser.parse_args()
+
+    library = SyntheticLibrary(args.count, albums=args.albums)
+    scripts = {name.strip() for name in args.scripts.split(",")}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(args.keep) if args.keep else Path(tmpdir)
+        target = workdir / "photos"
+        start = time.perf_counter()
+        files = write_local_library(library, target, args.match_ratio)
+        print(f"Synthetic library: {args.count} assets, {files} local files "
+              f"({time.perf_counter() - start:.1f}s to write)")
+
+        with FakeImmichServer(
+            library,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            api_key=API_KEY,
+        ) as server:
+            print(f"Fake Immich server at {server.url}")
+
+            if "cache" in scripts:
+                run_script(
+                    "cache.py",
+                    script_command(IMMICH_ROOT / "scripts" / "cache.py", str(target),
+                                   "--cache", str(workdir / "immich_cache.json"), "--clear"),
+                    workdir, server, args.verbose,
+                )
+            if "extract" in scripts:
+                run_script(
+                    "immich_extract.py",
+                    script_command(EXIF_ROOT / "scripts" / "immich_extract.py", "--search",
+                                   "--search-path", str(target), "--updatedAfter", "2000-01-01T00:00:00Z",
+                                   "--refresh-cache", "--dry-run"),
+                    workdir, server, args.verbose,
+                )
+
+
+if __name__ == "__main__":
+    main()
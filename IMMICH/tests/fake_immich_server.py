@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Immich API endpoints used by the IMMICH and EXIF scripts.
+
+Serves a synthetic library generated from the asset index (no per-asset state
+is kept until assets are deleted or edited), with optional injected latency and 503
+errors, so script throughput can be measured without a live server. Used by
+tests and by benchmark_immich_scripts.py; can also be run directly:
+
+    python tests/fake_immich_server.py --assets 50000 --port 2283 --latency 0.02
+
+Endpoints:
+    GET    /api/server/ping
+    GET    /api/users/me
+    POST   /api/search/metadata      (page/size, updatedAfter/Before, trashedAfter, withExif)
+    GET    /api/assets/{id}
+    DELETE /api/assets               ({"ids": [...], "force": bool})
+    PUT    /api/assets               ({"ids": [...], dateTimeOriginal, description, ...})
+    PUT    /api/tags                 ({"tags": [...]})
+    PUT    /api/tags/assets          ({"tagIds": [...], "assetIds": [...]})
+    GET    /api/albums
+    GET    /api/albums/{id}
+    GET    /api/queues
+    GET    /api/libraries
+    POST   /api/libraries/{id}/scan
+    POST   /api/sync/delta-sync
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def _format_time(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class SyntheticLibrary:
+    """Deterministic synthetic Immich library of `count` image assets."""
+
+    LIBRARY_ID = "11111111-1111-4111-8111-000000000001"
+    USER_ID = "22222222-2222-4222-8222-000000000001"
+
+    # Asset i was last updated BASE_TIME + i seconds, so date filters are ranges
+    BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, count: int, albums: int = 10, tags: int = 25):
+        self.count = count
+        self.album_count = max(1, albums)
+        self.tag_count = max(1, tags)
+        self.trashed: Dict[int, datetime] = {}
+        self.deleted: Dict[int, datetime] = {}
+        # Metadata set through PUT /api/assets and PUT /api/tags/assets
+        self.edits: Dict[int, Dict[str, Any]] = {}
+        self.tags: Dict[str, str] = {}
+        self.asset_tags: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def asset_id(index: int) -> str:
+        return f"00000000-0000-4000-8000-{index:012d}"
+
+    @staticmethod
+    def index_of(asset_id: str) -> Optional[int]:
+        match = re.fullmatch(r"00000000-0000-4000-8000-(\d{12})", asset_id or "")
+        return int(match.group(1)) if match else None
+
+    def album_id(self, album: int) -> str:
+        return f"33333333-3333-4333-8333-{album:012d}"
+
+    def filename(self, index: int) -> str:
+        return f"IMG_{index:06d}.jpg"
+
+    def relative_path(self, index: int) -> str:
+        """Folder layout a local copy of the asset is expected under."""
+        return f"{2000 + index % 20}/{self.filename(index)}"
+
+    @staticmethod
+    def content(index: int) -> bytes:
+        """File content whose SHA-1 is the asset's checksum."""
+        return f"fake immich asset {index}\n".encode()
+
+    def checksum(self, index: int) -> str:
+        return base64.b64encode(hashlib.sha1(self.content(index)).digest()).decode()
+
+    def updated_at(self, index: int) -> datetime:
+        return self.BASE_TIME + timedelta(seconds=index)
+
+    def is_visible(self, index: int) -> bool:
+        return 0 <= index < self.count and index not in self.trashed and index not in self.deleted
+
+    def asset(self, index: int, with_exif: bool = True, with_tags: bool = True) -> Dict[str, Any]:
+        """Asset payload; search results omit tags like the real server does."""
+        taken = datetime(2000 + index % 20, 1 + index % 12, 1 + index % 28, 12, 0, 0)
+        asset: Dict[str, Any] = {
+            "id": self.asset_id(index),
+            "type": "IMAGE",
+            "originalFileName": self.filename(index),
+            "originalPath": f"/library/{self.relative_path(index)}",
+            "checksum": self.checksum(index),
+            "fileCreatedAt": taken.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "localDateTime": taken.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "updatedAt": _format_time(self.updated_at(index)),
+            "isArchived": False,
+            "isTrashed": index in self.trashed,
+            "libraryId": self.LIBRARY_ID,
+            "ownerId": self.USER_ID,
+        }
+        if with_exif:
+            asset["exifInfo"] = {
+                "dateTimeOriginal": asset["fileCreatedAt"],
+                "timeZone": "UTC",
+                "description": f"Synthetic asset {index}",
+            }
+            asset["exifInfo"].update(self.edits.get(index, {}))
+        if with_tags:
+            tag = index % self.tag_count
+            asset["tags"] = [{"id": f"tag-{tag}", "name": f"tag{tag}", "value": f"tag{tag}"}]
+            names = {tag_id: name for name, tag_id in self.tags.items()}
+            asset["tags"] += [
+                {"id": tag_id, "name": names[tag_id].rsplit("/", 1)[-1], "value": names[tag_id]}
+                for tag_id in self.asset_tags.get(index, [])
+            ]
+        return asset
+
+    def update(self, asset_ids: List[str], fields: Dict[str, Any]):
+        with self._lock:
+            for asset_id in asset_ids:
+                index = self.index_of(asset_id)
+                if index is not None and self.is_visible(index):
+                    self.edits.setdefault(index, {}).update(fields)
+
+    def upsert_tags(self, names: List[str]) -> List[Dict[str, str]]:
+        with self._lock:
+            for name in names:
+                self.tags.setdefault(name, f"44444444-4444-4444-8444-{len(self.tags):012d}")
+            return [
+                {"id": self.tags[name], "name": name.rsplit("/", 1)[-1], "value": name}
+                for name in names
+            ]
+
+    def tag(self, tag_ids: List[str], asset_ids: List[str]) -> int:
+        count = 0
+        with self._lock:
+            for asset_id in asset_ids:
+                index = self.index_of(asset_id)
+                if index is None:
+                    continue
+                tagged = self.asset_tags.setdefault(index, [])
+                for tag_id in tag_ids:
+                    if tag_id not in tagged:
+                        tagged.append(tag_id)
+                        count += 1
+        return count
+
+    def search(self, payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return one page of search results and the next page number."""
+        page = max(1, int(payload.get("page") or 1))
+        size = max(1, min(1000, int(payload.get("size") or 250)))
+        with_exif = bool(payload.get("withExif"))
+
+        if payload.get("trashedAfter"):
+            since = _parse_time(payload["trashedAfter"])
+            with self._lock:
+                indices = sorted(i for i, at in self.trashed.items() if at > since)
+        else:
+            start, stop = 0, self.count
+            if payload.get("updatedAfter"):
+                offset = (_parse_time(payload["updatedAfter"]) - self.BASE_TIME).total_seconds()
+                start = max(start, int(offset // 1) + 1)
+            if payload.get("updatedBefore"):
+                offset = (_parse_time(payload["updatedBefore"]) - self.BASE_TIME).total_seconds()
+                stop = min(stop, int(-(-offset // 1)))
+            with self._lock:
+                hidden = bool(self.trashed or self.deleted)
+            if hidden:
+                indices = [i for i in range(start, max(start, stop)) if self.is_visible(i)]
+            else:
+                indices = range(start, max(start, stop))
+
+        begin = (page - 1) * size
+        items = [self.asset(i, with_exif, with_tags=False) for i in indices[begin:begin + size]]
+        next_page = page + 1 if begin + size < len(indices) else None
+        return items, next_page
+
+    def album_members(self, album: int) -> List[int]:
+        return [i for i in range(album, self.count, self.album_count) if self.is_visible(i)]
+
+    def remove(self, asset_ids: List[str], force: bool) -> int:
+        now = datetime.now(timezone.utc)
+        removed = 0
+        with self._lock:
+            for asset_id in asset_ids:
+                index = self.index_of(asset_id)
+                if index is None or not 0 <= index < self.count or index in self.deleted:
+                    continue
+                if force:
+                    self.trashed.pop(index, None)
+                    self.deleted[index] = now
+                else:
+                    self.trashed[index] = now
+                removed += 1
+        return removed
+
+
+class FakeImmichServer:
+    """Threaded HTTP server serving a SyntheticLibrary on localhost."""
+
+    def __init__(
+        self,
+        library: SyntheticLibrary,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        scan_seconds: float = 1.0,
+        api_key: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            library: Synthetic library to serve
+            latency: Seconds added to every response
+            jitter: Extra random latency, uniform in [0, jitter] seconds
+            error_rate: Probability of answering 503 instead (ping is exempt)
+            scan_seconds: How long queues stay busy after a library scan
+            api_key: Require this x-api-key header (None: accept any)
+            host: Bind address
+            port: Bind port (0: pick a free one)
+            seed: Seed for injected jitter and errors
+        """
+        self.library = library
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.scan_seconds = scan_seconds
+        self.api_key = api_key
+        self.requests: Counter = Counter()
+        self.errors_injected = 0
+        self.busy_until = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeImmichServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeImmichServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _delay_and_fail(self, endpoint: str) -> bool:
+        """Apply injected latency; return True if this request should fail."""
+        with self._lock:
+            self.requests[endpoint] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = endpoint != "GET /api/server/ping" and self._random.random() < self.error_rate
+            if fail:
+                self.errors_injected += 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def queues(self) -> List[Dict[str, Any]]:
+        busy = time.monotonic() < self.busy_until
+        names = ["thumbnailGeneration", "metadataExtraction", "library", "smartSearch"]
+        return [
+            {
+                "name": name,
+                "isPaused": False,
+                "statistics": {
+                    "active": 1 if busy and name != "smartSearch" else 0,
+                    "waiting": 10 if busy and name == "metadataExtraction" else 0,
+                    "delayed": 0,
+                    "failed": 0,
+                    "completed": 0,
+                    "paused": 0,
+                },
+            }
+            for name in names
+        ]
+
+    def route(self, method: str, path: str, body: Any) -> Tuple[int, Any]:
+        """Return (status, JSON body) for a request."""
+        library = self.library
+        if method == "GET" and path == "/api/server/ping":
+            return 200, {"res": "pong"}
+        if method == "GET" and path == "/api/users/me":
+            return 200, {"id": library.USER_ID, "email": "bench@example.com"}
+        if method == "POST" and path == "/api/search/metadata":
+            items, next_page = library.search(body or {})
+            return 200, {
+                "albums": {"total": 0, "count": 0, "items": [], "facets": []},
+                "assets": {
+                    "total": len(items),
+                    "count": len(items),
+                    "items": items,
+                    "facets": [],
+                    "nextPage": str(next_page) if next_page else None,
+                },
+            }
+        if method == "DELETE" and path == "/api/assets":
+            body = body or {}
+            library.remove(body.get("ids") or [], bool(body.get("force")))
+            return 204, None
+        if method == "PUT" and path == "/api/assets":
+            body = dict(body or {})
+            library.update(body.pop("ids", None) or [], body)
+            return 204, None
+        if method == "PUT" and path == "/api/tags":
+            return 200, library.upsert_tags((body or {}).get("tags") or [])
+        if method == "PUT" and path == "/api/tags/assets":
+            body = body or {}
+            return 200, {"count": library.tag(body.get("tagIds") or [], body.get("assetIds") or [])}
+        match = re.fullmatch(r"/api/assets/([^/]+)", path)
+        if method == "GET" and match:
+            index = library.index_of(match.group(1))
+            if index is None or not library.is_visible(index):
+                return 404, {"message": "Asset not found"}
+            return 200, library.asset(index)
+        if method == "GET" and path == "/api/albums":
+            return 200, [
+                {
+                    "id": library.album_id(album),
+                    "albumName": f"Album {album}",
+                    "assetCount": len(library.album_members(album)),
+                    "updatedAt": _format_time(library.BASE_TIME),
+                }
+                for album in range(library.album_count)
+            ]
+        match = re.fullmatch(r"/api/albums/33333333-3333-4333-8333-(\d{12})", path)
+        if method == "GET" and match:
+            album = int(match.group(1))
+            if album >= library.album_count:
+                return 404, {"message": "Album not found"}
+            members = library.album_members(album)
+            return 200, {
+                "id": library.album_id(album),
+                "albumName": f"Album {album}",
+                "assetCount": len(members),
+                "assets": [library.asset(i) for i in members],
+            }
+        if method == "GET" and path == "/api/queues":
+            return 200, self.queues()
+        if method == "GET" and path == "/api/libraries":
+            return 200, [{"id": library.LIBRARY_ID, "name": "Synthetic", "type": "EXTERNAL"}]
+        if method == "POST" and path == f"/api/libraries/{library.LIBRARY_ID}/scan":
+            self.busy_until = time.monotonic() + self.scan_seconds
+            return 204, None
+        if method == "POST" and path == "/api/sync/delta-sync":
+            since = _parse_time((body or {}).get("updatedAfter") or "1970-01-01T00:00:00Z")
+            deleted = [library.asset_id(i) for i, at in list(library.deleted.items()) if at > since]
+            return 200, {"needsFullSync": False, "upserted": [], "deleted": deleted}
+        return 404, {"message": f"Cannot {method} {path}"}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                path = urlsplit(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                endpoint = f"{self.command} {re.sub(r'[0-9a-f-]{36}', '{id}', path)}"
+
+                if server.api_key and self.headers.get("x-api-key") != server.api_key:
+                    status, payload = 401, {"message": "Invalid API key"}
+                elif server._delay_and_fail(endpoint):
+                    status, payload = 503, {"message": "Injected failure"}
+                else:
+                    try:
+                        body = json.loads(raw) if raw else None
+                        status, payload = server.route(self.command, path, body)
+                    except (ValueError, TypeError) as e:
+                        status, payload = 400, {"message": str(e)}
+
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                if data:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--assets", type=int, default=10_000, help="Library size")
+    parser.add_argument("--albums", type=int, default=10, help="Number of albums")
+    parser.add_argument("--port", type=int, default=2283, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    args = parser.parse_args()
+
+    server = FakeImmichServer(
+        SyntheticLibrary(args.assets, albums=args.albums),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        port=args.port,
+    )
+    print(f"Serving {args.assets} synthetic assets at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print("Requests served:")
+        for endpoint, count in server.requests.most_common():
+            print(f"  {endpoint}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed stand-in for `psql -X -q -t -A -F <sep>` reading SQL from stdin.
+
+Understands statements ending with ; (possibly spanning lines),
+BEGIN/COMMIT/ROLLBACK (a failed statement aborts the transaction and COMMIT
+then rolls back, as in PostgreSQL), \\echo with :ERROR / :LAST_ERROR_MESSAGE
+interpolation, and \\q. Used by test_immich_database.py:
+
+    python tests/fake_psql.py <database.sqlite> [psql options...]
+"""
+
+import re
+import sqlite3
+import sys
+
+
+def main():
+    database, options = sys.argv[1], sys.argv[2:]
+    separator = options[options.index("-F") + 1] if "-F" in options else "|"
+    conn = sqlite3.connect(database, isolation_level=None)
+    variables = {"ERROR": "false", "LAST_ERROR_MESSAGE": ""}
+    in_transaction = aborted = False
+    pending = []
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("\\echo") and not pending:
+            text = re.sub(r":(\w+)", lambda m: variables.get(m.group(1), m.group(0)), line[5:].strip())
+            print(text, flush=True)
+            continue
+        if line.startswith("\\q") and not pending:
+            break
+        pending.append(line)
+        if not line.endswith(";"):
+            continue
+        statement = "\n".join(pending).rstrip(";").strip()
+        pending = []
+        keyword = statement.upper()
+        try:
+            if keyword in ("BEGIN", "START TRANSACTION"):
+                conn.execute("BEGIN")
+                in_transaction, aborted = True, False
+            elif keyword in ("COMMIT", "END", "ROLLBACK"):
+                conn.execute("ROLLBACK" if aborted or keyword == "ROLLBACK" else "COMMIT")
+                in_transaction = aborted = False
+            elif aborted:
+                raise sqlite3.OperationalError(
+                    "current transaction is aborted, commands ignored until end of transaction block"
+                )
+            else:
+                for row in conn.execute(statement).fetchall():
+                    print(separator.join("" if value is None else str(value) for value in row))
+            variables["ERROR"] = "false"
+        except sqlite3.Error as e:
+            aborted = in_transaction
+            variables.update(ERROR="true", LAST_ERROR_MESSAGE=str(e))
+            print(f"ERROR:  {e}", file=sys.stderr, flush=True)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ def test_main_success(tmp_path, monkeypatch):
         def __init__(self, *_args, **_kwargs):
             pass
 
-        def analyze_to_csv(self, _output):
+        def analyze_to_csv(self, _output, _previous=None):
             return 42
 
     monkeypatch.setattr(analyze.ScriptLogging, "get_script_logger", lambda **_kwargs: DummyLogger())
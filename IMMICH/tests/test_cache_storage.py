@@ -0,0 +1,163 @@
+"""Tests for cache_storage module."""
+
+import json
+import sqlite3
+
+import pytest
+
+from cache_storage import JsonCacheStorage, SqliteCacheStorage, create_storage
+from immich_cache import ImmichCache
+
+
+@pytest.fixture
+def sample_asset():
+    """Create a sample asset for testing."""
+    return {
+        "id": "asset123",
+        "originalFileName": "test.jpg",
+        "tags": ["vacation", {"name": "beach"}],
+        "updatedAt": "2025-10-25T10:00:00Z",
+        "albums": ["album1", "album2"]
+    }
+
+
+class TestCreateStorage:
+    """Tests for backend selection by extension."""
+
+    def test_selects_by_extension(self, tmp_path):
+        """Test that .db/.sqlite select SQLite and anything else JSON."""
+        assert isinstance(create_storage(tmp_path / "c.json"), JsonCacheStorage)
+        assert isinstance(create_storage(tmp_path / "c.db"), SqliteCacheStorage)
+        assert isinstance(create_storage(tmp_path / "c.SQLITE"), SqliteCacheStorage)
+
+
+class TestSqliteCache:
+    """Tests for ImmichCache on SQLite storage."""
+
+    def test_find_apis(self, tmp_path, sample_asset):
+        """Test that find_by_* answer from the database."""
+        cache = ImmichCache(str(tmp_path / "cache.db"))
+        cache.add_asset(sample_asset, "/photos/test.jpg", "exact", "unique_filename")
+
+        assert cache.find_by_filename("test.jpg")[0]["immich_data"]["id"] == "asset123"
+        assert cache.find_by_path("/photos/test.jpg")["file_mapping"]["match_confidence"] == "exact"
+        assert len(cache.find_by_album("album2")) == 1
+        assert len(cache.find_by_tag("beach")) == 1
+        assert cache.find_by_filename("missing.jpg") == []
+        assert cache.find_by_path("/photos/missing.jpg") is None
+
+    def test_confidence_column_added_to_old_database(self, tmp_path, sample_asset):
+        """Test that databases without match_confidence are migrated and indexed."""
+        path = tmp_path / "cache.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE assets (id TEXT PRIMARY KEY, filename TEXT, matched_path TEXT, "
+            "checksum TEXT, immich_data TEXT NOT NULL, file_mapping TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO assets (id, immich_data, file_mapping) VALUES (?, ?, ?)",
+            ("old", "{}", json.dumps({"match_confidence": "none"}))
+        )
+        conn.commit()
+        conn.close()
+
+        cache = ImmichCache(str(path))
+        cache.load()
+        cache.add_asset(sample_asset)
+
+        assert cache.find_ids_by_confidence("none") == ["old", "asset123"]
+        assert cache.get_stats()["unmatched_files"] == 2
+
+    def test_save_and_reload(self, tmp_path, sample_asset):
+        """Test that committed rows and metadata survive a reload."""
+        cache_path = str(tmp_path / "cache.db")
+        cache = ImmichCache(cache_path)
+        cache.metadata["target_path"] = "/photos"
+        cache.add_asset(sample_asset, "/photos/test.jpg", "exact", "unique_filename")
+        assert cache.save()
+        cache.close()
+
+        reloaded = ImmichCache(cache_path)
+        assert reloaded.load()
+        stats = reloaded.get_stats()
+        assert stats["total_assets"] == 1
+        assert stats["matched_files"] == 1
+        assert stats["albums"] == 2
+        assert stats["tags"] == 2
+        assert stats["target_path"] == "/photos"
+
+    def test_unsaved_writes_are_discarded(self, tmp_path, sample_asset):
+        """Test that writes are only persisted on save."""
+        cache_path = str(tmp_path / "cache.db")
+        cache = ImmichCache(cache_path)
+        cache.add_asset(sample_asset)
+        cache.close()
+
+        reloaded = ImmichCache(cache_path)
+        reloaded.load()
+        assert len(reloaded.assets) == 0
+
+    def test_update_and_remove(self, tmp_path, sample_asset):
+        """Test that upserts replace album rows and removal drops them."""
+        cache = ImmichCache(str(tmp_path / "cache.db"))
+        cache.add_asset(sample_asset)
+        cache.add_asset(dict(sample_asset, albums=["album3"], updatedAt="2025-10-26T10:00:00Z"))
+
+        assert cache.find_by_album("album1") == []
+        assert len(cache.find_by_album("album3")) == 1
+
+        assert cache.remove_asset("asset123")
+        assert len(cache.assets) == 0
+        assert cache.find_by_tag("vacation") == []
+
+    def test_clear(self, tmp_path, sample_asset):
+        """Test that clear empties the database."""
+        cache = ImmichCache(str(tmp_path / "cache.db"))
+        cache.add_asset(sample_asset)
+        cache.save()
+
+        cache.clear()
+
+        assert len(cache.assets) == 0
+        assert cache.find_by_filename("test.jpg") == []
+
+
+@pytest.mark.parametrize("cache_name", ["cache.json", "cache.db"])
+def test_shared_path_maps_to_most_recently_stored_asset(tmp_path, sample_asset, cache_name):
+    """Test that both backends resolve a shared path to the last stored asset, also after reload."""
+    cache_path = str(tmp_path / cache_name)
+    cache = ImmichCache(cache_path)
+    first = dict(sample_asset, id="first")
+    cache.add_asset(first, "/photos/shared.jpg")
+    cache.add_asset(dict(sample_asset, id="second"), "/photos/shared.jpg")
+    cache.add_asset(dict(first, updatedAt="2025-10-26T10:00:00Z"), "/photos/shared.jpg")
+
+    assert cache.find_by_path("/photos/shared.jpg")["immich_data"]["id"] == "first"
+    assert cache.save()
+    cache.close()
+
+    reloaded = ImmichCache(cache_path)
+    assert reloaded.load()
+    assert reloaded.find_by_path("/photos/shared.jpg")["immich_data"]["id"] == "first"
+
+
+class TestMigrate:
+    """Tests for migrating between storage formats."""
+
+    def test_json_to_sqlite_round_trip(self, tmp_path, sample_asset):
+        """Test that a JSON cache migrates to SQLite and back unchanged."""
+        json_path = str(tmp_path / "cache.json")
+        cache = ImmichCache(json_path)
+        cache.add_asset(sample_asset, "/photos/test.jpg", "exact", "unique_filename")
+        cache.add_asset({"id": "asset456", "originalFileName": "other.jpg", "updatedAt": "2025-01-01"})
+        cache.save()
+
+        assert ImmichCache.migrate(json_path, str(tmp_path / "cache.db")) == 2
+        assert ImmichCache.migrate(str(tmp_path / "cache.db"), str(tmp_path / "back.json")) == 2
+
+        original = ImmichCache(json_path)
+        original.load()
+        restored = ImmichCache(str(tmp_path / "back.json"))
+        restored.load()
+        assert restored.assets == original.assets
+        assert list(restored.assets) == ["asset123", "asset456"]
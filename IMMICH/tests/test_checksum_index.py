@@ -0,0 +1,125 @@
+"""Tests for checksum_index module."""
+
+import base64
+import csv
+import hashlib
+
+import pytest
+
+from checksum_index import ChecksumIndex, CrossLibraryReport
+from immich_cache import ImmichCache, normalize_checksum
+from common.hash_cache import HashCache
+
+
+def immich_checksum(data: bytes) -> str:
+    """Return a checksum the way the Immich API reports it (base64 SHA-1)."""
+    return base64.b64encode(hashlib.sha1(data).digest()).decode()
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Create a local library and a matching Immich cache."""
+    target = tmp_path / "photos"
+    (target / "2024").mkdir(parents=True)
+    (target / "2024" / "same.jpg").write_bytes(b"same content")
+    (target / "2024" / "renamed_locally.jpg").write_bytes(b"renamed content")
+    (target / "2024" / "local.jpg").write_bytes(b"local only")
+    (target / "2024" / "copy_of_local.jpg").write_bytes(b"local only")
+    (target / "2024" / "notes.txt").write_bytes(b"same content")
+
+    cache = ImmichCache(str(tmp_path / "cache.json"))
+    cache.add_asset({
+        "id": "a1", "originalFileName": "same.jpg",
+        "checksum": immich_checksum(b"same content"), "updatedAt": "2025-01-01"
+    })
+    cache.add_asset({
+        "id": "a2", "originalFileName": "IMG_0002.jpg",
+        "checksum": immich_checksum(b"renamed content"), "updatedAt": "2025-01-01"
+    })
+    cache.add_asset({
+        "id": "a3", "originalFileName": "remote.jpg",
+        "checksum": immich_checksum(b"remote only"), "updatedAt": "2025-01-01"
+    })
+    cache.add_asset({
+        "id": "a4", "originalFileName": "external.jpg", "updatedAt": "2025-01-01"
+    })
+    return target, cache
+
+
+class TestNormalizeChecksum:
+    """Tests for normalize_checksum function."""
+
+    def test_base64_and_hex_agree(self):
+        """Base64 and hex encodings normalize to the same digest."""
+        digest = hashlib.sha1(b"data")
+        assert normalize_checksum(base64.b64encode(digest.digest()).decode()) == digest.hexdigest()
+        assert normalize_checksum(digest.hexdigest().upper()) == digest.hexdigest()
+
+    def test_invalid_values(self):
+        """Values that are not SHA-1 digests normalize to None."""
+        assert normalize_checksum(None) is None
+        assert normalize_checksum("") is None
+        assert normalize_checksum("not a checksum!") is None
+        assert normalize_checksum(base64.b64encode(b"short").decode()) is None
+
+
+class TestChecksumIndex:
+    """Tests for ChecksumIndex class."""
+
+    def test_build_indexes_images_only(self, library):
+        """Only image files are hashed and indexed."""
+        target, _ = library
+        index = ChecksumIndex(str(target), HashCache()).build()
+
+        assert index.stats['files'] == 4
+        assert len(index.by_checksum) == 3
+        assert len(index.find(hashlib.sha1(b"local only").hexdigest())) == 2
+
+    def test_rebuild_uses_hash_cache(self, library, tmp_path):
+        """A second build reads digests from the persistent hash cache."""
+        target, _ = library
+        cache_file = tmp_path / "hash_cache.json"
+        with HashCache(cache_file) as hash_cache:
+            ChecksumIndex(str(target), hash_cache).build()
+
+        index = ChecksumIndex(str(target), HashCache(cache_file)).build()
+
+        assert index.stats['hashed'] == 0
+        assert index.stats['cached'] == 4
+
+
+class TestCrossLibraryReport:
+    """Tests for CrossLibraryReport class."""
+
+    def test_categories(self, library):
+        """Local files and assets are classified by content."""
+        target, cache = library
+        index = ChecksumIndex(str(target), HashCache()).build()
+
+        rows = CrossLibraryReport(cache, index).build()
+        by_category = {}
+        for row in rows:
+            by_category.setdefault(row['category'], []).append(row)
+
+        assert [r['asset_id'] for r in by_category['in_immich']] == ["a1"]
+        assert by_category['renamed'][0]['local_path'].endswith("renamed_locally.jpg")
+        assert by_category['renamed'][0]['original_file_name'] == "IMG_0002.jpg"
+        assert len(by_category['local_only']) == 2
+        assert by_category['local_only'][0]['local_copies'] == 2
+        assert [r['asset_id'] for r in by_category['immich_only']] == ["a3"]
+        assert [r['asset_id'] for r in by_category['no_checksum']] == ["a4"]
+
+    def test_write_csv(self, library, tmp_path):
+        """Report rows are written with a header."""
+        target, cache = library
+        index = ChecksumIndex(str(target), HashCache()).build()
+        report = CrossLibraryReport(cache, index)
+        report.build()
+
+        output = tmp_path / "out" / "report.csv"
+        assert report.write_csv(str(output))
+
+        with open(output, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == len(report.rows)
+        assert set(rows[0]) == set(CrossLibraryReport.FIELDNAMES)
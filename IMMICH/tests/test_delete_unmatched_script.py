@@ -0,0 +1,85 @@
+"""Tests for delete_unmatched.py AssetDeleter."""
+
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+script_path = Path(__file__).parent.parent / "scripts" / "delete_unmatched.py"
+spec = importlib.util.spec_from_file_location("delete_unmatched_script", script_path)
+delete_script = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(delete_script)
+
+
+class FakeConnection:
+    """Records DELETE batches; fails every batch once fail_after batches succeeded."""
+
+    def __init__(self, delay=0.0, fail_after=None):
+        self.delay = delay
+        self.fail_after = fail_after
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def delete_assets(self, asset_ids, force=False):
+        with self.lock:
+            if self.fail_after is not None and len(self.batches) >= self.fail_after:
+                return False
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.batches.append(list(asset_ids))
+        return True
+
+
+IDS = [f"asset-{i:04d}" for i in range(1000)]
+
+
+def test_concurrent_adaptive_batches():
+    """Fast responses grow the batch size; all IDs are deleted exactly once."""
+    connection = FakeConnection(delay=0.01)
+    deleter = delete_script.AssetDeleter(connection, max_workers=3, batch_size=20)
+
+    results = deleter.delete_assets(IDS)
+
+    assert results == {'deleted': 1000, 'failed': 0, 'resumed': 0}
+    assert sorted(i for batch in connection.batches for i in batch) == IDS
+    assert connection.max_active > 1
+    assert max(len(batch) for batch in connection.batches) > 20
+
+
+def test_failed_batches_shrink_size_and_resume_from_checkpoint(tmp_path):
+    """An interrupted purge resumes from the checkpoint and then removes it."""
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    failing = FakeConnection(fail_after=2)
+    deleter = delete_script.AssetDeleter(
+        failing, max_workers=1, batch_size=100, checkpoint_path=str(checkpoint)
+    )
+
+    first = deleter.delete_assets(IDS, force=True)
+    done = sum(len(batch) for batch in failing.batches)
+
+    assert first == {'deleted': done, 'failed': 1000 - done, 'resumed': 0}
+    assert deleter.batch_size < 100
+    assert len(deleter.load_checkpoint(force=True)) == done
+    assert deleter.load_checkpoint(force=False) == set()
+
+    connection = FakeConnection()
+    resumed = delete_script.AssetDeleter(connection, checkpoint_path=str(checkpoint))
+    second = resumed.delete_assets(IDS, force=True)
+
+    assert second == {'deleted': 1000 - done, 'failed': 0, 'resumed': done}
+    assert sorted(i for batch in connection.batches for i in batch) == IDS[done:]
+    assert not checkpoint.exists()
+
+
+def test_dry_run_sends_nothing():
+    """Dry runs report every ID without calling the API."""
+    connection = FakeConnection()
+    deleter = delete_script.AssetDeleter(connection, dry_run=True)
+
+    assert deleter.delete_assets(IDS[:250])['deleted'] == 250
+    assert connection.batches == []
@@ -0,0 +1,69 @@
+"""Tests for ImmichConnection against the local fake Immich server."""
+
+import pytest
+
+from fake_immich_server import FakeImmichServer, SyntheticLibrary
+from immich_connection import ImmichConnection
+
+
+@pytest.fixture
+def server():
+    """Start a fake server with a small synthetic library."""
+    with FakeImmichServer(SyntheticLibrary(2500, albums=4), api_key="key") as fake:
+        yield fake
+
+
+@pytest.fixture
+def connection(server):
+    """Create a connection to the fake server."""
+    return ImmichConnection(server.url, "key")
+
+
+class TestFakeImmichServer:
+    """End-to-end tests of ImmichConnection over HTTP."""
+
+    def test_search_pages_and_filters(self, server, connection):
+        """Test that pipelined paging returns every asset once, in order."""
+        assets = connection.search_assets()
+
+        assert [a["id"] for a in assets] == [
+            SyntheticLibrary.asset_id(i) for i in range(2500)
+        ]
+        assert connection.validate_connection()
+
+        after = connection.search_assets(updated_after="2025-01-01T00:40:00.000Z")
+        assert len(after) == 2500 - 2401
+        assert after[0]["originalFileName"] == "IMG_002401.jpg"
+
+    def test_transient_errors_are_retried(self, server):
+        """Test that injected 503s are retried transparently."""
+        server.error_rate = 0.3
+        connection = ImmichConnection(server.url, "key", max_retries=10)
+        connection.http._sleep = lambda delay: None
+
+        assets = connection.search_assets()
+
+        assert len(assets) == 2500
+        assert server.errors_injected > 0
+        assert connection.http.stats["retries"] == server.errors_injected
+
+    def test_delete_then_sync_queries(self, server, connection):
+        """Test that trashed and deleted assets are reported by the sync endpoints."""
+        ids = [SyntheticLibrary.asset_id(i) for i in (1, 2)]
+
+        assert connection.delete_assets(ids[:1], force=False)
+        assert connection.delete_assets(ids[1:], force=True)
+
+        assert [a["id"] for a in connection.search_trashed_assets("2020-01-01T00:00:00Z")] == ids[:1]
+        assert connection.get_deleted_asset_ids("2020-01-01T00:00:00Z") == ids[1:]
+        assert len(connection.search_assets()) == 2498
+        assert connection.get_asset_details(ids[0]) is None
+
+    def test_albums_queues_and_scan(self, server, connection):
+        """Test album, library and queue endpoints."""
+        album_id = server.library.album_id(1)
+
+        assert len(connection.search_assets(album_id=album_id)) == 625
+        library_id = connection.get_libraries()[0]["id"]
+        assert connection.scan_library(library_id)
+        assert any(q["statistics"]["active"] for q in connection.get_queues())
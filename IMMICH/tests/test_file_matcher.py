@@ -1,5 +1,6 @@
 """Tests for file_matcher module."""
 
+import os
 import pytest
 import tempfile
 import json
@@ -47,6 +48,22 @@ class TestExifReader:
         
         assert exif_data == {}
     
+    @patch('file_matcher.subprocess.run')
+    def test_read_exif_batch(self, mock_run):
+        """Test that several files are read with one exiftool call."""
+        mock_result = Mock()
+        mock_result.stdout = json.dumps([
+            {"SourceFile": "/a/IMG_1.jpg", "DateTimeOriginal": "2025:06:15 18:30:00"},
+            {"SourceFile": "/b/IMG_1.jpg", "DateTimeOriginal": "2025:07:20 10:00:00"}
+        ])
+        mock_run.return_value = mock_result
+        
+        exif_data = ExifReader.read_exif_batch(["/a/IMG_1.jpg", "/b/IMG_1.jpg", "/c/IMG_1.jpg"])
+        
+        assert mock_run.call_count == 1
+        assert exif_data["/b/IMG_1.jpg"]["DateTimeOriginal"] == "2025:07:20 10:00:00"
+        assert "/c/IMG_1.jpg" not in exif_data
+    
     def test_parse_exif_datetime_colon_format(self):
         """Test parsing EXIF datetime with colons."""
         dt = ExifReader.parse_exif_datetime("2025:06:15 18:30:00")
@@ -162,7 +179,7 @@ class TestFileMatcher:
         assert confidence == "none"
         assert method == "no_file_found"
     
-    @patch.object(ExifReader, 'read_exif')
+    @patch.object(ExifReader, 'read_exif_batch')
     @patch.object(ExifReader, 'parse_exif_datetime')
     def test_match_asset_ambiguous_exact_exif(
         self, 
@@ -178,10 +195,10 @@ class TestFileMatcher:
         file1_dt = datetime(2025, 6, 15, 18, 30, 0)  # Exact match
         file2_dt = datetime(2025, 7, 20, 10, 0, 0)
         
-        mock_read.side_effect = [
-            {"DateTimeOriginal": "2025:06:15 18:30:00"},
-            {"DateTimeOriginal": "2025:07:20 10:00:00"}
-        ]
+        mock_read.return_value = {
+            str(temp_target_dir / "2025" / "06" / "IMG_001.jpg"): {"DateTimeOriginal": "2025:06:15 18:30:00"},
+            str(temp_target_dir / "2025" / "07" / "IMG_001.jpg"): {"DateTimeOriginal": "2025:07:20 10:00:00"}
+        }
         mock_parse.side_effect = [immich_dt, file1_dt, file2_dt]
         
         asset = {
@@ -196,7 +213,7 @@ class TestFileMatcher:
         assert confidence == "exact"
         assert method == "exif_date_exact"
     
-    @patch.object(ExifReader, 'read_exif')
+    @patch.object(ExifReader, 'read_exif_batch')
     @patch.object(ExifReader, 'parse_exif_datetime')
     def test_match_asset_ambiguous_fuzzy_exif(
         self, 
@@ -212,10 +229,10 @@ class TestFileMatcher:
         file1_dt = datetime(2025, 6, 15, 18, 35, 0)  # 5 minutes off
         file2_dt = datetime(2025, 7, 20, 10, 0, 0)
         
-        mock_read.side_effect = [
-            {"DateTimeOriginal": "2025:06:15 18:35:00"},
-            {"DateTimeOriginal": "2025:07:20 10:00:00"}
-        ]
+        mock_read.return_value = {
+            str(temp_target_dir / "2025" / "06" / "IMG_001.jpg"): {"DateTimeOriginal": "2025:06:15 18:35:00"},
+            str(temp_target_dir / "2025" / "07" / "IMG_001.jpg"): {"DateTimeOriginal": "2025:07:20 10:00:00"}
+        }
         mock_parse.side_effect = [immich_dt, file1_dt, file2_dt]
         
         asset = {
@@ -229,7 +246,7 @@ class TestFileMatcher:
         assert confidence == "fuzzy"
         assert "exif_date_fuzzy" in method
     
-    @patch.object(ExifReader, 'read_exif')
+    @patch.object(ExifReader, 'read_exif_batch')
     @patch.object(ExifReader, 'parse_exif_datetime')
     def test_match_asset_ambiguous_no_exif(
         self, 
@@ -255,7 +272,7 @@ class TestFileMatcher:
         assert confidence == "none"
         assert "ambiguous_2_files" in method
     
-    @patch.object(ExifReader, 'read_exif')
+    @patch.object(ExifReader, 'read_exif_batch')
     @patch.object(ExifReader, 'parse_exif_datetime')
     def test_match_asset_ambiguous_no_immich_date(
         self, 
@@ -281,3 +298,81 @@ class TestFileMatcher:
         matcher = FileMatcher("/nonexistent/path")
         
         assert len(matcher.filename_index) == 0
+    
+    @patch.object(ExifReader, 'read_exif_batch')
+    def test_match_asset_ambiguous_by_size(self, mock_read, temp_target_dir):
+        """Test that a unique file size resolves duplicates without hashing or EXIF."""
+        (temp_target_dir / "2025" / "07" / "IMG_001.jpg").write_bytes(b"12345")
+        matcher = FileMatcher(str(temp_target_dir))
+        
+        asset = {"originalFileName": "IMG_001.jpg", "exifInfo": {"fileSizeInByte": 5}}
+        
+        path, confidence, method = matcher.match_asset(asset)
+        
+        assert "2025/07" in path
+        assert (confidence, method) == ("exact", "file_size")
+        assert mock_read.call_count == 0
+        assert matcher.hash_cache.stats["misses"] == 0
+    
+    @patch.object(ExifReader, 'read_exif_batch')
+    def test_match_asset_ambiguous_by_checksum(self, mock_read, temp_target_dir):
+        """Test that the SHA-1 checksum picks the candidate when sizes are equal."""
+        import base64
+        import hashlib
+        (temp_target_dir / "2025" / "06" / "IMG_001.jpg").write_bytes(b"first")
+        (temp_target_dir / "2025" / "07" / "IMG_001.jpg").write_bytes(b"other")
+        matcher = FileMatcher(str(temp_target_dir))
+        
+        asset = {
+            "originalFileName": "IMG_001.jpg",
+            "checksum": base64.b64encode(hashlib.sha1(b"other").digest()).decode(),
+            "exifInfo": {"fileSizeInByte": 5}
+        }
+        
+        path, confidence, method = matcher.match_asset(asset)
+        
+        assert "2025/07" in path
+        assert (confidence, method) == ("exact", "checksum")
+        assert mock_read.call_count == 0
+        
+        # A checksum matching neither file falls through to EXIF dates
+        asset["checksum"] = base64.b64encode(hashlib.sha1(b"edited").digest()).decode()
+        mock_read.return_value = {}
+        
+        assert matcher.match_asset(asset)[2] == "ambiguous_2_files"
+        assert matcher.hash_cache.stats["misses"] == 2
+    
+    def test_persisted_index_relists_only_changed_dirs(self, temp_target_dir, tmp_path):
+        """Test that a saved index is reused and only changed directories are re-listed."""
+        index_path = tmp_path / "cache_files.json"
+        first = FileMatcher(str(temp_target_dir), index_path=str(index_path))
+        
+        assert index_path.exists()
+        assert first.filename_index.stats == {'dirs': 4, 'listed': 4, 'files': 4}
+        
+        second = FileMatcher(str(temp_target_dir), index_path=str(index_path))
+        
+        assert second.filename_index.stats['listed'] == 0
+        assert sorted(second.filename_index["IMG_001.jpg"]) == sorted(first.filename_index["IMG_001.jpg"])
+        
+        (temp_target_dir / "2025" / "06" / "IMG_002.jpg").unlink()
+        (temp_target_dir / "2025" / "07" / "IMG_004.jpg").touch()
+        os.utime(temp_target_dir / "2025" / "06", ns=(1, 1))
+        os.utime(temp_target_dir / "2025" / "07", ns=(2, 2))
+        third = FileMatcher(str(temp_target_dir), index_path=str(index_path))
+        
+        assert third.filename_index.stats['listed'] == 2
+        assert "IMG_002.jpg" not in third.filename_index
+        assert third.filename_index["IMG_004.jpg"] == [temp_target_dir / "2025" / "07" / "IMG_004.jpg"]
+    
+    def test_persisted_index_for_other_root_is_ignored(self, temp_target_dir, tmp_path):
+        """Test that an index saved for a different target is rebuilt from scratch."""
+        index_path = tmp_path / "cache_files.json"
+        other = tmp_path / "other"
+        other.mkdir()
+        FileMatcher(str(other), index_path=str(index_path))
+        
+        matcher = FileMatcher(str(temp_target_dir), index_path=str(index_path))
+        
+        assert matcher.filename_index.stats['listed'] == 4
+        assert len(matcher.filename_index["IMG_001.jpg"]) == 2
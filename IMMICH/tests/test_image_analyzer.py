@@ -126,6 +126,181 @@ def test_analyze_to_csv_writes_rows(tmp_path, monkeypatch):
     assert "TAG1" in data[0]["Sidecar Tags"]
 
 
+def _fake_exif(path):
+    if path.suffix.lower() == ".xmp":
+        return {"DateTimeOriginal": "2025:10:16 12:13:20+00:00"}
+    day = int(path.stem.split("_")[1])
+    return {"DateTimeOriginal": f"2024:01:{day:02d} 10:20:30+02:00", "Keywords": ["a", "b"]}
+
+
+def test_process_executor_matches_thread_rows_in_order(tmp_path, monkeypatch):
+    source_dir = tmp_path / "photos"
+    for day in range(1, 8):
+        folder = source_dir / f"2024-01-{day:02d}"
+        folder.mkdir(parents=True)
+        (folder / f"IMG_{day}.jpg").write_text("data")
+    (source_dir / "2024-01-03" / "IMG_3.xmp").write_text("<x/>")
+
+    threaded = ImageAnalyzer(str(source_dir), logger=_DummyLogger(), max_workers=2)
+    monkeypatch.setattr(threaded, "_read_exif", lambda path: _fake_exif(path) if path else {})
+    threaded.analyze_to_csv(str(tmp_path / "threads.csv"))
+
+    batches = []
+
+    def fake_read_batch(paths):
+        batches.append(len(paths))
+        return {str(path): _fake_exif(path) for path in paths}
+
+    processed = ImageAnalyzer(
+        str(source_dir), logger=_DummyLogger(), max_workers=2, executor="process", chunk_size=3
+    )
+    monkeypatch.setattr(processed, "_read_exif_batch", fake_read_batch)
+    rows = processed.analyze_to_csv(str(tmp_path / "processes.csv"))
+
+    def read_rows(name):
+        with (tmp_path / name).open(newline="", encoding="utf-8") as csv_file:
+            return list(csv.DictReader(csv_file))
+
+    thread_rows = read_rows("threads.csv")
+    process_rows = read_rows("processes.csv")
+
+    assert rows == 7
+    assert sorted(batches) == [1, 3, 4]
+    assert [row["Filenanme"] for row in process_rows] == [
+        str(path) for path in processed._iter_image_files()
+    ]
+    key = lambda row: row["Filenanme"]
+    assert sorted(process_rows, key=key) == sorted(thread_rows, key=key)
+    with_sidecar = [row for row in process_rows if row["Sidecar File"]]
+    assert [row["Sidecar Date"] for row in with_sidecar] == ["2025:10:16 12:13:20"]
+
+
+def test_read_chunk_metadata_falls_back_per_file(tmp_path, monkeypatch):
+    image_path = tmp_path / "IMG_1.jpg"
+    image_path.write_text("data")
+    analyzer = ImageAnalyzer(str(tmp_path), logger=_DummyLogger(), executor="process")
+    monkeypatch.setattr(analyzer, "_read_exif_batch", lambda paths: None)
+    monkeypatch.setattr(analyzer, "_read_exif", lambda path: {"FileType": "JPEG"})
+
+    assert analyzer._read_chunk_metadata([image_path]) == [
+        (image_path, None, {}, {"FileType": "JPEG"})
+    ]
+    with pytest.raises(ValueError):
+        ImageAnalyzer(str(tmp_path), logger=_DummyLogger(), executor="fibers")
+
+
+def test_incremental_reuses_unchanged_rows(tmp_path, monkeypatch):
+    source_dir = tmp_path / "photos"
+    source_dir.mkdir()
+    for day in (1, 2, 3):
+        (source_dir / f"IMG_{day}.jpg").write_text("data")
+
+    analyzer = ImageAnalyzer(str(source_dir), logger=_DummyLogger(), max_workers=1)
+    monkeypatch.setattr(analyzer, "_read_exif", lambda path: _fake_exif(path) if path else {})
+    first_csv = tmp_path / "first.csv"
+    assert analyzer.analyze_to_csv(str(first_csv)) == 3
+    assert ImageAnalyzer.manifest_path(first_csv).exists()
+    assert ImageAnalyzer.manifest_path(first_csv) != ImageAnalyzer.manifest_path(
+        tmp_path / "first.parquet"
+    )
+
+    # Mark a row selected, change one file and give another a new sidecar
+    with first_csv.open(newline="", encoding="utf-8") as csv_file:
+        data = list(csv.DictReader(csv_file))
+    for row in data:
+        row["Select"] = "x"
+    with first_csv.open("w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=list(data[0]))
+        writer.writeheader()
+        writer.writerows(data)
+    (source_dir / "IMG_2.jpg").write_text("edited")
+    (source_dir / "IMG_3.xmp").write_text("<x/>")
+
+    analyzed = []
+    incremental = ImageAnalyzer(str(source_dir), logger=_DummyLogger(), max_workers=1)
+
+    def fake_read_exif(path):
+        if path:
+            analyzed.append(path.name)
+        return _fake_exif(path) if path else {}
+
+    monkeypatch.setattr(incremental, "_read_exif", fake_read_exif)
+    second_csv = tmp_path / "second.csv"
+    assert incremental.analyze_to_csv(str(second_csv), str(first_csv)) == 3
+
+    assert incremental.stats == {"analyzed": 2, "reused": 1}
+    assert sorted(analyzed) == ["IMG_2.jpg", "IMG_3.jpg", "IMG_3.xmp"]
+    with second_csv.open(newline="", encoding="utf-8") as csv_file:
+        rows = {Path(row["Filenanme"]).name: row for row in csv.DictReader(csv_file)}
+    assert rows["IMG_1.jpg"]["Select"] == "x"
+    assert rows["IMG_2.jpg"]["Select"] == ""
+    assert rows["IMG_3.jpg"]["Sidecar Date"] == "2025:10:16 12:13:20"
+
+
+def test_incremental_reanalyzes_exif_timeouts(tmp_path, monkeypatch):
+    source_dir = tmp_path / "photos"
+    source_dir.mkdir()
+    for day in (1, 2):
+        (source_dir / f"IMG_{day}.jpg").write_text("data")
+
+    analyzer = ImageAnalyzer(str(source_dir), logger=_DummyLogger(), max_workers=1)
+
+    def timing_out_exif(path):
+        if path and path.name == "IMG_2.jpg":
+            analyzer.exif_timeout_files.append(path)
+            return {}
+        return _fake_exif(path) if path else {}
+
+    monkeypatch.setattr(analyzer, "_read_exif", timing_out_exif)
+    monkeypatch.setattr(analyzer, "_retry_exif_timeouts", lambda: None)
+    first_csv = tmp_path / "first.csv"
+    assert analyzer.analyze_to_csv(str(first_csv)) == 2
+
+    analyzed = []
+    incremental = ImageAnalyzer(str(source_dir), logger=_DummyLogger(), max_workers=1)
+
+    def fake_read_exif(path):
+        if path:
+            analyzed.append(path.name)
+        return _fake_exif(path) if path else {}
+
+    monkeypatch.setattr(incremental, "_read_exif", fake_read_exif)
+    second_csv = tmp_path / "second.csv"
+    assert incremental.analyze_to_csv(str(second_csv), str(first_csv)) == 2
+
+    # The blank-EXIF row of the timed-out file is not reused
+    assert incremental.stats == {"analyzed": 1, "reused": 1}
+    assert analyzed == ["IMG_2.jpg"]
+
+
+def test_analysis_starts_before_enumeration_finishes(tmp_path, monkeypatch):
+    source_dir = tmp_path / "photos"
+    source_dir.mkdir()
+    for day in range(1, 11):
+        (source_dir / f"IMG_{day}.jpg").write_text("data")
+
+    analyzer = ImageAnalyzer(str(source_dir), logger=_DummyLogger(), max_workers=1)
+    events = []
+    original_iter = analyzer._iter_image_files
+
+    def listing():
+        for path in original_iter():
+            events.append("listed")
+            yield path
+
+    def reading(path):
+        if path:
+            events.append("read")
+        return _fake_exif(path) if path else {}
+
+    monkeypatch.setattr(analyzer, "_iter_image_files", listing)
+    monkeypatch.setattr(analyzer, "_read_exif", reading)
+    assert analyzer.analyze_to_csv(str(tmp_path / "out.csv")) == 10
+
+    # Files stream into the pool instead of being enumerated up front
+    assert events.index("read") < len(events) - 1 - events[::-1].index("listed")
+
+
 def test_iter_image_files_filters(tmp_path):
     source_dir = tmp_path / "photos"
     source_dir.mkdir()
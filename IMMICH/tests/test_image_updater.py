@@ -15,6 +15,7 @@ from pathlib import Path
 
 import csv
 import json
+import os
 import shutil
 import subprocess
 
@@ -173,6 +174,114 @@ def test_process_csv_move(tmp_path, monkeypatch):
     assert any("sidecar_action=moved" in msg for msg in logger.audits)
 
 
+def _move_row(path: Path, calc_path: Path, calc_filename: str, status: str = "MOVE") -> dict:
+    return {
+        "Filenanme": str(path),
+        "Calc Date": "2024-01-02",
+        "Calc Filename": calc_filename,
+        "Calc Path": str(calc_path),
+        "Calc Status": status,
+        "Select": "y",
+    }
+
+
+def test_process_moves_plans_conflicts_resumes_and_undoes(tmp_path, monkeypatch):
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    target_dir = tmp_path / "target"
+    names = ["a.jpg", "b.jpg", "2024-01-02_0000_e.jpg", "d.jpg"]
+    for name in names:
+        (source_dir / name).write_text(name)
+    (source_dir / "d.xmp").write_text("xmp")
+
+    csv_path = tmp_path / "analyze.csv"
+    rows = [
+        _move_row(source_dir / "a.jpg", target_dir, "2024-01-02_0000_a.jpg"),
+        # Same target as a.jpg: rejected instead of overwriting it
+        _move_row(source_dir / "b.jpg", target_dir, "2024-01-02_0000_a.jpg"),
+        _move_row(source_dir / "2024-01-02_0000_e.jpg", target_dir, "2024-01-02_0000_e.jpg"),
+        # Onto e.jpg's source: runs after e.jpg has moved away
+        _move_row(source_dir / "d.jpg", source_dir, "2024-01-02_0000_e.jpg", "RENAME"),
+    ]
+    _write_csv(csv_path, rows)
+    exif_writes = []
+
+    def run():
+        updater = ImageUpdater(str(csv_path), logger=_DummyLogger(), max_workers=2)
+        updater.exiftool_available = True
+
+        def fake_update_exif(file_path, *_args, **_kwargs):
+            exif_writes.append(file_path)
+            return "updated"
+
+        monkeypatch.setattr(updater, "_update_exif", fake_update_exif)
+        return updater, updater.process()
+
+    updater, stats = run()
+
+    assert (stats["moved"], stats["renamed"], stats["move_conflicts"]) == (2, 1, 1)
+    assert (target_dir / "2024-01-02_0000_a.jpg").read_text() == "a.jpg"
+    assert (target_dir / "2024-01-02_0000_e.jpg").read_text() == "2024-01-02_0000_e.jpg"
+    assert (source_dir / "2024-01-02_0000_e.jpg").read_text() == "d.jpg"
+    assert (source_dir / "2024-01-02_0000_e.xmp").exists()
+    assert (source_dir / "b.jpg").exists()
+    assert updater.journal.path == tmp_path / "analyze.csv.moves.jsonl"
+    assert len(updater.journal.load()) == 4
+
+    # A rerun (with the conflicting row deselected) skips every file already
+    # moved, including e.jpg although d.jpg now sits at its old path
+    rows[1]["Select"] = ""
+    _write_csv(csv_path, rows)
+    exif_writes.clear()
+    _, stats = run()
+    assert stats["resumed"] == 3
+    assert (stats["moved"], stats["renamed"], stats["move_conflicts"], stats["errors"]) == (0, 0, 0, 0)
+    assert exif_writes == []
+    assert (source_dir / "2024-01-02_0000_e.jpg").read_text() == "d.jpg"
+
+    result = updater.undo_moves()
+
+    assert result == {"restored": 4, "skipped": 0, "errors": 0}
+    assert sorted(p.name for p in source_dir.iterdir()) == sorted(names + ["d.xmp"])
+    assert (source_dir / "2024-01-02_0000_e.jpg").read_text() == "2024-01-02_0000_e.jpg"
+    assert not updater.journal.path.exists()
+
+
+def test_process_moves_orders_rename_chains_and_rejects_cycles(tmp_path, monkeypatch):
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    for name in ["A.jpg", "B.jpg", "C.jpg", "X.jpg", "Y.jpg"]:
+        (source_dir / name).write_text(name)
+
+    csv_path = tmp_path / "analyze.csv"
+    _write_csv(
+        csv_path,
+        [
+            # A -> B -> C -> D: each rename must wait for the next one
+            _move_row(source_dir / "A.jpg", source_dir, "B.jpg", "RENAME"),
+            _move_row(source_dir / "B.jpg", source_dir, "C.jpg", "RENAME"),
+            _move_row(source_dir / "C.jpg", source_dir, "D.jpg", "RENAME"),
+            # X <-> Y can never run without overwriting
+            _move_row(source_dir / "X.jpg", source_dir, "Y.jpg", "RENAME"),
+            _move_row(source_dir / "Y.jpg", source_dir, "X.jpg", "RENAME"),
+        ],
+    )
+
+    updater = ImageUpdater(str(csv_path), logger=_DummyLogger(), max_workers=2)
+    updater.exiftool_available = True
+    monkeypatch.setattr(updater, "_update_exif", lambda *_args, **_kwargs: "updated")
+    stats = updater.process()
+
+    assert (stats["renamed"], stats["move_conflicts"], stats["errors"]) == (3, 2, 2)
+    assert {p.name: p.read_text() for p in source_dir.iterdir() if p.suffix == ".jpg"} == {
+        "B.jpg": "A.jpg",
+        "C.jpg": "B.jpg",
+        "D.jpg": "C.jpg",
+        "X.jpg": "X.jpg",
+        "Y.jpg": "Y.jpg",
+    }
+
+
 def test_process_missing_select_column(tmp_path):
     csv_path = tmp_path / "analyze.csv"
     _write_csv(
@@ -215,29 +324,86 @@ def test_process_row_missing_file(tmp_path):
     assert any("not found" in msg.lower() for msg in logger.errors)
 
 
-def test_apply_file_action_dry_run(tmp_path):
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_load_selected_rows_projects_and_filters(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    from common.row_store import RowWriter
+
+    image_path = tmp_path / "a.jpg"
+    image_path.write_text("data")
+    headers = ["Filenanme", "EXIF Tags", "Calc Date", "Select"]
+    input_path = tmp_path / f"analyze{suffix}"
+    with RowWriter(input_path, headers) as writer:
+        writer.writerow({"Filenanme": str(image_path), "EXIF Tags": "x", "Calc Date": "2024-01-02", "Select": " Yes"})
+        writer.writerow({"Filenanme": str(tmp_path / "b.jpg"), "Select": "n"})
+        writer.writerow({"Filenanme": str(tmp_path / "c.jpg"), "Select": "y"})
+
+    updater = ImageUpdater(str(input_path), logger=_DummyLogger(), dry_run=True)
+    rows = updater._load_selected_rows()
+
+    assert rows == [{"Filenanme": str(image_path), "Calc Date": "2024-01-02"}]
+    assert updater.stats["rows_total"] == 3
+    assert updater.stats["rows_selected"] == 2
+    assert updater.stats["errors"] == 1
+
+
+def test_plan_and_execute_moves_dry_run(tmp_path):
     image_path = tmp_path / "photo.jpg"
     image_path.write_text("data")
     target_dir = tmp_path / "target"
 
-    updater = ImageUpdater("/tmp/none.csv", logger=_DummyLogger(), dry_run=True)
-    result = updater._apply_file_action(
-        str(image_path), "MOVE", str(target_dir), "renamed.jpg"
-    )
+    logger = _DummyLogger()
+    updater = ImageUpdater("/tmp/none.csv", logger=logger, dry_run=True)
+    partitions, deferred = updater._plan_moves([_move_row(image_path, target_dir, "renamed.jpg")])
+
+    assert list(partitions) == [target_dir]
+    assert deferred == []
+    for moves in partitions.values():
+        updater._execute_moves(moves)
 
-    assert result == "moved"
+    assert updater.stats["moved"] == 1
     assert image_path.exists()
+    assert not target_dir.exists()
+    assert any("file_action=moved" in msg for msg in logger.audits)
+
+
+def test_case_only_rename_on_case_insensitive_filesystem(tmp_path, monkeypatch):
+    image_path = tmp_path / "IMG_0001.JPG"
+    image_path.write_text("data")
+    (tmp_path / "IMG_0001.xmp").write_text("xmp")
+
+    updater = ImageUpdater(str(tmp_path / "analyze.csv"), logger=_DummyLogger())
+    # Paths differing only in letter case name the same file, as on SMB shares or macOS
+    monkeypatch.setattr(
+        updater,
+        "_same_file",
+        lambda source, target: os.path.abspath(source).lower() == os.path.abspath(target).lower(),
+    )
+    partitions, deferred = updater._plan_moves(
+        [_move_row(image_path, tmp_path, "img_0001.jpg", "RENAME")]
+    )
+    for moves in partitions.values():
+        updater._execute_moves(moves)
+
+    assert updater.stats["renamed"] == 1
+    assert sorted(path.name for path in tmp_path.glob("img_0001.*")) == ["img_0001.jpg", "img_0001.xmp"]
+    assert not image_path.exists()
+    assert [entry["kind"] for entry in updater.journal.load()] == ["sidecar", "move"]
 
 
-def test_apply_file_action_missing_targets(tmp_path):
+def test_plan_moves_missing_targets(tmp_path):
     image_path = tmp_path / "photo.jpg"
     image_path.write_text("data")
 
     logger = _DummyLogger()
     updater = ImageUpdater("/tmp/none.csv", logger=logger, dry_run=True)
-    result = updater._apply_file_action(str(image_path), "MOVE", "", "")
+    row = _move_row(image_path, tmp_path, "")
+    row["Calc Path"] = ""
+    partitions, deferred = updater._plan_moves([row])
 
-    assert result == "error"
+    assert (partitions, deferred) == ({}, [])
+    assert updater.stats["errors"] == 1
     assert any("missing calc path" in msg.lower() for msg in logger.errors)
 
 
@@ -41,7 +41,7 @@ class TestImmichCache:
         assert cache.cache_path == Path(temp_cache_file)
         assert cache.metadata["total_assets"] == 0
         assert len(cache.assets) == 0
-        assert len(cache.indices) == 4
+        assert len(cache.indices) == 6
     
     def test_add_asset(self, temp_cache_file, sample_asset):
         """Test adding an asset."""
@@ -296,3 +296,71 @@ class TestImmichCache:
         # Cleanup
         cache_path.unlink()
         cache_dir.rmdir()
+    
+    def test_sync_watermark_tracks_max_updated_at(self, temp_cache_file):
+        """Test that the sync watermark follows the newest updatedAt."""
+        cache = ImmichCache(temp_cache_file)
+        assert cache.get_sync_start() is None
+        
+        cache.add_asset({"id": "a1", "updatedAt": "2025-10-25T10:00:00.000Z"})
+        cache.add_asset({"id": "a2", "updatedAt": "2025-10-20T10:00:00.000Z"})
+        
+        assert cache.metadata["sync_watermark"] == "2025-10-25T10:00:00.000Z"
+        assert cache.get_sync_start(skew_seconds=300) == "2025-10-25T09:55:00.000Z"
+        
+        cache.save()
+        reloaded = ImmichCache(temp_cache_file)
+        reloaded.load()
+        assert reloaded.metadata["sync_watermark"] == "2025-10-25T10:00:00.000Z"
+    
+    def test_remove_asset(self, temp_cache_file, sample_asset):
+        """Test removing an asset also removes it from indices."""
+        cache = ImmichCache(temp_cache_file)
+        cache.add_asset(sample_asset, "/path/to/test.jpg", "exact", "unique_filename")
+        
+        assert cache.remove_asset("asset123") is True
+        assert cache.remove_asset("asset123") is False
+        
+        assert cache.find_by_filename("test.jpg") == []
+        assert cache.find_by_path("/path/to/test.jpg") is None
+        assert "album1" not in cache.indices["by_album"]
+        assert "vacation" not in cache.indices["by_tag"]
+    
+    def test_update_replaces_index_entries(self, temp_cache_file, sample_asset):
+        """Test that a newer asset version drops its old index entries."""
+        cache = ImmichCache(temp_cache_file)
+        cache.add_asset(sample_asset)
+        
+        updated = dict(sample_asset, albums=["album3"], updatedAt="2025-10-26T10:00:00Z")
+        cache.add_asset(updated)
+        
+        assert cache.find_by_album("album1") == []
+        assert len(cache.find_by_album("album3")) == 1
+    
+    def test_index_buckets_keep_insertion_order(self, temp_cache_file):
+        """Test that index buckets are ordered and free of duplicates."""
+        cache = ImmichCache(temp_cache_file)
+        for i in range(5):
+            cache.add_asset({"id": f"a{i}", "albums": ["big"], "updatedAt": "2025-01-01"})
+        cache._update_indices_for_asset("a0", cache.get_asset("a0"))
+        
+        album_ids = [a["immich_data"]["id"] for a in cache.find_by_album("big")]
+        assert album_ids == ["a0", "a1", "a2", "a3", "a4"]
+    
+    def test_find_ids_by_confidence(self, temp_cache_file, sample_asset):
+        """Test that unmatched assets are listed from the confidence index."""
+        cache = ImmichCache(temp_cache_file)
+        cache.add_asset(sample_asset, "/path/to/test.jpg", "exact", "unique_filename")
+        cache.add_asset({"id": "lost", "updatedAt": "2025-01-01"})
+        cache.save()
+        
+        reloaded = ImmichCache(temp_cache_file)
+        reloaded.load()
+        
+        assert reloaded.find_ids_by_confidence("none") == ["lost"]
+        assert reloaded.get_stats()["unmatched_files"] == 1
+        
+        reloaded.add_asset(
+            {"id": "lost", "updatedAt": "2025-01-02"}, "/path/lost.jpg", "exact", "checksum"
+        )
+        assert reloaded.find_ids_by_confidence("none") == []
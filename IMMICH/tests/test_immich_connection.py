@@ -37,7 +37,9 @@ class TestImmichConnection:
         result = mock_connection.validate_connection()
         
         assert result is True
-        mock_get.assert_called_once_with("http://test-immich.com/api/server/ping")
+        mock_get.assert_called_once_with(
+            "http://test-immich.com/api/server/ping", timeout=mock_connection.http.timeout
+        )
     
     @patch('immich_connection.requests.Session.get')
     def test_validate_connection_failure(self, mock_get, mock_connection):
@@ -248,3 +250,67 @@ class TestImmichConnection:
         next_page = mock_connection._get_next_page(data)
         
         assert next_page is None
+    
+    @patch('immich_connection.requests.Session.post')
+    def test_search_trashed_assets(self, mock_post, mock_connection):
+        """Test searching trashed assets includes deleted assets."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"assets": {"items": [{"id": "asset1"}]}}
+        mock_post.return_value = mock_response
+        
+        assets = mock_connection.search_trashed_assets("2025-10-25T00:00:00Z")
+        
+        assert assets == [{"id": "asset1"}]
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["trashedAfter"] == "2025-10-25T00:00:00Z"
+        assert payload["withDeleted"] is True
+    
+    @patch('immich_connection.requests.Session.post')
+    @patch('immich_connection.requests.Session.get')
+    def test_get_deleted_asset_ids(self, mock_get, mock_post, mock_connection):
+        """Test fetching permanently deleted assets via delta sync."""
+        mock_get.return_value = Mock(json=Mock(return_value={"id": "user1"}))
+        mock_post.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"needsFullSync": False, "upserted": [], "deleted": ["a1"]})
+        )
+        
+        deleted = mock_connection.get_deleted_asset_ids("2025-10-25T00:00:00Z")
+        
+        assert deleted == ["a1"]
+        assert mock_post.call_args.kwargs["json"]["userIds"] == ["user1"]
+    
+    @patch('immich_connection.requests.Session.post')
+    @patch('immich_connection.requests.Session.get')
+    def test_get_deleted_asset_ids_needs_full_sync(self, mock_get, mock_post, mock_connection):
+        """Test that a required full sync is reported as unknown."""
+        mock_get.return_value = Mock(json=Mock(return_value={"id": "user1"}))
+        mock_post.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"needsFullSync": True, "upserted": [], "deleted": []})
+        )
+        
+        assert mock_connection.get_deleted_asset_ids("2025-10-25T00:00:00Z") is None
+    
+    @patch('immich_connection.requests.Session.post')
+    def test_iter_search_assets_prefetches_full_pages(self, mock_post, mock_connection):
+        """Test that full pages are fetched ahead and yielded in order."""
+        mock_connection.SEARCH_PAGE_SIZE = 2
+        total = 7
+        
+        def page_response(url, json, **kwargs):
+            page = json["page"]
+            items = [{"id": f"a{n}"} for n in range((page - 1) * 2, min(page * 2, total))]
+            next_page = page + 1 if page * 2 < total else None
+            return Mock(json=Mock(return_value={"assets": {"items": items, "nextPage": next_page}}))
+        
+        mock_post.side_effect = page_response
+        
+        assets = mock_connection.iter_search_assets(updated_after="2025-10-25T00:00:00Z")
+        
+        assert not isinstance(assets, list)
+        assert [a["id"] for a in assets] == [f"a{n}" for n in range(total)]
+        payloads = [call.kwargs["json"] for call in mock_post.call_args_list]
+        assert all(p["size"] == 2 and p["updatedAfter"] for p in payloads)
+        # Pages requested past the end may be in flight but are never yielded
+        assert {1, 2, 3, 4} <= {p["page"] for p in payloads}
@@ -0,0 +1,95 @@
+"""Tests for ImmichDatabase against a local SQLite-backed psql stand-in."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+from immich_database import ImmichDatabase, PsqlSession
+
+FAKE_PSQL = Path(__file__).parent / "fake_psql.py"
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Create an asset table with three deleted and two live assets."""
+    path = tmp_path / "immich.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE asset (id TEXT PRIMARY KEY, "originalFileName" TEXT, "deletedAt" TEXT)')
+    conn.executemany(
+        "INSERT INTO asset VALUES (?, ?, ?)",
+        [(f"a{i}", f"IMG {i}|x.jpg", "2025-01-01" if i < 3 else None) for i in range(5)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def db(database):
+    """Create an ImmichDatabase using the stand-in instead of ssh/docker."""
+    with ImmichDatabase("", "", psql_command=[sys.executable, str(FAKE_PSQL), str(database)]) as handler:
+        yield handler
+
+
+class TestImmichDatabase:
+    """Test cases for the batched psql session."""
+
+    def test_clear_deletion_records_in_one_batch(self, db, database):
+        """Test that counting and clearing reuse one psql process and one round trip."""
+        assert db.test_ssh_connection()
+        assert db.get_deleted_count() == 3
+
+        result = db.clear_deletion_records()
+
+        assert result == {'success': True, 'affected_rows': 3, 'error': None}
+        assert db.get_deleted_count() == 0
+        assert db.session.stats == {'started': 1, 'batches': 3, 'statements': 5}
+
+    def test_failed_statement_rolls_back_batch(self, db, database):
+        """Test that an error aborts the whole transaction and the session survives it."""
+        result = db.execute_batch([
+            'UPDATE asset SET "deletedAt" = NULL;',
+            'SELECT missing FROM asset;',
+        ])
+
+        assert not result['success']
+        assert 'missing' in result['error']
+        assert db.get_deleted_count() == 3
+        assert db.session.stats['started'] == 1
+
+    def test_unaligned_rows_keep_spaces_and_pipes(self, db):
+        """Test that rows are split on the unit separator only."""
+        result = db.execute_batch(
+            ['SELECT id, "originalFileName", "deletedAt" FROM asset ORDER BY id LIMIT 1;', "SELECT 1, 2;"],
+            transaction=False,
+        )
+
+        assert result['results'] == [[["a0", "IMG 0|x.jpg", "2025-01-01"]], [["1", "2"]]]
+        assert db.execute_sql("SELECT COUNT(*) FROM asset;")['output'] == "5"
+
+    def test_multiline_statements_are_sent_unchanged(self, db, database):
+        """Test that -- comments and newlines inside literals survive multi-line SQL."""
+        result = db.execute_batch([
+            'UPDATE asset -- clear one record\nSET "originalFileName" = \'two\nlines\'\nWHERE id = \'a0\'',
+            "SELECT COUNT(*) FROM asset -- every asset",
+        ])
+
+        assert result['success']
+        assert result['results'][1] == [["5"]]
+        conn = sqlite3.connect(database)
+        assert conn.execute('SELECT "originalFileName" FROM asset WHERE id = \'a0\'').fetchone() == ("two\nlines",)
+        conn.close()
+
+    def test_remote_command_uses_control_master(self):
+        """Test that the remote session runs psql in the container over a shared SSH master."""
+        db = ImmichDatabase("nas", "admin", ssh_port=2222, container_name="pg")
+
+        command = db.session_command()
+
+        assert command[:3] == ["ssh", "-p", "2222"]
+        assert "ControlMaster=auto" in command
+        assert command[-2] == "admin@nas"
+        assert command[-1].startswith("docker exec -i pg psql postgresql://postgres@localhost/immich")
+        assert f"-F '{PsqlSession.FIELD_SEPARATOR}'" in command[-1]
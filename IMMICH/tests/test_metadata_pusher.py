@@ -0,0 +1,88 @@
+"""Tests for MetadataPusher against the local fake Immich server."""
+
+import csv
+import logging
+
+from fake_immich_server import FakeImmichServer, SyntheticLibrary
+from immich_cache import ImmichCache
+from immich_connection import ImmichConnection
+from metadata_pusher import MetadataPusher
+
+
+class _Logger(logging.LoggerAdapter):
+    def audit(self, *args, **kwargs):
+        return None
+
+
+def _write_csv(path, rows):
+    fields = ["Select", "Filename", "Calc Date", "Calc Offset", "Calc Description", "Calc Tags"]
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(zip(fields, row)))
+
+
+def test_push_groups_updates_and_tags(tmp_path):
+    library = SyntheticLibrary(10)
+    cache = ImmichCache(str(tmp_path / "cache.json"))
+    cache.metadata["target_path"] = str(tmp_path / "photos")
+    rows = []
+    for i in range(4):
+        path = tmp_path / "photos" / library.filename(i)
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(library.content(i))
+        if i < 3:
+            cache.add_asset(library.asset(i), str(path), "exact", "checksum")
+        date = "2001-02-03 04:05:06" if i < 2 else "2002-03-04"
+        rows.append(("y", str(path), date, "+02:00", "Trip", "family;places/beach"))
+    rows.append(("n", str(tmp_path / "photos" / library.filename(0)), "", "", "Skipped", ""))
+    _write_csv(tmp_path / "analyze.csv", rows)
+
+    with FakeImmichServer(library, api_key="key") as server:
+        connection = ImmichConnection(server.url, "key")
+        pusher = MetadataPusher(
+            str(tmp_path / "analyze.csv"),
+            connection,
+            cache,
+            _Logger(logging.getLogger(__name__), {}),
+            max_workers=4,
+        )
+        stats = pusher.process()
+
+        assert stats["assets_updated"] == 3
+        assert stats["tags_applied"] == 6
+        assert stats["not_in_cache"] == 1
+        assert stats["errors"] == 0
+        # Two field groups, one tag upsert and one request per tag
+        assert server.requests["PUT /api/assets"] == 2
+        assert server.requests["PUT /api/tags"] == 1
+        assert server.requests["PUT /api/tags/assets"] == 2
+
+        asset = connection.get_asset_details(library.asset_id(0))
+        assert asset["exifInfo"]["dateTimeOriginal"] == "2001-02-03T04:05:06+02:00"
+        assert asset["exifInfo"]["description"] == "Trip"
+        assert {t["value"] for t in asset["tags"]} >= {"family", "places/beach"}
+        assert library.edits[2]["dateTimeOriginal"] == "2002-03-04T00:00:00+02:00"
+        assert 3 not in library.edits
+
+
+def test_dry_run_sends_no_updates(tmp_path):
+    library = SyntheticLibrary(1)
+    path = tmp_path / library.filename(0)
+    path.write_bytes(library.content(0))
+    cache = ImmichCache(str(tmp_path / "cache.json"))
+    cache.add_asset(library.asset(0), str(path), "exact", "checksum")
+    _write_csv(tmp_path / "analyze.csv", [("y", str(path), "2001-02-03", "", "Trip", "family")])
+
+    with FakeImmichServer(library) as server:
+        pusher = MetadataPusher(
+            str(tmp_path / "analyze.csv"),
+            ImmichConnection(server.url, ""),
+            cache,
+            _Logger(logging.getLogger(__name__), {}),
+            dry_run=True,
+        )
+
+        assert pusher.process()["assets_updated"] == 1
+        assert not any(endpoint.startswith("PUT") for endpoint in server.requests)
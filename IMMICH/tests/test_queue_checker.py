@@ -68,3 +68,114 @@ def test_queue_checker_missing_stats():
     assert overview.queues[0].waiting == 0
     assert overview.queues[0].delayed == 0
     assert overview.all_idle is True
+
+
+class _ScriptedConnection:
+    def __init__(self, snapshots):
+        self._snapshots = list(snapshots)
+
+    def get_queues(self):
+        snapshot = self._snapshots.pop(0) if len(self._snapshots) > 1 else self._snapshots[0]
+        if isinstance(snapshot, Exception):
+            raise snapshot
+        return snapshot
+
+
+def _queue(waiting, completed):
+    return {
+        "name": "thumbnailGeneration",
+        "statistics": {"active": 1 if waiting else 0, "waiting": waiting, "completed": completed},
+    }
+
+
+def _fake_clock(checker):
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    checker._sleep = sleep
+    checker._clock = lambda: now[0]
+    return sleeps
+
+
+def test_wait_until_idle_reports_rate_and_eta():
+    snapshots = [
+        [_queue(100, 0)],
+        RuntimeError("connection reset"),
+        [_queue(90, 10)],
+        [_queue(60, 40)],
+        [_queue(0, 100)],
+    ]
+    checker = QueueChecker(_ScriptedConnection(snapshots), _DummyLogger())
+    sleeps = _fake_clock(checker)
+    reports = []
+
+    overview = checker.wait_until_idle(
+        min_interval=2, backoff=2, on_progress=lambda o, p: reports.append(p[0])
+    )
+
+    assert overview.is_idle is True
+    assert sleeps[:3] == [4, 8, 16]
+    assert reports[1].drain_rate == 10 / 12
+    assert reports[1].eta_seconds == 91 / reports[1].drain_rate
+    # The interval is capped at a quarter of the ETA once the queue drains faster
+    assert sleeps[3] == reports[2].eta_seconds / 4 < 32
+    # Idle is confirmed by a second poll
+    assert [r.pending for r in reports[-2:]] == [0, 0]
+    assert len(reports) == 5
+
+
+def test_wait_until_idle_times_out():
+    checker = QueueChecker(_ScriptedConnection([[_queue(5, 0)]]), _DummyLogger())
+    sleeps = _fake_clock(checker)
+
+    overview = checker.wait_until_idle(timeout=30, min_interval=5, max_interval=10)
+
+    assert overview.is_idle is False
+    assert sum(sleeps) == 30
+    assert max(sleeps) == 10
+
+
+def test_wait_until_idle_waits_for_jobs_to_start():
+    snapshots = [[_queue(0, 0)], [_queue(0, 0)], [_queue(0, 0)], [_queue(3, 0)], [_queue(0, 3)]]
+    checker = QueueChecker(_ScriptedConnection(snapshots), _DummyLogger())
+    sleeps = _fake_clock(checker)
+    reports = []
+
+    overview = checker.wait_until_idle(
+        min_interval=2, start_grace=30, on_progress=lambda o, p: reports.append(p[0])
+    )
+
+    # Idle polls before the scan's jobs appeared do not count
+    assert overview.is_idle is True
+    assert [r.pending for r in reports] == [0, 0, 0, 4, 0, 0]
+    assert sleeps[:2] == [2, 2]
+
+
+def test_wait_until_idle_start_grace_expires():
+    checker = QueueChecker(_ScriptedConnection([[_queue(0, 0)]]), _DummyLogger())
+    sleeps = _fake_clock(checker)
+
+    overview = checker.wait_until_idle(min_interval=2, start_grace=5)
+
+    assert overview.is_idle is True
+    # Polls at 0, 2 and 4s fall inside the grace period; 6s and 8s confirm idle
+    assert sleeps == [2, 2, 2, 2]
+
+
+def test_wait_until_idle_stops_on_paused_queue():
+    paused = dict(_queue(5, 0), isPaused=True)
+    warnings = []
+    logger = _DummyLogger()
+    logger.warning = lambda *args, **kwargs: warnings.append(args)
+    checker = QueueChecker(_ScriptedConnection([[paused]]), logger)
+    sleeps = _fake_clock(checker)
+
+    overview = checker.wait_until_idle()
+
+    assert overview.is_idle is False
+    assert sleeps == []
+    assert "paused" in warnings[0][0]